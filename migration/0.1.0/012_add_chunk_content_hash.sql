@@ -0,0 +1,26 @@
+-- =====================================================
+-- Add content_hash to archon_crawled_pages for embedding reuse
+-- =====================================================
+-- Stores a SHA-256 hash of each chunk's original text. On recrawl,
+-- chunks whose hash and embedding model are unchanged reuse the stored
+-- vector and contextual text instead of being re-embedded.
+--
+-- NULLABLE because existing chunks won't have a hash until recrawled.
+-- =====================================================
+
+ALTER TABLE archon_crawled_pages
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_url_content_hash
+    ON archon_crawled_pages(url, content_hash);
+
+COMMENT ON COLUMN archon_crawled_pages.content_hash IS 'SHA-256 of the original chunk text, used to skip re-embedding unchanged chunks';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '012_add_chunk_content_hash')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,181 @@
+-- =====================================================
+-- Add candidate-only hybrid search functions
+-- =====================================================
+-- The hybrid_search_* functions merge the vector and keyword legs with
+-- COALESCE(vector_sim, text_sim) and ship full row content from both legs.
+-- These functions return only ids with each leg's rank and score, so the
+-- server can fuse the lists with (weighted) reciprocal rank fusion and
+-- fetch content for the final top-k results only.
+--
+-- candidate_count controls how deep each leg searches.
+-- =====================================================
+
+-- Candidate-only hybrid search for archon_crawled_pages (used for reciprocal rank fusion)
+CREATE OR REPLACE FUNCTION hybrid_candidates_archon_crawled_pages_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    candidate_count INT DEFAULT 50,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    vector_rank INTEGER,
+    vector_similarity FLOAT,
+    text_rank INTEGER,
+    text_similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    sql_query TEXT;
+    embedding_column TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Each leg returns only ids, scores and ranks; content is fetched by the caller
+    sql_query := format('
+    WITH vector_results AS (
+        SELECT
+            cp.id,
+            1 - (cp.%I <=> $1) AS vector_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $3
+            AND ($4 IS NULL OR cp.source_id = $4)
+            AND cp.%I IS NOT NULL
+        ORDER BY cp.%I <=> $1
+        LIMIT $2
+    ),
+    text_results AS (
+        SELECT
+            cp.id,
+            ts_rank_cd(cp.content_search_vector, plainto_tsquery(''english'', $5)) AS text_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $3
+            AND ($4 IS NULL OR cp.source_id = $4)
+            AND cp.content_search_vector @@ plainto_tsquery(''english'', $5)
+        ORDER BY text_sim DESC
+        LIMIT $2
+    ),
+    vector_ranked AS (
+        SELECT v.id, v.vector_sim, ROW_NUMBER() OVER (ORDER BY v.vector_sim DESC, v.id) AS vector_rank
+        FROM vector_results v
+    ),
+    text_ranked AS (
+        SELECT t.id, t.text_sim, ROW_NUMBER() OVER (ORDER BY t.text_sim DESC, t.id) AS text_rank
+        FROM text_results t
+    )
+    SELECT
+        COALESCE(v.id, t.id) AS id,
+        v.vector_rank::int AS vector_rank,
+        v.vector_sim::float8 AS vector_similarity,
+        t.text_rank::int AS text_rank,
+        t.text_sim::float8 AS text_similarity
+    FROM vector_ranked v
+    FULL OUTER JOIN text_ranked t ON v.id = t.id',
+    embedding_column, embedding_column, embedding_column);
+
+    RETURN QUERY EXECUTE sql_query USING query_embedding, candidate_count, filter, source_filter, query_text;
+END;
+$$;
+
+-- Candidate-only hybrid search for archon_code_examples (used for reciprocal rank fusion)
+CREATE OR REPLACE FUNCTION hybrid_candidates_archon_code_examples_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    candidate_count INT DEFAULT 50,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    vector_rank INTEGER,
+    vector_similarity FLOAT,
+    text_rank INTEGER,
+    text_similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    sql_query TEXT;
+    embedding_column TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Each leg returns only ids, scores and ranks; content is fetched by the caller
+    sql_query := format('
+    WITH vector_results AS (
+        SELECT
+            ce.id,
+            1 - (ce.%I <=> $1) AS vector_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $3
+            AND ($4 IS NULL OR ce.source_id = $4)
+            AND ce.%I IS NOT NULL
+        ORDER BY ce.%I <=> $1
+        LIMIT $2
+    ),
+    text_results AS (
+        SELECT
+            ce.id,
+            ts_rank_cd(ce.content_search_vector, plainto_tsquery(''english'', $5)) AS text_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $3
+            AND ($4 IS NULL OR ce.source_id = $4)
+            AND ce.content_search_vector @@ plainto_tsquery(''english'', $5)
+        ORDER BY text_sim DESC
+        LIMIT $2
+    ),
+    vector_ranked AS (
+        SELECT v.id, v.vector_sim, ROW_NUMBER() OVER (ORDER BY v.vector_sim DESC, v.id) AS vector_rank
+        FROM vector_results v
+    ),
+    text_ranked AS (
+        SELECT t.id, t.text_sim, ROW_NUMBER() OVER (ORDER BY t.text_sim DESC, t.id) AS text_rank
+        FROM text_results t
+    )
+    SELECT
+        COALESCE(v.id, t.id) AS id,
+        v.vector_rank::int AS vector_rank,
+        v.vector_sim::float8 AS vector_similarity,
+        t.text_rank::int AS text_rank,
+        t.text_sim::float8 AS text_similarity
+    FROM vector_ranked v
+    FULL OUTER JOIN text_ranked t ON v.id = t.id',
+    embedding_column, embedding_column, embedding_column);
+
+    RETURN QUERY EXECUTE sql_query USING query_embedding, candidate_count, filter, source_filter, query_text;
+END;
+$$;
+
+COMMENT ON FUNCTION hybrid_candidates_archon_crawled_pages_multi IS 'Hybrid search candidates (ids, ranks and scores per leg) for reciprocal rank fusion over crawled pages';
+COMMENT ON FUNCTION hybrid_candidates_archon_code_examples_multi IS 'Hybrid search candidates (ids, ranks and scores per leg) for reciprocal rank fusion over code examples';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '013_add_hybrid_candidate_functions')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
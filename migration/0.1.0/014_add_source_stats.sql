@@ -0,0 +1,253 @@
+-- =====================================================
+-- Add per-source counters (archon_source_stats)
+-- =====================================================
+-- Listing knowledge items used to count chunks and code examples with one
+-- query per source (chunk counts were disabled entirely to avoid timeouts).
+-- This migration adds a counters table kept up to date by statement-level
+-- triggers on insert and delete, so the list and summary endpoints read all
+-- counts with a single grouped query.
+--
+-- Existing data is backfilled by refresh_archon_source_stats(), which can
+-- also be called later to repair counters.
+-- =====================================================
+
+-- Per-source counters maintained by statement-level triggers on the chunk,
+-- code example and page tables, so listing sources needs one grouped read
+CREATE TABLE IF NOT EXISTS archon_source_stats (
+    source_id TEXT PRIMARY KEY REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    chunks_count BIGINT NOT NULL DEFAULT 0,
+    code_examples_count BIGINT NOT NULL DEFAULT 0,
+    pages_count BIGINT NOT NULL DEFAULT 0,
+    word_count BIGINT NOT NULL DEFAULT 0,
+    first_url TEXT,
+    last_crawled_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE archon_source_stats IS 'Trigger-maintained per-source counters for knowledge list and summary views';
+COMMENT ON COLUMN archon_source_stats.word_count IS 'Sum of chunk word counts (metadata.word_count)';
+COMMENT ON COLUMN archon_source_stats.first_url IS 'URL of the earliest stored chunk, used when the source has no source_url';
+COMMENT ON COLUMN archon_source_stats.last_crawled_at IS 'Time the most recent chunk was stored';
+
+-- Word count stored in chunk metadata, ignoring malformed values
+CREATE OR REPLACE FUNCTION archon_chunk_word_count(metadata JSONB)
+RETURNS BIGINT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE WHEN metadata->>'word_count' ~ '^[0-9]+$' THEN (metadata->>'word_count')::BIGINT ELSE 0 END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_chunks_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, chunks_count, word_count, first_url, last_crawled_at)
+    SELECT
+        n.source_id,
+        COUNT(*),
+        SUM(archon_chunk_word_count(n.metadata)),
+        (ARRAY_AGG(n.url ORDER BY n.id))[1],
+        MAX(n.created_at)
+    FROM new_rows n
+    GROUP BY n.source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunks_count = s.chunks_count + EXCLUDED.chunks_count,
+        word_count = s.word_count + EXCLUDED.word_count,
+        first_url = COALESCE(s.first_url, EXCLUDED.first_url),
+        last_crawled_at = GREATEST(s.last_crawled_at, EXCLUDED.last_crawled_at),
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+-- Deletes only UPDATE existing rows: when a source is deleted its stats row is
+-- removed by the cascade and must not be re-created by the cascaded chunk deletes
+CREATE OR REPLACE FUNCTION archon_source_stats_chunks_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        chunks_count = GREATEST(s.chunks_count - d.removed, 0),
+        word_count = GREATEST(s.word_count - d.words, 0),
+        first_url = CASE WHEN s.chunks_count - d.removed <= 0 THEN NULL ELSE s.first_url END,
+        updated_at = NOW()
+    FROM (
+        SELECT o.source_id, COUNT(*) AS removed, SUM(archon_chunk_word_count(o.metadata)) AS words
+        FROM old_rows o
+        GROUP BY o.source_id
+    ) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_examples_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, code_examples_count)
+    SELECT n.source_id, COUNT(*) FROM new_rows n GROUP BY n.source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        code_examples_count = s.code_examples_count + EXCLUDED.code_examples_count,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_examples_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        code_examples_count = GREATEST(s.code_examples_count - d.removed, 0),
+        updated_at = NOW()
+    FROM (SELECT o.source_id, COUNT(*) AS removed FROM old_rows o GROUP BY o.source_id) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, pages_count)
+    SELECT n.source_id, COUNT(*) FROM new_rows n GROUP BY n.source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        pages_count = s.pages_count + EXCLUDED.pages_count,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        pages_count = GREATEST(s.pages_count - d.removed, 0),
+        updated_at = NOW()
+    FROM (SELECT o.source_id, COUNT(*) AS removed FROM old_rows o GROUP BY o.source_id) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS archon_source_stats_chunks_insert ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_chunks_insert
+    AFTER INSERT ON archon_crawled_pages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_chunks_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_chunks_delete ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_chunks_delete
+    AFTER DELETE ON archon_crawled_pages
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_chunks_deleted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_examples_insert ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_examples_insert
+    AFTER INSERT ON archon_code_examples
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_code_examples_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_examples_delete ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_examples_delete
+    AFTER DELETE ON archon_code_examples
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_code_examples_deleted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_insert ON archon_page_metadata;
+CREATE TRIGGER archon_source_stats_pages_insert
+    AFTER INSERT ON archon_page_metadata
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_pages_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_delete ON archon_page_metadata;
+CREATE TRIGGER archon_source_stats_pages_delete
+    AFTER DELETE ON archon_page_metadata
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_pages_deleted();
+
+-- Recompute counters from the underlying tables (all sources, or one source)
+CREATE OR REPLACE FUNCTION refresh_archon_source_stats(p_source_id TEXT DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (
+        source_id, chunks_count, code_examples_count, pages_count, word_count, first_url, last_crawled_at
+    )
+    SELECT
+        src.source_id,
+        COALESCE(c.chunks_count, 0),
+        COALESCE(ce.code_examples_count, 0),
+        COALESCE(p.pages_count, 0),
+        COALESCE(c.word_count, 0),
+        c.first_url,
+        c.last_crawled_at
+    FROM archon_sources src
+    LEFT JOIN (
+        SELECT
+            source_id,
+            COUNT(*) AS chunks_count,
+            SUM(archon_chunk_word_count(metadata)) AS word_count,
+            (ARRAY_AGG(url ORDER BY id))[1] AS first_url,
+            MAX(created_at) AS last_crawled_at
+        FROM archon_crawled_pages
+        WHERE p_source_id IS NULL OR source_id = p_source_id
+        GROUP BY source_id
+    ) c ON c.source_id = src.source_id
+    LEFT JOIN (
+        SELECT source_id, COUNT(*) AS code_examples_count
+        FROM archon_code_examples
+        WHERE p_source_id IS NULL OR source_id = p_source_id
+        GROUP BY source_id
+    ) ce ON ce.source_id = src.source_id
+    LEFT JOIN (
+        SELECT source_id, COUNT(*) AS pages_count
+        FROM archon_page_metadata
+        WHERE p_source_id IS NULL OR source_id = p_source_id
+        GROUP BY source_id
+    ) p ON p.source_id = src.source_id
+    WHERE p_source_id IS NULL OR src.source_id = p_source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunks_count = EXCLUDED.chunks_count,
+        code_examples_count = EXCLUDED.code_examples_count,
+        pages_count = EXCLUDED.pages_count,
+        word_count = EXCLUDED.word_count,
+        first_url = EXCLUDED.first_url,
+        last_crawled_at = EXCLUDED.last_crawled_at,
+        updated_at = NOW();
+END;
+$$;
+
+COMMENT ON FUNCTION refresh_archon_source_stats IS 'Recompute archon_source_stats from the chunk, code example and page tables';
+
+ALTER TABLE archon_source_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to archon_source_stats" ON archon_source_stats;
+CREATE POLICY "Allow public read access to archon_source_stats"
+  ON archon_source_stats
+  FOR SELECT
+  TO public
+  USING (true);
+
+-- Backfill counters for existing sources
+SELECT refresh_archon_source_stats();
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '014_add_source_stats')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
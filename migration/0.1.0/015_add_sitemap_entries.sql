@@ -0,0 +1,37 @@
+-- =====================================================
+-- Add sitemap entries for incremental sitemap refreshes
+-- =====================================================
+-- Refreshing a sitemap source recrawled every URL in the sitemap. This
+-- migration records each sitemap URL with its <lastmod> value at the time
+-- it was last crawled, so a refresh only recrawls URLs that are new or
+-- whose lastmod has moved forward since then.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS archon_sitemap_entries (
+    source_id TEXT NOT NULL REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    lastmod TIMESTAMPTZ,
+    crawled_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source_id, url)
+);
+
+COMMENT ON TABLE archon_sitemap_entries IS 'Sitemap URLs per source with the lastmod seen when each was last crawled';
+COMMENT ON COLUMN archon_sitemap_entries.lastmod IS 'Sitemap <lastmod> at the last crawl (NULL when the sitemap gave none)';
+
+ALTER TABLE archon_sitemap_entries ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to archon_sitemap_entries" ON archon_sitemap_entries;
+CREATE POLICY "Allow public read access to archon_sitemap_entries"
+  ON archon_sitemap_entries
+  FOR SELECT
+  TO public
+  USING (true);
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '015_add_sitemap_entries')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
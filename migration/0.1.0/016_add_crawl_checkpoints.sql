@@ -0,0 +1,48 @@
+-- =====================================================
+-- Add crawl checkpoints for resuming interrupted crawls
+-- =====================================================
+-- Crawl state only lived in server memory, so a restart in the middle of a
+-- large crawl threw away every page already fetched and embedded. This
+-- migration adds a checkpoint per crawl operation holding the URLs it has
+-- discovered (with their crawl depth) and the pages already stored, so the
+-- crawl can be resumed without recrawling or re-embedding finished pages.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS archon_crawl_checkpoints (
+    progress_id TEXT PRIMARY KEY,
+    source_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    crawl_type TEXT,
+    request JSONB NOT NULL DEFAULT '{}'::jsonb,
+    seen_urls JSONB NOT NULL DEFAULT '{}'::jsonb,
+    stored_pages JSONB NOT NULL DEFAULT '{}'::jsonb,
+    stored_word_count INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'failed', 'cancelled')),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_crawl_checkpoints_updated_at
+  ON archon_crawl_checkpoints(updated_at DESC);
+
+COMMENT ON TABLE archon_crawl_checkpoints IS 'Durable state of unfinished crawls; removed when a crawl completes';
+COMMENT ON COLUMN archon_crawl_checkpoints.seen_urls IS 'Every URL queued by the crawl, mapped to its crawl depth';
+COMMENT ON COLUMN archon_crawl_checkpoints.stored_pages IS 'URLs whose page and chunks are stored, mapped to their page id';
+
+ALTER TABLE archon_crawl_checkpoints ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to archon_crawl_checkpoints" ON archon_crawl_checkpoints;
+CREATE POLICY "Allow public read access to archon_crawl_checkpoints"
+  ON archon_crawl_checkpoints
+  FOR SELECT
+  TO public
+  USING (true);
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '016_add_crawl_checkpoints')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,34 @@
+-- =====================================================
+-- Add HTTP validators and content hash to archon_page_metadata
+-- =====================================================
+-- Refreshing a source re-rendered every page in a headless browser. These
+-- columns keep what is needed to skip unchanged pages on refresh:
+--   * etag / last_modified: HTTP validators for a cheap conditional request
+--     (If-None-Match / If-Modified-Since) before rendering
+--   * content_hash: SHA-256 of the stored markdown, so a rendered page whose
+--     content did not change is not chunked and embedded again
+--   * internal_links: links found on the page, so a recursive refresh can
+--     keep discovering pages below a page it did not re-render
+--
+-- NULLABLE because existing pages won't have validators until recrawled.
+-- =====================================================
+
+ALTER TABLE archon_page_metadata
+ADD COLUMN IF NOT EXISTS etag TEXT,
+ADD COLUMN IF NOT EXISTS last_modified TEXT,
+ADD COLUMN IF NOT EXISTS content_hash TEXT,
+ADD COLUMN IF NOT EXISTS internal_links JSONB;
+
+COMMENT ON COLUMN archon_page_metadata.etag IS 'ETag response header when the page was last crawled';
+COMMENT ON COLUMN archon_page_metadata.last_modified IS 'Last-Modified response header when the page was last crawled';
+COMMENT ON COLUMN archon_page_metadata.content_hash IS 'SHA-256 of full_content, used to skip re-embedding unchanged pages on refresh';
+COMMENT ON COLUMN archon_page_metadata.internal_links IS 'Internal links found on the page, followed when a refresh skips rendering it';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '017_add_page_validators')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,726 @@
+-- =====================================================
+-- Add managed vector indexes
+-- =====================================================
+-- The embedding indexes were ivfflat with a fixed lists = 100, built when the
+-- tables were still empty, and embedding_3072 had no index at all. This
+-- migration adds what the server needs to manage them:
+--
+-- * archon_vector_index_settings: method and search parameters per index
+-- * archon_vector_index_status(): row counts and current index per column
+-- * archon_rebuild_vector_index(): rebuild one index as HNSW or ivfflat,
+--   indexing 3072-d embeddings as halfvec (needs pgvector 0.7 or later)
+-- * the *_multi search functions apply the tuned ivfflat.probes /
+--   hnsw.ef_search and search 3072-d embeddings through the halfvec index
+--
+-- Existing indexes are left as they are. Rebuild them from the server with
+-- POST /api/vector-indexes/rebuild once this migration is applied.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS archon_vector_index_settings (
+    table_name TEXT NOT NULL,
+    dimension INTEGER NOT NULL,
+    index_method TEXT NOT NULL CHECK (index_method IN ('hnsw', 'ivfflat')),
+    lists INTEGER,
+    probes INTEGER,
+    ef_search INTEGER,
+    recall_target FLOAT,
+    row_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (table_name, dimension)
+);
+
+COMMENT ON TABLE archon_vector_index_settings IS 'Method and search parameters of each managed embedding index';
+COMMENT ON COLUMN archon_vector_index_settings.probes IS 'ivfflat.probes applied to searches on this index';
+COMMENT ON COLUMN archon_vector_index_settings.ef_search IS 'hnsw.ef_search applied to searches on this index';
+COMMENT ON COLUMN archon_vector_index_settings.row_count IS 'Embedded rows when the index was last built or tuned';
+
+ALTER TABLE archon_vector_index_settings ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to archon_vector_index_settings" ON archon_vector_index_settings;
+CREATE POLICY "Allow public read access to archon_vector_index_settings"
+  ON archon_vector_index_settings
+  FOR SELECT
+  TO public
+  USING (true);
+
+-- Distance expression used by the search functions for an embedding column.
+-- Vectors above 2000 dimensions can only be indexed as halfvec, so 3072-d
+-- searches compare halfvec casts, matching the expression the index is built on.
+CREATE OR REPLACE FUNCTION archon_vector_distance_sql(p_alias TEXT, p_dimension INTEGER)
+RETURNS TEXT AS $$
+DECLARE
+    column_ref TEXT;
+BEGIN
+    column_ref := quote_ident(get_embedding_column_name(p_dimension));
+    IF p_alias IS NOT NULL THEN
+        column_ref := quote_ident(p_alias) || '.' || column_ref;
+    END IF;
+
+    IF p_dimension > 2000 AND to_regtype('halfvec') IS NOT NULL THEN
+        RETURN format('(%s::halfvec(%s)) <=> ($1::halfvec(%s))', column_ref, p_dimension, p_dimension);
+    END IF;
+    RETURN column_ref || ' <=> $1';
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Apply the tuned search parameters of an embedding index to the current query
+CREATE OR REPLACE FUNCTION archon_apply_vector_search_params(p_table_name TEXT, p_dimension INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    params RECORD;
+BEGIN
+    SELECT s.probes, s.ef_search INTO params
+    FROM archon_vector_index_settings s
+    WHERE s.table_name = p_table_name AND s.dimension = p_dimension;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+    -- Transaction-local, so the settings only apply to this search
+    IF params.probes IS NOT NULL THEN
+        PERFORM set_config('ivfflat.probes', params.probes::text, true);
+    END IF;
+    IF params.ef_search IS NOT NULL THEN
+        PERFORM set_config('hnsw.ef_search', params.ef_search::text, true);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Row counts, current index and search parameters per embedding column
+CREATE OR REPLACE FUNCTION archon_vector_index_status()
+RETURNS TABLE (
+    table_name TEXT,
+    dimension INTEGER,
+    row_count BIGINT,
+    index_name TEXT,
+    index_method TEXT,
+    index_options TEXT[],
+    index_definition TEXT,
+    probes INTEGER,
+    ef_search INTEGER,
+    recall_target FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    t TEXT;
+    d INTEGER;
+    n BIGINT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['archon_crawled_pages', 'archon_code_examples'] LOOP
+        FOREACH d IN ARRAY ARRAY[384, 768, 1024, 1536, 3072] LOOP
+            EXECUTE format('SELECT count(*) FROM %I WHERE %I IS NOT NULL', t, get_embedding_column_name(d))
+                INTO n;
+            RETURN QUERY
+            SELECT
+                t,
+                d,
+                n,
+                c.relname::text,
+                am.amname::text,
+                c.reloptions::text[],
+                CASE WHEN c.oid IS NULL THEN NULL ELSE pg_get_indexdef(c.oid) END,
+                s.probes,
+                s.ef_search,
+                s.recall_target::float8
+            FROM (SELECT 1) AS one
+            LEFT JOIN pg_class c
+                ON c.relname = format('idx_%s_embedding_%s', t, d) AND c.relkind = 'i'
+            LEFT JOIN pg_am am ON am.oid = c.relam
+            LEFT JOIN archon_vector_index_settings s ON s.table_name = t AND s.dimension = d;
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+-- Drop and recreate the index of one embedding column with the given method and options
+CREATE OR REPLACE FUNCTION archon_rebuild_vector_index(
+    p_table_name TEXT,
+    p_dimension INTEGER,
+    p_method TEXT,
+    p_lists INTEGER DEFAULT NULL,
+    p_m INTEGER DEFAULT 16,
+    p_ef_construction INTEGER DEFAULT 64
+)
+RETURNS TEXT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_index_name TEXT := format('idx_%s_embedding_%s', p_table_name, p_dimension);
+    column_expr TEXT;
+    opclass TEXT;
+    options TEXT;
+BEGIN
+    IF p_table_name NOT IN ('archon_crawled_pages', 'archon_code_examples') THEN
+        RAISE EXCEPTION 'Unsupported table for vector indexes: %', p_table_name;
+    END IF;
+    column_expr := quote_ident(get_embedding_column_name(p_dimension));
+
+    IF p_dimension > 2000 THEN
+        IF to_regtype('halfvec') IS NULL THEN
+            RAISE EXCEPTION '%-dimensional embeddings can only be indexed as halfvec (pgvector 0.7 or later)', p_dimension;
+        END IF;
+        column_expr := format('(%s::halfvec(%s))', column_expr, p_dimension);
+        opclass := 'halfvec_cosine_ops';
+    ELSE
+        opclass := 'vector_cosine_ops';
+    END IF;
+
+    CASE p_method
+        WHEN 'hnsw' THEN
+            options := format('m = %s, ef_construction = %s', p_m, p_ef_construction);
+        WHEN 'ivfflat' THEN
+            IF p_lists IS NULL OR p_lists < 1 THEN
+                RAISE EXCEPTION 'ivfflat indexes need lists >= 1';
+            END IF;
+            options := format('lists = %s', p_lists);
+        ELSE
+            RAISE EXCEPTION 'Unsupported vector index method: %', p_method;
+    END CASE;
+
+    EXECUTE format('DROP INDEX IF EXISTS %I', v_index_name);
+    EXECUTE format(
+        'CREATE INDEX %I ON %I USING %s (%s %s) WITH (%s)',
+        v_index_name, p_table_name, p_method, column_expr, opclass, options
+    );
+    RETURN pg_get_indexdef(v_index_name::regclass);
+END;
+$$;
+
+-- Rebuilding indexes is an admin operation reserved for the server's service role
+REVOKE ALL ON FUNCTION archon_rebuild_vector_index(TEXT, INTEGER, TEXT, INTEGER, INTEGER, INTEGER) FROM PUBLIC;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+        REVOKE ALL ON FUNCTION archon_rebuild_vector_index(TEXT, INTEGER, TEXT, INTEGER, INTEGER, INTEGER) FROM anon, authenticated;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+        GRANT EXECUTE ON FUNCTION archon_rebuild_vector_index(TEXT, INTEGER, TEXT, INTEGER, INTEGER, INTEGER) TO service_role;
+    END IF;
+END $$;
+
+COMMENT ON FUNCTION archon_vector_index_status IS 'Row counts, index method/options and search parameters for every embedding column';
+COMMENT ON FUNCTION archon_rebuild_vector_index IS 'Rebuild the HNSW or ivfflat index of one embedding column (halfvec for 3072-d)';
+
+-- Search functions: halfvec distance for 3072-d and tuned search parameters
+
+CREATE OR REPLACE FUNCTION match_archon_crawled_pages_multi (
+  query_embedding VECTOR,
+  embedding_dimension INTEGER,
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  distance TEXT;
+BEGIN
+  -- Determine which embedding column to use based on dimension
+  CASE embedding_dimension
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+  END CASE;
+
+  -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+  distance := archon_vector_distance_sql(NULL, embedding_dimension);
+  -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+  PERFORM archon_apply_vector_search_params('archon_crawled_pages', embedding_dimension);
+
+  -- Build dynamic query
+  sql_query := format('
+    SELECT id, url, chunk_number, content, metadata, source_id,
+           1 - (%s) AS similarity
+    FROM archon_crawled_pages
+    WHERE (%I IS NOT NULL)
+      AND metadata @> $3
+      AND ($4 IS NULL OR source_id = $4)
+    ORDER BY %s
+    LIMIT $2',
+    distance, embedding_column, distance);
+
+  -- Execute dynamic query
+  RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_archon_code_examples_multi (
+  query_embedding VECTOR,
+  embedding_dimension INTEGER,
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  summary TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  sql_query TEXT;
+  embedding_column TEXT;
+  distance TEXT;
+BEGIN
+  -- Determine which embedding column to use based on dimension
+  CASE embedding_dimension
+    WHEN 384 THEN embedding_column := 'embedding_384';
+    WHEN 768 THEN embedding_column := 'embedding_768';
+    WHEN 1024 THEN embedding_column := 'embedding_1024';
+    WHEN 1536 THEN embedding_column := 'embedding_1536';
+    WHEN 3072 THEN embedding_column := 'embedding_3072';
+    ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+  END CASE;
+
+  -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+  distance := archon_vector_distance_sql(NULL, embedding_dimension);
+  -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+  PERFORM archon_apply_vector_search_params('archon_code_examples', embedding_dimension);
+
+  -- Build dynamic query
+  sql_query := format('
+    SELECT id, url, chunk_number, content, summary, metadata, source_id,
+           1 - (%s) AS similarity
+    FROM archon_code_examples
+    WHERE (%I IS NOT NULL)
+      AND metadata @> $3
+      AND ($4 IS NULL OR source_id = $4)
+    ORDER BY %s
+    LIMIT $2',
+    distance, embedding_column, distance);
+
+  -- Execute dynamic query
+  RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_search_archon_crawled_pages_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    max_vector_results INT;
+    max_text_results INT;
+    sql_query TEXT;
+    embedding_column TEXT;
+    distance TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('cp', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_crawled_pages', embedding_dimension);
+
+    -- Calculate how many results to fetch from each search type
+    max_vector_results := match_count;
+    max_text_results := match_count;
+    
+    -- Build dynamic query with proper embedding column
+    sql_query := format('
+    WITH vector_results AS (
+        -- Vector similarity search
+        SELECT 
+            cp.id,
+            cp.url,
+            cp.chunk_number,
+            cp.content,
+            cp.metadata,
+            cp.source_id,
+            1 - (%s) AS vector_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $4
+            AND ($5 IS NULL OR cp.source_id = $5)
+            AND cp.%I IS NOT NULL
+        ORDER BY %s
+        LIMIT $2
+    ),
+    text_results AS (
+        -- Full-text search with ranking
+        SELECT 
+            cp.id,
+            cp.url,
+            cp.chunk_number,
+            cp.content,
+            cp.metadata,
+            cp.source_id,
+            ts_rank_cd(cp.content_search_vector, plainto_tsquery(''english'', $6)) AS text_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $4
+            AND ($5 IS NULL OR cp.source_id = $5)
+            AND cp.content_search_vector @@ plainto_tsquery(''english'', $6)
+        ORDER BY text_sim DESC
+        LIMIT $3
+    ),
+    combined_results AS (
+        -- Combine results from both searches
+        SELECT 
+            COALESCE(v.id, t.id) AS id,
+            COALESCE(v.url, t.url) AS url,
+            COALESCE(v.chunk_number, t.chunk_number) AS chunk_number,
+            COALESCE(v.content, t.content) AS content,
+            COALESCE(v.metadata, t.metadata) AS metadata,
+            COALESCE(v.source_id, t.source_id) AS source_id,
+            -- Use vector similarity if available, otherwise text similarity
+            COALESCE(v.vector_sim, t.text_sim, 0)::float8 AS similarity,
+            -- Determine match type
+            CASE 
+                WHEN v.id IS NOT NULL AND t.id IS NOT NULL THEN ''hybrid''
+                WHEN v.id IS NOT NULL THEN ''vector''
+                ELSE ''keyword''
+            END AS match_type
+        FROM vector_results v
+        FULL OUTER JOIN text_results t ON v.id = t.id
+    )
+    SELECT * FROM combined_results
+    ORDER BY similarity DESC
+    LIMIT $2', 
+    distance, embedding_column, distance);
+
+    -- Execute dynamic query
+    RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_search_archon_code_examples_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    summary TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    max_vector_results INT;
+    max_text_results INT;
+    sql_query TEXT;
+    embedding_column TEXT;
+    distance TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('ce', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_code_examples', embedding_dimension);
+
+    -- Calculate how many results to fetch from each search type
+    max_vector_results := match_count;
+    max_text_results := match_count;
+    
+    -- Build dynamic query with proper embedding column
+    sql_query := format('
+    WITH vector_results AS (
+        -- Vector similarity search
+        SELECT 
+            ce.id,
+            ce.url,
+            ce.chunk_number,
+            ce.content,
+            ce.summary,
+            ce.metadata,
+            ce.source_id,
+            1 - (%s) AS vector_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $4
+            AND ($5 IS NULL OR ce.source_id = $5)
+            AND ce.%I IS NOT NULL
+        ORDER BY %s
+        LIMIT $2
+    ),
+    text_results AS (
+        -- Full-text search with ranking (searches both content and summary)
+        SELECT 
+            ce.id,
+            ce.url,
+            ce.chunk_number,
+            ce.content,
+            ce.summary,
+            ce.metadata,
+            ce.source_id,
+            ts_rank_cd(ce.content_search_vector, plainto_tsquery(''english'', $6)) AS text_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $4
+            AND ($5 IS NULL OR ce.source_id = $5)
+            AND ce.content_search_vector @@ plainto_tsquery(''english'', $6)
+        ORDER BY text_sim DESC
+        LIMIT $3
+    ),
+    combined_results AS (
+        -- Combine results from both searches
+        SELECT 
+            COALESCE(v.id, t.id) AS id,
+            COALESCE(v.url, t.url) AS url,
+            COALESCE(v.chunk_number, t.chunk_number) AS chunk_number,
+            COALESCE(v.content, t.content) AS content,
+            COALESCE(v.summary, t.summary) AS summary,
+            COALESCE(v.metadata, t.metadata) AS metadata,
+            COALESCE(v.source_id, t.source_id) AS source_id,
+            -- Use vector similarity if available, otherwise text similarity
+            COALESCE(v.vector_sim, t.text_sim, 0)::float8 AS similarity,
+            -- Determine match type
+            CASE 
+                WHEN v.id IS NOT NULL AND t.id IS NOT NULL THEN ''hybrid''
+                WHEN v.id IS NOT NULL THEN ''vector''
+                ELSE ''keyword''
+            END AS match_type
+        FROM vector_results v
+        FULL OUTER JOIN text_results t ON v.id = t.id
+    )
+    SELECT * FROM combined_results
+    ORDER BY similarity DESC
+    LIMIT $2', 
+    distance, embedding_column, distance);
+
+    -- Execute dynamic query
+    RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_candidates_archon_crawled_pages_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    candidate_count INT DEFAULT 50,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    vector_rank INTEGER,
+    vector_similarity FLOAT,
+    text_rank INTEGER,
+    text_similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    sql_query TEXT;
+    embedding_column TEXT;
+    distance TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('cp', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_crawled_pages', embedding_dimension);
+
+    -- Each leg returns only ids, scores and ranks; content is fetched by the caller
+    sql_query := format('
+    WITH vector_results AS (
+        SELECT
+            cp.id,
+            1 - (%s) AS vector_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $3
+            AND ($4 IS NULL OR cp.source_id = $4)
+            AND cp.%I IS NOT NULL
+        ORDER BY %s
+        LIMIT $2
+    ),
+    text_results AS (
+        SELECT
+            cp.id,
+            ts_rank_cd(cp.content_search_vector, plainto_tsquery(''english'', $5)) AS text_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $3
+            AND ($4 IS NULL OR cp.source_id = $4)
+            AND cp.content_search_vector @@ plainto_tsquery(''english'', $5)
+        ORDER BY text_sim DESC
+        LIMIT $2
+    ),
+    vector_ranked AS (
+        SELECT v.id, v.vector_sim, ROW_NUMBER() OVER (ORDER BY v.vector_sim DESC, v.id) AS vector_rank
+        FROM vector_results v
+    ),
+    text_ranked AS (
+        SELECT t.id, t.text_sim, ROW_NUMBER() OVER (ORDER BY t.text_sim DESC, t.id) AS text_rank
+        FROM text_results t
+    )
+    SELECT
+        COALESCE(v.id, t.id) AS id,
+        v.vector_rank::int AS vector_rank,
+        v.vector_sim::float8 AS vector_similarity,
+        t.text_rank::int AS text_rank,
+        t.text_sim::float8 AS text_similarity
+    FROM vector_ranked v
+    FULL OUTER JOIN text_ranked t ON v.id = t.id',
+    distance, embedding_column, distance);
+
+    RETURN QUERY EXECUTE sql_query USING query_embedding, candidate_count, filter, source_filter, query_text;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_candidates_archon_code_examples_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    candidate_count INT DEFAULT 50,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    vector_rank INTEGER,
+    vector_similarity FLOAT,
+    text_rank INTEGER,
+    text_similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    sql_query TEXT;
+    embedding_column TEXT;
+    distance TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('ce', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_code_examples', embedding_dimension);
+
+    -- Each leg returns only ids, scores and ranks; content is fetched by the caller
+    sql_query := format('
+    WITH vector_results AS (
+        SELECT
+            ce.id,
+            1 - (%s) AS vector_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $3
+            AND ($4 IS NULL OR ce.source_id = $4)
+            AND ce.%I IS NOT NULL
+        ORDER BY %s
+        LIMIT $2
+    ),
+    text_results AS (
+        SELECT
+            ce.id,
+            ts_rank_cd(ce.content_search_vector, plainto_tsquery(''english'', $5)) AS text_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $3
+            AND ($4 IS NULL OR ce.source_id = $4)
+            AND ce.content_search_vector @@ plainto_tsquery(''english'', $5)
+        ORDER BY text_sim DESC
+        LIMIT $2
+    ),
+    vector_ranked AS (
+        SELECT v.id, v.vector_sim, ROW_NUMBER() OVER (ORDER BY v.vector_sim DESC, v.id) AS vector_rank
+        FROM vector_results v
+    ),
+    text_ranked AS (
+        SELECT t.id, t.text_sim, ROW_NUMBER() OVER (ORDER BY t.text_sim DESC, t.id) AS text_rank
+        FROM text_results t
+    )
+    SELECT
+        COALESCE(v.id, t.id) AS id,
+        v.vector_rank::int AS vector_rank,
+        v.vector_sim::float8 AS vector_similarity,
+        t.text_rank::int AS text_rank,
+        t.text_sim::float8 AS text_similarity
+    FROM vector_ranked v
+    FULL OUTER JOIN text_ranked t ON v.id = t.id',
+    distance, embedding_column, distance);
+
+    RETURN QUERY EXECUTE sql_query USING query_embedding, candidate_count, filter, source_filter, query_text;
+END;
+$$;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '018_add_vector_index_management')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,88 @@
+-- =====================================================
+-- Store project documents one row per document
+-- =====================================================
+-- Project documents lived in the archon_projects.docs JSONB array, so adding,
+-- updating or deleting one document read and rewrote every document of the
+-- project, and two concurrent edits could overwrite each other. This
+-- migration moves each document into its own row of archon_project_documents
+-- and empties the docs arrays it copied.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS archon_project_documents (
+    project_id UUID NOT NULL REFERENCES archon_projects(id) ON DELETE CASCADE,
+    -- TEXT to keep the IDs of documents created before this migration
+    id TEXT NOT NULL DEFAULT gen_random_uuid()::text,
+    document_type TEXT,
+    title TEXT NOT NULL DEFAULT '',
+    content JSONB NOT NULL DEFAULT '{}'::jsonb,
+    tags JSONB NOT NULL DEFAULT '[]'::jsonb,
+    status TEXT NOT NULL DEFAULT 'draft',
+    version TEXT NOT NULL DEFAULT '1.0',
+    author TEXT,
+    -- Documents are listed in creation order, as in the docs array
+    position BIGINT GENERATED BY DEFAULT AS IDENTITY,
+    content_size INTEGER GENERATED ALWAYS AS (octet_length(content::text)) STORED,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (project_id, id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_project_documents_position
+  ON archon_project_documents(project_id, position);
+
+COMMENT ON TABLE archon_project_documents IS 'Project documents, one row per document (formerly archon_projects.docs)';
+COMMENT ON COLUMN archon_project_documents.content_size IS 'Size of the content in bytes, for document summaries that omit the content';
+COMMENT ON COLUMN archon_project_documents.position IS 'Creation order of the documents within their project';
+COMMENT ON COLUMN archon_projects.docs IS 'DEPRECATED: documents are stored in archon_project_documents';
+
+CREATE OR REPLACE TRIGGER update_archon_project_documents_updated_at
+    BEFORE UPDATE ON archon_project_documents
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Copy the documents of every project in array order
+INSERT INTO archon_project_documents (
+    project_id, id, document_type, title, content, tags, status, version, author, created_at, updated_at
+)
+SELECT
+    p.id,
+    COALESCE(NULLIF(doc.value->>'id', ''), gen_random_uuid()::text),
+    doc.value->>'document_type',
+    COALESCE(doc.value->>'title', ''),
+    COALESCE(doc.value->'content', '{}'::jsonb),
+    CASE WHEN jsonb_typeof(doc.value->'tags') = 'array' THEN doc.value->'tags' ELSE '[]'::jsonb END,
+    COALESCE(doc.value->>'status', 'draft'),
+    COALESCE(doc.value->>'version', '1.0'),
+    doc.value->>'author',
+    COALESCE((doc.value->>'created_at')::timestamptz, p.created_at, NOW()),
+    COALESCE((doc.value->>'updated_at')::timestamptz, (doc.value->>'created_at')::timestamptz, p.updated_at, NOW())
+FROM archon_projects p
+CROSS JOIN LATERAL jsonb_array_elements(p.docs) WITH ORDINALITY AS doc(value, ordinality)
+WHERE jsonb_typeof(p.docs) = 'array'
+  AND jsonb_typeof(doc.value) = 'object'
+ORDER BY p.created_at, p.id, doc.ordinality
+ON CONFLICT (project_id, id) DO NOTHING;
+
+-- The documents now live in their own rows
+UPDATE archon_projects
+SET docs = '[]'::jsonb
+WHERE docs IS DISTINCT FROM '[]'::jsonb;
+
+ALTER TABLE archon_project_documents ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_project_documents" ON archon_project_documents;
+CREATE POLICY "Allow service role full access to archon_project_documents" ON archon_project_documents
+    FOR ALL USING (auth.role() = 'service_role');
+
+DROP POLICY IF EXISTS "Allow authenticated users to read and update archon_project_documents" ON archon_project_documents;
+CREATE POLICY "Allow authenticated users to read and update archon_project_documents" ON archon_project_documents
+    FOR ALL TO authenticated
+    USING (true);
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '019_add_project_documents')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -56,6 +56,10 @@ BEGIN
     DROP POLICY IF EXISTS "Allow service role full access to archon_project_sources" ON archon_project_sources;
     DROP POLICY IF EXISTS "Allow authenticated users to read and update archon_project_sources" ON archon_project_sources;
     
+    -- Project documents policies
+    DROP POLICY IF EXISTS "Allow service role full access to archon_project_documents" ON archon_project_documents;
+    DROP POLICY IF EXISTS "Allow authenticated users to read and update archon_project_documents" ON archon_project_documents;
+    
     -- Document versions policies
     DROP POLICY IF EXISTS "Allow service role full access to archon_document_versions" ON archon_document_versions;
     DROP POLICY IF EXISTS "Allow authenticated users to read archon_document_versions" ON archon_document_versions;
@@ -166,12 +170,17 @@ BEGIN
     
     -- Project System (complex dependencies) - new archon_ prefixed tables
     DROP TABLE IF EXISTS archon_document_versions CASCADE;
+    DROP TABLE IF EXISTS archon_project_documents CASCADE;
     DROP TABLE IF EXISTS archon_project_sources CASCADE;
     DROP TABLE IF EXISTS archon_tasks CASCADE;
     DROP TABLE IF EXISTS archon_projects CASCADE;
     DROP TABLE IF EXISTS archon_prompts CASCADE;
     
     -- Knowledge Base System - new archon_ prefixed tables
+    DROP TABLE IF EXISTS archon_vector_index_settings CASCADE;
+    DROP TABLE IF EXISTS archon_crawl_checkpoints CASCADE;
+    DROP TABLE IF EXISTS archon_sitemap_entries CASCADE;
+    DROP TABLE IF EXISTS archon_source_stats CASCADE;
     DROP TABLE IF EXISTS archon_code_examples CASCADE;
     DROP TABLE IF EXISTS archon_crawled_pages CASCADE;
     DROP TABLE IF EXISTS archon_sources CASCADE;
@@ -216,6 +216,7 @@ CREATE TABLE IF NOT EXISTS archon_crawled_pages (
     llm_chat_model TEXT,                -- LLM model used for processing (e.g., 'gpt-4', 'llama3:8b')
     embedding_model TEXT,                -- Embedding model used (e.g., 'text-embedding-3-large', 'all-MiniLM-L6-v2')
     embedding_dimension INTEGER,         -- Dimension of the embedding used (384, 768, 1024, 1536, 3072)
+    content_hash TEXT,                   -- SHA-256 of the original chunk text, used to reuse embeddings on recrawl
     -- Hybrid search support
     content_search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
@@ -228,12 +229,19 @@ CREATE TABLE IF NOT EXISTS archon_crawled_pages (
 );
 
 -- Multi-dimensional indexes
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_384 ON archon_crawled_pages USING ivfflat (embedding_384 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_768 ON archon_crawled_pages USING ivfflat (embedding_768 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1024 ON archon_crawled_pages USING ivfflat (embedding_1024 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1536 ON archon_crawled_pages USING ivfflat (embedding_1536 vector_cosine_ops) WITH (lists = 100);
--- Note: 3072-dimensional embeddings cannot have vector indexes due to PostgreSQL vector extension 2000 dimension limit
--- The embedding_3072 column exists but cannot be indexed with current pgvector version
+-- HNSW needs no training data, so it suits tables created empty; the server can
+-- re-tune or switch them to ivfflat as data grows (archon_rebuild_vector_index)
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_384 ON archon_crawled_pages USING hnsw (embedding_384 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_768 ON archon_crawled_pages USING hnsw (embedding_768 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1024 ON archon_crawled_pages USING hnsw (embedding_1024 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_1536 ON archon_crawled_pages USING hnsw (embedding_1536 vector_cosine_ops);
+-- 3072-d embeddings exceed the 2000-dimension limit of vector indexes and are indexed as halfvec (pgvector 0.7+)
+DO $$
+BEGIN
+    IF to_regtype('halfvec') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_archon_crawled_pages_embedding_3072 ON archon_crawled_pages USING hnsw ((embedding_3072::halfvec(3072)) halfvec_cosine_ops);
+    END IF;
+END $$;
 
 -- Other indexes for archon_crawled_pages
 CREATE INDEX idx_archon_crawled_pages_metadata ON archon_crawled_pages USING GIN (metadata);
@@ -245,6 +253,7 @@ CREATE INDEX idx_archon_crawled_pages_content_trgm ON archon_crawled_pages USING
 CREATE INDEX idx_archon_crawled_pages_embedding_model ON archon_crawled_pages (embedding_model);
 CREATE INDEX idx_archon_crawled_pages_embedding_dimension ON archon_crawled_pages (embedding_dimension);
 CREATE INDEX idx_archon_crawled_pages_llm_chat_model ON archon_crawled_pages (llm_chat_model);
+CREATE INDEX idx_archon_crawled_pages_url_content_hash ON archon_crawled_pages (url, content_hash);
 
 -- Create the code_examples table
 CREATE TABLE IF NOT EXISTS archon_code_examples (
@@ -303,6 +312,12 @@ CREATE TABLE IF NOT EXISTS archon_page_metadata (
     -- Flexible metadata storage
     metadata JSONB DEFAULT '{}'::jsonb,
 
+    -- Change detection for refreshes
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    internal_links JSONB,
+
     -- Constraints
     CONSTRAINT archon_page_metadata_url_unique UNIQUE(url),
     CONSTRAINT archon_page_metadata_source_fk FOREIGN KEY (source_id)
@@ -334,18 +349,29 @@ COMMENT ON COLUMN archon_page_metadata.word_count IS 'Number of words in full_co
 COMMENT ON COLUMN archon_page_metadata.char_count IS 'Number of characters in full_content';
 COMMENT ON COLUMN archon_page_metadata.chunk_count IS 'Number of chunks created from this page';
 COMMENT ON COLUMN archon_page_metadata.metadata IS 'Flexible JSON metadata (page_type, knowledge_type, tags, etc)';
+COMMENT ON COLUMN archon_page_metadata.etag IS 'ETag response header when the page was last crawled';
+COMMENT ON COLUMN archon_page_metadata.last_modified IS 'Last-Modified response header when the page was last crawled';
+COMMENT ON COLUMN archon_page_metadata.content_hash IS 'SHA-256 of full_content, used to skip re-embedding unchanged pages on refresh';
+COMMENT ON COLUMN archon_page_metadata.internal_links IS 'Internal links found on the page, followed when a refresh skips rendering it';
 COMMENT ON COLUMN archon_crawled_pages.page_id IS 'Foreign key linking chunk to parent page';
 
 -- Enable RLS on archon_page_metadata
 ALTER TABLE archon_page_metadata ENABLE ROW LEVEL SECURITY;
 
 -- Multi-dimensional indexes
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_384 ON archon_code_examples USING ivfflat (embedding_384 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_768 ON archon_code_examples USING ivfflat (embedding_768 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1024 ON archon_code_examples USING ivfflat (embedding_1024 vector_cosine_ops) WITH (lists = 100);
-CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1536 ON archon_code_examples USING ivfflat (embedding_1536 vector_cosine_ops) WITH (lists = 100);
--- Note: 3072-dimensional embeddings cannot have vector indexes due to PostgreSQL vector extension 2000 dimension limit
--- The embedding_3072 column exists but cannot be indexed with current pgvector version
+-- HNSW needs no training data, so it suits tables created empty; the server can
+-- re-tune or switch them to ivfflat as data grows (archon_rebuild_vector_index)
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_384 ON archon_code_examples USING hnsw (embedding_384 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_768 ON archon_code_examples USING hnsw (embedding_768 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1024 ON archon_code_examples USING hnsw (embedding_1024 vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_1536 ON archon_code_examples USING hnsw (embedding_1536 vector_cosine_ops);
+-- 3072-d embeddings exceed the 2000-dimension limit of vector indexes and are indexed as halfvec (pgvector 0.7+)
+DO $$
+BEGIN
+    IF to_regtype('halfvec') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_3072 ON archon_code_examples USING hnsw ((embedding_3072::halfvec(3072)) halfvec_cosine_ops);
+    END IF;
+END $$;
 
 -- Other indexes for archon_code_examples
 CREATE INDEX idx_archon_code_examples_metadata ON archon_code_examples USING GIN (metadata);
@@ -359,6 +385,288 @@ CREATE INDEX idx_archon_code_examples_embedding_model ON archon_code_examples (e
 CREATE INDEX idx_archon_code_examples_embedding_dimension ON archon_code_examples (embedding_dimension);
 CREATE INDEX idx_archon_code_examples_llm_chat_model ON archon_code_examples (llm_chat_model);
 
+-- Per-source counters maintained by statement-level triggers on the chunk,
+-- code example and page tables, so listing sources needs one grouped read
+CREATE TABLE IF NOT EXISTS archon_source_stats (
+    source_id TEXT PRIMARY KEY REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    chunks_count BIGINT NOT NULL DEFAULT 0,
+    code_examples_count BIGINT NOT NULL DEFAULT 0,
+    pages_count BIGINT NOT NULL DEFAULT 0,
+    word_count BIGINT NOT NULL DEFAULT 0,
+    first_url TEXT,
+    last_crawled_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE archon_source_stats IS 'Trigger-maintained per-source counters for knowledge list and summary views';
+COMMENT ON COLUMN archon_source_stats.word_count IS 'Sum of chunk word counts (metadata.word_count)';
+COMMENT ON COLUMN archon_source_stats.first_url IS 'URL of the earliest stored chunk, used when the source has no source_url';
+COMMENT ON COLUMN archon_source_stats.last_crawled_at IS 'Time the most recent chunk was stored';
+
+-- Word count stored in chunk metadata, ignoring malformed values
+CREATE OR REPLACE FUNCTION archon_chunk_word_count(metadata JSONB)
+RETURNS BIGINT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE WHEN metadata->>'word_count' ~ '^[0-9]+$' THEN (metadata->>'word_count')::BIGINT ELSE 0 END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_chunks_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, chunks_count, word_count, first_url, last_crawled_at)
+    SELECT
+        n.source_id,
+        COUNT(*),
+        SUM(archon_chunk_word_count(n.metadata)),
+        (ARRAY_AGG(n.url ORDER BY n.id))[1],
+        MAX(n.created_at)
+    FROM new_rows n
+    GROUP BY n.source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunks_count = s.chunks_count + EXCLUDED.chunks_count,
+        word_count = s.word_count + EXCLUDED.word_count,
+        first_url = COALESCE(s.first_url, EXCLUDED.first_url),
+        last_crawled_at = GREATEST(s.last_crawled_at, EXCLUDED.last_crawled_at),
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+-- Deletes only UPDATE existing rows: when a source is deleted its stats row is
+-- removed by the cascade and must not be re-created by the cascaded chunk deletes
+CREATE OR REPLACE FUNCTION archon_source_stats_chunks_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        chunks_count = GREATEST(s.chunks_count - d.removed, 0),
+        word_count = GREATEST(s.word_count - d.words, 0),
+        first_url = CASE WHEN s.chunks_count - d.removed <= 0 THEN NULL ELSE s.first_url END,
+        updated_at = NOW()
+    FROM (
+        SELECT o.source_id, COUNT(*) AS removed, SUM(archon_chunk_word_count(o.metadata)) AS words
+        FROM old_rows o
+        GROUP BY o.source_id
+    ) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_examples_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, code_examples_count)
+    SELECT n.source_id, COUNT(*) FROM new_rows n GROUP BY n.source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        code_examples_count = s.code_examples_count + EXCLUDED.code_examples_count,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_code_examples_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        code_examples_count = GREATEST(s.code_examples_count - d.removed, 0),
+        updated_at = NOW()
+    FROM (SELECT o.source_id, COUNT(*) AS removed FROM old_rows o GROUP BY o.source_id) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_inserted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (source_id, pages_count)
+    SELECT n.source_id, COUNT(*) FROM new_rows n GROUP BY n.source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        pages_count = s.pages_count + EXCLUDED.pages_count,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archon_source_stats_pages_deleted()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE archon_source_stats s SET
+        pages_count = GREATEST(s.pages_count - d.removed, 0),
+        updated_at = NOW()
+    FROM (SELECT o.source_id, COUNT(*) AS removed FROM old_rows o GROUP BY o.source_id) d
+    WHERE s.source_id = d.source_id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS archon_source_stats_chunks_insert ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_chunks_insert
+    AFTER INSERT ON archon_crawled_pages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_chunks_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_chunks_delete ON archon_crawled_pages;
+CREATE TRIGGER archon_source_stats_chunks_delete
+    AFTER DELETE ON archon_crawled_pages
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_chunks_deleted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_examples_insert ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_examples_insert
+    AFTER INSERT ON archon_code_examples
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_code_examples_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_code_examples_delete ON archon_code_examples;
+CREATE TRIGGER archon_source_stats_code_examples_delete
+    AFTER DELETE ON archon_code_examples
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_code_examples_deleted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_insert ON archon_page_metadata;
+CREATE TRIGGER archon_source_stats_pages_insert
+    AFTER INSERT ON archon_page_metadata
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_pages_inserted();
+
+DROP TRIGGER IF EXISTS archon_source_stats_pages_delete ON archon_page_metadata;
+CREATE TRIGGER archon_source_stats_pages_delete
+    AFTER DELETE ON archon_page_metadata
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_pages_deleted();
+
+-- Recompute counters from the underlying tables (all sources, or one source)
+CREATE OR REPLACE FUNCTION refresh_archon_source_stats(p_source_id TEXT DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO archon_source_stats AS s (
+        source_id, chunks_count, code_examples_count, pages_count, word_count, first_url, last_crawled_at
+    )
+    SELECT
+        src.source_id,
+        COALESCE(c.chunks_count, 0),
+        COALESCE(ce.code_examples_count, 0),
+        COALESCE(p.pages_count, 0),
+        COALESCE(c.word_count, 0),
+        c.first_url,
+        c.last_crawled_at
+    FROM archon_sources src
+    LEFT JOIN (
+        SELECT
+            source_id,
+            COUNT(*) AS chunks_count,
+            SUM(archon_chunk_word_count(metadata)) AS word_count,
+            (ARRAY_AGG(url ORDER BY id))[1] AS first_url,
+            MAX(created_at) AS last_crawled_at
+        FROM archon_crawled_pages
+        WHERE p_source_id IS NULL OR source_id = p_source_id
+        GROUP BY source_id
+    ) c ON c.source_id = src.source_id
+    LEFT JOIN (
+        SELECT source_id, COUNT(*) AS code_examples_count
+        FROM archon_code_examples
+        WHERE p_source_id IS NULL OR source_id = p_source_id
+        GROUP BY source_id
+    ) ce ON ce.source_id = src.source_id
+    LEFT JOIN (
+        SELECT source_id, COUNT(*) AS pages_count
+        FROM archon_page_metadata
+        WHERE p_source_id IS NULL OR source_id = p_source_id
+        GROUP BY source_id
+    ) p ON p.source_id = src.source_id
+    WHERE p_source_id IS NULL OR src.source_id = p_source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunks_count = EXCLUDED.chunks_count,
+        code_examples_count = EXCLUDED.code_examples_count,
+        pages_count = EXCLUDED.pages_count,
+        word_count = EXCLUDED.word_count,
+        first_url = EXCLUDED.first_url,
+        last_crawled_at = EXCLUDED.last_crawled_at,
+        updated_at = NOW();
+END;
+$$;
+
+COMMENT ON FUNCTION refresh_archon_source_stats IS 'Recompute archon_source_stats from the chunk, code example and page tables';
+
+ALTER TABLE archon_source_stats ENABLE ROW LEVEL SECURITY;
+
+-- Sitemap URLs with the lastmod seen at their last crawl, so refreshes only
+-- recrawl new or changed URLs
+CREATE TABLE IF NOT EXISTS archon_sitemap_entries (
+    source_id TEXT NOT NULL REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    lastmod TIMESTAMPTZ,
+    crawled_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source_id, url)
+);
+
+COMMENT ON TABLE archon_sitemap_entries IS 'Sitemap URLs per source with the lastmod seen when each was last crawled';
+COMMENT ON COLUMN archon_sitemap_entries.lastmod IS 'Sitemap <lastmod> at the last crawl (NULL when the sitemap gave none)';
+
+ALTER TABLE archon_sitemap_entries ENABLE ROW LEVEL SECURITY;
+
+-- Durable state of unfinished crawls so they can be resumed after a restart
+CREATE TABLE IF NOT EXISTS archon_crawl_checkpoints (
+    progress_id TEXT PRIMARY KEY,
+    source_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    crawl_type TEXT,
+    request JSONB NOT NULL DEFAULT '{}'::jsonb,
+    seen_urls JSONB NOT NULL DEFAULT '{}'::jsonb,
+    stored_pages JSONB NOT NULL DEFAULT '{}'::jsonb,
+    stored_word_count INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'failed', 'cancelled')),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_crawl_checkpoints_updated_at
+  ON archon_crawl_checkpoints(updated_at DESC);
+
+COMMENT ON TABLE archon_crawl_checkpoints IS 'Durable state of unfinished crawls; removed when a crawl completes';
+COMMENT ON COLUMN archon_crawl_checkpoints.seen_urls IS 'Every URL queued by the crawl, mapped to its crawl depth';
+COMMENT ON COLUMN archon_crawl_checkpoints.stored_pages IS 'URLs whose page and chunks are stored, mapped to their page id';
+
+ALTER TABLE archon_crawl_checkpoints ENABLE ROW LEVEL SECURITY;
+
+-- Method and search parameters of the embedding indexes managed by the server
+CREATE TABLE IF NOT EXISTS archon_vector_index_settings (
+    table_name TEXT NOT NULL,
+    dimension INTEGER NOT NULL,
+    index_method TEXT NOT NULL CHECK (index_method IN ('hnsw', 'ivfflat')),
+    lists INTEGER,
+    probes INTEGER,
+    ef_search INTEGER,
+    recall_target FLOAT,
+    row_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (table_name, dimension)
+);
+
+COMMENT ON TABLE archon_vector_index_settings IS 'Method and search parameters of each managed embedding index';
+COMMENT ON COLUMN archon_vector_index_settings.probes IS 'ivfflat.probes applied to searches on this index';
+COMMENT ON COLUMN archon_vector_index_settings.ef_search IS 'hnsw.ef_search applied to searches on this index';
+COMMENT ON COLUMN archon_vector_index_settings.row_count IS 'Embedded rows when the index was last built or tuned';
+
+ALTER TABLE archon_vector_index_settings ENABLE ROW LEVEL SECURITY;
+
 -- =====================================================
 -- SECTION 4.5: MULTI-DIMENSIONAL EMBEDDING HELPER FUNCTIONS
 -- =====================================================
@@ -386,6 +694,168 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql IMMUTABLE;
 
+-- Distance expression used by the search functions for an embedding column.
+-- Vectors above 2000 dimensions can only be indexed as halfvec, so 3072-d
+-- searches compare halfvec casts, matching the expression the index is built on.
+CREATE OR REPLACE FUNCTION archon_vector_distance_sql(p_alias TEXT, p_dimension INTEGER)
+RETURNS TEXT AS $$
+DECLARE
+    column_ref TEXT;
+BEGIN
+    column_ref := quote_ident(get_embedding_column_name(p_dimension));
+    IF p_alias IS NOT NULL THEN
+        column_ref := quote_ident(p_alias) || '.' || column_ref;
+    END IF;
+
+    IF p_dimension > 2000 AND to_regtype('halfvec') IS NOT NULL THEN
+        RETURN format('(%s::halfvec(%s)) <=> ($1::halfvec(%s))', column_ref, p_dimension, p_dimension);
+    END IF;
+    RETURN column_ref || ' <=> $1';
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Apply the tuned search parameters of an embedding index to the current query
+CREATE OR REPLACE FUNCTION archon_apply_vector_search_params(p_table_name TEXT, p_dimension INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    params RECORD;
+BEGIN
+    SELECT s.probes, s.ef_search INTO params
+    FROM archon_vector_index_settings s
+    WHERE s.table_name = p_table_name AND s.dimension = p_dimension;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+    -- Transaction-local, so the settings only apply to this search
+    IF params.probes IS NOT NULL THEN
+        PERFORM set_config('ivfflat.probes', params.probes::text, true);
+    END IF;
+    IF params.ef_search IS NOT NULL THEN
+        PERFORM set_config('hnsw.ef_search', params.ef_search::text, true);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Row counts, current index and search parameters per embedding column
+CREATE OR REPLACE FUNCTION archon_vector_index_status()
+RETURNS TABLE (
+    table_name TEXT,
+    dimension INTEGER,
+    row_count BIGINT,
+    index_name TEXT,
+    index_method TEXT,
+    index_options TEXT[],
+    index_definition TEXT,
+    probes INTEGER,
+    ef_search INTEGER,
+    recall_target FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    t TEXT;
+    d INTEGER;
+    n BIGINT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['archon_crawled_pages', 'archon_code_examples'] LOOP
+        FOREACH d IN ARRAY ARRAY[384, 768, 1024, 1536, 3072] LOOP
+            EXECUTE format('SELECT count(*) FROM %I WHERE %I IS NOT NULL', t, get_embedding_column_name(d))
+                INTO n;
+            RETURN QUERY
+            SELECT
+                t,
+                d,
+                n,
+                c.relname::text,
+                am.amname::text,
+                c.reloptions::text[],
+                CASE WHEN c.oid IS NULL THEN NULL ELSE pg_get_indexdef(c.oid) END,
+                s.probes,
+                s.ef_search,
+                s.recall_target::float8
+            FROM (SELECT 1) AS one
+            LEFT JOIN pg_class c
+                ON c.relname = format('idx_%s_embedding_%s', t, d) AND c.relkind = 'i'
+            LEFT JOIN pg_am am ON am.oid = c.relam
+            LEFT JOIN archon_vector_index_settings s ON s.table_name = t AND s.dimension = d;
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+-- Drop and recreate the index of one embedding column with the given method and options
+CREATE OR REPLACE FUNCTION archon_rebuild_vector_index(
+    p_table_name TEXT,
+    p_dimension INTEGER,
+    p_method TEXT,
+    p_lists INTEGER DEFAULT NULL,
+    p_m INTEGER DEFAULT 16,
+    p_ef_construction INTEGER DEFAULT 64
+)
+RETURNS TEXT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    v_index_name TEXT := format('idx_%s_embedding_%s', p_table_name, p_dimension);
+    column_expr TEXT;
+    opclass TEXT;
+    options TEXT;
+BEGIN
+    IF p_table_name NOT IN ('archon_crawled_pages', 'archon_code_examples') THEN
+        RAISE EXCEPTION 'Unsupported table for vector indexes: %', p_table_name;
+    END IF;
+    column_expr := quote_ident(get_embedding_column_name(p_dimension));
+
+    IF p_dimension > 2000 THEN
+        IF to_regtype('halfvec') IS NULL THEN
+            RAISE EXCEPTION '%-dimensional embeddings can only be indexed as halfvec (pgvector 0.7 or later)', p_dimension;
+        END IF;
+        column_expr := format('(%s::halfvec(%s))', column_expr, p_dimension);
+        opclass := 'halfvec_cosine_ops';
+    ELSE
+        opclass := 'vector_cosine_ops';
+    END IF;
+
+    CASE p_method
+        WHEN 'hnsw' THEN
+            options := format('m = %s, ef_construction = %s', p_m, p_ef_construction);
+        WHEN 'ivfflat' THEN
+            IF p_lists IS NULL OR p_lists < 1 THEN
+                RAISE EXCEPTION 'ivfflat indexes need lists >= 1';
+            END IF;
+            options := format('lists = %s', p_lists);
+        ELSE
+            RAISE EXCEPTION 'Unsupported vector index method: %', p_method;
+    END CASE;
+
+    EXECUTE format('DROP INDEX IF EXISTS %I', v_index_name);
+    EXECUTE format(
+        'CREATE INDEX %I ON %I USING %s (%s %s) WITH (%s)',
+        v_index_name, p_table_name, p_method, column_expr, opclass, options
+    );
+    RETURN pg_get_indexdef(v_index_name::regclass);
+END;
+$$;
+
+-- Rebuilding indexes is an admin operation reserved for the server's service role
+REVOKE ALL ON FUNCTION archon_rebuild_vector_index(TEXT, INTEGER, TEXT, INTEGER, INTEGER, INTEGER) FROM PUBLIC;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+        REVOKE ALL ON FUNCTION archon_rebuild_vector_index(TEXT, INTEGER, TEXT, INTEGER, INTEGER, INTEGER) FROM anon, authenticated;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+        GRANT EXECUTE ON FUNCTION archon_rebuild_vector_index(TEXT, INTEGER, TEXT, INTEGER, INTEGER, INTEGER) TO service_role;
+    END IF;
+END $$;
+
+COMMENT ON FUNCTION archon_vector_index_status IS 'Row counts, index method/options and search parameters for every embedding column';
+COMMENT ON FUNCTION archon_rebuild_vector_index IS 'Rebuild the HNSW or ivfflat index of one embedding column (halfvec for 3072-d)';
+
 -- =====================================================
 -- SECTION 5: SEARCH FUNCTIONS
 -- =====================================================
@@ -412,6 +882,7 @@ AS $$
 DECLARE
   sql_query TEXT;
   embedding_column TEXT;
+  distance TEXT;
 BEGIN
   -- Determine which embedding column to use based on dimension
   CASE embedding_dimension
@@ -423,17 +894,22 @@ BEGIN
     ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
   END CASE;
 
+  -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+  distance := archon_vector_distance_sql(NULL, embedding_dimension);
+  -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+  PERFORM archon_apply_vector_search_params('archon_crawled_pages', embedding_dimension);
+
   -- Build dynamic query
   sql_query := format('
     SELECT id, url, chunk_number, content, metadata, source_id,
-           1 - (%I <=> $1) AS similarity
+           1 - (%s) AS similarity
     FROM archon_crawled_pages
     WHERE (%I IS NOT NULL)
       AND metadata @> $3
       AND ($4 IS NULL OR source_id = $4)
-    ORDER BY %I <=> $1
+    ORDER BY %s
     LIMIT $2',
-    embedding_column, embedding_column, embedding_column);
+    distance, embedding_column, distance);
 
   -- Execute dynamic query
   RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
@@ -485,6 +961,7 @@ AS $$
 DECLARE
   sql_query TEXT;
   embedding_column TEXT;
+  distance TEXT;
 BEGIN
   -- Determine which embedding column to use based on dimension
   CASE embedding_dimension
@@ -496,17 +973,22 @@ BEGIN
     ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
   END CASE;
 
+  -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+  distance := archon_vector_distance_sql(NULL, embedding_dimension);
+  -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+  PERFORM archon_apply_vector_search_params('archon_code_examples', embedding_dimension);
+
   -- Build dynamic query
   sql_query := format('
     SELECT id, url, chunk_number, content, summary, metadata, source_id,
-           1 - (%I <=> $1) AS similarity
+           1 - (%s) AS similarity
     FROM archon_code_examples
     WHERE (%I IS NOT NULL)
       AND metadata @> $3
       AND ($4 IS NULL OR source_id = $4)
-    ORDER BY %I <=> $1
+    ORDER BY %s
     LIMIT $2',
-    embedding_column, embedding_column, embedding_column);
+    distance, embedding_column, distance);
 
   -- Execute dynamic query
   RETURN QUERY EXECUTE sql_query USING query_embedding, match_count, filter, source_filter;
@@ -567,6 +1049,7 @@ DECLARE
     max_text_results INT;
     sql_query TEXT;
     embedding_column TEXT;
+    distance TEXT;
 BEGIN
     -- Determine which embedding column to use based on dimension
     CASE embedding_dimension
@@ -578,6 +1061,11 @@ BEGIN
         ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
     END CASE;
 
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('cp', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_crawled_pages', embedding_dimension);
+
     -- Calculate how many results to fetch from each search type
     max_vector_results := match_count;
     max_text_results := match_count;
@@ -593,12 +1081,12 @@ BEGIN
             cp.content,
             cp.metadata,
             cp.source_id,
-            1 - (cp.%I <=> $1) AS vector_sim
+            1 - (%s) AS vector_sim
         FROM archon_crawled_pages cp
         WHERE cp.metadata @> $4
             AND ($5 IS NULL OR cp.source_id = $5)
             AND cp.%I IS NOT NULL
-        ORDER BY cp.%I <=> $1
+        ORDER BY %s
         LIMIT $2
     ),
     text_results AS (
@@ -641,7 +1129,7 @@ BEGIN
     SELECT * FROM combined_results
     ORDER BY similarity DESC
     LIMIT $2', 
-    embedding_column, embedding_column, embedding_column);
+    distance, embedding_column, distance);
 
     -- Execute dynamic query
     RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
@@ -701,6 +1189,7 @@ DECLARE
     max_text_results INT;
     sql_query TEXT;
     embedding_column TEXT;
+    distance TEXT;
 BEGIN
     -- Determine which embedding column to use based on dimension
     CASE embedding_dimension
@@ -712,6 +1201,11 @@ BEGIN
         ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
     END CASE;
 
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('ce', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_code_examples', embedding_dimension);
+
     -- Calculate how many results to fetch from each search type
     max_vector_results := match_count;
     max_text_results := match_count;
@@ -728,12 +1222,12 @@ BEGIN
             ce.summary,
             ce.metadata,
             ce.source_id,
-            1 - (ce.%I <=> $1) AS vector_sim
+            1 - (%s) AS vector_sim
         FROM archon_code_examples ce
         WHERE ce.metadata @> $4
             AND ($5 IS NULL OR ce.source_id = $5)
             AND ce.%I IS NOT NULL
-        ORDER BY ce.%I <=> $1
+        ORDER BY %s
         LIMIT $2
     ),
     text_results AS (
@@ -778,7 +1272,7 @@ BEGIN
     SELECT * FROM combined_results
     ORDER BY similarity DESC
     LIMIT $2', 
-    embedding_column, embedding_column, embedding_column);
+    distance, embedding_column, distance);
 
     -- Execute dynamic query
     RETURN QUERY EXECUTE sql_query USING query_embedding, max_vector_results, max_text_results, filter, source_filter, query_text;
@@ -817,6 +1311,179 @@ COMMENT ON FUNCTION hybrid_search_archon_crawled_pages IS 'Legacy hybrid search
 COMMENT ON FUNCTION hybrid_search_archon_code_examples_multi IS 'Multi-dimensional hybrid search on code examples with configurable embedding dimensions';
 COMMENT ON FUNCTION hybrid_search_archon_code_examples IS 'Legacy hybrid search function for code examples (uses 1536D embeddings)';
 
+-- Candidate-only hybrid search for archon_crawled_pages (used for reciprocal rank fusion)
+CREATE OR REPLACE FUNCTION hybrid_candidates_archon_crawled_pages_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    candidate_count INT DEFAULT 50,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    vector_rank INTEGER,
+    vector_similarity FLOAT,
+    text_rank INTEGER,
+    text_similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    sql_query TEXT;
+    embedding_column TEXT;
+    distance TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('cp', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_crawled_pages', embedding_dimension);
+
+    -- Each leg returns only ids, scores and ranks; content is fetched by the caller
+    sql_query := format('
+    WITH vector_results AS (
+        SELECT
+            cp.id,
+            1 - (%s) AS vector_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $3
+            AND ($4 IS NULL OR cp.source_id = $4)
+            AND cp.%I IS NOT NULL
+        ORDER BY %s
+        LIMIT $2
+    ),
+    text_results AS (
+        SELECT
+            cp.id,
+            ts_rank_cd(cp.content_search_vector, plainto_tsquery(''english'', $5)) AS text_sim
+        FROM archon_crawled_pages cp
+        WHERE cp.metadata @> $3
+            AND ($4 IS NULL OR cp.source_id = $4)
+            AND cp.content_search_vector @@ plainto_tsquery(''english'', $5)
+        ORDER BY text_sim DESC
+        LIMIT $2
+    ),
+    vector_ranked AS (
+        SELECT v.id, v.vector_sim, ROW_NUMBER() OVER (ORDER BY v.vector_sim DESC, v.id) AS vector_rank
+        FROM vector_results v
+    ),
+    text_ranked AS (
+        SELECT t.id, t.text_sim, ROW_NUMBER() OVER (ORDER BY t.text_sim DESC, t.id) AS text_rank
+        FROM text_results t
+    )
+    SELECT
+        COALESCE(v.id, t.id) AS id,
+        v.vector_rank::int AS vector_rank,
+        v.vector_sim::float8 AS vector_similarity,
+        t.text_rank::int AS text_rank,
+        t.text_sim::float8 AS text_similarity
+    FROM vector_ranked v
+    FULL OUTER JOIN text_ranked t ON v.id = t.id',
+    distance, embedding_column, distance);
+
+    RETURN QUERY EXECUTE sql_query USING query_embedding, candidate_count, filter, source_filter, query_text;
+END;
+$$;
+
+-- Candidate-only hybrid search for archon_code_examples (used for reciprocal rank fusion)
+CREATE OR REPLACE FUNCTION hybrid_candidates_archon_code_examples_multi(
+    query_embedding VECTOR,
+    embedding_dimension INTEGER,
+    query_text TEXT,
+    candidate_count INT DEFAULT 50,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    vector_rank INTEGER,
+    vector_similarity FLOAT,
+    text_rank INTEGER,
+    text_similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    sql_query TEXT;
+    embedding_column TEXT;
+    distance TEXT;
+BEGIN
+    -- Determine which embedding column to use based on dimension
+    CASE embedding_dimension
+        WHEN 384 THEN embedding_column := 'embedding_384';
+        WHEN 768 THEN embedding_column := 'embedding_768';
+        WHEN 1024 THEN embedding_column := 'embedding_1024';
+        WHEN 1536 THEN embedding_column := 'embedding_1536';
+        WHEN 3072 THEN embedding_column := 'embedding_3072';
+        ELSE RAISE EXCEPTION 'Unsupported embedding dimension: %', embedding_dimension;
+    END CASE;
+
+    -- Distance expression matching the column's index (halfvec for 3072-d vectors)
+    distance := archon_vector_distance_sql('ce', embedding_dimension);
+    -- Per-query ivfflat.probes / hnsw.ef_search tuned for the index
+    PERFORM archon_apply_vector_search_params('archon_code_examples', embedding_dimension);
+
+    -- Each leg returns only ids, scores and ranks; content is fetched by the caller
+    sql_query := format('
+    WITH vector_results AS (
+        SELECT
+            ce.id,
+            1 - (%s) AS vector_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $3
+            AND ($4 IS NULL OR ce.source_id = $4)
+            AND ce.%I IS NOT NULL
+        ORDER BY %s
+        LIMIT $2
+    ),
+    text_results AS (
+        SELECT
+            ce.id,
+            ts_rank_cd(ce.content_search_vector, plainto_tsquery(''english'', $5)) AS text_sim
+        FROM archon_code_examples ce
+        WHERE ce.metadata @> $3
+            AND ($4 IS NULL OR ce.source_id = $4)
+            AND ce.content_search_vector @@ plainto_tsquery(''english'', $5)
+        ORDER BY text_sim DESC
+        LIMIT $2
+    ),
+    vector_ranked AS (
+        SELECT v.id, v.vector_sim, ROW_NUMBER() OVER (ORDER BY v.vector_sim DESC, v.id) AS vector_rank
+        FROM vector_results v
+    ),
+    text_ranked AS (
+        SELECT t.id, t.text_sim, ROW_NUMBER() OVER (ORDER BY t.text_sim DESC, t.id) AS text_rank
+        FROM text_results t
+    )
+    SELECT
+        COALESCE(v.id, t.id) AS id,
+        v.vector_rank::int AS vector_rank,
+        v.vector_sim::float8 AS vector_similarity,
+        t.text_rank::int AS text_rank,
+        t.text_sim::float8 AS text_similarity
+    FROM vector_ranked v
+    FULL OUTER JOIN text_ranked t ON v.id = t.id',
+    distance, embedding_column, distance);
+
+    RETURN QUERY EXECUTE sql_query USING query_embedding, candidate_count, filter, source_filter, query_text;
+END;
+$$;
+
+COMMENT ON FUNCTION hybrid_candidates_archon_crawled_pages_multi IS 'Hybrid search candidates (ids, ranks and scores per leg) for reciprocal rank fusion over crawled pages';
+COMMENT ON FUNCTION hybrid_candidates_archon_code_examples_multi IS 'Hybrid search candidates (ids, ranks and scores per leg) for reciprocal rank fusion over code examples';
+
 -- =====================================================
 -- SECTION 6: RLS POLICIES FOR KNOWLEDGE BASE
 -- =====================================================
@@ -851,6 +1518,30 @@ CREATE POLICY "Allow public read access to archon_page_metadata"
   TO public
   USING (true);
 
+CREATE POLICY "Allow public read access to archon_source_stats"
+  ON archon_source_stats
+  FOR SELECT
+  TO public
+  USING (true);
+
+CREATE POLICY "Allow public read access to archon_sitemap_entries"
+  ON archon_sitemap_entries
+  FOR SELECT
+  TO public
+  USING (true);
+
+CREATE POLICY "Allow public read access to archon_crawl_checkpoints"
+  ON archon_crawl_checkpoints
+  FOR SELECT
+  TO public
+  USING (true);
+
+CREATE POLICY "Allow public read access to archon_vector_index_settings"
+  ON archon_vector_index_settings
+  FOR SELECT
+  TO public
+  USING (true);
+
 -- =====================================================
 -- SECTION 7: PROJECTS AND TASKS MODULE
 -- =====================================================
@@ -878,7 +1569,7 @@ CREATE TABLE IF NOT EXISTS archon_projects (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   title TEXT NOT NULL,
   description TEXT DEFAULT '',
-  docs JSONB DEFAULT '[]'::jsonb,
+  docs JSONB DEFAULT '[]'::jsonb, -- DEPRECATED: documents are stored in archon_project_documents
   features JSONB DEFAULT '[]'::jsonb,
   data JSONB DEFAULT '[]'::jsonb,
   github_repo TEXT,
@@ -887,6 +1578,24 @@ CREATE TABLE IF NOT EXISTS archon_projects (
   updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Project documents, one row per document
+CREATE TABLE IF NOT EXISTS archon_project_documents (
+  project_id UUID NOT NULL REFERENCES archon_projects(id) ON DELETE CASCADE,
+  id TEXT NOT NULL DEFAULT gen_random_uuid()::text,
+  document_type TEXT,
+  title TEXT NOT NULL DEFAULT '',
+  content JSONB NOT NULL DEFAULT '{}'::jsonb,
+  tags JSONB NOT NULL DEFAULT '[]'::jsonb,
+  status TEXT NOT NULL DEFAULT 'draft',
+  version TEXT NOT NULL DEFAULT '1.0',
+  author TEXT,
+  position BIGINT GENERATED BY DEFAULT AS IDENTITY, -- Creation order within the project
+  content_size INTEGER GENERATED ALWAYS AS (octet_length(content::text)) STORED, -- For summaries without content
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (project_id, id)
+);
+
 -- Tasks table
 CREATE TABLE IF NOT EXISTS archon_tasks (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -952,6 +1661,7 @@ CREATE INDEX IF NOT EXISTS idx_archon_tasks_archived ON archon_tasks(archived);
 CREATE INDEX IF NOT EXISTS idx_archon_tasks_archived_at ON archon_tasks(archived_at);
 CREATE INDEX IF NOT EXISTS idx_archon_project_sources_project_id ON archon_project_sources(project_id);
 CREATE INDEX IF NOT EXISTS idx_archon_project_sources_source_id ON archon_project_sources(source_id);
+CREATE INDEX IF NOT EXISTS idx_archon_project_documents_position ON archon_project_documents(project_id, position);
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_project_id ON archon_document_versions(project_id);
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_task_id ON archon_document_versions(task_id);
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_field_name ON archon_document_versions(field_name);
@@ -967,6 +1677,10 @@ CREATE OR REPLACE TRIGGER update_archon_tasks_updated_at
     BEFORE UPDATE ON archon_tasks
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE OR REPLACE TRIGGER update_archon_project_documents_updated_at
+    BEFORE UPDATE ON archon_project_documents
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 -- Soft delete function for tasks
 CREATE OR REPLACE FUNCTION archive_task(
     task_id_param UUID,
@@ -1062,7 +1776,15 @@ VALUES
   ('0.1.0', '008_add_migration_tracking'),
   ('0.1.0', '009_add_cascade_delete_constraints'),
   ('0.1.0', '010_add_provider_placeholders'),
-  ('0.1.0', '011_add_page_metadata_table')
+  ('0.1.0', '011_add_page_metadata_table'),
+  ('0.1.0', '012_add_chunk_content_hash'),
+  ('0.1.0', '013_add_hybrid_candidate_functions'),
+  ('0.1.0', '014_add_source_stats'),
+  ('0.1.0', '015_add_sitemap_entries'),
+  ('0.1.0', '016_add_crawl_checkpoints'),
+  ('0.1.0', '017_add_page_validators'),
+  ('0.1.0', '018_add_vector_index_management'),
+  ('0.1.0', '019_add_project_documents')
 ON CONFLICT (version, migration_name) DO NOTHING;
 
 -- Enable Row Level Security on migrations table
@@ -1112,6 +1834,7 @@ CREATE OR REPLACE TRIGGER update_archon_prompts_updated_at
 ALTER TABLE archon_projects ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_tasks ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_project_sources ENABLE ROW LEVEL SECURITY;
+ALTER TABLE archon_project_documents ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_document_versions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_prompts ENABLE ROW LEVEL SECURITY;
 
@@ -1125,6 +1848,9 @@ CREATE POLICY "Allow service role full access to archon_tasks" ON archon_tasks
 CREATE POLICY "Allow service role full access to archon_project_sources" ON archon_project_sources
     FOR ALL USING (auth.role() = 'service_role');
 
+CREATE POLICY "Allow service role full access to archon_project_documents" ON archon_project_documents
+    FOR ALL USING (auth.role() = 'service_role');
+
 CREATE POLICY "Allow service role full access to archon_document_versions" ON archon_document_versions
     FOR ALL USING (auth.role() = 'service_role');
 
@@ -1144,6 +1870,10 @@ CREATE POLICY "Allow authenticated users to read and update archon_project_sourc
     FOR ALL TO authenticated
     USING (true);
 
+CREATE POLICY "Allow authenticated users to read and update archon_project_documents" ON archon_project_documents
+    FOR ALL TO authenticated
+    USING (true);
+
 CREATE POLICY "Allow authenticated users to read archon_document_versions" ON archon_document_versions
     FOR SELECT TO authenticated
     USING (true);
@@ -149,16 +149,14 @@ class DocumentAgent(BaseAgent[DocumentDependencies, DocumentOperation]):
 
                 supabase = get_supabase_client()
                 response = (
-                    supabase.table("archon_projects")
-                    .select("docs")
-                    .eq("id", ctx.deps.project_id)
+                    supabase.table("archon_project_documents")
+                    .select("id, title, document_type")
+                    .eq("project_id", ctx.deps.project_id)
+                    .order("position")
                     .execute()
                 )
 
-                if not response.data:
-                    return "No project found with the given ID."
-
-                docs = response.data[0].get("docs", [])
+                docs = response.data or []
                 if not docs:
                     return "No documents found in this project."
 
@@ -180,16 +178,14 @@ class DocumentAgent(BaseAgent[DocumentDependencies, DocumentOperation]):
             try:
                 supabase = get_supabase_client()
                 response = (
-                    supabase.table("archon_projects")
-                    .select("docs")
-                    .eq("id", ctx.deps.project_id)
+                    supabase.table("archon_project_documents")
+                    .select("id, title, document_type, status, version, content")
+                    .eq("project_id", ctx.deps.project_id)
+                    .order("position")
                     .execute()
                 )
 
-                if not response.data:
-                    return "No project found."
-
-                docs = response.data[0].get("docs", [])
+                docs = response.data or []
                 matching_docs = [
                     doc for doc in docs if document_title.lower() in doc.get("title", "").lower()
                 ]
@@ -24,7 +24,7 @@ from pydantic import BaseModel
 from ..config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
 from ..middleware.auth_middleware import require_auth
 from ..services.crawler_manager import get_crawler
-from ..services.crawling import CrawlingService
+from ..services.crawling import CrawlCheckpointOperations, CrawlingService, is_orchestration_active
 from ..services.credential_service import credential_service
 from ..services.embeddings.provider_error_adapters import ProviderErrorFactory
 from ..services.knowledge import DatabaseMetricsService, KnowledgeItemService, KnowledgeSummaryService
@@ -199,7 +199,7 @@ async def get_crawl_progress(progress_id: str, auth = Depends(require_auth)):
         from ..utils.progress.progress_tracker import ProgressTracker
 
         # Get progress from the tracker's in-memory storage
-        progress_data = ProgressTracker.get_progress(progress_id)
+        progress_data = await ProgressTracker.get_progress_async(progress_id)
         safe_logfire_info(f"Crawl progress requested | progress_id={progress_id} | found={progress_data is not None}")
 
         if not progress_data:
@@ -318,6 +318,25 @@ async def get_knowledge_items_summary(
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+@router.get("/knowledge-items/crawl-checkpoints")
+async def list_crawl_checkpoints(auth = Depends(require_auth)):
+    """List unfinished crawls that left a checkpoint and whether each can be resumed."""
+    try:
+        checkpoint_ops = CrawlCheckpointOperations(get_supabase_client())
+        checkpoints = await checkpoint_ops.list_checkpoints()
+
+        items = []
+        for checkpoint in checkpoints:
+            item = checkpoint.summary()
+            # A checkpoint of a crawl still running on any worker is not resumable
+            item["resumable"] = not await is_orchestration_active(checkpoint.progress_id)
+            items.append(item)
+        return {"checkpoints": items, "count": len(items)}
+    except Exception as e:
+        safe_logfire_error(f"Failed to list crawl checkpoints | error={str(e)}")
+        raise HTTPException(status_code=500, detail={"error": str(e)}) from e
+
+
 @router.get("/knowledge-items/{source_id}")
 async def get_knowledge_item(source_id: str, auth = Depends(require_auth)):
     """Get a specific knowledge item by source_id."""
@@ -748,6 +767,8 @@ async def refresh_knowledge_item(source_id: str, auth = Depends(require_auth)):
             "max_depth": max_depth,
             "extract_code_examples": True,
             "generate_summary": True,
+            # Skip pages whose ETag/Last-Modified or content hash show no change
+            "conditional_recrawl": True,
         }
 
         # Create a wrapped task that acquires the semaphore
@@ -865,10 +886,89 @@ async def crawl_knowledge_item(request: KnowledgeItemRequest, auth = Depends(req
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/knowledge-items/crawl/{progress_id}/resume")
+async def resume_crawl(progress_id: str, auth = Depends(require_auth)):
+    """
+    Resume an interrupted crawl from its last checkpoint.
+
+    Pages stored before the interruption are neither recrawled nor re-embedded.
+    Progress is reported under the original progress ID.
+    """
+    checkpoint_ops = CrawlCheckpointOperations(get_supabase_client())
+    try:
+        checkpoint = await checkpoint_ops.load(progress_id)
+    except Exception as e:
+        safe_logfire_error(f"Failed to load crawl checkpoint | error={str(e)} | progress_id={progress_id}")
+        raise HTTPException(status_code=500, detail={"error": str(e)}) from e
+
+    if not checkpoint:
+        raise HTTPException(
+            status_code=404, detail={"error": f"No crawl checkpoint found for ID: {progress_id}"}
+        )
+    # Validate API key before restarting the expensive operation
+    provider_config = await credential_service.get_active_provider("embedding")
+    provider = provider_config.get("provider", "openai")
+    await _validate_provider_api_key(provider)
+
+    try:
+        request = KnowledgeItemRequest(**checkpoint.request)
+    except Exception as e:
+        safe_logfire_error(f"Failed to resume crawl | error={str(e)} | progress_id={progress_id}")
+        raise HTTPException(status_code=500, detail={"error": str(e)}) from e
+
+    # Nothing is awaited between the registry check and registering the task below,
+    # so concurrent resume requests for the same crawl can't both get past it
+    if await is_orchestration_active(progress_id) or progress_id in active_crawl_tasks:
+        raise HTTPException(
+            status_code=409, detail={"error": "This crawl is still running and cannot be resumed"}
+        )
+
+    pending = len(checkpoint.pending_urls())
+    safe_logfire_info(
+        f"Resuming crawl | progress_id={progress_id} | url={checkpoint.url} | "
+        f"stored={len(checkpoint.stored_pages)} | pending={pending}"
+    )
+
+    from ..utils.progress.progress_tracker import ProgressTracker
+    tracker = ProgressTracker(progress_id, operation_type="crawl")
+
+    async def _resume_with_progress():
+        try:
+            await tracker.start({
+                "url": checkpoint.url,
+                "current_url": checkpoint.url,
+                "crawl_type": checkpoint.crawl_type,
+                "progress": 0,
+                "log": f"Resuming crawl of {checkpoint.url}: {len(checkpoint.stored_pages)} pages already stored",
+            })
+            await _perform_crawl_with_progress(progress_id, request, tracker, checkpoint)
+        except Exception as e:
+            safe_logfire_error(f"Failed to resume crawl | error={str(e)} | progress_id={progress_id}")
+        finally:
+            # Drop the queued entry if the crawl never replaced it with its own task
+            if active_crawl_tasks.get(progress_id) is resume_task:
+                del active_crawl_tasks[progress_id]
+
+    # Registered while still queued on the crawl semaphore so it can be stopped
+    resume_task = asyncio.create_task(_resume_with_progress())
+    active_crawl_tasks[progress_id] = resume_task
+    return {
+        "success": True,
+        "progressId": progress_id,
+        "message": "Crawl resumed",
+        "pagesStored": len(checkpoint.stored_pages),
+        "pagesPending": pending,
+    }
+
+
 async def _perform_crawl_with_progress(
-    progress_id: str, request: KnowledgeItemRequest, tracker
+    progress_id: str, request: KnowledgeItemRequest, tracker, checkpoint=None
 ):
-    """Perform the actual crawl operation with progress tracking using service layer."""
+    """
+    Perform the actual crawl operation with progress tracking using service layer.
+
+    When a checkpoint is given, the interrupted crawl it describes is resumed instead.
+    """
     # Acquire semaphore to limit concurrent crawls
     async with crawl_semaphore:
         safe_logfire_info(
@@ -904,7 +1004,10 @@ async def _perform_crawl_with_progress(
             }
 
             # Orchestrate the crawl - this returns immediately with task info including the actual task
-            result = await orchestration_service.orchestrate_crawl(request_dict)
+            if checkpoint:
+                result = await orchestration_service.resume_crawl(checkpoint)
+            else:
+                result = await orchestration_service.orchestrate_crawl(request_dict)
 
             # Store the ACTUAL crawl task for proper cancellation
             crawl_task = result.get("task")
@@ -1266,6 +1369,14 @@ async def get_available_sources(auth = Depends(require_auth)):
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+@router.get("/rag/cache-stats")
+async def get_rag_cache_stats(auth = Depends(require_auth)):
+    """Get hit-rate metrics for the query embedding cache."""
+    from ..services.embeddings.query_embedding_cache import get_query_embedding_cache
+
+    return {"query_embedding_cache": get_query_embedding_cache().get_stats()}
+
+
 @router.delete("/sources/{source_id}")
 async def delete_source(source_id: str, auth = Depends(require_auth)):
     """Delete a source and all its associated data."""
@@ -1302,12 +1413,12 @@ async def delete_source(source_id: str, auth = Depends(require_auth)):
 
 
 @router.get("/database/metrics")
-async def get_database_metrics(auth = Depends(require_auth)):
-    """Get database metrics and statistics."""
+async def get_database_metrics(exact: bool = False, auth = Depends(require_auth)):
+    """Get database metrics and statistics (cached estimates unless exact=true)."""
     try:
         # Use DatabaseMetricsService
         service = DatabaseMetricsService(get_supabase_client())
-        metrics = await service.get_metrics()
+        metrics = await service.get_metrics(exact=exact)
         return metrics
     except Exception as e:
         safe_logfire_error(f"Failed to get database metrics | error={str(e)}")
@@ -1347,16 +1458,14 @@ async def knowledge_health():
 async def stop_crawl_task(progress_id: str, auth = Depends(require_auth)):
     """Stop a running crawl task."""
     try:
-        from ..services.crawling import get_active_orchestration, unregister_orchestration
+        from ..services.crawling import cancel_orchestration, unregister_orchestration
 
 
         safe_logfire_info(f"Stop crawl requested | progress_id={progress_id}")
 
         found = False
-        # Step 1: Cancel the orchestration service
-        orchestration = await get_active_orchestration(progress_id)
-        if orchestration:
-            orchestration.cancel()
+        # Step 1: Cancel the orchestration service (on whichever worker runs it)
+        if await cancel_orchestration(progress_id):
             found = True
 
         # Step 2: Cancel the asyncio task
@@ -1368,7 +1477,8 @@ async def stop_crawl_task(progress_id: str, auth = Depends(require_auth)):
                     await asyncio.wait_for(task, timeout=2.0)
                 except (TimeoutError, asyncio.CancelledError):
                     pass
-            del active_crawl_tasks[progress_id]
+            # A cancelled resume removes its own entry on the way out
+            active_crawl_tasks.pop(progress_id, None)
             found = True
 
         # Step 3: Remove from active orchestrations registry
@@ -1379,7 +1489,7 @@ async def stop_crawl_task(progress_id: str, auth = Depends(require_auth)):
             try:
                 from ..utils.progress.progress_tracker import ProgressTracker
                 # Get current progress from existing tracker, default to 0 if not found
-                current_state = ProgressTracker.get_progress(progress_id)
+                current_state = await ProgressTracker.get_progress_async(progress_id)
                 current_progress = current_state.get("progress", 0) if current_state else 0
 
                 tracker = ProgressTracker(progress_id, operation_type="crawl")
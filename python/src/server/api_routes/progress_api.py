@@ -1,17 +1,22 @@
-"""Progress API endpoints for polling operation status."""
+"""Progress API endpoints for polling and streaming operation status."""
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime
 from email.utils import formatdate
+from typing import Any
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from fastapi import status as http_status
+from fastapi.responses import StreamingResponse
 
 from ..middleware.auth_middleware import require_auth
 
 from ..config.logfire_config import get_logger, logfire
 from ..models.progress_models import create_progress_response
-from ..utils.etag_utils import check_etag, generate_etag
-from ..utils.progress import ProgressTracker
+from ..utils.etag_utils import check_etag, generate_etag, versioned_etags
+from ..utils.progress import ProgressSubscription, ProgressTracker, progress_broadcaster
 
 logger = get_logger(__name__)
 
@@ -20,6 +25,105 @@ router = APIRouter(prefix="/api/progress", tags=["progress"])
 # Terminal states that don't require further polling
 TERMINAL_STATES = {"completed", "failed", "error", "cancelled"}
 
+# Minimum seconds between events on a stream; updates in between are coalesced
+STREAM_MIN_INTERVAL = 0.25
+# Comment sent on idle streams so proxies keep the connection open
+STREAM_KEEPALIVE_INTERVAL = 15.0
+
+
+def _format_progress(operation_id: str, operation: dict[str, Any]) -> dict[str, Any]:
+    """Build the camelCase progress response for an operation state."""
+    # Ensure we have the progress_id in the response without mutating shared state
+    operation_with_id = {**operation, "progress_id": operation_id}
+
+    # Get operation type for proper model selection
+    operation_type = operation.get("type", "crawl")
+
+    # Create standardized response using Pydantic model
+    progress_response = create_progress_response(operation_type, operation_with_id)
+
+    # Convert to dict with camelCase fields for API response
+    return progress_response.model_dump(by_alias=True, exclude_none=True)
+
+
+async def _progress_events(
+    subscription: ProgressSubscription, initial: dict[str, dict[str, Any]]
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for a subscription, starting with the current states.
+
+    A stream for a single operation ends after its terminal state.
+    """
+    loop = asyncio.get_running_loop()
+    pending = initial
+    last_sent = 0.0
+    try:
+        while True:
+            for operation_id, state in pending.items():
+                try:
+                    data = _format_progress(operation_id, state)
+                except Exception as e:
+                    logger.warning(f"Skipping progress event | operation_id={operation_id} | error={e}")
+                    continue
+                yield f"event: progress\ndata: {json.dumps(data, default=str)}\n\n"
+                if subscription.progress_id and state.get("status") in TERMINAL_STATES:
+                    return
+            last_sent = loop.time()
+
+            pending = await subscription.next(timeout=STREAM_KEEPALIVE_INTERVAL)
+            if not pending:
+                yield ": keep-alive\n\n"
+                continue
+            # Rate-limit the stream; anything published meanwhile replaces older states
+            wait = last_sent + STREAM_MIN_INTERVAL - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                pending.update(await subscription.next(timeout=0))
+    finally:
+        progress_broadcaster.unsubscribe(subscription)
+
+
+def _event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stream")
+async def stream_all_progress(auth = Depends(require_auth)):
+    """
+    Stream progress of every operation as Server-Sent Events.
+
+    Sends the state of each active operation, then every change as it happens,
+    so a client can follow all running operations over a single connection.
+    """
+    subscription = progress_broadcaster.subscribe()
+    initial = {
+        operation_id: operation
+        for operation_id, operation in await ProgressTracker.list_active_async().items()
+        if operation.get("status") not in TERMINAL_STATES
+    }
+    logfire.info(f"Progress stream opened | active_operations={len(initial)}")
+    return _event_stream_response(_progress_events(subscription, initial))
+
+
+@router.get("/{operation_id}/stream")
+async def stream_progress(operation_id: str, auth = Depends(require_auth)):
+    """
+    Stream progress of one operation as Server-Sent Events.
+
+    Push alternative to polling GET /api/progress/{operation_id}: each event carries
+    the same payload, and the stream closes after the operation reaches a terminal state.
+    """
+    operation = await ProgressTracker.get_progress_async(operation_id)
+    if not operation:
+        raise HTTPException(status_code=404, detail={"error": f"Operation {operation_id} not found"})
+
+    subscription = progress_broadcaster.subscribe(operation_id)
+    return _event_stream_response(_progress_events(subscription, {operation_id: operation}))
+
 
 @router.get("/{operation_id}")
 async def get_progress(
@@ -38,7 +142,7 @@ async def get_progress(
         logfire.info(f"Getting progress for operation | operation_id={operation_id}")
 
         # Get operation progress from ProgressTracker
-        operation = ProgressTracker.get_progress(operation_id)
+        operation = await ProgressTracker.get_progress_async(operation_id)
 
         if not operation:
             logfire.warning(f"Operation not found | operation_id={operation_id}")
@@ -47,19 +151,17 @@ async def get_progress(
                 detail={"error": f"Operation {operation_id} not found"}
             )
 
+        # Unchanged since the client's copy: answer before building the response
+        etag_key = f"progress:{operation_id}"
+        state_version = operation.get("version")
+        if state_version is not None and versioned_etags.is_unchanged(etag_key, state_version, if_none_match):
+            return Response(
+                status_code=http_status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": if_none_match, "Cache-Control": "no-cache, must-revalidate"},
+            )
 
-        # Ensure we have the progress_id in the response without mutating shared state
-        operation_with_id = {**operation, "progress_id": operation_id}
-
-        # Get operation type for proper model selection
         operation_type = operation.get("type", "crawl")
-
-        # Create standardized response using Pydantic model
-        progress_response = create_progress_response(operation_type, operation_with_id)
-
-
-        # Convert to dict with camelCase fields for API response
-        response_data = progress_response.model_dump(by_alias=True, exclude_none=True)
+        response_data = _format_progress(operation_id, operation)
 
         # Debug logging for code extraction fields
         if operation_type == "crawl" and operation.get("status") == "code_extraction":
@@ -68,6 +170,8 @@ async def get_progress(
         # Generate ETag from stable data (excluding timestamp)
         etag_data = {k: v for k, v in response_data.items() if k != "timestamp"}
         current_etag = generate_etag(etag_data)
+        if state_version is not None:
+            versioned_etags.set(etag_key, state_version, current_etag)
 
         # Check if client's ETag matches
         if check_etag(if_none_match, current_etag):
@@ -115,7 +219,7 @@ async def list_active_operations(auth = Depends(require_auth)):
 
         # Get active operations from ProgressTracker
         # Include all non-completed statuses
-        for op_id, operation in ProgressTracker.list_active().items():
+        for op_id, operation in await ProgressTracker.list_active_async().items():
             status = operation.get("status", "unknown")
             # Include all operations that aren't in terminal states
             if status not in TERMINAL_STATES:
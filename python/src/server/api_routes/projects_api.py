@@ -22,7 +22,14 @@ from pydantic import BaseModel
 from ..config.logfire_config import get_logger, logfire
 from ..middleware.auth_middleware import require_auth
 from ..utils import get_supabase_client
-from ..utils.etag_utils import check_etag, generate_etag
+from ..utils.etag_utils import (
+    PROJECTS_SCOPE,
+    TASKS_SCOPE,
+    check_etag,
+    generate_etag,
+    get_data_version,
+    versioned_etags,
+)
 
 logger = get_logger(__name__)
 
@@ -93,6 +100,15 @@ async def list_projects(
     try:
         logfire.debug(f"Listing all projects | include_content={include_content}")
 
+        # No project written since the client's copy: answer before querying
+        etag_key = f"projects:include_content={include_content}"
+        data_version = get_data_version(PROJECTS_SCOPE)
+        if versioned_etags.is_unchanged(etag_key, data_version, if_none_match):
+            response.status_code = http_status.HTTP_304_NOT_MODIFIED
+            response.headers["ETag"] = if_none_match
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            return None
+
         # Use ProjectService to get projects with include_content parameter
         project_service = ProjectService()
         success, result = project_service.list_projects(include_content=include_content)
@@ -132,6 +148,7 @@ async def list_projects(
             "count": len(formatted_projects)
         }
         current_etag = generate_etag(etag_data)
+        versioned_etags.set(etag_key, data_version, current_etag)
 
         # Generate response with timestamp for polling
         response_data = {
@@ -295,6 +312,15 @@ async def get_all_task_counts(
 
         logfire.debug(f"Getting task counts for all projects | etag={if_none_match}")
 
+        # No task written since the client's copy: answer before querying
+        etag_key = "task_counts"
+        data_version = get_data_version(TASKS_SCOPE)
+        if versioned_etags.is_unchanged(etag_key, data_version, if_none_match):
+            response.status_code = 304
+            response.headers["ETag"] = if_none_match
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            return None
+
         # Use TaskService to get batch task counts
         # Get client explicitly to ensure mocking works in tests
         supabase_client = get_supabase_client()
@@ -311,6 +337,7 @@ async def get_all_task_counts(
             "count": len(result)
         }
         current_etag = generate_etag(etag_data)
+        versioned_etags.set(etag_key, data_version, current_etag)
 
         # Check if client's ETag matches (304 Not Modified)
         if check_etag(if_none_match, current_etag):
@@ -569,6 +596,16 @@ async def list_project_tasks(
             f"Listing project tasks | project_id={project_id} | include_archived={include_archived} | exclude_large_fields={exclude_large_fields} | etag={if_none_match}"
         )
 
+        # No task written since the client's copy: answer before querying
+        etag_key = f"tasks:{project_id}:include_archived={include_archived}:exclude_large_fields={exclude_large_fields}"
+        data_version = get_data_version(TASKS_SCOPE)
+        if versioned_etags.is_unchanged(etag_key, data_version, if_none_match):
+            response.status_code = 304
+            response.headers["ETag"] = if_none_match
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            logfire.debug(f"Tasks unchanged since version {data_version}, returning 304 | project_id={project_id}")
+            return None
+
         # Use TaskService to list tasks
         task_service = TaskService()
         success, result = task_service.list_tasks(
@@ -623,6 +660,7 @@ async def list_project_tasks(
 
         etag_data = {"tasks": etag_tasks, "project_id": project_id, "count": len(tasks)}
         current_etag = generate_etag(etag_data)
+        versioned_etags.set(etag_key, data_version, current_etag)
 
         # Check if client's ETag matches (304 Not Modified)
         if check_etag(if_none_match, current_etag):
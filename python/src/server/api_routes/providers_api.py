@@ -11,6 +11,7 @@ from ..middleware.auth_middleware import require_auth
 
 from ..config.logfire_config import logfire
 from ..services.credential_service import credential_service
+from ..services.threading_service import get_threading_service
 # Provider validation - simplified inline version
 
 router = APIRouter(prefix="/api/providers", tags=["providers"])
@@ -98,6 +99,12 @@ PROVIDER_TESTERS = {
 }
 
 
+@router.get("/rate-limits")
+async def get_rate_limits(auth = Depends(require_auth)):
+    """Current request/token budgets, learned provider limits and wait statistics per limiter"""
+    return {"limiters": get_threading_service().get_rate_limit_stats()}
+
+
 @router.get("/{provider}/status")
 async def get_provider_status(
     provider: str = Path(
@@ -17,6 +17,7 @@ from pydantic import BaseModel
 from ..config.logfire_config import logfire
 from ..middleware.auth_middleware import require_auth
 from ..services.credential_service import credential_service, initialize_credentials
+from ..services.knowledge import DatabaseMetricsService
 from ..utils import get_supabase_client
 
 router = APIRouter(prefix="/api", tags=["settings"])
@@ -280,41 +281,20 @@ async def initialize_credentials_endpoint(auth = Depends(require_auth)):
 
 
 @router.get("/database/metrics")
-async def database_metrics(auth = Depends(require_auth)):
-    """Get database metrics and statistics."""
+async def database_metrics(exact: bool = False, auth = Depends(require_auth)):
+    """Get database metrics and statistics (row estimates unless exact=true)."""
     try:
-        logfire.info("Getting database metrics")
-        supabase_client = get_supabase_client()
+        logfire.info(f"Getting database metrics | exact={exact}")
 
-        # Get various table counts
-        tables_info = {}
-
-        # Get projects count
-        projects_response = (
-            supabase_client.table("archon_projects").select("id", count="exact").execute()
-        )
-        tables_info["projects"] = (
-            projects_response.count if projects_response.count is not None else 0
-        )
-
-        # Get tasks count
-        tasks_response = supabase_client.table("archon_tasks").select("id", count="exact").execute()
-        tables_info["tasks"] = tasks_response.count if tasks_response.count is not None else 0
-
-        # Get crawled pages count
-        pages_response = (
-            supabase_client.table("archon_crawled_pages").select("id", count="exact").execute()
-        )
-        tables_info["crawled_pages"] = (
-            pages_response.count if pages_response.count is not None else 0
-        )
-
-        # Get settings count
-        settings_response = (
-            supabase_client.table("archon_settings").select("id", count="exact").execute()
-        )
-        tables_info["settings"] = (
-            settings_response.count if settings_response.count is not None else 0
+        # HEAD-only counts; no rows are transferred
+        tables_info = await DatabaseMetricsService(get_supabase_client()).get_table_counts(
+            {
+                "projects": "archon_projects",
+                "tasks": "archon_tasks",
+                "crawled_pages": "archon_crawled_pages",
+                "settings": "archon_settings",
+            },
+            exact=exact,
         )
 
         total_records = sum(tables_info.values())
@@ -327,6 +307,7 @@ async def database_metrics(auth = Depends(require_auth)):
             "database": "supabase",
             "tables": tables_info,
             "total_records": total_records,
+            "count_mode": "exact" if exact else "estimated",
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -0,0 +1,90 @@
+"""
+Vector Index API Module
+
+Admin endpoints for the pgvector indexes on the embedding columns:
+- Inspect row counts, current indexes and recommended plans
+- Rebuild indexes and re-tune their search parameters
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+
+from ..config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..middleware.auth_middleware import require_auth
+from ..services.credential_service import credential_service
+from ..services.search.vector_index_service import VectorIndexService
+from ..utils import get_supabase_client
+
+# Get logger for this module
+logger = get_logger(__name__)
+
+# Create router
+router = APIRouter(prefix="/api/vector-indexes", tags=["vector-indexes"])
+
+
+class VectorIndexRebuildRequest(BaseModel):
+    """Which indexes to rebuild and how; omitted fields use the rag_strategy settings"""
+
+    table_name: str | None = None
+    dimension: int | None = None
+    method: Literal["auto", "hnsw", "ivfflat"] | None = None
+    recall_target: float | None = Field(default=None, gt=0, lt=1)
+    force: bool = False
+
+
+async def _get_vector_index_service() -> VectorIndexService:
+    """Create the service with the current rag_strategy settings."""
+    try:
+        settings = await credential_service.get_credentials_by_category("rag_strategy")
+    except Exception as e:
+        logger.warning(f"Failed to load vector index settings, using defaults: {e}")
+        settings = {}
+    return VectorIndexService(
+        get_supabase_client(), get_setting=lambda key, default: str(settings.get(key, default))
+    )
+
+
+@router.get("")
+async def get_vector_indexes(auth = Depends(require_auth)):
+    """Get the index of every embedding column with its recommended method and parameters."""
+    try:
+        service = await _get_vector_index_service()
+        indexes = await service.get_status()
+        return {"indexes": indexes}
+    except Exception as e:
+        safe_logfire_error(
+            f"Failed to get vector index status (is migration 018_add_vector_index_management applied?) "
+            f"| error={str(e)}"
+        )
+        raise HTTPException(status_code=500, detail={"error": str(e)}) from e
+
+
+@router.post("/rebuild")
+async def rebuild_vector_indexes(request: VectorIndexRebuildRequest, auth = Depends(require_auth)):
+    """
+    Rebuild embedding indexes that no longer fit their data and re-tune search parameters.
+
+    Rebuilding locks writes to the table while the index is built.
+    """
+    try:
+        service = await _get_vector_index_service()
+        results = await service.rebuild(
+            table_name=request.table_name,
+            dimension=request.dimension,
+            method=request.method,
+            recall_target=request.recall_target,
+            force=request.force,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)}) from e
+    except Exception as e:
+        safe_logfire_error(f"Failed to rebuild vector indexes | error={str(e)}")
+        raise HTTPException(status_code=500, detail={"error": str(e)}) from e
+
+    safe_logfire_info(
+        f"Vector index maintenance finished | rebuilt={sum(r['action'] == 'rebuilt' for r in results)} "
+        f"| failed={sum(r['action'] == 'failed' for r in results)}"
+    )
+    return {"success": all(r["action"] != "failed" for r in results), "results": results}
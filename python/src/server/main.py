@@ -32,6 +32,7 @@ from .api_routes.pages_api import router as pages_router
 from .api_routes.progress_api import router as progress_router
 from .api_routes.projects_api import router as projects_router
 from .api_routes.providers_api import router as providers_router
+from .api_routes.vector_index_api import router as vector_index_router
 from .api_routes.version_api import router as version_router
 
 # Import modular API routers
@@ -42,6 +43,7 @@ from .config.logfire_config import api_logger, setup_logfire
 from .services.crawler_manager import cleanup_crawler, initialize_crawler
 
 # Import utilities and core classes
+from .services.client_manager import get_supabase_client_stats
 from .services.credential_service import initialize_credentials
 
 # Import missing dependencies that the modular APIs need
@@ -104,6 +106,19 @@ async def lifespan(app: FastAPI):
 
         api_logger.info("✅ Using polling for real-time updates")
 
+        # Share progress and crawl cancellation with the other workers (ARCHON_STATE_STORE)
+        # An unknown backend is a configuration error and stops startup
+        from .utils.progress import get_state_store, progress_broadcaster
+
+        state_store = get_state_store()
+        try:
+            # Stream updates of operations running on other workers too
+            state_store.watch_progress(progress_broadcaster.publish)
+            state_store.start()
+            api_logger.info(f"✅ Operation state store: {type(state_store).__name__}")
+        except Exception as e:
+            api_logger.warning(f"Could not start operation state store: {e}")
+
         # Initialize prompt service
         try:
             from .services.prompt_service import prompt_service
@@ -113,6 +128,23 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.warning(f"Could not initialize prompt service: {e}")
 
+        # Warm-load the reranking model so the first reranked query doesn't pay for it
+        try:
+            from .services.credential_service import credential_service
+            from .services.search.reranking_strategy import (
+                DEFAULT_RERANKING_MODEL,
+                initialize_reranking_model,
+            )
+
+            use_reranking = await credential_service.get_credential("USE_RERANKING", "false")
+            if str(use_reranking).lower() in ("true", "1", "yes", "on"):
+                model_name = await credential_service.get_credential(
+                    "RERANKING_MODEL", DEFAULT_RERANKING_MODEL
+                )
+                if await initialize_reranking_model(model_name or DEFAULT_RERANKING_MODEL):
+                    api_logger.info("✅ Reranking model loaded")
+        except Exception as e:
+            api_logger.warning(f"Could not warm-load reranking model: {e}")
 
         # MCP Client functionality removed from architecture
         # Agents now use MCP tools directly
@@ -140,6 +172,38 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.warning("Could not cleanup crawling context: %s", e, exc_info=True)
 
+        # Stop the reranking worker thread
+        try:
+            from .services.search.reranking_strategy import shutdown_reranking_executor
+
+            shutdown_reranking_executor()
+        except Exception as e:
+            api_logger.warning(f"Could not shut down reranking executor: {e}")
+
+        # Stop watching the operation state store
+        try:
+            from .utils.progress import get_state_store
+
+            await get_state_store().close()
+        except Exception as e:
+            api_logger.warning(f"Could not close operation state store: {e}")
+
+        # Close pooled LLM/embedding clients
+        try:
+            from .services.llm_provider_service import close_llm_clients
+
+            await close_llm_clients()
+        except Exception as e:
+            api_logger.warning(f"Could not close LLM clients: {e}")
+
+        # Close pooled database connections
+        try:
+            from .services.client_manager import close_supabase_client
+
+            close_supabase_client()
+        except Exception as e:
+            api_logger.warning(f"Could not close Supabase client: {e}")
+
 
         api_logger.info("✅ Cleanup completed")
 
@@ -209,6 +273,7 @@ app.include_router(bug_report_router)
 app.include_router(providers_router)
 app.include_router(version_router)
 app.include_router(migration_router)
+app.include_router(vector_index_router)
 
 
 # Root endpoint
@@ -263,6 +328,7 @@ async def health_check(response: Response):
         "ready": True,
         "credentials_loaded": True,
         "schema_valid": True,
+        "database_client": get_supabase_client_stats(),
     }
 
 
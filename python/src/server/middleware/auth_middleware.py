@@ -11,11 +11,11 @@ import logging
 import os
 from typing import Callable
 
-import bcrypt
 from fastapi import HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from ..services.api_key_service import APIKeyService
 from ..services.client_manager import get_supabase_client
 
 logger = logging.getLogger(__name__)
@@ -148,34 +148,9 @@ class APIKeyAuthMiddleware(BaseHTTPMiddleware):
             Dict with key info if valid, None if invalid
         """
         try:
-            # Hash the provided key
-            # Note: We'll need to query all active keys and check each hash
-            # This is necessary because bcrypt hashing is one-way
-
-            supabase = get_supabase_client()
-
-            # Get all active API keys
-            result = supabase.table("api_keys").select("*").eq("is_active", True).execute()
-
-            if not result.data:
-                return None
-
-            # Check each key's hash
-            for key_record in result.data:
-                key_hash = key_record["key_hash"]
-
-                # Verify the provided key against the stored hash
-                if bcrypt.checkpw(api_key.encode('utf-8'), key_hash.encode('utf-8')):
-                    # Key is valid
-                    return {
-                        "id": key_record["id"],
-                        "key_name": key_record["key_name"],
-                        "permissions": key_record["permissions"],
-                        "metadata": key_record.get("metadata", {})
-                    }
-
-            # No matching key found
-            return None
+            # Prefix lookup + cached, off-loop bcrypt verification
+            valid, key_info = await APIKeyService(get_supabase_client()).validate_api_key(api_key)
+            return key_info if valid else None
 
         except Exception as e:
             logger.error(f"Error validating API key: {e}", exc_info=True)
@@ -6,8 +6,14 @@ Handles API key generation, validation, and management.
 Created: 2025-10-15
 """
 
+import asyncio
+import hashlib
+import hmac
 import logging
+import os
 import secrets
+import threading
+import time
 from datetime import datetime
 from typing import Optional
 
@@ -16,6 +22,77 @@ from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+# Length of the stored key_prefix ("ak_XXXX")
+KEY_PREFIX_LENGTH = 7
+
+
+class VerifiedKeyCache:
+    """
+    Short-lived cache of successfully verified API keys.
+
+    Entries are keyed by an HMAC-SHA256 digest of the key under a per-process secret,
+    so the plain-text key is never held and a cache hit costs one fast hash instead of
+    a bcrypt check. Only positive results are cached. Revocation and updates invalidate
+    entries locally; the TTL bounds staleness for other worker processes.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._secret = secrets.token_bytes(32)
+        self._entries: dict[str, tuple[dict, float]] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, api_key: str) -> str:
+        return hmac.new(self._secret, api_key.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def get(self, api_key: str) -> dict | None:
+        if self.ttl_seconds <= 0:
+            return None
+        key = self.digest(api_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            key_info, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return key_info
+
+    def set(self, api_key: str, key_info: dict) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = self.digest(api_key)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (key_info, time.monotonic() + self.ttl_seconds)
+
+    def invalidate_key(self, key_id: str) -> None:
+        """Drop every cached entry for the given key id."""
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if v[0].get("id") != key_id}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global verified-key cache shared by the auth middleware and the API key routes
+_verified_key_cache: VerifiedKeyCache | None = None
+
+
+def get_verified_key_cache() -> VerifiedKeyCache:
+    """Get the global verified-key cache, configured by API_KEY_CACHE_TTL (seconds)."""
+    global _verified_key_cache
+    if _verified_key_cache is None:
+        _verified_key_cache = VerifiedKeyCache(ttl_seconds=float(os.getenv("API_KEY_CACHE_TTL", "60")))
+    return _verified_key_cache
+
 
 class APIKeyService:
     """Service for managing API keys."""
@@ -65,7 +142,7 @@ class APIKeyService:
             api_key = self.generate_api_key()
 
             # Extract prefix for storage
-            prefix = api_key[:7]  # "ak_XXXX"
+            prefix = api_key[:KEY_PREFIX_LENGTH]  # "ak_XXXX"
 
             # Hash the API key using bcrypt
             salt = bcrypt.gensalt()
@@ -122,6 +199,10 @@ class APIKeyService:
         """
         Validate an API key against the database.
 
+        Recently verified keys are served from the verified-key cache. Otherwise only
+        active rows sharing the key's indexed prefix are fetched, and bcrypt runs in a
+        worker thread so it doesn't block the event loop.
+
         Args:
             api_key: The API key to validate
 
@@ -129,26 +210,44 @@ class APIKeyService:
             Tuple of (valid: bool, key_info: dict or None)
         """
         try:
-            # Get all active API keys
-            result = self.supabase.table("api_keys").select("*").eq("is_active", True).execute()
+            cache = get_verified_key_cache()
+            cached = cache.get(api_key)
+            if cached is not None:
+                return True, cached
+
+            if not api_key.startswith("ak_") or len(api_key) <= KEY_PREFIX_LENGTH:
+                return False, None
+
+            # Only rows with this prefix can match (4 hex chars, so collisions are rare)
+            result = (
+                self.supabase.table("api_keys")
+                .select("id, key_name, key_hash, permissions, metadata, created_at, last_used_at")
+                .eq("key_prefix", api_key[:KEY_PREFIX_LENGTH])
+                .eq("is_active", True)
+                .execute()
+            )
 
             if not result.data:
                 return False, None
 
-            # Check each key's hash
             for key_record in result.data:
                 key_hash = key_record["key_hash"]
 
                 # Verify the provided key against the stored hash
-                if bcrypt.checkpw(api_key.encode('utf-8'), key_hash.encode('utf-8')):
-                    # Key is valid
-                    return True, {
+                matches = await asyncio.to_thread(
+                    bcrypt.checkpw, api_key.encode('utf-8'), key_hash.encode('utf-8')
+                )
+                if matches:
+                    key_info = {
                         "id": key_record["id"],
                         "key_name": key_record["key_name"],
                         "permissions": key_record["permissions"],
-                        "created_at": key_record["created_at"],
+                        "metadata": key_record.get("metadata") or {},
+                        "created_at": key_record.get("created_at"),
                         "last_used_at": key_record.get("last_used_at")
                     }
+                    cache.set(api_key, key_info)
+                    return True, key_info
 
             # No matching key found
             return False, None
@@ -176,6 +275,7 @@ class APIKeyService:
             if not result.data:
                 return False, {"error": "API key not found"}
 
+            get_verified_key_cache().invalidate_key(key_id)
             logger.info(f"Revoked API key | key_id={key_id}")
 
             return True, {
@@ -278,6 +378,8 @@ class APIKeyService:
             if not result.data:
                 return False, {"error": "API key not found"}
 
+            # Cached entries carry permissions, so drop them after any update
+            get_verified_key_cache().invalidate_key(key_id)
             logger.info(f"Updated API key | key_id={key_id} | updates={list(updates.keys())}")
 
             return True, {
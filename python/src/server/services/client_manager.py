@@ -2,42 +2,224 @@
 Client Manager Service
 
 Manages database and API client connections.
+
+A single Supabase client is shared by the whole process so PostgREST requests
+reuse keep-alive (and HTTP/2, when available) connections instead of paying
+TCP/TLS setup on every call. Pool limits are configurable via environment:
+
+    SUPABASE_POOL_SIZE               Maximum open connections (default 20)
+    SUPABASE_POOL_KEEPALIVE          Maximum idle keep-alive connections (default: pool size)
+    SUPABASE_POOL_KEEPALIVE_EXPIRY   Seconds an idle connection is kept (default 30)
+    SUPABASE_HTTP2                   Negotiate HTTP/2 with PostgREST (default true)
+
+supabase-py query builders execute synchronously. Async code should run them via
+execute_async() / run_db_call(), which use a dedicated thread pool sized to the
+connection pool, so a slow query no longer stalls the event loop.
 """
 
+import asyncio
+import functools
 import os
 import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
+import httpx
+from postgrest.utils import SyncClient
 from supabase import Client, create_client
 
 from ..config.logfire_config import search_logger
 
+_client: Client | None = None
+_client_lock = threading.Lock()
+_db_executor: ThreadPoolExecutor | None = None
+_client_stats = {
+    "created_at": None,
+    "clients_created": 0,
+    "client_requests": 0,
+    "creation_errors": 0,
+    "db_calls": 0,
+    "db_calls_in_flight": 0,
+}
+
+
+def _get_pool_config() -> dict[str, Any]:
+    max_connections = max(1, int(os.getenv("SUPABASE_POOL_SIZE", "20")))
+    return {
+        "max_connections": max_connections,
+        "max_keepalive_connections": max(
+            0, int(os.getenv("SUPABASE_POOL_KEEPALIVE", str(max_connections)))
+        ),
+        "keepalive_expiry": float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30")),
+        "http2": os.getenv("SUPABASE_HTTP2", "true").lower() == "true",
+    }
+
+
+def _http2_supported() -> bool:
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+def _create_pooled_client(url: str, key: str) -> Client:
+    """Create a Supabase client whose PostgREST session uses the configured pool limits."""
+    client = create_client(url, key)
+    pool_config = _get_pool_config()
+
+    # supabase-py doesn't expose PostgREST pool limits, so swap in a session with them
+    postgrest = client.postgrest
+    default_session = postgrest.session
+    postgrest.session = SyncClient(
+        base_url=default_session.base_url,
+        headers=default_session.headers,
+        timeout=default_session.timeout,
+        verify=postgrest.verify,
+        proxy=postgrest.proxy,
+        follow_redirects=True,
+        http2=pool_config["http2"] and _http2_supported(),
+        limits=httpx.Limits(
+            max_connections=pool_config["max_connections"],
+            max_keepalive_connections=pool_config["max_keepalive_connections"],
+            keepalive_expiry=pool_config["keepalive_expiry"],
+        ),
+    )
+    default_session.close()
+    return client
+
 
 def get_supabase_client() -> Client:
     """
-    Get a Supabase client instance.
+    Get the shared Supabase client instance, creating it on first use.
 
     Returns:
         Supabase client instance
     """
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_KEY")
+    global _client
+
+    client = _client
+    if client is None:
+        with _client_lock:
+            if _client is None:
+                url = os.getenv("SUPABASE_URL")
+                key = os.getenv("SUPABASE_SERVICE_KEY")
+
+                if not url or not key:
+                    raise ValueError(
+                        "SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment variables"
+                    )
+
+                try:
+                    _client = _create_pooled_client(url, key)
+                    _client_stats["created_at"] = time.time()
+                    _client_stats["clients_created"] += 1
+
+                    # Extract project ID from URL for logging purposes only
+                    match = re.match(r"https://([^.]+)\.supabase\.co", url)
+                    if match:
+                        project_id = match.group(1)
+                        search_logger.debug(f"Supabase client initialized - project_id={project_id}")
+                except Exception as e:
+                    _client_stats["creation_errors"] += 1
+                    search_logger.error(f"Failed to create Supabase client: {e}")
+                    raise
+            client = _client
+
+    _client_stats["client_requests"] += 1
+    return client
+
 
-    if not url or not key:
-        raise ValueError(
-            "SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment variables"
-        )
+def _get_db_executor() -> ThreadPoolExecutor:
+    global _db_executor
+    if _db_executor is None:
+        with _client_lock:
+            if _db_executor is None:
+                # One worker per pooled connection; more would only queue inside httpx
+                _db_executor = ThreadPoolExecutor(
+                    max_workers=_get_pool_config()["max_connections"],
+                    thread_name_prefix="archon-db",
+                )
+    return _db_executor
 
+
+async def run_db_call[T](func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking database call on the database thread pool.
+
+    Args:
+        func: Synchronous function performing Supabase/PostgREST I/O
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    _client_stats["db_calls"] += 1
+    _client_stats["db_calls_in_flight"] += 1
     try:
-        # Let Supabase handle connection pooling internally
-        client = create_client(url, key)
+        return await loop.run_in_executor(_get_db_executor(), functools.partial(func, *args, **kwargs))
+    finally:
+        _client_stats["db_calls_in_flight"] -= 1
+
+
+async def execute_async(query: Any) -> Any:
+    """
+    Execute a Supabase query builder without blocking the event loop.
+
+    Example:
+        response = await execute_async(client.table("archon_sources").select("*"))
+    """
+    return await run_db_call(query.execute)
 
-        # Extract project ID from URL for logging purposes only
-        match = re.match(r"https://([^.]+)\.supabase\.co", url)
-        if match:
-            project_id = match.group(1)
-            search_logger.debug(f"Supabase client initialized - project_id={project_id}")
 
-        return client
+def close_supabase_client() -> None:
+    """Close the shared client's connections; the next get_supabase_client() creates a new one."""
+    global _client, _db_executor
+    with _client_lock:
+        client, _client = _client, None
+        executor, _db_executor = _db_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+    if client is None:
+        return
+    try:
+        client.postgrest.session.close()
+        search_logger.info("Supabase client connections closed")
     except Exception as e:
-        search_logger.error(f"Failed to create Supabase client: {e}")
-        raise
+        search_logger.warning(f"Error closing Supabase client: {e}")
+
+
+def _pool_connections(client: Client) -> list[Any] | None:
+    """Return the PostgREST session's pooled connections, or None if they can't be read."""
+    transport = getattr(client.postgrest.session, "_transport", None)
+    pool = getattr(transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return None
+    return [c for c in connections if callable(getattr(c, "is_idle", None)) and callable(getattr(c, "info", None))]
+
+
+def get_supabase_client_stats() -> dict[str, Any]:
+    """Get usage and connection-pool metrics for the shared Supabase client."""
+    pool_config = _get_pool_config()
+    stats: dict[str, Any] = {
+        **_client_stats,
+        "initialized": _client is not None,
+        "pool": pool_config,
+    }
+    if stats["created_at"]:
+        stats["uptime_seconds"] = round(time.time() - stats["created_at"], 1)
+
+    # httpx doesn't expose its connection pool, so only report counts when it is reachable
+    connections = _pool_connections(_client) if _client is not None else None
+    if connections is not None:
+        stats["open_connections"] = len(connections)
+        stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        stats["http2_connections"] = sum(1 for c in connections if "HTTP/2" in c.info())
+
+    return stats
@@ -6,9 +6,13 @@ and related orchestration operations.
 """
 
 from .code_extraction_service import CodeExtractionService
+from .conditional_recrawl import ConditionalRecrawl
+from .crawl_checkpoint_operations import CrawlCheckpoint, CrawlCheckpointOperations
 from .crawling_service import (
     CrawlingService,
+    cancel_orchestration,
     get_active_orchestration,
+    is_orchestration_active,
     register_orchestration,
     unregister_orchestration,
 )
@@ -28,6 +32,9 @@ from .strategies.sitemap import SitemapCrawlStrategy
 __all__ = [
     "CrawlingService",
     "CodeExtractionService",
+    "ConditionalRecrawl",
+    "CrawlCheckpoint",
+    "CrawlCheckpointOperations",
     "DocumentStorageOperations",
     "ProgressMapper",
     "BatchCrawlStrategy",
@@ -36,7 +43,9 @@ __all__ = [
     "SitemapCrawlStrategy",
     "URLHandler",
     "SiteConfig",
+    "cancel_orchestration",
     "get_active_orchestration",
+    "is_orchestration_active",
     "register_orchestration",
     "unregister_orchestration"
 ]
@@ -141,6 +141,7 @@ class CodeExtractionService:
         cancellation_check: Callable[[], None] | None = None,
         provider: str | None = None,
         embedding_provider: str | None = None,
+        extracted_code_blocks: list[dict[str, Any]] | None = None,
     ) -> int:
         """
         Extract code examples from crawled documents and store them.
@@ -153,6 +154,8 @@ class CodeExtractionService:
             cancellation_check: Optional function to check for cancellation
             provider: Optional LLM provider identifier for summary generation
             embedding_provider: Optional embedding provider override for vector creation
+            extracted_code_blocks: Optional code blocks already extracted from documents
+                that are not in crawl_results (see extract_code_blocks)
 
         Returns:
             Number of code examples stored
@@ -176,7 +179,8 @@ class CodeExtractionService:
             extraction_callback = extraction_progress
 
         # Extract code blocks from all documents
-        all_code_blocks = await self._extract_code_blocks_from_documents(
+        all_code_blocks = list(extracted_code_blocks or [])
+        all_code_blocks += await self._extract_code_blocks_from_documents(
             crawl_results, source_id, extraction_callback, cancellation_check
         )
 
@@ -255,6 +259,17 @@ class CodeExtractionService:
             embedding_provider,
         )
 
+    async def extract_code_blocks(
+        self, crawl_results: list[dict[str, Any]], source_id: str
+    ) -> list[dict[str, Any]]:
+        """
+        Extract code blocks from documents without summarizing or storing them.
+
+        Lets streamed crawls keep only the code blocks of each page instead of the
+        page itself; pass the collected blocks to extract_and_store_code_examples.
+        """
+        return await self._extract_code_blocks_from_documents(crawl_results, source_id)
+
     async def _extract_code_blocks_from_documents(
         self,
         crawl_results: list[dict[str, Any]],
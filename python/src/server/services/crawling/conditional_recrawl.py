@@ -0,0 +1,166 @@
+"""
+Conditional Recrawl
+
+Skips unchanged pages when a source is refreshed. Every stored page keeps the
+ETag and Last-Modified headers it was served with and a hash of its markdown.
+On refresh:
+
+1. A conditional GET (If-None-Match / If-Modified-Since) probes each known page
+   before it is rendered. A 304, or a 200 carrying the same validators, means
+   the page is skipped without starting the browser.
+2. A page that is rendered anyway but whose markdown hash matches the stored
+   one is not chunked or embedded again.
+"""
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any
+
+import httpx
+
+from ...config.logfire_config import get_logger
+from ..storage.document_storage_service import compute_content_hash
+
+logger = get_logger(__name__)
+
+# Probes are plain HTTP requests, far cheaper than a browser render
+MAX_CONCURRENT_PROBES = 16
+PROBE_TIMEOUT = 10.0
+
+# Page dict keys carried from the crawler to archon_page_metadata
+PAGE_VALIDATOR_KEYS = ("etag", "last_modified", "internal_links")
+
+
+def page_validators(headers: Mapping[str, str] | None) -> dict[str, str | None]:
+    """Extract the ETag and Last-Modified validators from response headers (case-insensitive)."""
+    lowered = {str(name).lower(): value for name, value in (headers or {}).items()}
+    return {
+        "etag": lowered.get("etag") or None,
+        "last_modified": lowered.get("last-modified") or None,
+    }
+
+
+class ConditionalRecrawl:
+    """
+    Change detection for one refresh, with counters for the refresh report.
+    """
+
+    def __init__(
+        self,
+        validators: dict[str, dict[str, Any]],
+        max_concurrent: int = MAX_CONCURRENT_PROBES,
+    ):
+        """
+        Args:
+            validators: Stored validators per page URL, as returned by
+                PageStorageOperations.get_page_validators
+            max_concurrent: Maximum probes in flight at once
+        """
+        self.validators = validators
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        self._client: httpx.AsyncClient | None = None
+
+        self.not_modified: list[str] = []
+        self.content_unchanged_urls: list[str] = []
+        self.changed = 0
+        self.new = 0
+        self.probe_errors = 0
+        # Fresh validators of pages rendered without changes, saved at the end of the refresh
+        self.refreshed_validators: dict[str, dict[str, str | None]] = {}
+
+    @property
+    def skipped(self) -> int:
+        return len(self.not_modified) + len(self.content_unchanged_urls)
+
+    async def is_not_modified(self, url: str) -> bool:
+        """Probe a known page with a conditional request; True when it has not changed."""
+        stored = self.validators.get(url)
+        if not stored or not (stored.get("etag") or stored.get("last_modified")):
+            return False
+
+        headers = {}
+        if stored.get("etag"):
+            headers["If-None-Match"] = stored["etag"]
+        if stored.get("last_modified"):
+            headers["If-Modified-Since"] = stored["last_modified"]
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=PROBE_TIMEOUT, follow_redirects=True)
+
+        try:
+            async with self._semaphore:
+                # Streamed so that servers ignoring the conditional headers never send us the body
+                async with self._client.stream("GET", url, headers=headers) as response:
+                    status = response.status_code
+                    current = page_validators(response.headers)
+        except httpx.HTTPError as e:
+            self.probe_errors += 1
+            logger.debug(f"Conditional probe failed for {url}: {e}")
+            return False
+
+        unchanged = status == 304 or (
+            status == 200
+            and (
+                (stored.get("etag") and current["etag"] == stored["etag"])
+                or (
+                    not current["etag"]
+                    and stored.get("last_modified")
+                    and current["last_modified"] == stored["last_modified"]
+                )
+            )
+        )
+        if unchanged:
+            self.not_modified.append(url)
+        return bool(unchanged)
+
+    async def filter_changed(self, urls: list[str]) -> list[str]:
+        """Probe the URLs in parallel and return those that need to be rendered."""
+        not_modified = await asyncio.gather(*(self.is_not_modified(url) for url in urls))
+        return [url for url, skip in zip(urls, not_modified, strict=True) if not skip]
+
+    async def links_if_not_modified(self, url: str) -> list[str] | None:
+        """
+        For recursive refreshes: the stored internal links of an unchanged page, or None
+        when the page must be rendered (changed, unknown, or stored without links).
+        """
+        stored = self.validators.get(url)
+        if not stored or stored.get("internal_links") is None:
+            return None
+        if not await self.is_not_modified(url):
+            return None
+        return list(stored["internal_links"])
+
+    def content_unchanged(self, page: dict[str, Any]) -> bool:
+        """True when a rendered page has the same markdown as the stored copy."""
+        url = page.get("url")
+        stored = self.validators.get(url)
+        if not stored:
+            self.new += 1
+            return False
+
+        markdown = (page.get("markdown") or "").strip()
+        if stored.get("content_hash") and compute_content_hash(markdown) == stored["content_hash"]:
+            self.content_unchanged_urls.append(url)
+            self.refreshed_validators[url] = {
+                "etag": page.get("etag"),
+                "last_modified": page.get("last_modified"),
+            }
+            return True
+
+        self.changed += 1
+        return False
+
+    def report(self) -> dict[str, int]:
+        """Per-refresh counts of skipped and changed pages."""
+        return {
+            "pages_not_modified": len(self.not_modified),
+            "pages_content_unchanged": len(self.content_unchanged_urls),
+            "pages_changed": self.changed,
+            "pages_new": self.new,
+            "probe_errors": self.probe_errors,
+        }
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
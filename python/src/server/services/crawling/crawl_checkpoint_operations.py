@@ -0,0 +1,208 @@
+"""
+Crawl Checkpoint Operations
+
+Persists the state of running crawls in archon_crawl_checkpoints so a crawl
+interrupted by a restart or crash can be resumed. A checkpoint records every
+URL the crawl has queued (with its depth) and every page whose chunks are
+already stored; resuming requeues the remaining URLs only.
+"""
+
+import time
+from datetime import datetime
+from typing import Any
+
+from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..client_manager import execute_async
+
+logger = get_logger(__name__)
+
+# Minimum seconds between checkpoint writes while a crawl is running
+DEFAULT_CHECKPOINT_INTERVAL = 15.0
+
+
+class CrawlCheckpoint:
+    """
+    In-memory state of one crawl operation, saved periodically as a checkpoint.
+
+    seen_urls is shared with the recursive crawl frontier, which records each URL
+    it queues there; stored_pages is filled as the streaming pipeline stores pages.
+    """
+
+    def __init__(
+        self,
+        progress_id: str,
+        source_id: str,
+        url: str,
+        request: dict[str, Any],
+        crawl_type: str | None = None,
+        seen_urls: dict[str, int] | None = None,
+        stored_pages: dict[str, str | None] | None = None,
+        stored_word_count: int = 0,
+        status: str = "running",
+        updated_at: str | None = None,
+    ):
+        self.progress_id = progress_id
+        self.source_id = source_id
+        self.url = url
+        self.request = request
+        self.crawl_type = crawl_type
+        self.seen_urls: dict[str, int] = dict(seen_urls or {})
+        self.stored_pages: dict[str, str | None] = dict(stored_pages or {})
+        self.stored_word_count = stored_word_count
+        self.status = status
+        self.updated_at = updated_at
+        self.resumed = bool(self.seen_urls or self.stored_pages)
+
+    def add_urls(self, urls: list[str], depth: int = 0) -> None:
+        """Record URLs queued outside the recursive frontier (sitemaps, link collections)."""
+        for url in urls:
+            self.seen_urls.setdefault(url, depth)
+
+    def pending_urls(self) -> list[tuple[str, int]]:
+        """
+        URLs that still need crawling, shallowest first.
+
+        Includes pages that were crawled but not stored before the interruption,
+        since their content was only held in memory.
+        """
+        pending = [
+            (url, depth) for url, depth in self.seen_urls.items() if url not in self.stored_pages
+        ]
+        pending.sort(key=lambda item: item[1])
+        return pending
+
+    def mark_stored(self, url_to_page_id: dict[str, str | None], word_count: int) -> None:
+        """Record pages whose page row and chunks have been stored."""
+        self.stored_pages.update(url_to_page_id)
+        self.stored_word_count += word_count
+
+    def to_row(self) -> dict[str, Any]:
+        return {
+            "progress_id": self.progress_id,
+            "source_id": self.source_id,
+            "url": self.url,
+            "crawl_type": self.crawl_type,
+            "request": self.request,
+            "seen_urls": self.seen_urls,
+            "stored_pages": self.stored_pages,
+            "stored_word_count": self.stored_word_count,
+            "status": self.status,
+            "updated_at": datetime.now().astimezone().isoformat(),
+        }
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "CrawlCheckpoint":
+        return cls(
+            progress_id=row["progress_id"],
+            source_id=row["source_id"],
+            url=row["url"],
+            request=row.get("request") or {},
+            crawl_type=row.get("crawl_type"),
+            seen_urls=row.get("seen_urls") or {},
+            stored_pages=row.get("stored_pages") or {},
+            stored_word_count=row.get("stored_word_count") or 0,
+            status=row.get("status", "running"),
+            updated_at=row.get("updated_at"),
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """Counts exposed by the API without the full URL maps."""
+        return {
+            "progress_id": self.progress_id,
+            "source_id": self.source_id,
+            "url": self.url,
+            "crawl_type": self.crawl_type,
+            "status": self.status,
+            "pages_discovered": len(self.seen_urls),
+            "pages_stored": len(self.stored_pages),
+            "pages_pending": len(self.pending_urls()),
+            "updated_at": self.updated_at,
+        }
+
+
+class CrawlCheckpointOperations:
+    """
+    Saves, loads and removes crawl checkpoints.
+    """
+
+    def __init__(self, supabase_client, interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Initialize crawl checkpoint operations.
+
+        Args:
+            supabase_client: The Supabase client for database operations
+            interval: Minimum seconds between periodic saves (see save_if_due)
+        """
+        self.supabase_client = supabase_client
+        self.interval = interval
+        self._last_saved: dict[str, float] = {}
+
+    async def save(self, checkpoint: CrawlCheckpoint) -> bool:
+        """
+        Write the checkpoint, replacing the previous one for the same crawl.
+
+        Failures are logged and swallowed: losing a checkpoint only means a
+        resumed crawl repeats more work, which must not fail the crawl itself.
+        """
+        self._last_saved[checkpoint.progress_id] = time.monotonic()
+        try:
+            await execute_async(
+                self.supabase_client.table("archon_crawl_checkpoints").upsert(
+                    checkpoint.to_row(), on_conflict="progress_id"
+                )
+            )
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to save crawl checkpoint (is migration 016_add_crawl_checkpoints applied?) "
+                f"| progress_id={checkpoint.progress_id} | error={str(e)}"
+            )
+            return False
+        return True
+
+    async def save_if_due(self, checkpoint: CrawlCheckpoint) -> bool:
+        """Save the checkpoint unless it was saved less than `interval` seconds ago."""
+        last_saved = self._last_saved.get(checkpoint.progress_id)
+        if last_saved is not None and time.monotonic() - last_saved < self.interval:
+            return False
+        return await self.save(checkpoint)
+
+    async def load(self, progress_id: str) -> CrawlCheckpoint | None:
+        """Load the checkpoint of a crawl, or None if there is none."""
+        result = await execute_async(
+            self.supabase_client.table("archon_crawl_checkpoints")
+            .select("*")
+            .eq("progress_id", progress_id)
+            .limit(1)
+        )
+        if not result.data:
+            return None
+        return CrawlCheckpoint.from_row(result.data[0])
+
+    async def list_checkpoints(self) -> list[CrawlCheckpoint]:
+        """List checkpoints of unfinished crawls, most recently updated first."""
+        result = await execute_async(
+            self.supabase_client.table("archon_crawl_checkpoints")
+            .select("*")
+            .order("updated_at", desc=True)
+        )
+        return [CrawlCheckpoint.from_row(row) for row in result.data or []]
+
+    async def set_status(self, checkpoint: CrawlCheckpoint, status: str) -> None:
+        """Record why a crawl stopped (failed, cancelled) together with its final state."""
+        checkpoint.status = status
+        await self.save(checkpoint)
+
+    async def delete(self, progress_id: str) -> None:
+        """Remove the checkpoint of a crawl that completed."""
+        self._last_saved.pop(progress_id, None)
+        try:
+            await execute_async(
+                self.supabase_client.table("archon_crawl_checkpoints")
+                .delete()
+                .eq("progress_id", progress_id)
+            )
+            safe_logfire_info(f"Removed crawl checkpoint | progress_id={progress_id}")
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to remove crawl checkpoint | progress_id={progress_id} | error={str(e)}"
+            )
@@ -14,27 +14,35 @@ from typing import Any, Optional
 from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
 from ...utils import get_supabase_client
 from ...utils.progress.progress_tracker import ProgressTracker
+from ...utils.progress.state_store import StateStore, get_state_store
 from ..credential_service import credential_service
 
 # Import strategies
 # Import operations
+from .conditional_recrawl import ConditionalRecrawl
+from .crawl_checkpoint_operations import CrawlCheckpoint, CrawlCheckpointOperations
 from .document_storage_operations import DocumentStorageOperations
 from .page_storage_operations import PageStorageOperations
+from .sitemap_entry_operations import SitemapEntryOperations
 from .helpers.site_config import SiteConfig
 
 # Import helpers
 from .helpers.url_handler import URLHandler
 from .progress_mapper import ProgressMapper
+from .streaming_pipeline import StreamingDocumentPipeline
 from .strategies.batch import BatchCrawlStrategy
 from .strategies.recursive import RecursiveCrawlStrategy
 from .strategies.single_page import SinglePageCrawlStrategy
-from .strategies.sitemap import SitemapCrawlStrategy
+from .strategies.sitemap import SitemapCrawlStrategy, SitemapEntry, filter_changed_entries
 
 logger = get_logger(__name__)
 
-# Global registry to track active orchestration services for cancellation support
+# Global registry to track active orchestration services for cancellation support.
+# It holds the crawls of this worker; the state store knows the crawls of all workers.
 _active_orchestrations: dict[str, "CrawlingService"] = {}
 _orchestration_lock: asyncio.Lock | None = None
+# Store whose cancellation requests reach this worker's crawls
+_cancellation_store: StateStore | None = None
 
 
 def _ensure_orchestration_lock() -> asyncio.Lock:
@@ -51,18 +59,66 @@ async def get_active_orchestration(progress_id: str) -> Optional["CrawlingServic
         return _active_orchestrations.get(progress_id)
 
 
+def _cancel_requested(progress_id: str) -> None:
+    """Cancel a crawl of this worker when a stop was requested on any worker."""
+    orchestration = _active_orchestrations.get(progress_id)
+    if orchestration:
+        orchestration.cancel()
+
+
+def _get_orchestration_store() -> StateStore:
+    global _cancellation_store
+    store = get_state_store()
+    if store is not _cancellation_store:
+        store.watch_cancellations(_cancel_requested)
+        _cancellation_store = store
+    return store
+
+
 async def register_orchestration(progress_id: str, orchestration: "CrawlingService"):
     """Register an active orchestration service."""
     lock = _ensure_orchestration_lock()
     async with lock:
         _active_orchestrations[progress_id] = orchestration
+        await _get_orchestration_store().register_operation_async(progress_id)
 
 
 async def unregister_orchestration(progress_id: str):
     """Unregister an orchestration service."""
     lock = _ensure_orchestration_lock()
     async with lock:
-        _active_orchestrations.pop(progress_id, None)
+        if _active_orchestrations.pop(progress_id, None) is not None:
+            await _get_orchestration_store().unregister_operation_async(progress_id)
+
+
+async def is_orchestration_active(progress_id: str) -> bool:
+    """Whether a crawl with this progress ID is running on this or another worker."""
+    lock = _ensure_orchestration_lock()
+    async with lock:
+        if progress_id in _active_orchestrations:
+            return True
+        return await _get_orchestration_store().is_operation_active_async(progress_id)
+
+
+async def cancel_orchestration(progress_id: str) -> bool:
+    """
+    Cancel a running crawl, whichever worker runs it.
+
+    Returns:
+        True if the crawl was running; a crawl on another worker stops at its
+        next cancellation check after that worker picks up the request
+    """
+    lock = _ensure_orchestration_lock()
+    async with lock:
+        orchestration = _active_orchestrations.get(progress_id)
+        if orchestration:
+            orchestration.cancel()
+            return True
+        store = _get_orchestration_store()
+        if await store.is_operation_active_async(progress_id):
+            await store.request_cancel_async(progress_id)
+            return True
+        return False
 
 
 class CrawlingService:
@@ -100,6 +156,8 @@ class CrawlingService:
         # Initialize operations
         self.doc_storage_ops = DocumentStorageOperations(self.supabase_client)
         self.page_storage_ops = PageStorageOperations(self.supabase_client)
+        self.sitemap_entry_ops = SitemapEntryOperations(self.supabase_client)
+        self.checkpoint_ops = CrawlCheckpointOperations(self.supabase_client)
 
         # Track progress state across all stages to prevent UI resets
         self.progress_state = {"progressId": self.progress_id} if self.progress_id else {}
@@ -107,6 +165,12 @@ class CrawlingService:
         self.progress_mapper = ProgressMapper()
         # Cancellation support
         self._cancelled = False
+        # Sitemap entries selected for this crawl, recorded once their pages are stored
+        self._sitemap_refresh: dict[str, Any] | None = None
+        # Durable crawl state; set before orchestration when resuming a crawl
+        self._checkpoint: CrawlCheckpoint | None = None
+        # Change detection against stored page validators, for refreshes
+        self._recrawl: ConditionalRecrawl | None = None
 
     def set_progress_id(self, progress_id: str):
         """Set the progress ID for HTTP polling updates."""
@@ -205,9 +269,50 @@ class CrawlingService:
             progress_callback,
         )
 
-    def parse_sitemap(self, sitemap_url: str) -> list[str]:
+    async def parse_sitemap(self, sitemap_url: str) -> list[str]:
         """Parse a sitemap and extract URLs."""
-        return self.sitemap_strategy.parse_sitemap(sitemap_url, self._check_cancellation)
+        return await self.sitemap_strategy.parse_sitemap(sitemap_url, self._check_cancellation)
+
+    async def read_sitemap(self, sitemap_url: str) -> list[SitemapEntry]:
+        """Read a sitemap (following sitemap indexes) and return its entries with lastmod."""
+        return await self.sitemap_strategy.read_sitemap(sitemap_url, self._check_cancellation)
+
+    async def _select_sitemap_entries(
+        self, sitemap_url: str, entries: list[SitemapEntry]
+    ) -> list[SitemapEntry]:
+        """
+        Keep only the sitemap entries that are new or changed since the source was last crawled.
+
+        The selection is remembered so _record_sitemap_entries can store the new
+        lastmod values once the pages have been stored.
+        """
+        source_id = self.url_handler.generate_unique_source_id(sitemap_url)
+        previous = await self.sitemap_entry_ops.get_lastmods(source_id)
+        selected = filter_changed_entries(entries, previous) if previous else entries
+
+        self._sitemap_refresh = {
+            "source_id": source_id,
+            "entries": selected,
+            "total": len(entries),
+            "unchanged": len(entries) - len(selected),
+            "crawled_urls": set(),
+        }
+        if previous:
+            safe_logfire_info(
+                f"Incremental sitemap refresh | source_id={source_id} | total={len(entries)} | "
+                f"changed={len(selected)} | unchanged={len(entries) - len(selected)}"
+            )
+        return selected
+
+    async def _record_sitemap_entries(self) -> None:
+        """Store lastmod for the sitemap pages crawled in this run."""
+        if not self._sitemap_refresh or not self._sitemap_refresh["entries"]:
+            return
+        await self.sitemap_entry_ops.record_crawled(
+            self._sitemap_refresh["source_id"],
+            self._sitemap_refresh["entries"],
+            self._sitemap_refresh["crawled_urls"],
+        )
 
     async def crawl_batch_with_progress(
         self,
@@ -215,6 +320,7 @@ class CrawlingService:
         max_concurrent: int | None = None,
         progress_callback: Callable[[str, int, str], Awaitable[None]] | None = None,
         link_text_fallbacks: dict[str, str] | None = None,
+        result_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """Batch crawl multiple URLs in parallel."""
         return await self.batch_strategy.crawl_batch_with_progress(
@@ -225,6 +331,7 @@ class CrawlingService:
             progress_callback,
             self._check_cancellation,  # Pass cancellation check
             link_text_fallbacks,  # Pass link text fallbacks
+            result_callback,
         )
 
     async def crawl_recursive_with_progress(
@@ -233,8 +340,10 @@ class CrawlingService:
         max_depth: int = 3,
         max_concurrent: int | None = None,
         progress_callback: Callable[[str, int, str], Awaitable[None]] | None = None,
+        result_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """Recursively crawl internal links from start URLs."""
+        checkpoint = self._checkpoint
         return await self.recursive_strategy.crawl_recursive_with_progress(
             start_urls,
             self.url_handler.transform_github_url,
@@ -243,6 +352,10 @@ class CrawlingService:
             max_concurrent,
             progress_callback,
             self._check_cancellation,  # Pass cancellation check
+            result_callback,
+            seen_urls=checkpoint.seen_urls if checkpoint else None,
+            resume_urls=checkpoint.pending_urls() if checkpoint and checkpoint.resumed else None,
+            unchanged_page_links=self._recrawl.links_if_not_modified if self._recrawl else None,
         )
 
     # Orchestration methods
@@ -283,12 +396,30 @@ class CrawlingService:
             "task": crawl_task,  # Return the actual task for proper cancellation
         }
 
+    async def resume_crawl(self, checkpoint: CrawlCheckpoint) -> dict[str, Any]:
+        """
+        Resume an interrupted crawl from its checkpoint.
+
+        Only URLs that were queued but not stored are crawled; pages stored
+        before the interruption are neither recrawled nor re-embedded.
+
+        Args:
+            checkpoint: The checkpoint saved by the interrupted crawl
+
+        Returns:
+            Same as orchestrate_crawl
+        """
+        self._checkpoint = checkpoint
+        checkpoint.status = "running"
+        return await self.orchestrate_crawl(checkpoint.request)
+
     async def _async_orchestrate_crawl(self, request: dict[str, Any], task_id: str):
         """
         Async orchestration that runs in the main event loop.
         """
         last_heartbeat = asyncio.get_event_loop().time()
         heartbeat_interval = 30.0  # Send heartbeat every 30 seconds
+        pipeline: StreamingDocumentPipeline | None = None
 
         async def send_heartbeat_if_needed():
             """Send heartbeat to keep connection alive"""
@@ -358,8 +489,25 @@ class CrawlingService:
                 processed_pages=0
             )
 
+            # Pages stream into chunking/embedding/storage while the crawl is still running
+            pipeline = await self._create_streaming_pipeline(
+                request, original_source_id, url, source_display_name
+            )
+            # Checkpoints need pages stored as they are crawled, i.e. the streaming pipeline
+            if pipeline and self.progress_id:
+                await self._start_checkpoint(pipeline, request, url, original_source_id)
+            resumed_pages = bool(self._checkpoint and self._checkpoint.resumed and self._checkpoint.stored_pages)
+            previously_stored = len(self._checkpoint.stored_pages) if resumed_pages else 0
+            # On refresh, pages unchanged since the last crawl are neither rendered nor re-embedded
+            if request.get("conditional_recrawl"):
+                await self._start_conditional_recrawl(original_source_id)
+
             # Detect URL type and perform crawl
-            crawl_results, crawl_type = await self._crawl_by_url_type(url, request)
+            crawl_results, crawl_type = await self._crawl_by_url_type(url, request, pipeline)
+            if self._recrawl and crawl_results:
+                crawl_results = [page for page in crawl_results if not self._recrawl.content_unchanged(page)]
+            if self._checkpoint:
+                self._checkpoint.crawl_type = crawl_type
 
             # Update progress tracker with crawl type
             if self.progress_tracker and crawl_type:
@@ -378,7 +526,32 @@ class CrawlingService:
             # Send heartbeat after potentially long crawl operation
             await send_heartbeat_if_needed()
 
-            if not crawl_results:
+            streamed = pipeline is not None and pipeline.pages_received > 0
+            unchanged = self._unchanged_page_count()
+            if not crawl_results and not streamed and not resumed_pages and unchanged:
+                if pipeline:
+                    await pipeline.finish()
+                await self._finish_checkpoint()
+                await self._finish_conditional_recrawl()
+                message = f"No changes since last crawl: {unchanged} pages up to date"
+                await update_mapped_progress(
+                    "completed", 100, message, processed_pages=0, total_pages=unchanged
+                )
+                if self.progress_tracker:
+                    await self.progress_tracker.complete({
+                        "chunks_stored": 0,
+                        "code_examples_found": 0,
+                        "processed_pages": 0,
+                        "total_pages": unchanged,
+                        "sourceId": original_source_id,
+                        "log": message,
+                        **self._refresh_report(),
+                    })
+                if self.progress_id:
+                    await unregister_orchestration(self.progress_id)
+                return
+
+            if not crawl_results and not streamed and not resumed_pages:
                 raise ValueError("No content was crawled from the provided URL")
 
             # Processing stage
@@ -388,7 +561,8 @@ class CrawlingService:
             self._check_cancellation()
 
             # Calculate total work units for accurate progress tracking
-            total_pages = len(crawl_results)
+            total_pages = pipeline.pages_received if streamed else len(crawl_results)
+            total_pages += previously_stored
 
             # Process and store documents using document storage operations
             last_logged_progress = 0
@@ -426,17 +600,39 @@ class CrawlingService:
                         **kwargs
                     )
 
-            storage_results = await self.doc_storage_ops.process_and_store_documents(
-                crawl_results,
-                request,
-                crawl_type,
-                original_source_id,
-                doc_storage_callback,
-                self._check_cancellation,
-                source_url=url,
-                source_display_name=source_display_name,
-                url_to_page_id=None,  # Will be populated after page storage
-            )
+            streamed_code_blocks = None
+            if streamed or resumed_pages:
+                # Crawl is done; report the remaining storage work as the document_storage stage
+                pipeline.progress_callback = doc_storage_callback
+                await doc_storage_callback(
+                    "document_storage",
+                    int(pipeline.chunks_stored / max(pipeline.chunk_count, 1) * 100),
+                    f"Storing remaining chunks ({pipeline.chunks_stored} stored so far)",
+                )
+                storage_results = await pipeline.finish()
+                # Streamed pages are not kept; their code blocks were extracted as they passed
+                crawl_results = []
+                streamed_code_blocks = pipeline.code_blocks
+                if resumed_pages:
+                    await self._load_resumed_pages(
+                        request, crawl_results, storage_results, pipeline.processed_urls
+                    )
+                elif storage_results["chunk_count"] == 0:
+                    raise ValueError("No content was crawled from the provided URL")
+            else:
+                if pipeline:
+                    await pipeline.finish()
+                storage_results = await self.doc_storage_ops.process_and_store_documents(
+                    crawl_results,
+                    request,
+                    crawl_type,
+                    original_source_id,
+                    doc_storage_callback,
+                    self._check_cancellation,
+                    source_url=url,
+                    source_display_name=source_display_name,
+                    url_to_page_id=None,  # Will be populated after page storage
+                )
 
             # Update progress tracker with source_id now that it's created
             if self.progress_tracker and storage_results.get("source_id"):
@@ -471,7 +667,7 @@ class CrawlingService:
 
             # Extract code examples if requested
             code_examples_count = 0
-            if request.get("extract_code_examples", True) and actual_chunks_stored > 0:
+            if request.get("extract_code_examples", True) and (actual_chunks_stored > 0 or resumed_pages):
                 # Check for cancellation before starting code extraction
                 self._check_cancellation()
 
@@ -525,6 +721,7 @@ class CrawlingService:
                         self._check_cancellation,
                         provider,
                         embedding_provider,
+                        extracted_code_blocks=streamed_code_blocks,
                     )
                 except RuntimeError as e:
                     # Code extraction failed, continue crawl with warning
@@ -547,6 +744,11 @@ class CrawlingService:
                 # Send heartbeat after code extraction
                 await send_heartbeat_if_needed()
 
+            # Remember sitemap lastmods only now that the pages are stored
+            await self._record_sitemap_entries()
+            # The crawl is complete; there is nothing left to resume
+            await self._finish_checkpoint()
+
             # Finalization
             await update_mapped_progress(
                 "finalization",
@@ -556,15 +758,20 @@ class CrawlingService:
                 code_examples_found=code_examples_count,
             )
 
+            await self._finish_conditional_recrawl()
+            completion_message = f"Crawl completed: {actual_chunks_stored} chunks, {code_examples_count} code examples"
+            if self._recrawl:
+                completion_message += f" ({self._recrawl.skipped} unchanged pages skipped)"
+
             # Complete - send both the progress update and completion event
             await update_mapped_progress(
                 "completed",
                 100,
-                f"Crawl completed: {actual_chunks_stored} chunks, {code_examples_count} code examples",
+                completion_message,
                 chunks_stored=actual_chunks_stored,
                 code_examples_found=code_examples_count,
-                processed_pages=len(crawl_results),
-                total_pages=len(crawl_results),
+                processed_pages=total_pages,
+                total_pages=total_pages,
             )
 
             # Mark crawl as completed
@@ -572,10 +779,11 @@ class CrawlingService:
                 await self.progress_tracker.complete({
                     "chunks_stored": actual_chunks_stored,
                     "code_examples_found": code_examples_count,
-                    "processed_pages": len(crawl_results),
-                    "total_pages": len(crawl_results),
+                    "processed_pages": total_pages,
+                    "total_pages": total_pages,
                     "sourceId": storage_results.get("source_id", ""),
                     "log": "Crawl completed successfully!",
+                    **self._refresh_report(),
                 })
 
             # Unregister after successful completion
@@ -587,6 +795,10 @@ class CrawlingService:
 
         except asyncio.CancelledError:
             safe_logfire_info(f"Crawl operation cancelled | progress_id={self.progress_id}")
+            if pipeline:
+                await pipeline.abort()
+            if self._checkpoint:
+                await self.checkpoint_ops.set_status(self._checkpoint, "cancelled")
             # Use ProgressMapper to get proper progress value for cancelled state
             cancelled_progress = self.progress_mapper.map_progress("cancelled", 0)
             await self._handle_progress_update(
@@ -607,6 +819,10 @@ class CrawlingService:
             # Log full stack trace for debugging
             logger.error("Async crawl orchestration failed", exc_info=True)
             safe_logfire_error(f"Async crawl orchestration failed | error={str(e)}")
+            if pipeline:
+                await pipeline.abort()
+            if self._checkpoint:
+                await self.checkpoint_ops.set_status(self._checkpoint, "failed")
             error_message = f"Crawl failed: {str(e)}"
             # Use ProgressMapper to get proper progress value for error state
             error_progress = self.progress_mapper.map_progress("error", 0)
@@ -627,6 +843,120 @@ class CrawlingService:
                 safe_logfire_info(
                     f"Unregistered orchestration service on error | progress_id={self.progress_id}"
                 )
+        finally:
+            if self._recrawl:
+                await self._recrawl.close()
+
+    async def _start_checkpoint(
+        self,
+        pipeline: StreamingDocumentPipeline,
+        request: dict[str, Any],
+        url: str,
+        source_id: str,
+    ) -> None:
+        """Create (or continue) the checkpoint of this crawl and save it as stored pages accumulate."""
+        if self._checkpoint is None:
+            self._checkpoint = CrawlCheckpoint(self.progress_id, source_id, url, request)
+        elif self._checkpoint.stored_pages:
+            pipeline.resume_from(self._checkpoint.stored_word_count)
+            safe_logfire_info(
+                f"Resuming crawl from checkpoint | progress_id={self.progress_id} | "
+                f"stored={len(self._checkpoint.stored_pages)} | pending={len(self._checkpoint.pending_urls())}"
+            )
+
+        async def record_stored_batch(url_to_page_id: dict[str, str | None], word_count: int) -> None:
+            self._checkpoint.mark_stored(url_to_page_id, word_count)
+            await self.checkpoint_ops.save_if_due(self._checkpoint)
+
+        pipeline.on_batch_stored = record_stored_batch
+        await self.checkpoint_ops.save(self._checkpoint)
+
+    async def _finish_checkpoint(self) -> None:
+        """Drop the checkpoint of a crawl that completed."""
+        if self._checkpoint:
+            await self.checkpoint_ops.delete(self._checkpoint.progress_id)
+
+    async def _load_resumed_pages(
+        self,
+        request: dict[str, Any],
+        crawl_results: list[dict[str, Any]],
+        storage_results: dict[str, Any],
+        crawled_urls: set[str],
+    ) -> None:
+        """
+        Add pages stored before a crawl was interrupted to the results used for code extraction.
+
+        They are loaded from archon_page_metadata, so only their markdown is available.
+        Pages in crawled_urls were crawled again by this run and are skipped.
+        """
+        if not request.get("extract_code_examples", True):
+            return
+        urls = [url for url in self._checkpoint.stored_pages if url not in crawled_urls]
+        for page in await self.page_storage_ops.get_pages_by_url(urls):
+            crawl_results.append(page)
+            storage_results["url_to_full_document"][page["url"]] = page["markdown"]
+
+    def _unstored_urls(self, urls: list[str]) -> list[str]:
+        """Record URLs in the checkpoint and return those not stored by an earlier run."""
+        if not self._checkpoint:
+            return urls
+        self._checkpoint.add_urls(urls)
+        return [url for url in urls if url not in self._checkpoint.stored_pages]
+
+    async def _start_conditional_recrawl(self, source_id: str) -> None:
+        """Load the validators of the source's stored pages so unchanged pages can be skipped."""
+        validators = await self.page_storage_ops.get_page_validators(source_id)
+        if validators:
+            self._recrawl = ConditionalRecrawl(validators)
+            safe_logfire_info(
+                f"Conditional recrawl enabled | source_id={source_id} | known_pages={len(validators)}"
+            )
+
+    async def _finish_conditional_recrawl(self) -> None:
+        """Save the fresh validators of pages that were rendered but had not changed."""
+        if self._recrawl and self._recrawl.refreshed_validators:
+            await self.page_storage_ops.update_page_validators(self._recrawl.refreshed_validators)
+        if self._recrawl:
+            safe_logfire_info(f"Refresh report | progress_id={self.progress_id} | {self._recrawl.report()}")
+
+    def _refresh_report(self) -> dict[str, Any]:
+        """Skipped/changed page counts for the completion event of a refresh."""
+        return {"refresh_report": self._recrawl.report()} if self._recrawl else {}
+
+    async def _probe_unmodified(self, urls: list[str]) -> list[str]:
+        """Drop URLs whose pages answer a conditional request as not modified."""
+        if not self._recrawl or not urls:
+            return urls
+        changed = await self._recrawl.filter_changed(urls)
+        if len(changed) < len(urls):
+            logger.info(f"Skipping {len(urls) - len(changed)} of {len(urls)} URLs not modified since last crawl")
+        return changed
+
+    def _page_sink(
+        self, pipeline: StreamingDocumentPipeline | None
+    ) -> Callable[[dict[str, Any]], Awaitable[None]] | None:
+        """Result callback streaming crawled pages to the pipeline, minus pages whose content is unchanged."""
+        if not pipeline:
+            return None
+        recrawl = self._recrawl
+        if not recrawl:
+            return pipeline.put
+
+        async def put_changed_page(page: dict[str, Any]) -> None:
+            if not recrawl.content_unchanged(page):
+                await pipeline.put(page)
+
+        return put_changed_page
+
+    def _unchanged_page_count(self) -> int:
+        """Pages a refresh found unchanged, via sitemap lastmod or page validators."""
+        sitemap_unchanged = self._sitemap_refresh["unchanged"] if self._sitemap_refresh else 0
+        skipped = self._recrawl.skipped if self._recrawl else 0
+        if skipped:
+            return skipped + sitemap_unchanged
+        if self._sitemap_refresh and not self._sitemap_refresh["entries"]:
+            return sitemap_unchanged
+        return 0
 
     def _is_self_link(self, link: str, base_url: str) -> bool:
         """
@@ -662,10 +992,71 @@ class CrawlingService:
             # Fallback to simple string comparison
             return link.rstrip('/') == base_url.rstrip('/')
 
-    async def _crawl_by_url_type(self, url: str, request: dict[str, Any]) -> tuple:
+    async def _create_streaming_pipeline(
+        self,
+        request: dict[str, Any],
+        source_id: str,
+        source_url: str,
+        source_display_name: str,
+    ) -> StreamingDocumentPipeline | None:
+        """
+        Create the streaming storage pipeline unless disabled via CRAWL_STREAMING_STORAGE.
+
+        Returns:
+            StreamingDocumentPipeline, or None to store documents after the crawl finishes
+        """
+        try:
+            settings = await credential_service.get_credentials_by_category("rag_strategy")
+        except Exception as e:
+            logger.warning(f"Failed to load streaming settings, using defaults: {e}")
+            settings = {}
+
+        if str(settings.get("CRAWL_STREAMING_STORAGE", "true")).lower() != "true":
+            return None
+
+        try:
+            page_queue_size = int(settings.get("CRAWL_STREAM_QUEUE_SIZE", "20"))
+            flush_chunk_count = int(settings.get("CRAWL_STREAM_FLUSH_CHUNKS", "100"))
+            self.checkpoint_ops.interval = float(
+                settings.get("CRAWL_CHECKPOINT_INTERVAL", self.checkpoint_ops.interval)
+            )
+        except (ValueError, TypeError):
+            logger.warning("Invalid streaming storage settings, using defaults")
+            page_queue_size, flush_chunk_count = 20, 100
+
+        return StreamingDocumentPipeline(
+            self.doc_storage_ops,
+            request,
+            crawl_type="normal",  # Set by _crawl_by_url_type before pages are streamed
+            source_id=source_id,
+            progress_callback=self._report_streamed_storage,
+            cancellation_check=self._check_cancellation,
+            source_url=source_url,
+            source_display_name=source_display_name,
+            page_queue_size=page_queue_size,
+            flush_chunk_count=flush_chunk_count,
+            extract_code=request.get("extract_code_examples", True),
+        )
+
+    async def _report_streamed_storage(self, status: str, progress: int, message: str, **kwargs):
+        """Surface storage counters while the crawl stage is still running."""
+        if self.progress_tracker:
+            await self.progress_tracker.update(
+                status=self.progress_tracker.state.get("status", "crawling"),
+                progress=self.progress_tracker.state.get("progress", 0),
+                log=self.progress_tracker.state.get("log", message),
+                **kwargs
+            )
+
+    async def _crawl_by_url_type(
+        self, url: str, request: dict[str, Any], pipeline: StreamingDocumentPipeline | None = None
+    ) -> tuple:
         """
         Detect URL type and perform appropriate crawling.
 
+        When a streaming pipeline is given, multi-page crawls hand each page to it as
+        soon as it is crawled instead of returning them.
+
         Returns:
             Tuple of (crawl_results, crawl_type)
         """
@@ -726,6 +1117,18 @@ class CrawlingService:
                         # Build mapping of URL -> link text for title fallback
                         url_to_link_text = {link: text for link, text in extracted_links_with_text}
                         extracted_links = [link for link, _ in extracted_links_with_text]
+                        # When resuming, links stored by the interrupted run are skipped
+                        collection_pending = self._unstored_urls([url])
+                        extracted_links = self._unstored_urls(extracted_links)
+                        extracted_links = await self._probe_unmodified(extracted_links)
+
+                        crawl_type = "link_collection_with_crawled_links"
+                        if pipeline:
+                            # Stream the collection file itself alongside its linked pages
+                            pipeline.crawl_type = crawl_type
+                            collection_page = crawl_results.pop(0)
+                            if collection_pending:
+                                await self._page_sink(pipeline)(collection_page)
 
                         # Crawl the extracted links using batch crawling
                         logger.info(f"Crawling {len(extracted_links)} extracted links from {url}")
@@ -734,13 +1137,14 @@ class CrawlingService:
                             max_concurrent=request.get('max_concurrent'),  # None -> use DB settings
                             progress_callback=await self._create_crawl_progress_callback("crawling"),
                             link_text_fallbacks=url_to_link_text,  # Pass link text for title fallback
+                            result_callback=self._page_sink(pipeline),
                         )
 
                         # Combine original text file results with batch results
                         crawl_results.extend(batch_results)
-                        crawl_type = "link_collection_with_crawled_links"
 
-                        logger.info(f"Link collection crawling completed: {len(crawl_results)} total results (1 text file + {len(batch_results)} extracted links)")
+                        total_results = pipeline.pages_received if pipeline else len(crawl_results)
+                        logger.info(f"Link collection crawling completed: {total_results} total results (1 text file + {total_results - 1} extracted links)")
                     else:
                         logger.info(f"No valid links found in link collection file: {url}")
                         logger.info(f"Text file crawling completed: {len(crawl_results)} results")
@@ -753,20 +1157,44 @@ class CrawlingService:
                 "Detected sitemap, parsing URLs...",
                 crawl_type=crawl_type
             )
-            sitemap_urls = self.parse_sitemap(url)
+            sitemap_entries = await self.read_sitemap(url)
+            # On refresh, only pages new or changed since the last crawl are fetched
+            sitemap_entries = await self._select_sitemap_entries(url, sitemap_entries)
+            # When resuming, pages stored by the interrupted run are not crawled again
+            sitemap_urls = self._unstored_urls([entry.url for entry in sitemap_entries])
+            if self._checkpoint:
+                self._sitemap_refresh["crawled_urls"].update(self._checkpoint.stored_pages)
+            if self._recrawl:
+                changed_urls = await self._probe_unmodified(sitemap_urls)
+                # Pages confirmed unchanged count as crawled for their sitemap lastmod
+                self._sitemap_refresh["crawled_urls"].update(set(sitemap_urls) - set(changed_urls))
+                sitemap_urls = changed_urls
 
             if sitemap_urls:
                 # Update progress before starting batch crawl
+                unchanged = self._sitemap_refresh["unchanged"]
                 await update_crawl_progress(
                     75,  # 75% of crawling stage
-                    f"Starting batch crawl of {len(sitemap_urls)} URLs...",
+                    f"Starting batch crawl of {len(sitemap_urls)} URLs..."
+                    + (f" ({unchanged} unchanged URLs skipped)" if unchanged else ""),
                     crawl_type=crawl_type
                 )
 
+                crawled_urls = self._sitemap_refresh["crawled_urls"]
+                put_page = self._page_sink(pipeline)
+
+                async def track_sitemap_page(page: dict[str, Any]) -> None:
+                    crawled_urls.add(page.get("url"))
+                    await put_page(page)
+
+                if pipeline:
+                    pipeline.crawl_type = crawl_type
                 crawl_results = await self.crawl_batch_with_progress(
                     sitemap_urls,
                     progress_callback=await self._create_crawl_progress_callback("crawling"),
+                    result_callback=track_sitemap_page if pipeline else None,
                 )
+                crawled_urls.update(result.get("url") for result in crawl_results)
 
         else:
             # Handle regular webpages with recursive crawling
@@ -781,11 +1209,14 @@ class CrawlingService:
             # Let the strategy handle concurrency from settings
             # This will use CRAWL_MAX_CONCURRENT from database (default: 10)
 
+            if pipeline:
+                pipeline.crawl_type = crawl_type
             crawl_results = await self.crawl_recursive_with_progress(
                 [url],
                 max_depth=max_depth,
                 max_concurrent=None,  # Let strategy use settings
                 progress_callback=await self._create_crawl_progress_callback("crawling"),
+                result_callback=self._page_sink(pipeline),
             )
 
         return crawl_results, crawl_type
@@ -130,20 +130,8 @@ class DocumentStorageOperations:
                 all_contents.append(chunk)
 
                 # Create metadata for each chunk (page_id will be set later)
-                word_count = len(chunk.split())
-                metadata = {
-                    "url": doc_url,
-                    "title": doc.get("title", ""),
-                    "description": doc.get("description", ""),
-                    "source_id": source_id,
-                    "knowledge_type": request.get("knowledge_type", "documentation"),
-                    "page_id": None,  # Will be set after pages are stored
-                    "crawl_type": crawl_type,
-                    "word_count": word_count,
-                    "char_count": len(chunk),
-                    "chunk_index": i,
-                    "tags": request.get("tags", []),
-                }
+                metadata = self.build_chunk_metadata(doc, doc_url, chunk, i, source_id, request, crawl_type)
+                word_count = metadata["word_count"]
                 all_metadatas.append(metadata)
 
                 # Accumulate word count
@@ -288,6 +276,35 @@ class DocumentStorageOperations:
             'source_id': original_source_id
         }
 
+    @staticmethod
+    def build_chunk_metadata(
+        doc: dict[str, Any],
+        doc_url: str,
+        chunk: str,
+        chunk_index: int,
+        source_id: str,
+        request: dict[str, Any],
+        crawl_type: str,
+    ) -> dict[str, Any]:
+        """
+        Build the metadata stored alongside a chunk of a crawled page.
+
+        page_id is left unset; it is filled in once the page itself has been stored.
+        """
+        return {
+            "url": doc_url,
+            "title": doc.get("title", ""),
+            "description": doc.get("description", ""),
+            "source_id": source_id,
+            "knowledge_type": request.get("knowledge_type", "documentation"),
+            "page_id": None,
+            "crawl_type": crawl_type,
+            "word_count": len(chunk.split()),
+            "char_count": len(chunk),
+            "chunk_index": chunk_index,
+            "tags": request.get("tags", []),
+        }
+
     async def _create_source_records(
         self,
         all_metadatas: list[dict],
@@ -444,6 +461,7 @@ class DocumentStorageOperations:
         cancellation_check: Callable[[], None] | None = None,
         provider: str | None = None,
         embedding_provider: str | None = None,
+        extracted_code_blocks: list[dict[str, Any]] | None = None,
     ) -> int:
         """
         Extract code examples from crawled documents and store them.
@@ -456,6 +474,7 @@ class DocumentStorageOperations:
             cancellation_check: Optional function to check for cancellation
             provider: Optional LLM provider to use for code summaries
             embedding_provider: Optional embedding provider override for code example embeddings
+            extracted_code_blocks: Optional code blocks already extracted from streamed pages
 
         Returns:
             Number of code examples stored
@@ -468,6 +487,20 @@ class DocumentStorageOperations:
             cancellation_check,
             provider,
             embedding_provider,
+            extracted_code_blocks=extracted_code_blocks,
         )
 
         return result
+
+    async def extract_code_blocks(self, crawl_results: list[dict], source_id: str) -> list[dict[str, Any]]:
+        """
+        Extract code blocks from crawled documents without summarizing or storing them.
+
+        Args:
+            crawl_results: List of crawled documents
+            source_id: The unique source_id for all documents
+
+        Returns:
+            List of code blocks with metadata
+        """
+        return await self.code_extraction_service.extract_code_blocks(crawl_results, source_id)
@@ -10,10 +10,19 @@ from typing import Any
 from postgrest.exceptions import APIError
 
 from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..client_manager import execute_async
+from ..search.page_metadata_cache import clear_page_metadata_cache
+from ..storage.document_storage_service import compute_content_hash
 from .helpers.llms_full_parser import parse_llms_full_sections
 
 logger = get_logger(__name__)
 
+# Change-detection columns added by migration 017_add_page_validators
+PAGE_VALIDATOR_COLUMNS = ("etag", "last_modified", "content_hash", "internal_links")
+
+# Rows per request when reading validators of large sources
+PAGE_VALIDATOR_PAGE_SIZE = 1000
+
 
 class PageStorageOperations:
     """
@@ -85,6 +94,11 @@ class PageStorageOperations:
                     "page_type": "documentation",
                     "tags": request.get("tags", []),
                 },
+                # Validators checked by conditional recrawls on refresh
+                "etag": doc.get("etag"),
+                "last_modified": doc.get("last_modified"),
+                "content_hash": compute_content_hash(markdown),
+                "internal_links": doc.get("internal_links"),
             }
             pages_to_insert.append(page_record)
 
@@ -94,11 +108,8 @@ class PageStorageOperations:
                 safe_logfire_info(
                     f"Upserting {len(pages_to_insert)} pages into archon_page_metadata table"
                 )
-                result = (
-                    self.supabase_client.table("archon_page_metadata")
-                    .upsert(pages_to_insert, on_conflict="url")
-                    .execute()
-                )
+                result = self._upsert_pages(pages_to_insert)
+                clear_page_metadata_cache()
 
                 # Build url → page_id mapping
                 for page in result.data:
@@ -124,6 +135,36 @@ class PageStorageOperations:
 
         return url_to_page_id
 
+    def _upsert_pages(self, pages: list[dict[str, Any]]):
+        """
+        Upsert page records, dropping the validator columns if the database predates them.
+
+        Without migration 017 a refresh simply recrawls every page, so page storage
+        must not fail over the missing columns.
+        """
+        try:
+            return (
+                self.supabase_client.table("archon_page_metadata")
+                .upsert(pages, on_conflict="url")
+                .execute()
+            )
+        except APIError as e:
+            if not any(column in str(e) for column in PAGE_VALIDATOR_COLUMNS):
+                raise
+            safe_logfire_error(
+                f"Storing pages without change validators (is migration 017_add_page_validators applied?) "
+                f"| error={str(e)}"
+            )
+            stripped = [
+                {key: value for key, value in page.items() if key not in PAGE_VALIDATOR_COLUMNS}
+                for page in pages
+            ]
+            return (
+                self.supabase_client.table("archon_page_metadata")
+                .upsert(stripped, on_conflict="url")
+                .execute()
+            )
+
     async def store_llms_full_sections(
         self,
         base_url: str,
@@ -198,6 +239,7 @@ class PageStorageOperations:
                     .upsert(pages_to_insert, on_conflict="url")
                     .execute()
                 )
+                clear_page_metadata_cache()
 
                 # Build url → page_id mapping
                 for page in result.data:
@@ -223,6 +265,87 @@ class PageStorageOperations:
 
         return url_to_page_id
 
+    async def get_pages_by_url(self, urls: list[str], batch_size: int = 200) -> list[dict[str, Any]]:
+        """
+        Load stored pages as crawl results ({url, markdown, title}).
+
+        Used when a resumed crawl needs the content of pages stored before it was
+        interrupted, e.g. for code extraction. Pages that cannot be loaded are skipped.
+
+        Args:
+            urls: Page URLs to load
+            batch_size: URLs per query, keeping the request URL short
+
+        Returns:
+            Crawl-result dicts for the pages found
+        """
+        pages: list[dict[str, Any]] = []
+        for start in range(0, len(urls), batch_size):
+            try:
+                result = await execute_async(
+                    self.supabase_client.table("archon_page_metadata")
+                    .select("url, full_content, section_title")
+                    .in_("url", urls[start : start + batch_size])
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load stored pages: {e}", exc_info=True)
+                continue
+            for row in result.data or []:
+                pages.append({
+                    "url": row["url"],
+                    "markdown": row.get("full_content") or "",
+                    "title": row.get("section_title") or "Untitled",
+                })
+        return pages
+
+    async def get_page_validators(self, source_id: str) -> dict[str, dict[str, Any]]:
+        """
+        Get the change validators stored for each page of a source.
+
+        Returns:
+            Dict mapping page URL to its etag, last_modified, content_hash and
+            internal_links; empty when the source has no pages or the columns are missing
+        """
+        validators: dict[str, dict[str, Any]] = {}
+        offset = 0
+        try:
+            while True:
+                result = await execute_async(
+                    self.supabase_client.table("archon_page_metadata")
+                    .select("url, " + ", ".join(PAGE_VALIDATOR_COLUMNS))
+                    .eq("source_id", source_id)
+                    .order("url")
+                    .range(offset, offset + PAGE_VALIDATOR_PAGE_SIZE - 1)
+                )
+                rows = result.data or []
+                for row in rows:
+                    validators[row["url"]] = {column: row.get(column) for column in PAGE_VALIDATOR_COLUMNS}
+                if len(rows) < PAGE_VALIDATOR_PAGE_SIZE:
+                    break
+                offset += PAGE_VALIDATOR_PAGE_SIZE
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to read page validators (is migration 017_add_page_validators applied?) "
+                f"| source_id={source_id} | error={str(e)}"
+            )
+            return {}
+        return validators
+
+    async def update_page_validators(self, validators: dict[str, dict[str, Any]]) -> None:
+        """
+        Record fresh ETag/Last-Modified values for pages whose content did not change.
+
+        Args:
+            validators: Dict mapping page URL to its new etag and last_modified
+        """
+        for url, values in validators.items():
+            try:
+                await execute_async(
+                    self.supabase_client.table("archon_page_metadata").update(values).eq("url", url)
+                )
+            except Exception as e:
+                logger.warning(f"Failed to update validators for page {url}: {e}", exc_info=True)
+
     async def update_page_chunk_count(self, page_id: str, chunk_count: int) -> None:
         """
         Update the chunk_count field for a page after chunking is complete.
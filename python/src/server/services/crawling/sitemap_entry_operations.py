@@ -0,0 +1,107 @@
+"""
+Sitemap Entry Operations
+
+Stores the sitemap URLs of a source together with the <lastmod> seen when each
+was last crawled (archon_sitemap_entries), so a refresh only recrawls pages
+that are new or have changed since.
+"""
+
+from datetime import datetime
+
+from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..client_manager import execute_async
+from .strategies.sitemap import SitemapEntry, parse_lastmod
+
+logger = get_logger(__name__)
+
+# Rows per request when reading or writing entries of large sitemaps
+SITEMAP_ENTRY_PAGE_SIZE = 1000
+
+
+class SitemapEntryOperations:
+    """
+    Reads and records per-URL sitemap state for incremental refreshes.
+    """
+
+    def __init__(self, supabase_client):
+        """
+        Initialize sitemap entry operations.
+
+        Args:
+            supabase_client: The Supabase client for database operations
+        """
+        self.supabase_client = supabase_client
+
+    async def get_lastmods(self, source_id: str) -> dict[str, datetime | None]:
+        """
+        Get the lastmod recorded for each sitemap URL of a source.
+
+        Returns:
+            Dict mapping URL to its recorded lastmod; empty when the source has
+            never been crawled from a sitemap or the table is unavailable
+        """
+        lastmods: dict[str, datetime | None] = {}
+        offset = 0
+        try:
+            while True:
+                result = await execute_async(
+                    self.supabase_client.table("archon_sitemap_entries")
+                    .select("url, lastmod")
+                    .eq("source_id", source_id)
+                    .order("url")
+                    .range(offset, offset + SITEMAP_ENTRY_PAGE_SIZE - 1)
+                )
+                rows = result.data or []
+                for row in rows:
+                    lastmods[row["url"]] = parse_lastmod(row.get("lastmod"))
+                if len(rows) < SITEMAP_ENTRY_PAGE_SIZE:
+                    break
+                offset += SITEMAP_ENTRY_PAGE_SIZE
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to read sitemap entries (is migration 015_add_sitemap_entries applied?) "
+                f"| source_id={source_id} | error={str(e)}"
+            )
+            return {}
+        return lastmods
+
+    async def record_crawled(
+        self, source_id: str, entries: list[SitemapEntry], crawled_urls: set[str]
+    ) -> int:
+        """
+        Record the lastmod of every entry whose page was crawled and stored.
+
+        Entries that were not crawled keep their previous row, so a failed page is
+        retried on the next refresh.
+
+        Returns:
+            Number of entries recorded
+        """
+        now = datetime.now().astimezone().isoformat()
+        rows = [
+            {
+                "source_id": source_id,
+                "url": entry.url,
+                "lastmod": entry.lastmod.isoformat() if entry.lastmod else None,
+                "crawled_at": now,
+            }
+            for entry in entries
+            if entry.url in crawled_urls
+        ]
+
+        try:
+            for start in range(0, len(rows), SITEMAP_ENTRY_PAGE_SIZE):
+                await execute_async(
+                    self.supabase_client.table("archon_sitemap_entries").upsert(
+                        rows[start : start + SITEMAP_ENTRY_PAGE_SIZE], on_conflict="source_id,url"
+                    )
+                )
+        except Exception as e:
+            # Losing this state only means the next refresh recrawls more pages
+            safe_logfire_error(
+                f"Failed to record sitemap entries | source_id={source_id} | error={str(e)}"
+            )
+            return 0
+
+        safe_logfire_info(f"Recorded {len(rows)} sitemap entries | source_id={source_id}")
+        return len(rows)
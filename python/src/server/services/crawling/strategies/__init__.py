@@ -7,11 +7,12 @@ This module contains different crawling strategies for various URL types.
 from .batch import BatchCrawlStrategy
 from .recursive import RecursiveCrawlStrategy
 from .single_page import SinglePageCrawlStrategy
-from .sitemap import SitemapCrawlStrategy
+from .sitemap import SitemapCrawlStrategy, SitemapEntry
 
 __all__ = [
     'BatchCrawlStrategy',
     'RecursiveCrawlStrategy',
     'SinglePageCrawlStrategy',
-    'SitemapCrawlStrategy'
+    'SitemapCrawlStrategy',
+    'SitemapEntry'
 ]
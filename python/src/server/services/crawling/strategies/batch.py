@@ -12,6 +12,7 @@ from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
 
 from ....config.logfire_config import get_logger
 from ...credential_service import credential_service
+from ..conditional_recrawl import page_validators
 
 logger = get_logger(__name__)
 
@@ -39,6 +40,7 @@ class BatchCrawlStrategy:
         progress_callback: Callable[..., Awaitable[None]] | None = None,
         cancellation_check: Callable[[], None] | None = None,
         link_text_fallbacks: dict[str, str] | None = None,
+        result_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Batch crawl multiple URLs in parallel with progress reporting.
@@ -51,6 +53,8 @@ class BatchCrawlStrategy:
             progress_callback: Optional callback for progress updates
             cancellation_check: Optional function to check for cancellation
             link_text_fallbacks: Optional dict mapping URLs to link text for title fallback
+            result_callback: Optional async callback receiving each page as it is crawled.
+                Pages handed to the callback are not retained in the returned list.
 
         Returns:
             List of crawl results
@@ -161,6 +165,7 @@ class BatchCrawlStrategy:
 
         # Use configured batch size
         successful_results = []
+        successful_count = 0
         processed = 0
         cancelled = False
 
@@ -185,7 +190,7 @@ class BatchCrawlStrategy:
                         status="cancelled",
                         total_pages=total_urls,
                         processed_pages=processed,
-                        successful_count=len(successful_results),
+                        successful_count=successful_count,
                     )
                     break
 
@@ -225,7 +230,7 @@ class BatchCrawlStrategy:
                             status="cancelled",
                             total_pages=total_urls,
                             processed_pages=processed,
-                            successful_count=len(successful_results),
+                            successful_count=successful_count,
                         )
                         break
                     except Exception:
@@ -255,12 +260,19 @@ class BatchCrawlStrategy:
                         if fallback_text:
                             title = fallback_text
 
-                    successful_results.append({
+                    page = {
                         "url": original_url,
                         "markdown": result.markdown.fit_markdown,
                         "html": result.html,  # Use raw HTML
                         "title": title,
-                    })
+                        **page_validators(getattr(result, "response_headers", None)),
+                    }
+                    successful_count += 1
+                    if result_callback:
+                        # Hand off immediately so storage overlaps with crawling
+                        await result_callback(page)
+                    else:
+                        successful_results.append(page)
                 else:
                     logger.warning(
                         f"Failed to crawl {result.url}: {getattr(result, 'error_message', 'Unknown error')}"
@@ -278,7 +290,7 @@ class BatchCrawlStrategy:
                         f"Crawled {processed}/{total_urls} pages",
                         total_pages=total_urls,
                         processed_pages=processed,
-                        successful_count=len(successful_results)
+                        successful_count=successful_count
                     )
             if cancelled:
                 break
@@ -287,9 +299,9 @@ class BatchCrawlStrategy:
             return successful_results
         await report_progress(
             100,
-            f"Batch crawling completed: {len(successful_results)}/{total_urls} pages successful",
+            f"Batch crawling completed: {successful_count}/{total_urls} pages successful",
             total_pages=total_urls,
             processed_pages=processed,
-            successful_count=len(successful_results)
+            successful_count=successful_count
         )
         return successful_results
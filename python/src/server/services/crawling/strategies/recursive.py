@@ -2,22 +2,165 @@
 Recursive Crawling Strategy
 
 Handles recursive crawling of websites by following internal links.
+
+Links are crawled from a single priority frontier rather than depth by depth:
+a discovered link is queued as soon as its page is crawled, and every free
+worker takes the shallowest queued URL whose host has capacity.
 """
 
 import asyncio
+import heapq
+import itertools
+import re
+import time
 from collections.abc import Awaitable, Callable
 from typing import Any
-from urllib.parse import urldefrag
+from urllib.parse import urldefrag, urlparse
 
-from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
+import psutil
+from crawl4ai import CacheMode, CrawlerRunConfig
 
 from ....config.logfire_config import get_logger
 from ...credential_service import credential_service
+from ..conditional_recrawl import page_validators
 from ..helpers.url_handler import URLHandler
 
 logger = get_logger(__name__)
 
 
+class _CrawlCancelled(Exception):
+    """Raised by a frontier worker when the crawl has been cancelled."""
+
+
+def normalize_url(url: str) -> str:
+    """Drop the fragment so page anchors are not crawled as separate URLs."""
+    return urldefrag(url)[0]
+
+
+def _extract_title(html: str | None) -> str:
+    """Extract the page title from the HTML <title> tag."""
+    if not html:
+        return "Untitled"
+    title_match = re.search(r'<title[^>]*>(.*?)</title>', html, re.IGNORECASE | re.DOTALL)
+    if not title_match:
+        return "Untitled"
+    extracted_title = title_match.group(1).strip()
+    # Clean up HTML entities
+    extracted_title = extracted_title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
+    return extracted_title or "Untitled"
+
+
+class CrawlFrontier:
+    """
+    Priority queue of URLs to crawl, shared by all workers of one recursive crawl.
+
+    URLs are ordered by depth (then discovery order), so the crawl stays
+    breadth-first overall without waiting for a level to finish. Each URL is
+    queued at most once. Hosts are crawled politely: at most
+    per_host_max_concurrent pages at a time, started at least per_host_delay
+    seconds apart.
+
+    Every queued URL is recorded in `seen` with its depth; passing in a dict
+    owned by a crawl checkpoint lets the crawl be resumed later.
+    """
+
+    def __init__(
+        self,
+        per_host_max_concurrent: int,
+        per_host_delay: float = 0.0,
+        seen: dict[str, int] | None = None,
+    ):
+        self.per_host_max_concurrent = max(1, per_host_max_concurrent)
+        self.per_host_delay = max(0.0, per_host_delay)
+        self.in_flight = 0
+        self._queued = 0
+        # One heap per host, so a busy host never makes get() scan its whole backlog
+        self._host_queues: dict[str, list[tuple[int, int, str]]] = {}
+        self._host_active: dict[str, int] = {}
+        self._host_next_start: dict[str, float] = {}
+        self._seen: dict[str, int] = seen if seen is not None else {}
+        self._order = itertools.count()
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return self._queued
+
+    @property
+    def discovered(self) -> int:
+        """Number of distinct URLs ever queued."""
+        return len(self._seen)
+
+    def add(self, url: str, depth: int) -> bool:
+        """Queue a URL unless it has been seen before. Returns True if it was queued."""
+        if url in self._seen:
+            return False
+        self._push(url, depth)
+        return True
+
+    def requeue(self, url: str, depth: int) -> None:
+        """Queue a URL again even if it was seen, e.g. when resuming from a checkpoint."""
+        self._push(url, depth)
+
+    def _push(self, url: str, depth: int) -> None:
+        self._seen[url] = depth
+        host = urlparse(url).netloc
+        heapq.heappush(self._host_queues.setdefault(host, []), (depth, next(self._order), url))
+        self._queued += 1
+        self._changed.set()
+
+    async def get(self) -> tuple[str, int] | None:
+        """
+        Wait for the next URL that can be crawled now.
+
+        Returns:
+            (url, depth), or None once the frontier is empty and no page is in
+            flight, meaning no more links can be discovered
+        """
+        while True:
+            if not self._queued and self.in_flight == 0:
+                return None
+            item, wait = self._pop_ready(time.monotonic())
+            if item is not None:
+                return item
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=wait)
+            except TimeoutError:
+                pass
+
+    def done(self, url: str) -> None:
+        """Release the host slot held by a URL returned from get()."""
+        self.in_flight -= 1
+        self._host_active[urlparse(url).netloc] -= 1
+        self._changed.set()
+
+    def _pop_ready(self, now: float) -> tuple[tuple[str, int] | None, float | None]:
+        """Pop the shallowest URL whose host has capacity, or report how long to wait."""
+        best_host = None
+        wait = None
+        for host, queue in self._host_queues.items():
+            if self._host_active.get(host, 0) >= self.per_host_max_concurrent:
+                continue
+            delay = self._host_next_start.get(host, 0.0) - now
+            if delay > 0:
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            if best_host is None or queue[0] < self._host_queues[best_host][0]:
+                best_host = host
+        if best_host is None:
+            return None, wait
+
+        queue = self._host_queues[best_host]
+        depth, _, url = heapq.heappop(queue)
+        if not queue:
+            del self._host_queues[best_host]
+        self._queued -= 1
+        self.in_flight += 1
+        self._host_active[best_host] = self._host_active.get(best_host, 0) + 1
+        self._host_next_start[best_host] = now + self.per_host_delay
+        return (url, depth), None
+
+
 class RecursiveCrawlStrategy:
     """Strategy for recursive crawling of websites."""
 
@@ -42,6 +185,10 @@ class RecursiveCrawlStrategy:
         max_concurrent: int | None = None,
         progress_callback: Callable[..., Awaitable[None]] | None = None,
         cancellation_check: Callable[[], None] | None = None,
+        result_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        seen_urls: dict[str, int] | None = None,
+        resume_urls: list[tuple[str, int]] | None = None,
+        unchanged_page_links: Callable[[str], Awaitable[list[str] | None]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Recursively crawl internal links from start URLs up to a maximum depth with progress reporting.
@@ -54,6 +201,15 @@ class RecursiveCrawlStrategy:
             max_concurrent: Maximum concurrent crawls
             progress_callback: Optional callback for progress updates
             cancellation_check: Optional function to check for cancellation
+            result_callback: Optional async callback receiving each page as it is crawled.
+                Pages handed to the callback are not retained in the returned list.
+            seen_urls: Optional dict the frontier records every queued URL in (URL -> depth);
+                URLs already in it are not queued again
+            resume_urls: Optional (URL, depth) pairs to crawl instead of start_urls, when
+                resuming an interrupted crawl
+            unchanged_page_links: Optional async function returning the stored internal links of
+                a page that has not changed since it was last crawled (None if it has). Such
+                pages are not rendered; their stored links are followed instead.
 
         Returns:
             List of crawl results
@@ -68,12 +224,6 @@ class RecursiveCrawlStrategy:
         try:
             settings = await credential_service.get_credentials_by_category("rag_strategy")
 
-            # Clamp batch_size to prevent zero step in range()
-            raw_batch_size = int(settings.get("CRAWL_BATCH_SIZE", "50"))
-            batch_size = max(1, raw_batch_size)
-            if batch_size != raw_batch_size:
-                logger.warning(f"Invalid CRAWL_BATCH_SIZE={raw_batch_size}, clamped to {batch_size}")
-
             if max_concurrent is None:
                 # CRAWL_MAX_CONCURRENT: Pages to crawl in parallel within this single crawl operation
                 # (Different from server-level CONCURRENT_CRAWL_LIMIT which limits total crawl operations)
@@ -88,6 +238,15 @@ class RecursiveCrawlStrategy:
             if memory_threshold != raw_memory_threshold:
                 logger.warning(f"Invalid MEMORY_THRESHOLD_PERCENT={raw_memory_threshold}, clamped to {memory_threshold}")
             check_interval = float(settings.get("DISPATCHER_CHECK_INTERVAL", "0.5"))
+
+            # Politeness per host; by default a single site may use every worker
+            raw_per_host = int(settings.get("CRAWL_PER_HOST_MAX_CONCURRENT", str(max_concurrent)))
+            per_host_max_concurrent = max(1, raw_per_host)
+            if per_host_max_concurrent != raw_per_host:
+                logger.warning(
+                    f"Invalid CRAWL_PER_HOST_MAX_CONCURRENT={raw_per_host}, clamped to {per_host_max_concurrent}"
+                )
+            per_host_delay = max(0.0, float(settings.get("CRAWL_PER_HOST_DELAY", "0")))
         except (ValueError, KeyError, TypeError) as e:
             # Critical configuration errors should fail fast
             logger.error(f"Invalid crawl settings format: {e}", exc_info=True)
@@ -97,11 +256,12 @@ class RecursiveCrawlStrategy:
             logger.error(
                 f"Failed to load crawl settings from database: {e}, using defaults", exc_info=True
             )
-            batch_size = 50
             if max_concurrent is None:
                 max_concurrent = 10  # Safe default to prevent memory issues
             memory_threshold = 80.0
             check_interval = 0.5
+            per_host_max_concurrent = max_concurrent
+            per_host_delay = 0.0
             settings = {}  # Empty dict for defaults
 
         # Check if start URLs include documentation sites
@@ -113,7 +273,6 @@ class RecursiveCrawlStrategy:
             )
             run_config = CrawlerRunConfig(
                 cache_mode=CacheMode.BYPASS,
-                stream=True,  # Enable streaming for faster parallel processing
                 markdown_generator=self.markdown_generator,
                 wait_until=settings.get("CRAWL_WAIT_STRATEGY", "domcontentloaded"),
                 page_timeout=int(settings.get("CRAWL_PAGE_TIMEOUT", "30000")),
@@ -128,7 +287,6 @@ class RecursiveCrawlStrategy:
             # Configuration for regular recursive crawling
             run_config = CrawlerRunConfig(
                 cache_mode=CacheMode.BYPASS,
-                stream=True,  # Enable streaming
                 markdown_generator=self.markdown_generator,
                 wait_until=settings.get("CRAWL_WAIT_STRATEGY", "domcontentloaded"),
                 page_timeout=int(settings.get("CRAWL_PAGE_TIMEOUT", "45000")),
@@ -136,12 +294,6 @@ class RecursiveCrawlStrategy:
                 scan_full_page=True,
             )
 
-        dispatcher = MemoryAdaptiveDispatcher(
-            memory_threshold_percent=memory_threshold,
-            check_interval=check_interval,
-            max_session_permit=max_concurrent,
-        )
-
         async def report_progress(progress_val: int, message: str, status: str = "crawling", **kwargs):
             """Helper to report progress if callback is available"""
             if progress_callback:
@@ -155,190 +307,153 @@ class RecursiveCrawlStrategy:
                     **kwargs
                 )
 
-        visited = set()
-
-        def normalize_url(url):
-            return urldefrag(url)[0]
+        frontier = CrawlFrontier(per_host_max_concurrent, per_host_delay, seen=seen_urls)
+        if resume_urls is not None:
+            for url, depth in resume_urls:
+                frontier.requeue(url, depth)
+        elif max_depth > 0:
+            for url in start_urls:
+                frontier.add(normalize_url(url), 0)
 
-        current_urls = {normalize_url(u) for u in start_urls}
         results_all = []
+        total_successful = 0
         total_processed = 0
-        total_discovered = len(current_urls)  # Track total URLs discovered (normalized & de-duped)
-        cancelled = False
+        deepest = 0
 
-        for depth in range(max_depth):
-            # Check for cancellation at the start of each depth level
-            if cancellation_check:
-                try:
-                    cancellation_check()
-                except asyncio.CancelledError:
-                    cancelled = True
-                    await report_progress(
-                        int(((depth) / max_depth) * 99),  # Cap at 99% for cancellation
-                        f"Crawl cancelled at depth {depth + 1}",
-                        status="cancelled",
-                        total_pages=total_discovered,
-                        processed_pages=total_processed,
-                    )
-                    break
-                except Exception:
-                    logger.exception("Unexpected error from cancellation_check()")
-                    raise
-
-            urls_to_crawl = [
-                normalize_url(url) for url in current_urls if normalize_url(url) not in visited
-            ]
-            if not urls_to_crawl:
-                break
-
-            # Calculate progress for this depth level
-            # Report 0-100 to properly integrate with ProgressMapper architecture
-            depth_progress = int((depth / max(max_depth, 1)) * 100)
+        await report_progress(
+            0,
+            f"Crawling {len(frontier)} {'remaining' if resume_urls is not None else 'start'} URLs "
+            f"with up to {max_concurrent} pages in parallel",
+            total_pages=frontier.discovered,
+            processed_pages=0,
+        )
+
+        async def wait_for_memory() -> None:
+            """Hold back new pages while memory is above the threshold (as the dispatcher did)."""
+            while frontier.in_flight > 1 and psutil.virtual_memory().percent > memory_threshold:
+                await asyncio.sleep(check_interval)
+
+        def queue_links(urls: list[str], depth: int) -> None:
+            if depth + 1 >= max_depth:
+                return
+            for link in urls:
+                next_url = normalize_url(link)
+                if self.url_handler.is_binary_file(next_url):
+                    logger.debug(f"Skipping binary file from crawl queue: {next_url}")
+                    continue
+                frontier.add(next_url, depth + 1)
+
+        async def crawl_page(url: str, depth: int) -> None:
+            nonlocal total_successful, total_processed, deepest
+            if unchanged_page_links:
+                stored_links = await unchanged_page_links(url)
+                if stored_links is not None:
+                    # Unchanged since the last crawl: skip the render, keep discovering
+                    total_processed += 1
+                    deepest = max(deepest, depth)
+                    queue_links(stored_links, depth)
+                    return
+
+            await wait_for_memory()
+            try:
+                result = await self.crawler.arun(url=transform_url_func(url), config=run_config)
+            except Exception as e:
+                result = None
+                logger.warning(f"Failed to crawl {url}: {e}")
+
+            total_processed += 1
+            deepest = max(deepest, depth)
+
+            if result is not None and result.success and result.markdown and result.markdown.fit_markdown:
+                # Queue internal links right away instead of waiting for the depth to finish.
+                # This happens before the page is handed off, so a checkpoint never shows a
+                # stored page whose links are missing from the frontier.
+                links = getattr(result, "links", {}) or {}
+                internal_links = list(dict.fromkeys(
+                    normalize_url(link["href"]) for link in links.get("internal", []) if link.get("href")
+                ))
+                queue_links(internal_links, depth)
+
+                page = {
+                    "url": url,
+                    "markdown": result.markdown.fit_markdown,
+                    "html": result.html,  # Always use raw HTML for code extraction
+                    "title": _extract_title(result.html),
+                    # Kept with the page so an unchanged page can be skipped on refresh
+                    "internal_links": internal_links,
+                    **page_validators(getattr(result, "response_headers", None)),
+                }
+                if result_callback:
+                    # Hand off immediately so storage overlaps with crawling
+                    await result_callback(page)
+                else:
+                    results_all.append(page)
+                total_successful += 1
+            elif result is not None:
+                logger.warning(
+                    f"Failed to crawl {url}: {getattr(result, 'error_message', 'Unknown error')}"
+                )
 
             await report_progress(
-                depth_progress,
-                f"Crawling depth {depth + 1}/{max_depth}: {len(urls_to_crawl)} URLs to process",
-                total_pages=total_discovered,
+                min(int((total_processed / max(frontier.discovered, 1)) * 100), 99),
+                f"Crawled {total_processed}/{frontier.discovered} URLs (depth {depth + 1}/{max_depth})",
+                total_pages=frontier.discovered,
                 processed_pages=total_processed,
             )
 
-            # Use configured batch size for recursive crawling
-            next_level_urls = set()
-            depth_successful = 0
-
-            for batch_idx in range(0, len(urls_to_crawl), batch_size):
-                # Check for cancellation before processing each batch
+        async def worker() -> None:
+            while True:
                 if cancellation_check:
                     try:
                         cancellation_check()
-                    except asyncio.CancelledError:
-                        cancelled = True
-                        break
+                    except asyncio.CancelledError as e:
+                        raise _CrawlCancelled() from e
                     except Exception:
                         logger.exception("Unexpected error from cancellation_check()")
                         raise
 
-                batch_urls = urls_to_crawl[batch_idx : batch_idx + batch_size]
-                batch_end_idx = min(batch_idx + batch_size, len(urls_to_crawl))
-
-                # Transform URLs and create mapping for this batch
-                url_mapping = {}
-                transformed_batch_urls = []
-                for url in batch_urls:
-                    transformed = transform_url_func(url)
-                    transformed_batch_urls.append(transformed)
-                    url_mapping[transformed] = url
-
-                # Calculate overall progress based on URLs actually being crawled at this depth
-                # Use a more accurate progress calculation that accounts for depth
-                urls_at_this_depth = len(urls_to_crawl)
-                progress_within_depth = (batch_idx / urls_at_this_depth) if urls_at_this_depth > 0 else 0
-                # Weight by depth to show overall progress (later depths contribute less)
-                overall_progress = int(((depth + progress_within_depth) / max_depth) * 100)
-                await report_progress(
-                    min(overall_progress, 99),  # Never show 100% until actually complete
-                    f"Crawling URLs {batch_idx + 1}-{batch_end_idx} of {len(urls_to_crawl)} at depth {depth + 1}",
-                    total_pages=total_discovered,
-                    processed_pages=total_processed,
-                )
-
-                # Use arun_many for native parallel crawling with streaming
-                logger.info(f"Starting parallel crawl of {len(batch_urls)} URLs with arun_many")
-                batch_results = await self.crawler.arun_many(
-                    urls=transformed_batch_urls, config=run_config, dispatcher=dispatcher
-                )
+                item = await frontier.get()
+                if item is None:
+                    return
+                url, depth = item
+                try:
+                    await crawl_page(url, depth)
+                finally:
+                    frontier.done(url)
+
+        # Every worker pulls the shallowest ready URL as soon as it is free, so
+        # browser slots never wait for a batch or a depth level to finish
+        logger.info(f"Starting frontier crawl of {len(frontier)} URLs with {max_concurrent} workers")
+        workers = [asyncio.create_task(worker()) for _ in range(max_concurrent)]
+        try:
+            done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-                # Handle streaming results from arun_many
-                i = 0
-                async for result in batch_results:
-                    # Check for cancellation during streaming results
-                    if cancellation_check:
-                        try:
-                            cancellation_check()
-                        except asyncio.CancelledError:
-                            cancelled = True
-                            await report_progress(
-                                min(int((total_processed / max(total_discovered, 1)) * 100), 99),
-                                "Crawl cancelled during batch processing",
-                                status="cancelled",
-                                total_pages=total_discovered,
-                                processed_pages=total_processed,
-                            )
-                            break
-                        except Exception:
-                            logger.exception("Unexpected error from cancellation_check()")
-                            raise
-
-                    # Map back to original URL using the mapping dict
-                    original_url = url_mapping.get(result.url, result.url)
-
-                    norm_url = normalize_url(original_url)
-                    visited.add(norm_url)
-                    total_processed += 1
+        cancelled = False
+        for task in done:
+            error = None if task.cancelled() else task.exception()
+            if isinstance(error, _CrawlCancelled):
+                cancelled = True
+            elif error is not None:
+                raise error
 
-                    if result.success and result.markdown and result.markdown.fit_markdown:
-                        # Extract title from HTML <title> tag
-                        title = "Untitled"
-                        if result.html:
-                            import re
-                            title_match = re.search(r'<title[^>]*>(.*?)</title>', result.html, re.IGNORECASE | re.DOTALL)
-                            if title_match:
-                                extracted_title = title_match.group(1).strip()
-                                # Clean up HTML entities
-                                extracted_title = extracted_title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
-                                if extracted_title:
-                                    title = extracted_title
-
-                        results_all.append({
-                            "url": original_url,
-                            "markdown": result.markdown.fit_markdown,
-                            "html": result.html,  # Always use raw HTML for code extraction
-                            "title": title,
-                        })
-                        depth_successful += 1
-
-                        # Find internal links for next depth
-                        links = getattr(result, "links", {}) or {}
-                        for link in links.get("internal", []):
-                            next_url = normalize_url(link["href"])
-                            # Skip binary files and already visited URLs
-                            is_binary = self.url_handler.is_binary_file(next_url)
-                            if next_url not in visited and not is_binary:
-                                if next_url not in next_level_urls:
-                                    next_level_urls.add(next_url)
-                                    total_discovered += 1  # Increment when we discover a new URL
-                            elif is_binary:
-                                logger.debug(f"Skipping binary file from crawl queue: {next_url}")
-                    else:
-                        logger.warning(
-                            f"Failed to crawl {original_url}: {getattr(result, 'error_message', 'Unknown error')}"
-                        )
-
-                    # Skip the confusing "processed X/Y URLs" updates
-                    # The "crawling URLs" message at the start of each batch is more accurate
-                    i += 1
-                if cancelled:
-                    break
-
-            if cancelled:
-                break
-
-            current_urls = next_level_urls
-
-            # Report completion of this depth
+        if cancelled:
             await report_progress(
-                int(((depth + 1) / max_depth) * 100),
-                f"Depth {depth + 1} completed: {depth_successful} pages crawled, {len(next_level_urls)} URLs found for next depth",
-                total_pages=total_discovered,
+                min(int((total_processed / max(frontier.discovered, 1)) * 100), 99),
+                f"Crawl cancelled after {total_processed} pages",
+                status="cancelled",
+                total_pages=frontier.discovered,
                 processed_pages=total_processed,
             )
-
-        if cancelled:
             return results_all
         await report_progress(
             100,
-            f"Recursive crawling completed: {len(results_all)} total pages crawled across {max_depth} depth levels",
-            total_pages=total_discovered,
+            f"Recursive crawling completed: {total_successful} total pages crawled across {deepest + 1} depth levels",
+            total_pages=frontier.discovered,
             processed_pages=total_processed,
         )
         return results_all
@@ -2,63 +2,238 @@
 Sitemap Crawling Strategy
 
 Handles crawling of URLs from XML sitemaps.
+
+Sitemaps are fetched asynchronously and parsed incrementally while the body
+streams in, so large sitemaps never sit in memory as a full tree. Gzipped
+sitemaps and nested sitemap indexes are supported, and each URL's <lastmod>
+is kept so refreshes can skip pages that have not changed.
 """
 import asyncio
+import zlib
 from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from xml.etree import ElementTree
 
-import requests
+import httpx
 
 from ....config.logfire_config import get_logger
 
 logger = get_logger(__name__)
 
+# Limits for sitemap indexes that point at further sitemaps
+MAX_SITEMAP_DEPTH = 3
+MAX_CONCURRENT_SITEMAP_FETCHES = 8
+SITEMAP_FETCH_TIMEOUT = 30.0
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapEntry:
+    """A page URL listed in a sitemap."""
+
+    url: str
+    lastmod: datetime | None = None
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """
+    Parse a W3C datetime <lastmod> value ("2024-05-01", "2024-05-01T10:00:00+02:00", ...).
+
+    Returns:
+        Timezone-aware datetime (UTC when no offset is given), or None if unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def filter_changed_entries(
+    entries: list[SitemapEntry], previous: dict[str, datetime | None]
+) -> list[SitemapEntry]:
+    """
+    Select entries that need crawling given the lastmod recorded at the previous crawl.
+
+    An entry is crawled when it is new, when either side has no lastmod (nothing
+    to compare), or when its lastmod is later than the recorded one.
+    """
+    changed = []
+    for entry in entries:
+        if entry.url not in previous:
+            changed.append(entry)
+            continue
+        previous_lastmod = previous[entry.url]
+        if entry.lastmod is None or previous_lastmod is None or entry.lastmod > previous_lastmod:
+            changed.append(entry)
+    return changed
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag."""
+    return tag.rsplit("}", 1)[-1]
+
 
 class SitemapCrawlStrategy:
     """Strategy for parsing and crawling sitemaps."""
 
-    def parse_sitemap(self, sitemap_url: str, cancellation_check: Callable[[], None] | None = None) -> list[str]:
+    async def read_sitemap(
+        self,
+        sitemap_url: str,
+        cancellation_check: Callable[[], None] | None = None,
+        max_concurrent: int = MAX_CONCURRENT_SITEMAP_FETCHES,
+        max_depth: int = MAX_SITEMAP_DEPTH,
+    ) -> list[SitemapEntry]:
+        """
+        Read a sitemap or sitemap index and return every page entry it lists.
+
+        Child sitemaps of an index are fetched in parallel (bounded by max_concurrent)
+        and followed up to max_depth levels. A sitemap that fails to fetch or parse
+        is logged and skipped; the entries from the others are still returned.
+
+        Args:
+            sitemap_url: URL of the sitemap (or sitemap index) to read
+            cancellation_check: Optional function to check for cancellation
+            max_concurrent: Maximum number of sitemaps fetched at once
+            max_depth: Maximum nesting of sitemap indexes to follow
+
+        Returns:
+            Entries in sitemap order, de-duplicated by URL
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        seen_sitemaps: set[str] = set()
+
+        async with httpx.AsyncClient(
+            timeout=SITEMAP_FETCH_TIMEOUT, follow_redirects=True
+        ) as client:
+
+            async def read(url: str, depth: int) -> list[SitemapEntry]:
+                if url in seen_sitemaps:
+                    return []
+                seen_sitemaps.add(url)
+
+                if cancellation_check:
+                    try:
+                        cancellation_check()
+                    except asyncio.CancelledError:
+                        logger.info("Sitemap parsing cancelled by user")
+                        raise  # Re-raise to let the caller handle progress reporting
+
+                async with semaphore:
+                    entries, child_sitemaps = await self._fetch_and_parse(client, url)
+
+                if child_sitemaps:
+                    if depth >= max_depth:
+                        logger.warning(
+                            f"Not following {len(child_sitemaps)} nested sitemaps in {url}: "
+                            f"max depth {max_depth} reached"
+                        )
+                    else:
+                        logger.info(f"Sitemap index {url} lists {len(child_sitemaps)} sitemaps")
+                        children = await asyncio.gather(
+                            *(read(child, depth + 1) for child in child_sitemaps)
+                        )
+                        for child_entries in children:
+                            entries.extend(child_entries)
+                return entries
+
+            entries = await read(sitemap_url, 0)
+
+        unique: dict[str, SitemapEntry] = {}
+        for entry in entries:
+            unique.setdefault(entry.url, entry)
+        logger.info(f"Successfully extracted {len(unique)} URLs from sitemap {sitemap_url}")
+        return list(unique.values())
+
+    async def parse_sitemap(
+        self, sitemap_url: str, cancellation_check: Callable[[], None] | None = None
+    ) -> list[str]:
         """
         Parse a sitemap and extract URLs with comprehensive error handling.
-        
+
         Args:
             sitemap_url: URL of the sitemap to parse
             cancellation_check: Optional function to check for cancellation
-            
+
         Returns:
             List of URLs extracted from the sitemap
         """
-        urls = []
+        entries = await self.read_sitemap(sitemap_url, cancellation_check)
+        return [entry.url for entry in entries]
 
-        try:
-            # Check for cancellation before making the request
-            if cancellation_check:
-                try:
-                    cancellation_check()
-                except asyncio.CancelledError:
-                    logger.info("Sitemap parsing cancelled by user")
-                    raise  # Re-raise to let the caller handle progress reporting
+    async def _fetch_and_parse(
+        self, client: httpx.AsyncClient, sitemap_url: str
+    ) -> tuple[list[SitemapEntry], list[str]]:
+        """
+        Stream one sitemap document through an incremental XML parser.
 
-            logger.info(f"Parsing sitemap: {sitemap_url}")
-            resp = requests.get(sitemap_url, timeout=30)
+        Returns:
+            Tuple of (page entries, child sitemap URLs when the document is an index)
+        """
+        entries: list[SitemapEntry] = []
+        child_sitemaps: list[str] = []
+        parser = ElementTree.XMLPullParser(events=("end",))
+        decompressor = None
+
+        def drain() -> None:
+            for _, element in parser.read_events():
+                name = _local_name(element.tag)
+                if name not in ("url", "sitemap"):
+                    continue
+                loc = None
+                lastmod = None
+                for child in element:
+                    child_name = _local_name(child.tag)
+                    if child_name == "loc" and child.text:
+                        loc = child.text.strip()
+                    elif child_name == "lastmod":
+                        lastmod = child.text
+                if loc:
+                    if name == "url":
+                        entries.append(SitemapEntry(loc, parse_lastmod(lastmod)))
+                    else:
+                        child_sitemaps.append(loc)
+                # Finished elements are not needed again; keep memory flat
+                element.clear()
 
-            if resp.status_code != 200:
-                logger.error(f"Failed to fetch sitemap: HTTP {resp.status_code}")
-                return urls
+        try:
+            logger.info(f"Parsing sitemap: {sitemap_url}")
+            async with client.stream("GET", sitemap_url) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to fetch sitemap: HTTP {response.status_code}")
+                    return [], []
 
-            try:
-                tree = ElementTree.fromstring(resp.content)
-                urls = [loc.text for loc in tree.findall('.//{*}loc') if loc.text]
-                logger.info(f"Successfully extracted {len(urls)} URLs from sitemap")
+                first_chunk = True
+                async for chunk in response.aiter_bytes():
+                    if first_chunk:
+                        # .xml.gz files are served as gzip bodies, not Content-Encoding: gzip
+                        if chunk.startswith(_GZIP_MAGIC):
+                            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                        first_chunk = False
+                    if decompressor is not None:
+                        chunk = decompressor.decompress(chunk)
+                    parser.feed(chunk)
+                    drain()
 
-            except ElementTree.ParseError:
-                logger.exception(f"Error parsing sitemap XML from {sitemap_url}")
-            except Exception:
-                logger.exception(f"Unexpected error parsing sitemap from {sitemap_url}")
+            if decompressor is not None:
+                parser.feed(decompressor.flush())
+            parser.close()
+            drain()
 
-        except requests.exceptions.RequestException:
+        except ElementTree.ParseError:
+            logger.exception(f"Error parsing sitemap XML from {sitemap_url}")
+        except zlib.error:
+            logger.exception(f"Error decompressing gzipped sitemap from {sitemap_url}")
+        except httpx.HTTPError:
             logger.exception(f"Network error fetching sitemap from {sitemap_url}")
         except Exception:
             logger.exception(f"Unexpected error in sitemap parsing for {sitemap_url}")
 
-        return urls
+        return entries, child_sitemaps
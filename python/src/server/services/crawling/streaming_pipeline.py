@@ -0,0 +1,345 @@
+"""
+Streaming Document Pipeline
+
+Overlaps crawling with chunking, embedding and storage. Pages are handed to the
+pipeline as soon as the crawler yields them and flow through two stages connected
+by bounded queues:
+
+    crawler -> [page queue] -> chunking -> [batch queue] -> embed + store
+
+The bounded queues provide backpressure: when embedding falls behind, put() blocks
+the crawler instead of letting pages pile up in memory. Each flushed batch stores
+its pages, then embeds and inserts its chunks through add_documents_to_supabase.
+
+Pages are not kept once chunked. When code extraction is requested, each page's
+code blocks are extracted as it streams by, and only those blocks (plus the
+markdown of pages that have any) are kept for the code extraction stage.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..client_manager import execute_async
+from ..storage.document_storage_service import add_documents_to_supabase
+from .conditional_recrawl import PAGE_VALIDATOR_KEYS
+from .page_storage_operations import PageStorageOperations
+
+logger = get_logger(__name__)
+
+# Sentinel marking the end of a stage's input
+_END_OF_STREAM = object()
+
+
+class StreamingDocumentPipeline:
+    """
+    Bounded-queue pipeline that chunks, embeds and stores pages while the crawl runs.
+    """
+
+    def __init__(
+        self,
+        doc_storage_ops,
+        request: dict[str, Any],
+        crawl_type: str,
+        source_id: str,
+        progress_callback: Callable | None = None,
+        cancellation_check: Callable[[], None] | None = None,
+        source_url: str | None = None,
+        source_display_name: str | None = None,
+        page_queue_size: int = 20,
+        flush_chunk_count: int = 100,
+        embedding_batch_size: int = 25,
+        extract_code: bool = True,
+    ):
+        """
+        Initialize the streaming pipeline.
+
+        Args:
+            doc_storage_ops: DocumentStorageOperations used for chunking and source records
+            request: The original crawl request
+            crawl_type: Type of crawl performed
+            source_id: The source ID for all documents
+            progress_callback: Optional callback for storage progress updates
+            cancellation_check: Optional function to check for cancellation
+            source_url: Optional original URL that was crawled
+            source_display_name: Optional human-readable name for the source
+            page_queue_size: Maximum crawled pages waiting to be chunked
+            flush_chunk_count: Number of chunks collected before a batch is stored
+            embedding_batch_size: Batch size passed to add_documents_to_supabase
+            extract_code: Extract code blocks from each page for the code extraction stage
+        """
+        self.doc_storage_ops = doc_storage_ops
+        self.supabase_client = doc_storage_ops.supabase_client
+        self.page_storage_ops = PageStorageOperations(self.supabase_client)
+        self.request = request
+        self.crawl_type = crawl_type
+        self.source_id = source_id
+        self.progress_callback = progress_callback
+        self.cancellation_check = cancellation_check
+        self.source_url = source_url
+        self.source_display_name = source_display_name
+        self.flush_chunk_count = max(1, flush_chunk_count)
+        self.embedding_batch_size = max(1, embedding_batch_size)
+        self.extract_code = extract_code
+        # Called with ({url: page_id}, word count) after each batch is stored (crawl checkpoints)
+        self.on_batch_stored: Callable[[dict[str, str | None], int], Awaitable[None]] | None = None
+
+        self._page_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, page_queue_size))
+        # Two pending batches keep the embedder busy without buffering the whole crawl
+        self._batch_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        self._tasks: list[asyncio.Task] = []
+        self._error: BaseException | None = None
+        self._source_created = False
+
+        self.input_closed = False
+        self.pages_received = 0
+        self.pages_processed = 0
+        self.chunk_count = 0
+        self.chunks_stored = 0
+        self.chunks_reused = 0
+        self.total_word_count = 0
+        # Code blocks of the streamed pages, and the documents they came from
+        self.code_blocks: list[dict[str, Any]] = []
+        self.url_to_full_document: dict[str, str] = {}
+        self.processed_urls: set[str] = set()
+
+    def resume_from(self, stored_word_count: int) -> None:
+        """
+        Continue a crawl whose earlier pages were already stored by a previous run.
+
+        The source record exists already, and the final word count includes the
+        words stored before the interruption.
+        """
+        self._source_created = True
+        self.total_word_count += stored_word_count
+
+    def start(self) -> None:
+        """Start the chunking and storage workers."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._chunk_worker(), name=f"stream_chunk_{self.source_id}"),
+            asyncio.create_task(self._store_worker(), name=f"stream_store_{self.source_id}"),
+        ]
+
+    async def put(self, page: dict[str, Any]) -> None:
+        """
+        Hand a crawled page to the pipeline, waiting while the page queue is full.
+
+        Raises:
+            The first error raised by a pipeline worker, so the crawl stops early.
+        """
+        if self._error:
+            raise self._error
+        if not self._tasks:
+            self.start()
+        self.pages_received += 1
+        await self._page_queue.put(page)
+
+    async def finish(self) -> dict[str, Any]:
+        """
+        Close the pipeline input, wait for queued work to drain and return storage stats.
+
+        Returns:
+            Dict with the same keys as DocumentStorageOperations.process_and_store_documents
+        """
+        self.input_closed = True
+        if self._tasks:
+            await self._page_queue.put(_END_OF_STREAM)
+            await asyncio.gather(*self._tasks)
+        if self._error:
+            raise self._error
+
+        if self._source_created:
+            await self._update_source_word_count()
+
+        safe_logfire_info(
+            f"Streaming storage finished | source_id={self.source_id} | pages={self.pages_processed} | "
+            f"chunks={self.chunk_count} | stored={self.chunks_stored} | reused={self.chunks_reused}"
+        )
+
+        return {
+            "chunk_count": self.chunk_count,
+            "chunks_stored": self.chunks_stored,
+            "chunks_reused": self.chunks_reused,
+            "total_word_count": self.total_word_count,
+            "url_to_full_document": self.url_to_full_document,
+            "source_id": self.source_id,
+        }
+
+    async def abort(self) -> None:
+        """Stop the workers without draining (used on cancellation and errors)."""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _chunk_worker(self) -> None:
+        """Chunk incoming pages and hand fixed-size batches to the storage worker."""
+        storage_service = self.doc_storage_ops.doc_storage_service
+        batch = self._new_batch()
+
+        while True:
+            page = await self._page_queue.get()
+            if page is _END_OF_STREAM:
+                break
+            if self._error:
+                # Keep draining so producers never block on a dead pipeline
+                continue
+
+            try:
+                if self.cancellation_check:
+                    self.cancellation_check()
+
+                doc_url = (page.get("url") or "").strip()
+                markdown_content = (page.get("markdown") or "").strip()
+                if not markdown_content or not doc_url:
+                    continue
+
+                self.pages_processed += 1
+                self.processed_urls.add(doc_url)
+                if self.extract_code:
+                    code_blocks = await self.doc_storage_ops.extract_code_blocks([page], self.source_id)
+                    if code_blocks:
+                        self.code_blocks.extend(code_blocks)
+                        # Code example storage looks up the full document of each block
+                        self.url_to_full_document[doc_url] = markdown_content
+
+                chunks = await storage_service.smart_chunk_text_async(markdown_content, chunk_size=5000)
+                batch["pages"].append({
+                    "url": doc_url,
+                    "markdown": markdown_content,
+                    **{key: page[key] for key in PAGE_VALIDATOR_KEYS if key in page},
+                })
+                batch["url_to_full_document"][doc_url] = markdown_content
+
+                for i, chunk in enumerate(chunks):
+                    metadata = self.doc_storage_ops.build_chunk_metadata(
+                        page, doc_url, chunk, i, self.source_id, self.request, self.crawl_type
+                    )
+                    batch["urls"].append(doc_url)
+                    batch["chunk_numbers"].append(i)
+                    batch["contents"].append(chunk)
+                    batch["metadatas"].append(metadata)
+                    self.chunk_count += 1
+                    self.total_word_count += metadata["word_count"]
+
+                # Flush on page boundaries so all chunks of a URL land in one batch
+                if len(batch["contents"]) >= self.flush_chunk_count:
+                    await self._batch_queue.put(batch)
+                    batch = self._new_batch()
+            except asyncio.CancelledError as e:
+                self._fail_unless_cancelled(e)
+            except Exception as e:
+                self._fail(e)
+
+        if batch["contents"] and not self._error:
+            await self._batch_queue.put(batch)
+        await self._batch_queue.put(_END_OF_STREAM)
+
+    async def _store_worker(self) -> None:
+        """Store pages, then embed and insert chunks for each batch."""
+        while True:
+            batch = await self._batch_queue.get()
+            if batch is _END_OF_STREAM:
+                break
+            if self._error:
+                continue
+
+            try:
+                await self._store_batch(batch)
+            except asyncio.CancelledError as e:
+                self._fail_unless_cancelled(e)
+            except Exception as e:
+                self._fail(e)
+
+    async def _store_batch(self, batch: dict[str, Any]) -> None:
+        # Source record must exist before pages and chunks (FK constraints)
+        if not self._source_created:
+            await self.doc_storage_ops._create_source_records(
+                batch["metadatas"],
+                batch["contents"],
+                {self.source_id: sum(m["word_count"] for m in batch["metadatas"])},
+                self.request,
+                self.source_url,
+                self.source_display_name,
+            )
+            self._source_created = True
+
+        url_to_page_id = await self.page_storage_ops.store_pages(
+            batch["pages"], self.source_id, self.request, self.crawl_type
+        )
+        for metadata in batch["metadatas"]:
+            metadata["page_id"] = url_to_page_id.get(metadata["url"])
+
+        storage_stats = await add_documents_to_supabase(
+            client=self.supabase_client,
+            urls=batch["urls"],
+            chunk_numbers=batch["chunk_numbers"],
+            contents=batch["contents"],
+            metadatas=batch["metadatas"],
+            url_to_full_document=batch["url_to_full_document"],
+            batch_size=self.embedding_batch_size,
+            progress_callback=None,
+            enable_parallel_batches=True,
+            provider=None,
+            cancellation_check=self.cancellation_check,
+            url_to_page_id=url_to_page_id,
+        )
+        self.chunks_stored += storage_stats.get("chunks_stored", 0)
+        self.chunks_reused += storage_stats.get("chunks_reused", 0)
+
+        if self.on_batch_stored:
+            await self.on_batch_stored(
+                {page["url"]: url_to_page_id.get(page["url"]) for page in batch["pages"]},
+                sum(metadata["word_count"] for metadata in batch["metadatas"]),
+            )
+
+        if self.progress_callback:
+            progress = int(self.chunks_stored / max(self.chunk_count, 1) * 100)
+            await self.progress_callback(
+                "document_storage",
+                min(progress, 100) if self.input_closed else min(progress, 99),
+                f"Stored {self.chunks_stored}/{self.chunk_count} chunks from {self.pages_processed} pages",
+                chunks_stored=self.chunks_stored,
+                chunks_reused=self.chunks_reused,
+                total_chunks=self.chunk_count,
+            )
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+            if not isinstance(error, asyncio.CancelledError):
+                logger.error("Streaming document pipeline failed", exc_info=error)
+                safe_logfire_error(f"Streaming document pipeline failed | source_id={self.source_id} | error={error}")
+
+    def _fail_unless_cancelled(self, error: asyncio.CancelledError) -> None:
+        # Re-raise when abort() cancelled the task; record cancellation_check() errors
+        task = asyncio.current_task()
+        if task is not None and task.cancelling():
+            raise error
+        self._fail(error)
+
+    async def _update_source_word_count(self) -> None:
+        """Record the final word count; the source row was created from the first batch only."""
+        try:
+            await execute_async(
+                self.supabase_client.table("archon_sources")
+                .update({"total_word_count": self.total_word_count})
+                .eq("source_id", self.source_id)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update word count for source {self.source_id}: {e}")
+
+    @staticmethod
+    def _new_batch() -> dict[str, Any]:
+        return {
+            "pages": [],
+            "urls": [],
+            "chunk_numbers": [],
+            "contents": [],
+            "metadatas": [],
+            "url_to_full_document": {},
+        }
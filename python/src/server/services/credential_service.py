@@ -7,7 +7,6 @@ Credentials include API keys, service credentials, and application configuration
 
 import base64
 import os
-import re
 import time
 from dataclasses import dataclass
 
@@ -17,9 +16,10 @@ from typing import Any
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from supabase import Client, create_client
+from supabase import Client
 
 from ..config.logfire_config import get_logger
+from .client_manager import get_supabase_client
 
 logger = get_logger(__name__)
 
@@ -37,6 +37,16 @@ class CredentialItem:
 
 
 
+# Settings that change which vectors a query maps to
+EMBEDDING_CONFIG_KEYS = {
+    "EMBEDDING_PROVIDER",
+    "EMBEDDING_MODEL",
+    "EMBEDDING_DIMENSIONS",
+    "LLM_PROVIDER",
+    "LLM_BASE_URL",
+    "OLLAMA_EMBEDDING_URL",
+}
+
 
 class CredentialService:
     """Service for managing application credentials and configuration."""
@@ -51,36 +61,29 @@ class CredentialService:
 
     def _get_supabase_client(self) -> Client:
         """
-        Get or create a properly configured Supabase client using environment variables.
-        Uses the standard Supabase client initialization.
+        Get the process-wide Supabase client, sharing its connection pool with other services.
         """
         if self._supabase is None:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_SERVICE_KEY")
-
-            if not url or not key:
-                raise ValueError(
-                    "SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment variables"
-                )
-
             try:
-                # Initialize with standard Supabase client - no need for custom headers
-                self._supabase = create_client(url, key)
-
-                # Extract project ID from URL for logging purposes only
-                match = re.match(r"https://([^.]+)\.supabase\.co", url)
-                if match:
-                    project_id = match.group(1)
-                    logger.debug(f"Supabase client initialized for project: {project_id}")
-                else:
-                    logger.debug("Supabase client initialized successfully")
-
+                self._supabase = get_supabase_client()
             except Exception as e:
                 logger.error(f"Error initializing Supabase client: {e}")
                 raise
 
         return self._supabase
 
+    def _invalidate_embedding_caches(self, key: str) -> None:
+        """Clear cached query embeddings when an embedding-related setting changes."""
+        if key not in EMBEDDING_CONFIG_KEYS:
+            return
+        try:
+            from .embeddings.query_embedding_cache import clear_query_embedding_cache
+
+            clear_query_embedding_cache()
+            logger.debug(f"Cleared query embedding cache due to change of {key}")
+        except Exception as e:
+            logger.warning(f"Failed to clear query embedding cache: {e}")
+
     def _get_encryption_key(self) -> bytes:
         """Generate encryption key from environment variables."""
         # Use Supabase service key as the basis for encryption key
@@ -263,6 +266,8 @@ class CredentialService:
                 except Exception as e:
                     logger.error(f"Error invalidating LLM provider service cache: {e}")
 
+            self._invalidate_embedding_caches(key)
+
             logger.info(
                 f"Successfully {'encrypted and ' if is_encrypted else ''}stored credential: {key}"
             )
@@ -313,6 +318,8 @@ class CredentialService:
                 except Exception as e:
                     logger.error(f"Error invalidating LLM provider service cache: {e}")
 
+            self._invalidate_embedding_caches(key)
+
             logger.info(f"Successfully deleted credential: {key}")
             return True
 
@@ -590,6 +597,9 @@ async def initialize_credentials() -> None:
     # - USE_CONTEXTUAL_EMBEDDINGS
     # - CONTEXTUAL_EMBEDDINGS_MAX_WORKERS
     # - USE_HYBRID_SEARCH
+    # - HYBRID_SEARCH_MODE, HYBRID_RRF_K, HYBRID_VECTOR_WEIGHT,
+    #   HYBRID_KEYWORD_WEIGHT, HYBRID_CANDIDATE_COUNT
+    # - EMBEDDING_MAX_IN_FLIGHT, <PROVIDER>_EMBEDDING_MAX_IN_FLIGHT
     # - USE_AGENTIC_RAG
     # - USE_RERANKING
 
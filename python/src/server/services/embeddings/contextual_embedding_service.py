@@ -55,7 +55,9 @@ async def generate_contextual_embedding(
 
     try:
         # Use rate limiting before making the API call
-        async with threading_service.rate_limited_operation(estimated_tokens):
+        async with threading_service.rate_limited_operation(
+            estimated_tokens, provider=f"{provider or 'llm'}:chat"
+        ) as rate_limiter:
             async with get_llm_client(provider=provider) as client:
                 prompt = f"""<document>
 {full_document[:5000]}
@@ -83,7 +85,14 @@ Please give a short succinct context to situate this chunk within the overall do
                     "max_tokens": 1200 if requires_max_completion_tokens(model) else 200,  # Much more tokens for reasoning models (GPT-5 needs extra for reasoning process)
                 }
                 final_params = prepare_chat_completion_params(model, params)
-                response = await client.chat.completions.create(**final_params)
+                try:
+                    response = await client.chat.completions.create(**final_params)
+                except openai.RateLimitError as e:
+                    if rate_limiter is not None:
+                        rate_limiter.record_throttle(getattr(e.response, "headers", None))
+                    raise
+                if rate_limiter is not None:
+                    rate_limiter.record_success()
 
                 choice = response.choices[0] if response.choices else None
                 context, _, _ = extract_message_text(choice)
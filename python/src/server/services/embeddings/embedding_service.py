@@ -25,6 +25,10 @@ from .embedding_exceptions import (
     EmbeddingQuotaExhaustedError,
     EmbeddingRateLimitError,
 )
+from .query_embedding_cache import get_query_embedding_cache
+
+# Embedding requests kept in flight per provider unless EMBEDDING_MAX_IN_FLIGHT says otherwise
+DEFAULT_EMBEDDING_MAX_IN_FLIGHT = 4
 
 
 @dataclass
@@ -71,6 +75,9 @@ class EmbeddingBatchResult:
 class EmbeddingProviderAdapter(ABC):
     """Adapter interface for embedding providers."""
 
+    # Headers of the most recent provider response, when the adapter can see them
+    last_response_headers: Any = None
+
     @abstractmethod
     async def create_embeddings(
         self,
@@ -100,7 +107,13 @@ class OpenAICompatibleEmbeddingAdapter(EmbeddingProviderAdapter):
         if dimensions is not None:
             request_args["dimensions"] = dimensions
             
-        response = await self._client.embeddings.create(**request_args)
+        if isinstance(self._client, openai.AsyncOpenAI):
+            # Raw response exposes the rate-limit headers the limiter learns from
+            raw_response = await self._client.embeddings.with_raw_response.create(**request_args)
+            self.last_response_headers = raw_response.headers
+            response = raw_response.parse()
+        else:
+            response = await self._client.embeddings.create(**request_args)
         return [item.embedding for item in response.data]
 
 
@@ -293,6 +306,49 @@ async def create_embedding(text: str, provider: str | None = None) -> list[float
             )
 
 
+async def create_query_embedding(query: str, provider: str | None = None) -> list[float]:
+    """
+    Create an embedding for a search query, reusing cached vectors for repeated queries.
+
+    The cache key includes provider, model and dimensions, so vectors are never reused
+    across embedding configurations. Falls back to an uncached call if the active
+    embedding configuration cannot be resolved.
+
+    Args:
+        query: Search query to embed
+        provider: Optional provider override
+
+    Returns:
+        List of floats representing the embedding
+    """
+    cache = get_query_embedding_cache()
+    if not cache.enabled:
+        return await create_embedding(query, provider=provider)
+
+    try:
+        embedding_config = await _maybe_await(
+            credential_service.get_active_provider(service_type="embedding")
+        )
+        embedding_provider = provider or embedding_config.get("provider") or "openai"
+        embedding_model = await get_embedding_model(provider=embedding_provider)
+        rag_settings = await _maybe_await(
+            credential_service.get_credentials_by_category("rag_strategy")
+        )
+        embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
+        cache_key = cache.make_key(embedding_provider, embedding_model, embedding_dimensions, query)
+    except Exception as e:
+        search_logger.warning(f"Could not resolve embedding config for query cache: {e}")
+        return await create_embedding(query, provider=provider)
+
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    embedding = await create_embedding(query, provider=provider)
+    await cache.set(cache_key, embedding)
+    return embedding
+
+
 async def create_embeddings_batch(
     texts: list[str],
     progress_callback: Any | None = None,
@@ -346,6 +402,10 @@ async def create_embeddings_batch(
     texts = validated_texts
     threading_service = get_threading_service()
 
+    # Per-batch outcomes, merged in input order once every batch has finished
+    batch_outcomes: dict[int, tuple[list[tuple[str, list[float]]], list[tuple[str, Exception]]]] = {}
+    batch_ranges: list[tuple[int, int]] = []
+
     with safe_span(
         "create_embeddings_batch", text_count=len(texts), total_chars=sum(len(t) for t in texts)
     ) as span:
@@ -365,147 +425,172 @@ async def create_embeddings_batch(
 
             search_logger.info(f"Using embedding provider: '{embedding_provider}' (from EMBEDDING_PROVIDER setting)")
             async with get_llm_client(provider=embedding_provider, use_embedding_provider=True) as client:
-                # Load batch size and dimensions from settings
+                # Load batch size, dimensions and concurrency from settings
                 try:
                     rag_settings = await _maybe_await(
                         credential_service.get_credentials_by_category("rag_strategy")
                     )
                     batch_size = int(rag_settings.get("EMBEDDING_BATCH_SIZE", "100"))
                     embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
+                    max_in_flight = _get_max_in_flight(rag_settings, embedding_provider)
                 except Exception as e:
                     search_logger.warning(f"Failed to load embedding settings: {e}, using defaults")
                     batch_size = 100
                     embedding_dimensions = 1536
+                    max_in_flight = DEFAULT_EMBEDDING_MAX_IN_FLIGHT
 
-                total_tokens_used = 0
                 adapter = _get_embedding_adapter(embedding_provider, client)
                 dimensions_to_use = embedding_dimensions if embedding_dimensions > 0 else None
+                limiter_key = f"{embedding_provider}:embeddings"
+                threading_service.get_rate_limiter(limiter_key, max_concurrent=max_in_flight)
+
+                batch_ranges = [
+                    (start, min(start + batch_size, len(texts))) for start in range(0, len(texts), batch_size)
+                ]
+                span.set_attribute("batch_count", len(batch_ranges))
+                span.set_attribute("max_in_flight", max_in_flight)
+
+                in_flight = asyncio.Semaphore(max_in_flight)
+                quota_exhausted: EmbeddingQuotaExhaustedError | None = None
+                total_tokens_used = 0.0
+                completed_tokens = 0.0
+                processed_count = 0
+                failed_count = 0
+
+                async def embed_batch(batch_index: int, batch: list[str]) -> None:
+                    """Embed one batch under the rate limiter, retrying rate-limit errors."""
+                    nonlocal quota_exhausted, total_tokens_used, completed_tokens
+
+                    # Estimate tokens for this batch
+                    batch_tokens = sum(len(text.split()) for text in batch) * 1.3
+
+                    # Create rate limit progress callback if we have a progress callback
+                    rate_limit_callback = None
+                    if progress_callback:
+                        async def rate_limit_callback(data: dict):
+                            # Send heartbeat during rate limit wait
+                            message = f"Rate limited: {data.get('message', 'Waiting...')}"
+                            await progress_callback(message, (processed_count / len(texts)) * 100)
+
+                    async with threading_service.rate_limited_operation(
+                        batch_tokens, rate_limit_callback, provider=limiter_key
+                    ) as rate_limiter:
+                        retry_count = 0
+                        max_retries = 3
+
+                        while retry_count < max_retries:
+                            if quota_exhausted is not None:
+                                raise quota_exhausted
+
+                            try:
+                                # Create embeddings for this batch
+                                embedding_model = await get_embedding_model(provider=embedding_provider)
+                                embeddings = await adapter.create_embeddings(
+                                    batch,
+                                    embedding_model,
+                                    dimensions=dimensions_to_use,
+                                )
 
-                for i in range(0, len(texts), batch_size):
-                    batch = texts[i : i + batch_size]
-                    batch_index = i // batch_size
-
-                    try:
-                        # Estimate tokens for this batch
-                        batch_tokens = sum(len(text.split()) for text in batch) * 1.3
-                        total_tokens_used += batch_tokens
-
-                        # Create rate limit progress callback if we have a progress callback
-                        rate_limit_callback = None
-                        if progress_callback:
-                            async def rate_limit_callback(data: dict):
-                                # Send heartbeat during rate limit wait
-                                processed = result.success_count + result.failure_count
-                                message = f"Rate limited: {data.get('message', 'Waiting...')}"
-                                await progress_callback(message, (processed / len(texts)) * 100)
-
-                        # Rate limit each batch
-                        async with threading_service.rate_limited_operation(batch_tokens, rate_limit_callback):
-                            retry_count = 0
-                            max_retries = 3
-
-                            while retry_count < max_retries:
-                                try:
-                                    # Create embeddings for this batch
-                                    embedding_model = await get_embedding_model(provider=embedding_provider)
-                                    embeddings = await adapter.create_embeddings(
-                                        batch,
-                                        embedding_model,
-                                        dimensions=dimensions_to_use,
-                                    )
-
-                                    for text, vector in zip(batch, embeddings, strict=False):
-                                        result.add_success(vector, text)
-
-                                    break  # Success, exit retry loop
-
-                                except openai.RateLimitError as e:
-                                    error_message = str(e)
-                                    if "insufficient_quota" in error_message:
-                                        # Quota exhausted is critical - stop everything
-                                        tokens_so_far = total_tokens_used - batch_tokens
-                                        cost_so_far = (tokens_so_far / 1_000_000) * 0.02
-
+                                batch_outcomes[batch_index] = (
+                                    list(zip(batch, embeddings, strict=False)),
+                                    [],
+                                )
+                                total_tokens_used += batch_tokens
+                                completed_tokens += batch_tokens
+                                if rate_limiter is not None:
+                                    rate_limiter.record_success(adapter.last_response_headers)
+                                return
+
+                            except openai.RateLimitError as e:
+                                error_message = str(e)
+                                if "insufficient_quota" in error_message:
+                                    # Quota exhausted is critical - stop every batch not yet sent
+                                    if quota_exhausted is None:
                                         search_logger.error(
                                             f"⚠️ QUOTA EXHAUSTED at batch {batch_index}! "
-                                            f"Processed {result.success_count} texts successfully.",
+                                            f"Processed {processed_count} texts before it.",
                                             exc_info=True,
                                         )
-
-                                        # Add remaining texts as failures
-                                        for text in texts[i:]:
-                                            result.add_failure(
-                                                text,
-                                                EmbeddingQuotaExhaustedError(
-                                                    "OpenAI quota exhausted",
-                                                    tokens_used=tokens_so_far,
-                                                ),
-                                                batch_index,
-                                            )
-
-                                        # Return what we have so far
-                                        span.set_attribute("quota_exhausted", True)
-                                        span.set_attribute("partial_success", True)
-                                        return result
-
-                                    else:
-                                        # Regular rate limit - retry
-                                        retry_count += 1
-                                        if retry_count < max_retries:
-                                            wait_time = 2**retry_count
-                                            search_logger.warning(
-                                                f"Rate limit hit for batch {batch_index}, "
-                                                f"waiting {wait_time}s before retry {retry_count}/{max_retries}"
-                                            )
-                                            await asyncio.sleep(wait_time)
-                                        else:
-                                            raise  # Will be caught by outer try
-                                except EmbeddingRateLimitError as e:
-                                    retry_count += 1
-                                    if retry_count < max_retries:
-                                        wait_time = 2**retry_count
-                                        search_logger.warning(
-                                            f"Embedding rate limit for batch {batch_index}: {e}. "
-                                            f"Waiting {wait_time}s before retry {retry_count}/{max_retries}"
+                                        quota_exhausted = EmbeddingQuotaExhaustedError(
+                                            "OpenAI quota exhausted",
+                                            tokens_used=completed_tokens,
                                         )
-                                        await asyncio.sleep(wait_time)
-                                    else:
-                                        raise
-
-                    except Exception as e:
-                        # This batch failed - track failures but continue with next batch
-                        search_logger.error(f"Batch {batch_index} failed: {e}", exc_info=True)
-
-                        for text in batch:
-                            if isinstance(e, EmbeddingError):
-                                result.add_failure(text, e, batch_index)
-                            else:
-                                result.add_failure(
-                                    text,
-                                    EmbeddingAPIError(
+                                    raise quota_exhausted from e
+
+                                # Regular rate limit - back off (honouring Retry-After) and retry
+                                retry_count += 1
+                                wait_time = 2**retry_count
+                                if rate_limiter is not None:
+                                    wait_time = rate_limiter.record_throttle(
+                                        getattr(e.response, "headers", None)
+                                    )
+                                if retry_count < max_retries:
+                                    search_logger.warning(
+                                        f"Rate limit hit for batch {batch_index}, "
+                                        f"waiting {wait_time}s before retry {retry_count}/{max_retries}"
+                                    )
+                                    await asyncio.sleep(wait_time)
+                                else:
+                                    raise  # Will be caught by run_batch
+                            except EmbeddingRateLimitError as e:
+                                retry_count += 1
+                                wait_time = 2**retry_count
+                                if rate_limiter is not None:
+                                    wait_time = rate_limiter.record_throttle()
+                                if retry_count < max_retries:
+                                    search_logger.warning(
+                                        f"Embedding rate limit for batch {batch_index}: {e}. "
+                                        f"Waiting {wait_time}s before retry {retry_count}/{max_retries}"
+                                    )
+                                    await asyncio.sleep(wait_time)
+                                else:
+                                    raise
+
+                async def run_batch(batch_index: int, start: int, end: int) -> None:
+                    nonlocal processed_count, failed_count
+                    batch = texts[start:end]
+
+                    async with in_flight:
+                        try:
+                            if quota_exhausted is not None:
+                                raise quota_exhausted
+                            await embed_batch(batch_index, batch)
+                        except Exception as e:
+                            # This batch failed - track failures but let the other batches finish
+                            if not isinstance(e, EmbeddingQuotaExhaustedError):
+                                search_logger.error(f"Batch {batch_index} failed: {e}", exc_info=True)
+                                if not isinstance(e, EmbeddingError):
+                                    e = EmbeddingAPIError(
                                         f"Failed to create embedding: {str(e)}", original_error=e
-                                    ),
-                                    batch_index,
-                                )
+                                    )
+                            batch_outcomes[batch_index] = ([], [(text, e) for text in batch])
+                            failed_count += len(batch)
+
+                    processed_count += len(batch)
 
                     # Progress reporting
                     if progress_callback:
-                        processed = result.success_count + result.failure_count
-                        progress = (processed / len(texts)) * 100
+                        progress = (processed_count / len(texts)) * 100
 
-                        message = f"Processed {processed}/{len(texts)} texts"
-                        if result.has_failures:
-                            message += f" ({result.failure_count} failed)"
+                        message = f"Processed {processed_count}/{len(texts)} texts"
+                        if failed_count:
+                            message += f" ({failed_count} failed)"
 
                         await progress_callback(message, progress)
 
-                    # Yield control
-                    await asyncio.sleep(0.01)
+                await asyncio.gather(
+                    *(run_batch(index, start, end) for index, (start, end) in enumerate(batch_ranges))
+                )
+
+                _merge_batch_outcomes(result, batch_outcomes)
 
                 span.set_attribute("embeddings_created", result.success_count)
                 span.set_attribute("embeddings_failed", result.failure_count)
                 span.set_attribute("success", not result.has_failures)
                 span.set_attribute("total_tokens_used", total_tokens_used)
+                if quota_exhausted is not None:
+                    span.set_attribute("quota_exhausted", True)
+                    span.set_attribute("partial_success", result.success_count > 0)
 
                 return result
 
@@ -514,16 +599,47 @@ async def create_embeddings_batch(
             span.set_attribute("catastrophic_failure", True)
             search_logger.error(f"Catastrophic failure in batch embedding: {e}", exc_info=True)
 
-            # Mark remaining texts as failed
-            processed_count = result.success_count + result.failure_count
-            for text in texts[processed_count:]:
-                result.add_failure(
-                    text, EmbeddingAPIError(f"Catastrophic failure: {str(e)}", original_error=e)
-                )
+            # Keep finished batches and mark every other text as failed
+            _merge_batch_outcomes(result, batch_outcomes)
+            unfinished = [
+                texts[start:end]
+                for batch_index, (start, end) in enumerate(batch_ranges)
+                if batch_index not in batch_outcomes
+            ] if batch_ranges else [texts]
+            for batch in unfinished:
+                for text in batch:
+                    result.add_failure(
+                        text, EmbeddingAPIError(f"Catastrophic failure: {str(e)}", original_error=e)
+                    )
 
             return result
 
 
+def _get_max_in_flight(rag_settings: dict[str, Any], provider: str) -> int:
+    """
+    Maximum concurrent embedding requests for a provider.
+
+    <PROVIDER>_EMBEDDING_MAX_IN_FLIGHT overrides EMBEDDING_MAX_IN_FLIGHT.
+    """
+    value = rag_settings.get(f"{provider.upper()}_EMBEDDING_MAX_IN_FLIGHT") or rag_settings.get(
+        "EMBEDDING_MAX_IN_FLIGHT", DEFAULT_EMBEDDING_MAX_IN_FLIGHT
+    )
+    return max(1, int(value))
+
+
+def _merge_batch_outcomes(
+    result: EmbeddingBatchResult,
+    batch_outcomes: dict[int, tuple[list[tuple[str, list[float]]], list[tuple[str, Exception]]]],
+) -> None:
+    """Add per-batch successes and failures to the result in input order."""
+    for batch_index in sorted(batch_outcomes):
+        successes, failures = batch_outcomes[batch_index]
+        for text, vector in successes:
+            result.add_success(vector, text)
+        for text, error in failures:
+            result.add_failure(text, error, batch_index)
+
+
 # Deprecated functions - kept for backward compatibility
 async def get_openai_api_key() -> str | None:
     """
@@ -0,0 +1,192 @@
+"""
+Query Embedding Cache
+
+Bounded LRU cache with TTL for search query embeddings. AI coding assistants re-issue
+the same queries constantly, so caching query vectors saves a provider round trip per
+repeat. Entries are keyed by (provider, model, dimensions, normalized query) so a model
+change can never serve stale vectors.
+
+An optional SQLite-backed disk tier (QUERY_EMBEDDING_CACHE_PATH) keeps vectors across
+restarts. It is consulted on memory misses and populated on every insert.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+from ...config.logfire_config import search_logger
+
+QueryEmbeddingKey = tuple[str, str, int, str]
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups (unicode form and whitespace only)."""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+class QueryEmbeddingCache:
+    """In-memory LRU cache of query embeddings with TTL and an optional disk tier."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, disk_path: str | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self._entries: OrderedDict[QueryEmbeddingKey, tuple[list[float], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_initialized = False
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, dimensions: int, query: str) -> QueryEmbeddingKey:
+        return ((provider or "").lower(), model or "", int(dimensions or 0), normalize_query(query))
+
+    async def get(self, key: QueryEmbeddingKey) -> list[float] | None:
+        """Look up a query embedding, checking memory first and then the disk tier."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, stored_at = entry
+                if now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+
+        if self.disk_path:
+            disk_entry = await asyncio.to_thread(self._disk_get, key)
+            if disk_entry is not None and now - disk_entry[1] < self.ttl_seconds:
+                self._put_memory(key, disk_entry[0], disk_entry[1])
+                with self._lock:
+                    self.disk_hits += 1
+                return disk_entry[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def set(self, key: QueryEmbeddingKey, vector: list[float]) -> None:
+        """Store a query embedding in memory and, if configured, on disk."""
+        if not self.enabled or not vector:
+            return
+        stored_at = time.time()
+        self._put_memory(key, vector, stored_at)
+        if self.disk_path:
+            await asyncio.to_thread(self._disk_set, key, vector, stored_at)
+
+    def clear(self) -> None:
+        """Drop every cached vector from both tiers."""
+        with self._lock:
+            self._entries.clear()
+        if self.disk_path:
+            try:
+                with self._disk_lock, self._connect() as conn:
+                    conn.execute("DELETE FROM query_embeddings")
+            except Exception as e:
+                search_logger.warning(f"Failed to clear query embedding disk cache: {e}")
+        search_logger.info("Query embedding cache cleared")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache size and hit-rate metrics."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": bool(self.disk_path),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def _put_memory(self, key: QueryEmbeddingKey, vector: list[float], stored_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (vector, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.disk_path)
+        if not self._disk_initialized:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    cache_key TEXT PRIMARY KEY,
+                    embedding TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+            self._disk_initialized = True
+        return conn
+
+    def _disk_get(self, key: QueryEmbeddingKey) -> tuple[list[float], float] | None:
+        try:
+            with self._disk_lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT embedding, stored_at FROM query_embeddings WHERE cache_key = ?",
+                    (json.dumps(key),),
+                ).fetchone()
+            if row is None:
+                return None
+            return json.loads(row[0]), row[1]
+        except Exception as e:
+            search_logger.warning(f"Query embedding disk cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key: QueryEmbeddingKey, vector: list[float], stored_at: float) -> None:
+        try:
+            with self._disk_lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (cache_key, embedding, stored_at) VALUES (?, ?, ?)",
+                    (json.dumps(key), json.dumps(vector), stored_at),
+                )
+                conn.execute(
+                    "DELETE FROM query_embeddings WHERE stored_at < ?",
+                    (stored_at - self.ttl_seconds,),
+                )
+        except Exception as e:
+            search_logger.warning(f"Query embedding disk cache write failed: {e}")
+
+
+# Global cache instance
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get the global query embedding cache, creating it from environment settings on first use."""
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        _query_embedding_cache = QueryEmbeddingCache(
+            max_entries=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600")),
+            disk_path=os.getenv("QUERY_EMBEDDING_CACHE_PATH") or None,
+        )
+    return _query_embedding_cache
+
+
+def clear_query_embedding_cache() -> None:
+    """Clear the global query embedding cache (e.g. after the embedding model changes)."""
+    if _query_embedding_cache is not None:
+        _query_embedding_cache.clear()
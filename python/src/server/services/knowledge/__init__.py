@@ -9,6 +9,7 @@ from .knowledge_folder_service import KnowledgeFolderService
 from .knowledge_item_service import KnowledgeItemService
 from .knowledge_summary_service import KnowledgeSummaryService
 from .knowledge_tag_service import KnowledgeTagService
+from .source_stats_service import SourceStatsService
 
 __all__ = [
     "KnowledgeItemService",
@@ -17,4 +18,5 @@ __all__ = [
     "KnowledgeFolderService",
     "KnowledgeTagService",
     "AutoTaggingService",
+    "SourceStatsService",
 ]
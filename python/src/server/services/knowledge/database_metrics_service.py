@@ -2,12 +2,52 @@
 Database Metrics Service
 
 Handles retrieval of database statistics and metrics.
+
+Row counts are requested as HEAD-only queries, so no rows (or embeddings) leave
+the database. By default they use PostgREST's "estimated" count - exact for small
+tables, planner estimates for large ones - and are served from a snapshot that is
+refreshed at most every DATABASE_METRICS_TTL seconds (default 60). Callers that
+need precise numbers can ask for exact mode, which always counts server-side.
 """
 
+import asyncio
+import os
+import time
+from collections.abc import Collection
 from datetime import datetime
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from ..client_manager import execute_async
+
+# Metric name -> table counted for get_metrics()
+KNOWLEDGE_TABLES = {
+    "sources_count": "archon_sources",
+    "pages_count": "archon_crawled_pages",
+    "code_examples_count": "archon_code_examples",
+}
+# Metrics reported as 0 when their table can't be counted (e.g. not migrated yet)
+OPTIONAL_KNOWLEDGE_METRICS = ("code_examples_count",)
+
+# Snapshot key -> (payload, refreshed_at)
+_snapshots: dict[str, tuple[dict[str, Any], float]] = {}
+_snapshot_lock: asyncio.Lock | None = None
+
+
+def _ensure_snapshot_lock() -> asyncio.Lock:
+    global _snapshot_lock
+    if _snapshot_lock is None:
+        _snapshot_lock = asyncio.Lock()
+    return _snapshot_lock
+
+
+def _snapshot_ttl() -> float:
+    return float(os.getenv("DATABASE_METRICS_TTL", "60"))
+
+
+def clear_metrics_snapshot() -> None:
+    """Drop cached metrics so the next request recomputes them."""
+    _snapshots.clear()
 
 
 class DatabaseMetricsService:
@@ -24,41 +64,92 @@ class DatabaseMetricsService:
         """
         self.supabase = supabase_client
 
-    async def get_metrics(self) -> dict[str, Any]:
+    async def count_rows(self, table: str, exact: bool = False) -> int:
+        """
+        Count a table's rows without transferring them.
+
+        Args:
+            table: Table name
+            exact: Use an exact count instead of PostgREST's estimate
+
+        Returns:
+            Row count (0 if PostgREST returned none)
+        """
+        response = await execute_async(
+            self.supabase.table(table).select("*", count="exact" if exact else "estimated", head=True)
+        )
+        return response.count if response.count and response.count > 0 else 0
+
+    async def get_table_counts(
+        self, tables: dict[str, str], exact: bool = False, optional: Collection[str] = ()
+    ) -> dict[str, int]:
+        """
+        Count several tables concurrently.
+
+        Estimated counts are served from the snapshot; exact counts are always fresh.
+
+        Args:
+            tables: Mapping of result key -> table name
+            exact: Use exact counts instead of estimates
+            optional: Result keys counted as 0 when their count fails
+
+        Returns:
+            Mapping of result key -> row count
+        """
+
+        async def build() -> dict[str, int]:
+            results = await asyncio.gather(
+                *(self.count_rows(table, exact=exact) for table in tables.values()),
+                return_exceptions=True,
+            )
+            counts = {}
+            for key, result in zip(tables, results, strict=True):
+                if isinstance(result, BaseException):
+                    if key not in optional or not isinstance(result, Exception):
+                        raise result
+                    safe_logfire_error(f"Failed to count {tables[key]} | error={str(result)}")
+                    result = 0
+                counts[key] = result
+            return counts
+
+        if exact:
+            return await build()
+        counts = await self._get_snapshot("counts:" + ",".join(tables.values()), build)
+        return dict(counts)
+
+    async def _get_snapshot(self, key: str, build) -> dict[str, Any]:
+        """Return the cached payload for key, rebuilding it once it is older than the TTL."""
+        cached = _snapshots.get(key)
+        if cached and time.time() - cached[1] < _snapshot_ttl():
+            return cached[0]
+
+        async with _ensure_snapshot_lock():
+            # Another request may have refreshed it while we waited
+            cached = _snapshots.get(key)
+            if cached and time.time() - cached[1] < _snapshot_ttl():
+                return cached[0]
+            payload = await build()
+            _snapshots[key] = (payload, time.time())
+            return payload
+
+    async def get_metrics(self, exact: bool = False) -> dict[str, Any]:
         """
         Get database metrics and statistics.
 
+        Args:
+            exact: Count rows exactly (server-side) instead of using the cached estimates
+
         Returns:
             Dictionary containing database metrics
         """
         try:
-            safe_logfire_info("Getting database metrics")
+            safe_logfire_info(f"Getting database metrics | exact={exact}")
 
             # Get counts from various tables
-            metrics = {}
-
-            # Sources count
-            sources_result = (
-                self.supabase.table("archon_sources").select("*", count="exact").execute()
-            )
-            metrics["sources_count"] = sources_result.count if sources_result.count else 0
-
-            # Crawled pages count
-            pages_result = (
-                self.supabase.table("archon_crawled_pages").select("*", count="exact").execute()
+            metrics: dict[str, Any] = await self.get_table_counts(
+                KNOWLEDGE_TABLES, exact=exact, optional=OPTIONAL_KNOWLEDGE_METRICS
             )
-            metrics["pages_count"] = pages_result.count if pages_result.count else 0
-
-            # Code examples count
-            try:
-                code_examples_result = (
-                    self.supabase.table("archon_code_examples").select("*", count="exact").execute()
-                )
-                metrics["code_examples_count"] = (
-                    code_examples_result.count if code_examples_result.count else 0
-                )
-            except:
-                metrics["code_examples_count"] = 0
+            metrics["count_mode"] = "exact" if exact else "estimated"
 
             # Add timestamp
             metrics["timestamp"] = datetime.now().isoformat()
@@ -84,40 +175,43 @@ class DatabaseMetricsService:
         """
         Get storage statistics including sizes and counts by type.
 
+        Served from the periodically refreshed snapshot.
+
         Returns:
             Dictionary containing storage statistics
         """
         try:
-            stats = {}
+            return await self._get_snapshot("storage_statistics", self._build_storage_statistics)
 
-            # Get knowledge type distribution
-            knowledge_types_result = (
-                self.supabase.table("archon_sources").select("metadata->knowledge_type").execute()
-            )
+        except Exception as e:
+            safe_logfire_error(f"Failed to get storage statistics | error={str(e)}")
+            return {}
 
-            if knowledge_types_result.data:
-                type_counts = {}
-                for row in knowledge_types_result.data:
-                    ktype = row.get("knowledge_type", "unknown")
-                    type_counts[ktype] = type_counts.get(ktype, 0) + 1
-                stats["knowledge_type_distribution"] = type_counts
+    async def _build_storage_statistics(self) -> dict[str, Any]:
+        stats = {}
 
+        # Get knowledge type distribution
+        knowledge_types_result, recent_sources = await asyncio.gather(
+            execute_async(self.supabase.table("archon_sources").select("metadata->knowledge_type")),
             # Get recent activity
-            recent_sources = (
+            execute_async(
                 self.supabase.table("archon_sources")
                 .select("source_id, created_at")
                 .order("created_at", desc=True)
                 .limit(5)
-                .execute()
-            )
-
-            stats["recent_sources"] = [
-                {"source_id": s["source_id"], "created_at": s["created_at"]}
-                for s in (recent_sources.data or [])
-            ]
-
-            return stats
-
-        except Exception as e:
-            safe_logfire_error(f"Failed to get storage statistics | error={str(e)}")
-            return {}
+            ),
+        )
+
+        if knowledge_types_result.data:
+            type_counts = {}
+            for row in knowledge_types_result.data:
+                ktype = row.get("knowledge_type", "unknown")
+                type_counts[ktype] = type_counts.get(ktype, 0) + 1
+            stats["knowledge_type_distribution"] = type_counts
+
+        stats["recent_sources"] = [
+            {"source_id": s["source_id"], "created_at": s["created_at"]}
+            for s in (recent_sources.data or [])
+        ]
+
+        return stats
@@ -7,6 +7,8 @@ Handles all knowledge item CRUD operations and data transformations.
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from ..client_manager import execute_async
+from .source_stats_service import SourceStatsService
 
 
 class KnowledgeItemService:
@@ -96,7 +98,7 @@ class KnowledgeItemService:
                     f"title.ilike.{search_pattern},summary.ilike.{search_pattern},source_id.ilike.{search_pattern}"
                 )
 
-            count_result = count_query.execute()
+            count_result = await execute_async(count_query)
             total = count_result.count if hasattr(count_result, "count") else 0
 
             # Apply pagination at database level
@@ -104,7 +106,7 @@ class KnowledgeItemService:
             query = query.range(start_idx, start_idx + per_page - 1)
 
             # Execute query
-            result = query.execute()
+            result = await execute_async(query)
             sources = result.data if result.data else []
 
             # Get source IDs for batch queries
@@ -113,45 +115,8 @@ class KnowledgeItemService:
             # Debug log source IDs
             safe_logfire_info(f"Source IDs for batch query: {source_ids}")
 
-            # Batch fetch related data to avoid N+1 queries
-            first_urls = {}
-            code_example_counts = {}
-            chunk_counts = {}
-
-            if source_ids:
-                # Batch fetch first URLs
-                urls_result = (
-                    self.supabase.from_("archon_crawled_pages")
-                    .select("source_id, url")
-                    .in_("source_id", source_ids)
-                    .execute()
-                )
-
-                # Group URLs by source_id (take first one for each)
-                for item in urls_result.data or []:
-                    if item["source_id"] not in first_urls:
-                        first_urls[item["source_id"]] = item["url"]
-
-                # Get code example counts per source - NO CONTENT, just counts!
-                # Fetch counts individually for each source
-                for source_id in source_ids:
-                    count_result = (
-                        self.supabase.from_("archon_code_examples")
-                        .select("id", count="exact", head=True)
-                        .eq("source_id", source_id)
-                        .execute()
-                    )
-                    code_example_counts[source_id] = (
-                        count_result.count if hasattr(count_result, "count") else 0
-                    )
-
-                # Ensure all sources have a count (default to 0)
-                for source_id in source_ids:
-                    if source_id not in code_example_counts:
-                        code_example_counts[source_id] = 0
-                    chunk_counts[source_id] = 0  # Default to 0 to avoid timeout
-
-                safe_logfire_info(f"Code example counts: {code_example_counts}")
+            # Per-source counters (and first URL) in one grouped query
+            source_stats = await SourceStatsService(self.supabase).get_stats(source_ids)
 
             # Transform sources to items with batched data
             items = []
@@ -159,16 +124,19 @@ class KnowledgeItemService:
                 source_id = source["source_id"]
                 source_metadata = source.get("metadata", {})
 
+                stats = source_stats[source_id]
+
                 # Use the original source_url from the source record (the URL the user entered)
                 # Fall back to first crawled page URL, then to source:// format as last resort
                 source_url = source.get("source_url")
                 if source_url:
                     display_url = source_url
                 else:
-                    display_url = first_urls.get(source_id, f"source://{source_id}")
-                
-                code_examples_count = code_example_counts.get(source_id, 0)
-                chunks_count = chunk_counts.get(source_id, 0)
+                    display_url = stats["first_url"] or f"source://{source_id}"
+
+                code_examples_count = stats["code_examples_count"]
+                chunks_count = stats["chunks_count"]
+                word_count = stats["word_count"] or source.get("total_word_count", 0)
 
                 # Determine source type - use display_url for type detection
                 source_type = self._determine_source_type(source_metadata, display_url)
@@ -191,10 +159,10 @@ class KnowledgeItemService:
                             "description", source.get("summary", "")
                         ),
                         "chunks_count": chunks_count,
-                        "word_count": source.get("total_word_count", 0),
-                        "estimated_pages": round(source.get("total_word_count", 0) / 250, 1),
-                        "pages_tooltip": f"{round(source.get('total_word_count', 0) / 250, 1)} pages (≈ {source.get('total_word_count', 0):,} words)",
-                        "last_scraped": source.get("updated_at"),
+                        "word_count": word_count,
+                        "estimated_pages": round(word_count / 250, 1),
+                        "pages_tooltip": f"{round(word_count / 250, 1)} pages (≈ {word_count:,} words)",
+                        "last_scraped": stats["last_crawled_at"] or source.get("updated_at"),
                         "file_name": source_metadata.get("file_name"),
                         "file_type": source_metadata.get("file_type"),
                         "update_frequency": source_metadata.get("update_frequency", 7),
@@ -236,12 +204,11 @@ class KnowledgeItemService:
             safe_logfire_info(f"Getting knowledge item | source_id={source_id}")
 
             # Get the source record
-            result = (
+            result = await execute_async(
                 self.supabase.from_("archon_sources")
                 .select("*")
                 .eq("source_id", source_id)
                 .single()
-                .execute()
             )
 
             if not result.data:
@@ -295,11 +262,10 @@ class KnowledgeItemService:
 
             if metadata_updates:
                 # Get current metadata
-                current_response = (
+                current_response = await execute_async(
                     self.supabase.table("archon_sources")
                     .select("metadata")
                     .eq("source_id", source_id)
-                    .execute()
                 )
                 if current_response.data:
                     current_metadata = current_response.data[0].get("metadata", {})
@@ -309,11 +275,10 @@ class KnowledgeItemService:
                     update_data["metadata"] = metadata_updates
 
             # Perform the update
-            result = (
+            result = await execute_async(
                 self.supabase.table("archon_sources")
                 .update(update_data)
                 .eq("source_id", source_id)
-                .execute()
             )
 
             if result.data:
@@ -342,7 +307,7 @@ class KnowledgeItemService:
         """
         try:
             # Query the sources table
-            result = self.supabase.from_("archon_sources").select("*").order("source_id").execute()
+            result = await execute_async(self.supabase.from_("archon_sources").select("*").order("source_id"))
 
             # Format the sources
             sources = []
@@ -425,12 +390,11 @@ class KnowledgeItemService:
     async def _get_first_page_url(self, source_id: str) -> str:
         """Get the first page URL for a source."""
         try:
-            pages_response = (
+            pages_response = await execute_async(
                 self.supabase.from_("archon_crawled_pages")
                 .select("url")
                 .eq("source_id", source_id)
                 .limit(1)
-                .execute()
             )
 
             if pages_response.data:
@@ -444,11 +408,10 @@ class KnowledgeItemService:
     async def _get_code_examples(self, source_id: str) -> list[dict[str, Any]]:
         """Get code examples for a source."""
         try:
-            code_examples_response = (
+            code_examples_response = await execute_async(
                 self.supabase.from_("archon_code_examples")
                 .select("id, content, summary, metadata")
                 .eq("source_id", source_id)
-                .execute()
             )
 
             return code_examples_response.data if code_examples_response.data else []
@@ -485,16 +448,8 @@ class KnowledgeItemService:
     async def _get_chunks_count(self, source_id: str) -> int:
         """Get the actual number of chunks for a source."""
         try:
-            # Count the actual rows in crawled_pages for this source
-            result = (
-                self.supabase.table("archon_crawled_pages")
-                .select("*", count="exact")
-                .eq("source_id", source_id)
-                .execute()
-            )
-
-            # Return the count of pages (chunks)
-            return result.count if result.count else 0
+            stats = await SourceStatsService(self.supabase).get_stats([source_id])
+            return stats[source_id]["chunks_count"]
 
         except Exception as e:
             # If we can't get chunk count, return 0
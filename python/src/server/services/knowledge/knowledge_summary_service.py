@@ -8,6 +8,8 @@ Optimized for frequent polling and card displays.
 from typing import Any, Optional
 
 from ...config.logfire_config import safe_logfire_info, safe_logfire_error
+from ..client_manager import execute_async
+from .source_stats_service import SourceStatsService
 
 
 class KnowledgeSummaryService:
@@ -81,7 +83,7 @@ class KnowledgeSummaryService:
                     f"title.ilike.{search_pattern},summary.ilike.{search_pattern}"
                 )
             
-            count_result = count_query.execute()
+            count_result = await execute_async(count_query)
             total = count_result.count if hasattr(count_result, "count") else 0
             
             # Apply pagination
@@ -90,7 +92,7 @@ class KnowledgeSummaryService:
             query = query.order("updated_at", desc=True)
             
             # Execute main query
-            result = query.execute()
+            result = await execute_async(query)
             sources = result.data if result.data else []
             
             # Get source IDs for batch operations
@@ -100,27 +102,23 @@ class KnowledgeSummaryService:
             summaries = []
             
             if source_ids:
-                # Get document counts in a single query
-                doc_counts = await self._get_document_counts_batch(source_ids)
-                
-                # Get code example counts in a single query
-                code_counts = await self._get_code_example_counts_batch(source_ids)
-                
-                # Get first URLs in a single query
-                first_urls = await self._get_first_urls_batch(source_ids)
-                
+                # Counts and first URLs for every source in a single query
+                source_stats = await SourceStatsService(self.supabase).get_stats(source_ids)
+
                 # Build summaries
                 for source in sources:
                     source_id = source["source_id"]
                     metadata = source.get("metadata", {})
                     
+                    stats = source_stats[source_id]
+
                     # Use the original source_url from the source record (the URL the user entered)
                     # Fall back to first crawled page URL, then to source:// format as last resort
                     source_url = source.get("source_url")
                     if source_url:
                         first_url = source_url
                     else:
-                        first_url = first_urls.get(source_id, f"source://{source_id}")
+                        first_url = stats["first_url"] or f"source://{source_id}"
                     
                     source_type = metadata.get("source_type", "file" if first_url.startswith("file://") else "url")
                     
@@ -138,8 +136,8 @@ class KnowledgeSummaryService:
                         "title": source.get("title", source.get("summary", "Untitled")),
                         "url": first_url,
                         "status": "active",  # Always active for now
-                        "document_count": doc_counts.get(source_id, 0),
-                        "code_examples_count": code_counts.get(source_id, 0),
+                        "document_count": stats["chunks_count"],
+                        "code_examples_count": stats["code_examples_count"],
                         "knowledge_type": knowledge_type,
                         "source_type": source_type,
                         "created_at": source.get("created_at"),
@@ -163,101 +161,3 @@ class KnowledgeSummaryService:
         except Exception as e:
             safe_logfire_error(f"Failed to get knowledge summaries | error={str(e)}")
             raise
-    
-    async def _get_document_counts_batch(self, source_ids: list[str]) -> dict[str, int]:
-        """
-        Get document counts for multiple sources in a single query.
-        
-        Args:
-            source_ids: List of source IDs
-            
-        Returns:
-            Dict mapping source_id to document count
-        """
-        try:
-            # Use a raw SQL query for efficient counting
-            # Group by source_id and count
-            counts = {}
-            
-            # For now, use individual queries but optimize later with raw SQL
-            for source_id in source_ids:
-                result = (
-                    self.supabase.from_("archon_crawled_pages")
-                    .select("id", count="exact", head=True)
-                    .eq("source_id", source_id)
-                    .execute()
-                )
-                counts[source_id] = result.count if hasattr(result, "count") else 0
-            
-            return counts
-            
-        except Exception as e:
-            safe_logfire_error(f"Failed to get document counts | error={str(e)}")
-            return {sid: 0 for sid in source_ids}
-    
-    async def _get_code_example_counts_batch(self, source_ids: list[str]) -> dict[str, int]:
-        """
-        Get code example counts for multiple sources efficiently.
-        
-        Args:
-            source_ids: List of source IDs
-            
-        Returns:
-            Dict mapping source_id to code example count
-        """
-        try:
-            counts = {}
-            
-            # For now, use individual queries but can optimize with raw SQL later
-            for source_id in source_ids:
-                result = (
-                    self.supabase.from_("archon_code_examples")
-                    .select("id", count="exact", head=True)
-                    .eq("source_id", source_id)
-                    .execute()
-                )
-                counts[source_id] = result.count if hasattr(result, "count") else 0
-            
-            return counts
-            
-        except Exception as e:
-            safe_logfire_error(f"Failed to get code example counts | error={str(e)}")
-            return {sid: 0 for sid in source_ids}
-    
-    async def _get_first_urls_batch(self, source_ids: list[str]) -> dict[str, str]:
-        """
-        Get first URL for each source in a batch.
-        
-        Args:
-            source_ids: List of source IDs
-            
-        Returns:
-            Dict mapping source_id to first URL
-        """
-        try:
-            # Get all first URLs in one query
-            result = (
-                self.supabase.from_("archon_crawled_pages")
-                .select("source_id, url")
-                .in_("source_id", source_ids)
-                .order("created_at", desc=False)
-                .execute()
-            )
-            
-            # Group by source_id, keeping first URL for each
-            urls = {}
-            for item in result.data or []:
-                source_id = item["source_id"]
-                if source_id not in urls:
-                    urls[source_id] = item["url"]
-            
-            # Provide defaults for any missing
-            for source_id in source_ids:
-                if source_id not in urls:
-                    urls[source_id] = f"source://{source_id}"
-            
-            return urls
-            
-        except Exception as e:
-            safe_logfire_error(f"Failed to get first URLs | error={str(e)}")
-            return {sid: f"source://{sid}" for sid in source_ids}
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Source Stats Service
+
+Reads the per-source counters in archon_source_stats (chunks, code examples,
+pages, word count, first URL and last crawl time). The counters are maintained
+by database triggers, so any number of sources is served by one grouped query.
+"""
+
+from typing import Any
+
+from ...config.logfire_config import safe_logfire_error
+from ..client_manager import execute_async
+
+SOURCE_STATS_COLUMNS = (
+    "source_id, chunks_count, code_examples_count, pages_count, word_count, first_url, last_crawled_at"
+)
+
+EMPTY_SOURCE_STATS = {
+    "chunks_count": 0,
+    "code_examples_count": 0,
+    "pages_count": 0,
+    "word_count": 0,
+    "first_url": None,
+    "last_crawled_at": None,
+}
+
+
+class SourceStatsService:
+    """
+    Service for reading trigger-maintained per-source counters.
+    """
+
+    def __init__(self, supabase_client):
+        """
+        Initialize the source stats service.
+
+        Args:
+            supabase_client: The Supabase client for database operations
+        """
+        self.supabase = supabase_client
+
+    async def get_stats(self, source_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get counters for several sources in a single query.
+
+        Args:
+            source_ids: List of source IDs
+
+        Returns:
+            Dict mapping every requested source_id to its counters (zeros when the
+            source has no stats row or the stats table is unavailable)
+        """
+        stats = {source_id: dict(EMPTY_SOURCE_STATS) for source_id in source_ids}
+        if not source_ids:
+            return stats
+
+        try:
+            result = await execute_async(
+                self.supabase.from_("archon_source_stats")
+                .select(SOURCE_STATS_COLUMNS)
+                .in_("source_id", source_ids)
+            )
+        except Exception as e:
+            safe_logfire_error(
+                f"Failed to get source stats (is migration 014_add_source_stats applied?) | error={str(e)}"
+            )
+            return stats
+
+        for row in result.data or []:
+            source_id = row.get("source_id")
+            if source_id in stats:
+                stats[source_id].update(
+                    {key: value for key, value in row.items() if key != "source_id" and value is not None}
+                )
+        return stats
+
+    async def refresh(self, source_id: str | None = None) -> None:
+        """Recompute counters from the underlying tables (all sources when source_id is None)."""
+        await execute_async(
+            self.supabase.rpc("refresh_archon_source_stats", {"p_source_id": source_id})
+        )
@@ -5,11 +5,17 @@ Provides a unified interface for creating OpenAI-compatible clients for differen
 Supports OpenAI, Ollama, and Google Gemini.
 """
 
+import asyncio
+import concurrent.futures
+import hashlib
 import inspect
+import os
 import time
+import weakref
 from contextlib import asynccontextmanager
 from typing import Any
 
+import httpx
 import openai
 
 from ..config.logfire_config import get_logger
@@ -147,14 +153,188 @@ def _set_cached_settings(key: str, value: Any) -> None:
         logger.error(f"Failed to cache settings for key {_sanitize_for_log(key)}: {e}")
 
 
+# Long-lived clients, per event loop (httpx pools are bound to the loop that opened them),
+# keyed by (provider, base_url, api key fingerprint)
+_client_pool: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Callers currently inside get_llm_client() per client, and evicted clients whose close
+# waits for their last caller. Both are only touched on the client's own loop.
+_client_users: dict[Any, int] = {}
+_retired_clients: dict[Any, str] = {}
+_closing_tasks: set[asyncio.Task | concurrent.futures.Future] = set()
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # httpx[http2] not installed
+    _HTTP2_AVAILABLE = False
+
+
+def _client_pool_key(provider: str, base_url: str | None, api_key: str | None) -> tuple[str, str, str]:
+    """Pool key; the API key is only kept as a fingerprint."""
+    fingerprint = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+    return provider, base_url or "", fingerprint
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """
+    Shared connection pool for one pooled client.
+
+    Limits come from LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS and
+    LLM_HTTP_KEEPALIVE_EXPIRY; HTTP/2 is used when h2 is installed unless LLM_HTTP2=false.
+    """
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60")),
+    )
+    http2 = _HTTP2_AVAILABLE and os.getenv("LLM_HTTP2", "true").lower() in ("true", "1", "yes", "on")
+    return openai.DefaultAsyncHttpxClient(http2=http2, limits=limits)
+
+
+def _get_pooled_client(provider: str, **client_kwargs: Any) -> Any:
+    """Return the pooled AsyncOpenAI client for these settings, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    clients = _client_pool.setdefault(loop, {})
+    key = _client_pool_key(provider, client_kwargs.get("base_url"), client_kwargs.get("api_key"))
+
+    client = clients.get(key)
+    if client is not None and client.is_closed() is not True:
+        logger.debug(f"Reusing pooled LLM client for provider: {_sanitize_for_log(provider)}")
+        return client
+
+    client = openai.AsyncOpenAI(**client_kwargs, http_client=_create_http_client())
+    clients[key] = client
+    return client
+
+
+async def _close_client(client: Any, provider: str) -> None:
+    """Close a client, logging rather than raising on failure."""
+    safe_provider = _sanitize_for_log(provider) if provider else "unknown"
+
+    try:
+        close_method = getattr(client, "aclose", None)
+        if callable(close_method):
+            if inspect.iscoroutinefunction(close_method):
+                await close_method()
+            else:
+                maybe_coro = close_method()
+                if inspect.isawaitable(maybe_coro):
+                    await maybe_coro
+        else:
+            close_method = getattr(client, "close", None)
+            if callable(close_method):
+                if inspect.iscoroutinefunction(close_method):
+                    await close_method()
+                else:
+                    close_result = close_method()
+                    if inspect.isawaitable(close_result):
+                        await close_result
+        logger.debug(f"Closed LLM client for provider: {safe_provider}")
+    except RuntimeError as close_error:
+        if "Event loop is closed" in str(close_error):
+            logger.error(
+                f"Failed to close LLM client cleanly for provider {safe_provider}: event loop already closed",
+                exc_info=True,
+            )
+        else:
+            logger.error(
+                f"Runtime error closing LLM client for provider {safe_provider}: {close_error}",
+                exc_info=True,
+            )
+    except Exception as close_error:
+        logger.error(
+            f"Unexpected error while closing LLM client for provider {safe_provider}: {close_error}",
+            exc_info=True,
+        )
+
+
+async def _retire_client(client: Any, provider: str) -> None:
+    """Close an evicted client now, or once its last caller releases it."""
+    if _client_users.get(client):
+        _retired_clients[client] = provider
+    else:
+        await _close_client(client, provider)
+
+
+def _schedule_on_loop(loop: asyncio.AbstractEventLoop, coro: Any) -> None:
+    """Run coro on loop (the client's own loop) and track it until it finishes."""
+    try:
+        current_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        current_loop = None
+
+    if loop is current_loop:
+        task = loop.create_task(coro)
+    else:
+        task = asyncio.run_coroutine_threadsafe(coro, loop)
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_tasks.discard)
+
+
+def _acquire_client(client: Any) -> None:
+    _client_users[client] = _client_users.get(client, 0) + 1
+
+
+def _release_client(client: Any) -> None:
+    """Drop one caller of client, closing it if it was evicted while in use."""
+    users = _client_users.get(client, 0) - 1
+    if users > 0:
+        _client_users[client] = users
+        return
+    _client_users.pop(client, None)
+    provider = _retired_clients.pop(client, None)
+    if provider is not None:
+        _schedule_on_loop(asyncio.get_running_loop(), _close_client(client, provider))
+
+
+def _evict_pooled_clients(provider: str | None = None) -> int:
+    """
+    Remove pooled clients (all, or only those for provider) from the pool.
+
+    Evicted clients are closed on their own loop once no get_llm_client() caller is
+    still using them, so in-flight requests finish on the connection they started on.
+
+    Returns:
+        Number of clients removed from the pool
+    """
+    removed = 0
+    for loop, clients in list(_client_pool.items()):
+        for key in [key for key in clients if provider is None or key[0] == provider]:
+            client = clients.pop(key)
+            removed += 1
+            if not loop.is_closed():
+                _schedule_on_loop(loop, _retire_client(client, key[0]))
+    return removed
+
+
+async def close_llm_clients() -> None:
+    """Close every pooled client, including ones still in use, and wait for it (used at shutdown)."""
+    _evict_pooled_clients()
+    pending = [task for task in _closing_tasks if isinstance(task, asyncio.Task)]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    retired = list(_retired_clients.items())
+    _retired_clients.clear()
+    _client_users.clear()
+    await asyncio.gather(*(_close_client(client, provider) for client, provider in retired))
+
+
 def clear_provider_cache() -> None:
-    """Clear the provider configuration cache to force refresh on next request."""
+    """Clear the provider configuration cache and pooled clients to force refresh on next request."""
     global _settings_cache
 
     cache_size_before = len(_settings_cache)
     _settings_cache.clear()
     _log_cache_access("*", "clear")
-    logger.debug(f"Provider configuration cache cleared ({cache_size_before} entries removed)")
+    clients_evicted = _evict_pooled_clients()
+    logger.debug(
+        f"Provider configuration cache cleared ({cache_size_before} entries removed, "
+        f"{clients_evicted} pooled clients evicted)"
+    )
 
 
 def invalidate_provider_cache(provider: str = None) -> None:
@@ -171,6 +351,7 @@ def invalidate_provider_cache(provider: str = None) -> None:
         cache_size_before = len(_settings_cache)
         _settings_cache.clear()
         _log_cache_access("*", "invalidate")
+        _evict_pooled_clients()
         logger.debug(f"All provider cache entries invalidated ({cache_size_before} entries)")
     else:
         # Validate provider name before processing
@@ -188,6 +369,7 @@ def invalidate_provider_cache(provider: str = None) -> None:
         for key in keys_to_remove:
             del _settings_cache[key]
             _log_cache_access(key, "invalidate")
+        _evict_pooled_clients(provider)
 
         safe_provider = _sanitize_for_log(provider)
         logger.debug(f"Cache entries for provider '{safe_provider}' invalidated: {len(keys_to_remove)} entries removed")
@@ -323,6 +505,11 @@ async def get_llm_client(
     that support the OpenAI API format, with enhanced support for multi-instance
     Ollama configurations and intelligent instance routing.
 
+    Clients are pooled per (provider, base_url, API key fingerprint) and kept open
+    across calls so connections are reused; clear_provider_cache() and
+    invalidate_provider_cache() evict them, and an evicted client is closed once
+    its last caller leaves this context.
+
     Args:
         provider: Override provider selection
         use_embedding_provider: Use the embedding-specific provider if different
@@ -398,7 +585,7 @@ async def get_llm_client(
 
         if provider_name == "openai":
             if api_key:
-                client = openai.AsyncOpenAI(api_key=api_key)
+                client = _get_pooled_client(provider_name, api_key=api_key)
                 logger.info("OpenAI client created successfully")
             else:
                 logger.warning("OpenAI API key not found, attempting Ollama fallback")
@@ -412,7 +599,8 @@ async def get_llm_client(
                     if not ollama_base_url:
                         raise RuntimeError("No Ollama base URL resolved")
 
-                    client = openai.AsyncOpenAI(
+                    client = _get_pooled_client(
+                        "ollama",
                         api_key="ollama",
                         base_url=ollama_base_url,
                     )
@@ -436,7 +624,8 @@ async def get_llm_client(
             )
 
             # Ollama requires an API key in the client but doesn't actually use it
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key="ollama",  # Required but unused by Ollama
                 base_url=ollama_base_url,
             )
@@ -446,7 +635,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("Google API key not found")
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://generativelanguage.googleapis.com/v1beta/openai/",
             )
@@ -456,7 +646,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("OpenRouter API key not found")
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://openrouter.ai/api/v1",
             )
@@ -466,7 +657,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("Anthropic API key not found")
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://api.anthropic.com/v1",
             )
@@ -490,7 +682,8 @@ async def get_llm_client(
                 f"Grok API key validation: format_valid={key_format_valid}, length_valid={key_length_valid}"
             )
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://api.x.ai/v1",
             )
@@ -505,48 +698,12 @@ async def get_llm_client(
         )
         raise
 
+    # Pooled clients stay open for reuse; eviction closes them after their last caller
+    _acquire_client(client)
     try:
         yield client
     finally:
-        if client is not None:
-            safe_provider = _sanitize_for_log(provider_name) if provider_name else "unknown"
-
-            try:
-                close_method = getattr(client, "aclose", None)
-                if callable(close_method):
-                    if inspect.iscoroutinefunction(close_method):
-                        await close_method()
-                    else:
-                        maybe_coro = close_method()
-                        if inspect.isawaitable(maybe_coro):
-                            await maybe_coro
-                else:
-                    close_method = getattr(client, "close", None)
-                    if callable(close_method):
-                        if inspect.iscoroutinefunction(close_method):
-                            await close_method()
-                        else:
-                            close_result = close_method()
-                            if inspect.isawaitable(close_result):
-                                await close_result
-                logger.debug(f"Closed LLM client for provider: {safe_provider}")
-            except RuntimeError as close_error:
-                if "Event loop is closed" in str(close_error):
-                    logger.error(
-                        f"Failed to close LLM client cleanly for provider {safe_provider}: event loop already closed",
-                        exc_info=True,
-                    )
-                else:
-                    logger.error(
-                        f"Runtime error closing LLM client for provider {safe_provider}: {close_error}",
-                        exc_info=True,
-                    )
-            except Exception as close_error:
-                logger.error(
-                    f"Unexpected error while closing LLM client for provider {safe_provider}: {close_error}",
-                    exc_info=True,
-                )
-
+        _release_client(client)
 
 
 async def _get_optimal_ollama_instance(instance_type: str | None = None,
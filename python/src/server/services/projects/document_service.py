@@ -3,6 +3,9 @@ Document Service Module for Archon
 
 This module provides core business logic for document operations within projects
 that can be shared between MCP tools and FastAPI endpoints.
+
+Each document is a row of archon_project_documents, so reading or writing one
+document touches only that row.
 """
 
 import uuid
@@ -14,9 +17,23 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ...utils.etag_utils import PROJECTS_SCOPE, bump_data_version
 
 logger = get_logger(__name__)
 
+DOCUMENTS_TABLE = "archon_project_documents"
+
+# Columns of a document summary; content_size is computed by the database
+DOCUMENT_SUMMARY_COLUMNS = (
+    "project_id, id, document_type, title, status, version, tags, author, created_at, updated_at, content_size"
+)
+DOCUMENT_COLUMNS = (
+    "project_id, id, document_type, title, content, status, version, tags, author, created_at, updated_at"
+)
+
+# Fields a document update may change
+DOCUMENT_UPDATE_FIELDS = ("title", "content", "status", "tags", "author", "version", "document_type")
+
 
 class DocumentService:
     """Service class for document operations within projects"""
@@ -35,26 +52,14 @@ class DocumentService:
         author: str = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
-        Add a new document to a project's docs JSONB field.
+        Add a new document to a project.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
-            # Get current project
-            project_response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
-                .execute()
-            )
-            if not project_response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
-
-            current_docs = project_response.data[0].get("docs", [])
-
-            # Create new document entry
             new_doc = {
+                "project_id": project_id,
                 "id": str(uuid.uuid4()),
                 "document_type": document_type,
                 "title": title,
@@ -67,16 +72,8 @@ class DocumentService:
             if author:
                 new_doc["author"] = author
 
-            # Add to docs array
-            updated_docs = current_docs + [new_doc]
-
-            # Update project
-            response = (
-                self.supabase_client.table("archon_projects")
-                .update({"docs": updated_docs})
-                .eq("id", project_id)
-                .execute()
-            )
+            response = self.supabase_client.table(DOCUMENTS_TABLE).insert(new_doc).execute()
+            bump_data_version(PROJECTS_SCOPE)
 
             if response.data:
                 return True, {
@@ -93,12 +90,14 @@ class DocumentService:
                 return False, {"error": "Failed to add document to project"}
 
         except Exception as e:
+            if "foreign key" in str(e).lower():
+                return False, {"error": f"Project with ID {project_id} not found"}
             logger.error(f"Error adding document: {e}")
             return False, {"error": f"Error adding document: {str(e)}"}
 
     def list_documents(self, project_id: str, include_content: bool = False) -> tuple[bool, dict[str, Any]]:
         """
-        List all documents in a project's docs JSONB field.
+        List all documents of a project.
 
         Args:
             project_id: The project ID
@@ -110,39 +109,21 @@ class DocumentService:
         """
         try:
             response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .select(DOCUMENT_COLUMNS if include_content else DOCUMENT_SUMMARY_COLUMNS)
+                .eq("project_id", project_id)
+                .order("position")
                 .execute()
             )
+            rows = response.data or []
 
-            if not response.data:
+            if not rows and not self._project_exists(project_id):
                 return False, {"error": f"Project with ID {project_id} not found"}
 
-            docs = response.data[0].get("docs", [])
-
-            # Format documents for response
-            documents = []
-            for doc in docs:
-                if include_content:
-                    # Return full document
-                    documents.append(doc)
-                else:
-                    # Return metadata only
-                    documents.append({
-                        "id": doc.get("id"),
-                        "document_type": doc.get("document_type"),
-                        "title": doc.get("title"),
-                        "status": doc.get("status"),
-                        "version": doc.get("version"),
-                        "tags": doc.get("tags", []),
-                        "author": doc.get("author"),
-                        "created_at": doc.get("created_at"),
-                        "updated_at": doc.get("updated_at"),
-                        "stats": {
-                            "content_size": len(str(doc.get("content", {})))
-                        }
-                    })
+            if include_content:
+                documents = [self._to_document(row) for row in rows]
+            else:
+                documents = [self._to_summary(row) for row in rows]
 
             return True, {
                 "project_id": project_id,
@@ -154,35 +135,52 @@ class DocumentService:
             logger.error(f"Error listing documents: {e}")
             return False, {"error": f"Error listing documents: {str(e)}"}
 
+    def get_project_documents(
+        self, project_ids: list[str] | None = None, include_content: bool = True
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get the documents of several projects in one query.
+
+        Args:
+            project_ids: Projects to fetch documents for (default: all projects)
+            include_content: If True, full documents; if False, summaries
+
+        Returns:
+            Dict mapping project ID to its documents in creation order
+        """
+        query = self.supabase_client.table(DOCUMENTS_TABLE).select(
+            DOCUMENT_COLUMNS if include_content else DOCUMENT_SUMMARY_COLUMNS
+        )
+        if project_ids is not None:
+            if not project_ids:
+                return {}
+            query = query.in_("project_id", project_ids)
+        response = query.order("position").execute()
+
+        documents: dict[str, list[dict[str, Any]]] = {}
+        for row in response.data or []:
+            document = self._to_document(row) if include_content else self._to_summary(row)
+            documents.setdefault(row["project_id"], []).append(document)
+        return documents
+
     def get_document(self, project_id: str, doc_id: str) -> tuple[bool, dict[str, Any]]:
         """
-        Get a specific document from a project's docs JSONB field.
+        Get a specific document of a project.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
             response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .select(DOCUMENT_COLUMNS)
+                .eq("project_id", project_id)
+                .eq("id", doc_id)
                 .execute()
             )
 
-            if not response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
-
-            docs = response.data[0].get("docs", [])
-
-            # Find the specific document
-            document = None
-            for doc in docs:
-                if doc.get("id") == doc_id:
-                    document = doc
-                    break
-
-            if document:
-                return True, {"document": document}
+            if response.data:
+                return True, {"document": self._to_document(response.data[0])}
             else:
                 return False, {
                     "error": f"Document with ID {doc_id} not found in project {project_id}"
@@ -200,26 +198,18 @@ class DocumentService:
         create_version: bool = True,
     ) -> tuple[bool, dict[str, Any]]:
         """
-        Update a document in a project's docs JSONB field.
+        Update the given fields of a document, leaving the others untouched.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
-            # Get current project docs
-            project_response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
-                .execute()
-            )
-            if not project_response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
+            # Create version snapshot of this document if requested
+            if create_version:
+                success, current = self.get_document(project_id, doc_id)
+                if not success:
+                    return False, current
 
-            current_docs = project_response.data[0].get("docs", [])
-
-            # Create version snapshot if requested
-            if create_version and current_docs:
                 try:
                     from .versioning_service import VersioningService
 
@@ -229,7 +219,7 @@ class DocumentService:
                     versioning.create_version(
                         project_id=project_id,
                         field_name="docs",
-                        content=current_docs,
+                        content=current["document"],
                         change_summary=change_summary,
                         change_type="update",
                         document_id=doc_id,
@@ -240,55 +230,26 @@ class DocumentService:
                         f"Version creation failed for document {doc_id}: {version_error}"
                     )
 
-            # Make a copy to modify
-            docs = current_docs.copy()
-
-            # Find and update the document
-            updated = False
-            for i, doc in enumerate(docs):
-                if doc.get("id") == doc_id:
-                    # Update allowed fields
-                    if "title" in update_fields:
-                        docs[i]["title"] = update_fields["title"]
-                    if "content" in update_fields:
-                        docs[i]["content"] = update_fields["content"]
-                    if "status" in update_fields:
-                        docs[i]["status"] = update_fields["status"]
-                    if "tags" in update_fields:
-                        docs[i]["tags"] = update_fields["tags"]
-                    if "author" in update_fields:
-                        docs[i]["author"] = update_fields["author"]
-                    if "version" in update_fields:
-                        docs[i]["version"] = update_fields["version"]
-
-                    docs[i]["updated_at"] = datetime.now().isoformat()
-                    updated = True
-                    break
-
-            if not updated:
-                return False, {
-                    "error": f"Document with ID {doc_id} not found in project {project_id}"
-                }
+            update_data = {
+                field: update_fields[field] for field in DOCUMENT_UPDATE_FIELDS if field in update_fields
+            }
+            update_data["updated_at"] = datetime.now().isoformat()
 
-            # Update the project
             response = (
-                self.supabase_client.table("archon_projects")
-                .update({"docs": docs, "updated_at": datetime.now().isoformat()})
-                .eq("id", project_id)
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .update(update_data)
+                .eq("project_id", project_id)
+                .eq("id", doc_id)
                 .execute()
             )
+            bump_data_version(PROJECTS_SCOPE)
 
             if response.data:
-                # Find the updated document to return
-                updated_doc = None
-                for doc in docs:
-                    if doc.get("id") == doc_id:
-                        updated_doc = doc
-                        break
-
-                return True, {"document": updated_doc}
+                return True, {"document": self._to_document(response.data[0])}
             else:
-                return False, {"error": "Failed to update document"}
+                return False, {
+                    "error": f"Document with ID {doc_id} not found in project {project_id}"
+                }
 
         except Exception as e:
             logger.error(f"Error updating document: {e}")
@@ -296,49 +257,151 @@ class DocumentService:
 
     def delete_document(self, project_id: str, doc_id: str) -> tuple[bool, dict[str, Any]]:
         """
-        Delete a document from a project's docs JSONB field.
+        Delete a document from a project.
 
         Returns:
             Tuple of (success, result_dict)
         """
         try:
-            # Get current project docs
-            project_response = (
-                self.supabase_client.table("archon_projects")
-                .select("docs")
-                .eq("id", project_id)
+            response = (
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .delete()
+                .eq("project_id", project_id)
+                .eq("id", doc_id)
                 .execute()
             )
-            if not project_response.data:
-                return False, {"error": f"Project with ID {project_id} not found"}
-
-            docs = project_response.data[0].get("docs", [])
+            bump_data_version(PROJECTS_SCOPE)
 
-            # Remove the document
-            original_length = len(docs)
-            docs = [doc for doc in docs if doc.get("id") != doc_id]
-
-            if len(docs) == original_length:
+            if response.data:
+                return True, {"project_id": project_id, "doc_id": doc_id}
+            else:
                 return False, {
                     "error": f"Document with ID {doc_id} not found in project {project_id}"
                 }
 
-            # Update the project
+        except Exception as e:
+            logger.error(f"Error deleting document: {e}")
+            return False, {"error": f"Error deleting document: {str(e)}"}
+
+    def save_document(self, project_id: str, document: dict[str, Any]) -> tuple[bool, dict[str, Any]]:
+        """
+        Create or overwrite one document, e.g. when restoring it from a version.
+
+        Returns:
+            Tuple of (success, result_dict)
+        """
+        try:
             response = (
-                self.supabase_client.table("archon_projects")
-                .update({"docs": docs, "updated_at": datetime.now().isoformat()})
-                .eq("id", project_id)
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .upsert(self._to_row(project_id, document), on_conflict="project_id,id")
                 .execute()
             )
+            bump_data_version(PROJECTS_SCOPE)
 
             if response.data:
-                return True, {"project_id": project_id, "doc_id": doc_id}
+                return True, {"document": self._to_document(response.data[0])}
             else:
-                return False, {"error": "Failed to delete document"}
+                return False, {"error": "Failed to save document"}
 
         except Exception as e:
-            logger.error(f"Error deleting document: {e}")
-            return False, {"error": f"Error deleting document: {str(e)}"}
+            logger.error(f"Error saving document: {e}")
+            return False, {"error": f"Error saving document: {str(e)}"}
+
+    def replace_documents(
+        self, project_id: str, documents: list[dict[str, Any]]
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Replace all documents of a project, as writing the former docs array did.
+
+        Documents missing from the list are deleted; the others are created or
+        overwritten.
+
+        Returns:
+            Tuple of (success, result_dict)
+        """
+        try:
+            rows = [self._to_row(project_id, document) for document in documents or []]
+            keep_ids = {row["id"] for row in rows}
+
+            existing = (
+                self.supabase_client.table(DOCUMENTS_TABLE)
+                .select("id")
+                .eq("project_id", project_id)
+                .execute()
+            )
+            stale_ids = [row["id"] for row in existing.data or [] if row["id"] not in keep_ids]
+
+            if stale_ids:
+                (
+                    self.supabase_client.table(DOCUMENTS_TABLE)
+                    .delete()
+                    .eq("project_id", project_id)
+                    .in_("id", stale_ids)
+                    .execute()
+                )
+            if rows:
+                (
+                    self.supabase_client.table(DOCUMENTS_TABLE)
+                    .upsert(rows, on_conflict="project_id,id")
+                    .execute()
+                )
+            bump_data_version(PROJECTS_SCOPE)
+
+            return True, {"project_id": project_id, "saved": len(rows), "deleted": len(stale_ids)}
+
+        except Exception as e:
+            logger.error(f"Error replacing documents: {e}")
+            return False, {"error": f"Error replacing documents: {str(e)}"}
+
+    def _project_exists(self, project_id: str) -> bool:
+        response = (
+            self.supabase_client.table("archon_projects")
+            .select("id")
+            .eq("id", project_id)
+            .execute()
+        )
+        return bool(response.data)
+
+    @staticmethod
+    def _to_row(project_id: str, document: dict[str, Any]) -> dict[str, Any]:
+        """Build a table row from a document dict, dropping unknown keys."""
+        row = {
+            "project_id": project_id,
+            "id": str(document.get("id") or uuid.uuid4()),
+            "document_type": document.get("document_type"),
+            "title": document.get("title") or "",
+            "content": document.get("content") or {},
+            "tags": document.get("tags") or [],
+            "status": document.get("status") or "draft",
+            "version": str(document.get("version") or "1.0"),
+            "author": document.get("author"),
+        }
+        for timestamp in ("created_at", "updated_at"):
+            if document.get(timestamp):
+                row[timestamp] = document[timestamp]
+        return row
+
+    @staticmethod
+    def _to_document(row: dict[str, Any]) -> dict[str, Any]:
+        """Document dict as stored in the former docs array."""
+        return {key: value for key, value in row.items() if key not in ("position", "content_size")}
+
+    @staticmethod
+    def _to_summary(row: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": row.get("id"),
+            "document_type": row.get("document_type"),
+            "title": row.get("title"),
+            "status": row.get("status"),
+            "version": row.get("version"),
+            "tags": row.get("tags") or [],
+            "author": row.get("author"),
+            "created_at": row.get("created_at"),
+            "updated_at": row.get("updated_at"),
+            "stats": {
+                "content_size": row.get("content_size") or 0
+            }
+        }
 
     def _build_change_summary(self, doc_id: str, update_fields: dict[str, Any]) -> str:
         """Build a human-readable change summary"""
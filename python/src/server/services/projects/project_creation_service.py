@@ -12,6 +12,9 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ...utils.etag_utils import PROJECTS_SCOPE, bump_data_version
+from .document_service import DocumentService
+from .project_service import PROJECT_COLUMNS
 
 logger = get_logger(__name__)
 
@@ -69,6 +72,7 @@ class ProjectCreationService:
 
             # Create the project in database
             response = self.supabase_client.table("archon_projects").insert(project_data).execute()
+            bump_data_version(PROJECTS_SCOPE)
             if hasattr(response, "error") and response.error:
                 raise RuntimeError(f"Supabase insert failed for project '{title}': {response.error}")
             if not response.data:
@@ -87,12 +91,15 @@ class ProjectCreationService:
             # Final success - fetch complete project data
             final_project_response = (
                 self.supabase_client.table("archon_projects")
-                .select("*")
+                .select(PROJECT_COLUMNS)
                 .eq("id", project_id)
                 .execute()
             )
             if final_project_response.data:
                 final_project = final_project_response.data[0]
+                final_docs = DocumentService(self.supabase_client).get_project_documents(
+                    [project_id]
+                ).get(project_id, [])
 
                 # Prepare project data for frontend
                 project_data_for_frontend = {
@@ -102,7 +109,7 @@ class ProjectCreationService:
                     "github_repo": final_project.get("github_repo"),
                     "created_at": final_project["created_at"],
                     "updated_at": final_project["updated_at"],
-                    "docs": final_project.get("docs", []),  # PRD documents will be here
+                    "docs": final_docs,  # PRD documents will be here
                     "features": final_project.get("features", {}),
                     "data": final_project.get("data", {}),
                     "pinned": final_project.get("pinned", False),
@@ -177,6 +184,8 @@ class ProjectCreationService:
                 user_id="system",
                 progress_callback=agent_progress_callback,
             )
+            # The agent writes the project docs itself
+            bump_data_version(PROJECTS_SCOPE)
 
             if agent_result.success:
 
@@ -13,9 +13,14 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ...utils.etag_utils import PROJECTS_SCOPE, TASKS_SCOPE, bump_data_version
+from .document_service import DocumentService
 
 logger = get_logger(__name__)
 
+# Project columns without the deprecated docs array (documents have their own table)
+PROJECT_COLUMNS = "id, title, description, github_repo, pinned, features, data, created_at, updated_at"
+
 
 class ProjectService:
     """Service class for project operations"""
@@ -51,6 +56,7 @@ class ProjectService:
 
             # Insert project
             response = self.supabase_client.table("archon_projects").insert(project_data).execute()
+            bump_data_version(PROJECTS_SCOPE)
 
             if not response.data:
                 logger.error("Supabase returned empty data for project creation")
@@ -85,14 +91,17 @@ class ProjectService:
             Tuple of (success, result_dict)
         """
         try:
+            document_service = DocumentService(self.supabase_client)
+
             if include_content:
                 # Current behavior - maintain backward compatibility
                 response = (
                     self.supabase_client.table("archon_projects")
-                    .select("*")
+                    .select(PROJECT_COLUMNS)
                     .order("created_at", desc=True)
                     .execute()
                 )
+                docs_by_project = document_service.get_project_documents(include_content=True)
 
                 projects = []
                 for project in response.data:
@@ -104,7 +113,7 @@ class ProjectService:
                         "updated_at": project["updated_at"],
                         "pinned": project.get("pinned", False),
                         "description": project.get("description", ""),
-                        "docs": project.get("docs", []),
+                        "docs": docs_by_project.get(project["id"], []),
                         "features": project.get("features", []),
                         "data": project.get("data", []),
                     })
@@ -113,15 +122,17 @@ class ProjectService:
                 # FIXED: N+1 query problem - now using single query
                 response = (
                     self.supabase_client.table("archon_projects")
-                    .select("*")  # Fetch all fields in single query
+                    .select(PROJECT_COLUMNS)  # Fetch all fields in single query
                     .order("created_at", desc=True)
                     .execute()
                 )
+                # Document summaries only, without their content
+                docs_by_project = document_service.get_project_documents(include_content=False)
 
                 projects = []
                 for project in response.data:
                     # Calculate counts from fetched data (no additional queries)
-                    docs_count = len(project.get("docs", []))
+                    docs_count = len(docs_by_project.get(project["id"], []))
                     features_count = len(project.get("features", []))
                     has_data = bool(project.get("data", []))
 
@@ -157,13 +168,13 @@ class ProjectService:
         try:
             response = (
                 self.supabase_client.table("archon_projects")
-                .select("*")
+                .select(PROJECT_COLUMNS)
                 .eq("id", project_id)
                 .execute()
             )
 
             if response.data:
-                project = response.data[0]
+                project = self._with_documents(response.data[0])
 
                 # Get linked sources
                 technical_sources = []
@@ -258,6 +269,7 @@ class ProjectService:
                 .eq("id", project_id)
                 .execute()
             )
+            bump_data_version(PROJECTS_SCOPE, TASKS_SCOPE)
 
             # For DELETE operations, success is indicated by no error, not by response.data content
             # response.data will be empty list [] even on successful deletion
@@ -332,7 +344,6 @@ class ProjectService:
                 "title",
                 "description",
                 "github_repo",
-                "docs",
                 "features",
                 "data",
                 "technical_sources",
@@ -344,6 +355,14 @@ class ProjectService:
                 if field in update_fields:
                     update_data[field] = update_fields[field]
 
+            # A docs array replaces the project's documents, which have their own table
+            if "docs" in update_fields:
+                docs_success, docs_result = DocumentService(self.supabase_client).replace_documents(
+                    project_id, update_fields["docs"] or []
+                )
+                if not docs_success:
+                    return False, docs_result
+
             # Handle pinning logic - only one project can be pinned at a time
             if update_fields.get("pinned") is True:
                 # Unpin any other pinned projects first
@@ -363,20 +382,21 @@ class ProjectService:
                 .eq("id", project_id)
                 .execute()
             )
+            bump_data_version(PROJECTS_SCOPE)
 
             if response.data and len(response.data) > 0:
-                project = response.data[0]
+                project = self._with_documents(response.data[0])
                 return True, {"project": project, "message": "Project updated successfully"}
             else:
                 # If update didn't return data, fetch the project to ensure it exists and get current state
                 get_response = (
                     self.supabase_client.table("archon_projects")
-                    .select("*")
+                    .select(PROJECT_COLUMNS)
                     .eq("id", project_id)
                     .execute()
                 )
                 if get_response.data and len(get_response.data) > 0:
-                    project = get_response.data[0]
+                    project = self._with_documents(get_response.data[0])
                     return True, {"project": project, "message": "Project updated successfully"}
                 else:
                     return False, {"error": f"Project with ID {project_id} not found"}
@@ -384,3 +404,10 @@ class ProjectService:
         except Exception as e:
             logger.error(f"Error updating project: {e}")
             return False, {"error": f"Error updating project: {str(e)}"}
+
+    def _with_documents(self, project: dict[str, Any]) -> dict[str, Any]:
+        """Set the docs of a project from the documents table."""
+        project["docs"] = DocumentService(self.supabase_client).get_project_documents(
+            [project["id"]], include_content=True
+        ).get(project["id"], [])
+        return project
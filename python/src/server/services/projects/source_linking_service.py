@@ -11,6 +11,7 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ...utils.etag_utils import PROJECTS_SCOPE, bump_data_version
 
 logger = get_logger(__name__)
 
@@ -126,6 +127,9 @@ class SourceLinkingService:
         except Exception as e:
             logger.error(f"Error updating project sources: {e}")
             return False, {"error": str(e), **result}
+        finally:
+            # Links may have changed even if some inserts failed
+            bump_data_version(PROJECTS_SCOPE)
 
     def format_project_with_sources(self, project: dict[str, Any]) -> dict[str, Any]:
         """
@@ -12,10 +12,13 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ...utils.etag_utils import TASKS_SCOPE, bump_data_version
+from ..client_manager import execute_async
 
 logger = get_logger(__name__)
 
-# Task updates are handled via polling - no broadcasting needed
+# Task updates are handled via polling - writes bump the tasks data version
+# so unchanged polls are answered from the ETag cache
 
 
 class TaskService:
@@ -93,13 +96,12 @@ class TaskService:
             # REORDERING LOGIC: If inserting at a specific position, increment existing tasks
             if task_order > 0:
                 # Get all tasks in the same project and status with task_order >= new task's order
-                existing_tasks_response = (
+                existing_tasks_response = await execute_async(
                     self.supabase_client.table("archon_tasks")
                     .select("id, task_order")
                     .eq("project_id", project_id)
                     .eq("status", task_status)
                     .gte("task_order", task_order)
-                    .execute()
                 )
 
                 if existing_tasks_response.data:
@@ -108,10 +110,12 @@ class TaskService:
                     # Increment task_order for all affected tasks
                     for existing_task in existing_tasks_response.data:
                         new_order = existing_task["task_order"] + 1
-                        self.supabase_client.table("archon_tasks").update({
-                            "task_order": new_order,
-                            "updated_at": datetime.now().isoformat(),
-                        }).eq("id", existing_task["id"]).execute()
+                        await execute_async(
+                            self.supabase_client.table("archon_tasks").update({
+                                "task_order": new_order,
+                                "updated_at": datetime.now().isoformat(),
+                            }).eq("id", existing_task["id"])
+                        )
 
             task_data = {
                 "project_id": project_id,
@@ -130,7 +134,9 @@ class TaskService:
             if feature:
                 task_data["feature"] = feature
 
-            response = self.supabase_client.table("archon_tasks").insert(task_data).execute()
+            response = await execute_async(self.supabase_client.table("archon_tasks").insert(task_data))
+            # Also covers the reordering above
+            bump_data_version(TASKS_SCOPE)
 
             if response.data:
                 task = response.data[0]
@@ -403,12 +409,12 @@ class TaskService:
                 update_data["feature"] = update_fields["feature"]
 
             # Update task
-            response = (
+            response = await execute_async(
                 self.supabase_client.table("archon_tasks")
                 .update(update_data)
                 .eq("id", task_id)
-                .execute()
             )
+            bump_data_version(TASKS_SCOPE)
 
             if response.data:
                 task = response.data[0]
@@ -433,8 +439,8 @@ class TaskService:
         """
         try:
             # First, check if task exists and is not already archived
-            task_response = (
-                self.supabase_client.table("archon_tasks").select("*").eq("id", task_id).execute()
+            task_response = await execute_async(
+                self.supabase_client.table("archon_tasks").select("*").eq("id", task_id)
             )
             if not task_response.data:
                 return False, {"error": f"Task with ID {task_id} not found"}
@@ -452,12 +458,12 @@ class TaskService:
             }
 
             # Archive the main task
-            response = (
+            response = await execute_async(
                 self.supabase_client.table("archon_tasks")
                 .update(archive_data)
                 .eq("id", task_id)
-                .execute()
             )
+            bump_data_version(TASKS_SCOPE)
 
             if response.data:
 
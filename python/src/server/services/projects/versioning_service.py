@@ -12,6 +12,7 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ...utils.etag_utils import PROJECTS_SCOPE, bump_data_version
 
 logger = get_logger(__name__)
 
@@ -186,6 +187,11 @@ class VersioningService:
             version_to_restore = version_result.data[0]
             content_to_restore = version_to_restore["content"]
 
+            if field_name == "docs":
+                return self._restore_documents(
+                    project_id, version_to_restore, version_number, restored_by
+                )
+
             # Get current content to create backup
             current_project = (
                 self.supabase_client.table("archon_projects")
@@ -218,6 +224,7 @@ class VersioningService:
                 .eq("id", project_id)
                 .execute()
             )
+            bump_data_version(PROJECTS_SCOPE)
 
             if restore_result.data:
                 # Create restore version record
@@ -242,3 +249,63 @@ class VersioningService:
         except Exception as e:
             logger.error(f"Error restoring version: {e}")
             return False, {"error": f"Error restoring version: {str(e)}"}
+
+    def _restore_documents(
+        self, project_id: str, version: dict[str, Any], version_number: int, restored_by: str
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Restore project documents from a "docs" version.
+
+        Versions of a single document (a dict with document_id set) restore that
+        document only; versions holding a docs array replace all documents.
+        """
+        from .document_service import DocumentService
+
+        document_service = DocumentService(self.supabase_client)
+        content = version["content"]
+        document_id = version.get("document_id")
+        single_document = isinstance(content, dict) and bool(document_id)
+
+        # Create backup version before restore
+        if single_document:
+            found, current = document_service.get_document(project_id, document_id)
+            current_content = current["document"] if found else None
+        else:
+            found, current = document_service.list_documents(project_id, include_content=True)
+            current_content = current["documents"] if found else None
+        if current_content is not None:
+            backup_result = self.create_version(
+                project_id=project_id,
+                field_name="docs",
+                content=current_content,
+                change_summary=f"Backup before restoring to version {version_number}",
+                change_type="backup",
+                document_id=document_id if single_document else None,
+                created_by=restored_by,
+            )
+            if not backup_result[0]:
+                logger.warning(f"Failed to create backup version: {backup_result[1]}")
+
+        if single_document:
+            success, result = document_service.save_document(project_id, {**content, "id": document_id})
+        else:
+            success, result = document_service.replace_documents(project_id, content or [])
+        if not success:
+            return False, {"error": f"Failed to restore version: {result.get('error')}"}
+
+        self.create_version(
+            project_id=project_id,
+            field_name="docs",
+            content=content,
+            change_summary=f"Restored to version {version_number}",
+            change_type="restore",
+            document_id=document_id if single_document else None,
+            created_by=restored_by,
+        )
+
+        return True, {
+            "project_id": project_id,
+            "field_name": "docs",
+            "restored_version": version_number,
+            "restored_by": restored_by,
+        }
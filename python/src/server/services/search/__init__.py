@@ -12,6 +12,7 @@ from .base_search_strategy import BaseSearchStrategy
 from .hybrid_search_strategy import HybridSearchStrategy
 from .rag_service import RAGService
 from .reranking_strategy import RerankingStrategy
+from .vector_index_service import VectorIndexService
 
 __all__ = [
     # Main service classes
@@ -21,4 +22,6 @@ __all__ = [
     "HybridSearchStrategy",
     "RerankingStrategy",
     "AgenticRAGStrategy",
+    # Index management
+    "VectorIndexService",
 ]
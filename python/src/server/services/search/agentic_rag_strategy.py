@@ -17,7 +17,7 @@ from typing import Any
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
-from ..embeddings.embedding_service import create_embedding
+from ..embeddings.embedding_service import create_query_embedding
 
 logger = get_logger(__name__)
 
@@ -89,7 +89,7 @@ class AgenticRAGStrategy:
         ) as span:
             try:
                 # Create embedding for the query (no enhancement)
-                query_embedding = await create_embedding(query)
+                query_embedding = await create_query_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -10,6 +10,7 @@ from typing import Any
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
+from ..client_manager import execute_async
 
 logger = get_logger(__name__)
 
@@ -61,7 +62,7 @@ class BaseSearchStrategy:
                     rpc_params["filter"] = {}
 
                 # Execute search
-                response = self.supabase_client.rpc(table_rpc, rpc_params).execute()
+                response = await execute_async(self.supabase_client.rpc(table_rpc, rpc_params))
 
                 # Filter by similarity threshold
                 filtered_results = []
@@ -9,24 +9,175 @@ Strategy combines:
 1. Vector/semantic search for conceptual matches
 2. Full-text search using ts_vector for efficient keyword matching
 3. Returns union of both result sets for maximum coverage
+
+Two fusion modes are available via the HYBRID_SEARCH_MODE setting:
+- "coalesce" (default): the database merges both legs, preferring the vector score
+- "rrf": the database returns only candidate ids with per-leg ranks; the legs are
+  fused here with weighted reciprocal rank fusion and content is fetched only for
+  the final top-k rows (requires migration 013_add_hybrid_candidate_functions)
 """
 
+import os
+from collections.abc import Callable
 from typing import Any
 
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
-from ..embeddings.embedding_service import create_embedding
+from ..client_manager import execute_async
+from ..embeddings.embedding_service import create_query_embedding
 
 logger = get_logger(__name__)
 
+DOCUMENT_COLUMNS = "id, url, chunk_number, content, metadata, source_id"
+CODE_EXAMPLE_COLUMNS = "id, url, chunk_number, content, summary, metadata, source_id"
+
+
+def reciprocal_rank_fusion(
+    candidates: list[dict[str, Any]],
+    k: float = 60,
+    vector_weight: float = 1.0,
+    keyword_weight: float = 1.0,
+) -> list[dict[str, Any]]:
+    """
+    Fuse vector and keyword candidate lists with weighted reciprocal rank fusion.
+
+    Each candidate carries its 1-based rank in either leg (vector_rank / text_rank,
+    None when the leg did not return it). Its fused score is the sum of
+    weight / (k + rank) over the legs that returned it.
+
+    Args:
+        candidates: Rows from a hybrid_candidates_* RPC
+        k: RRF damping constant; larger values flatten the contribution of top ranks
+        vector_weight: Weight of the vector (semantic) leg
+        keyword_weight: Weight of the keyword (full-text) leg
+
+    Returns:
+        Candidates sorted by fused score, each with rrf_score, similarity and match_type set
+    """
+    fused = []
+    for candidate in candidates:
+        vector_rank = candidate.get("vector_rank")
+        text_rank = candidate.get("text_rank")
+
+        score = 0.0
+        if vector_rank is not None:
+            score += vector_weight / (k + vector_rank)
+        if text_rank is not None:
+            score += keyword_weight / (k + text_rank)
+
+        if vector_rank is not None and text_rank is not None:
+            match_type = "hybrid"
+        elif vector_rank is not None:
+            match_type = "vector"
+        else:
+            match_type = "keyword"
+
+        # Keep reporting the leg's own score as similarity, as the coalesce mode does
+        similarity = candidate.get("vector_similarity")
+        if similarity is None:
+            similarity = candidate.get("text_similarity") or 0.0
+
+        fused.append({
+            **candidate,
+            "rrf_score": score,
+            "similarity": float(similarity),
+            "match_type": match_type,
+        })
+
+    fused.sort(key=lambda c: (-c["rrf_score"], c["id"]))
+    return fused
+
 
 class HybridSearchStrategy:
     """Strategy class implementing hybrid search combining vector and full-text search"""
 
-    def __init__(self, supabase_client: Client, base_strategy):
+    def __init__(
+        self,
+        supabase_client: Client,
+        base_strategy,
+        get_setting: Callable[[str, str], str] | None = None,
+    ):
         self.supabase_client = supabase_client
         self.base_strategy = base_strategy
+        self.get_setting = get_setting or os.getenv
+
+    def _rrf_config(self, match_count: int) -> dict[str, Any]:
+        """Read the fusion settings; candidate depth is never below match_count."""
+        return {
+            "k": float(self.get_setting("HYBRID_RRF_K", "60")),
+            "vector_weight": float(self.get_setting("HYBRID_VECTOR_WEIGHT", "1.0")),
+            "keyword_weight": float(self.get_setting("HYBRID_KEYWORD_WEIGHT", "1.0")),
+            "candidate_count": max(
+                match_count, int(self.get_setting("HYBRID_CANDIDATE_COUNT", "50"))
+            ),
+        }
+
+    def use_rrf(self) -> bool:
+        """Whether hybrid search should fuse candidate lists with reciprocal rank fusion."""
+        return self.get_setting("HYBRID_SEARCH_MODE", "coalesce").lower() == "rrf"
+
+    async def _search_rrf(
+        self,
+        candidates_rpc: str,
+        table: str,
+        columns: str,
+        query: str,
+        query_embedding: list[float],
+        match_count: int,
+        filter_json: dict,
+        source_filter: str | None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a candidate-only hybrid RPC, fuse the legs with RRF and fetch the top-k rows.
+
+        Returns:
+            Up to match_count rows in fused order, with rrf_score, similarity and match_type
+        """
+        config = self._rrf_config(match_count)
+
+        response = await execute_async(
+            self.supabase_client.rpc(
+                candidates_rpc,
+                {
+                    "query_embedding": query_embedding,
+                    "embedding_dimension": len(query_embedding),
+                    "query_text": query,
+                    "candidate_count": config["candidate_count"],
+                    "filter": filter_json,
+                    "source_filter": source_filter,
+                },
+            )
+        )
+        if not response.data:
+            return []
+
+        top = reciprocal_rank_fusion(
+            response.data,
+            k=config["k"],
+            vector_weight=config["vector_weight"],
+            keyword_weight=config["keyword_weight"],
+        )[:match_count]
+
+        # Only the final top-k rows are read in full
+        rows_response = await execute_async(
+            self.supabase_client.table(table).select(columns).in_("id", [c["id"] for c in top])
+        )
+        rows_by_id = {row["id"]: row for row in rows_response.data or []}
+
+        results = []
+        for candidate in top:
+            row = rows_by_id.get(candidate["id"])
+            if row is None:
+                # Deleted between the candidate query and the fetch
+                continue
+            results.append({
+                **row,
+                "similarity": candidate["similarity"],
+                "rrf_score": candidate["rrf_score"],
+                "match_type": candidate["match_type"],
+            })
+        return results
 
     async def search_documents_hybrid(
         self,
@@ -54,37 +205,52 @@ class HybridSearchStrategy:
                 filter_json = filter_metadata or {}
                 source_filter = filter_json.pop("source", None) if "source" in filter_json else None
 
-                # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
-                    "hybrid_search_archon_crawled_pages",
-                    {
-                        "query_embedding": query_embedding,
-                        "query_text": query,
-                        "match_count": match_count,
-                        "filter": filter_json,
-                        "source_filter": source_filter,
-                    },
-                ).execute()
-
-                if not response.data:
+                if self.use_rrf():
+                    span.set_attribute("fusion", "rrf")
+                    results = await self._search_rrf(
+                        "hybrid_candidates_archon_crawled_pages_multi",
+                        "archon_crawled_pages",
+                        DOCUMENT_COLUMNS,
+                        query,
+                        query_embedding,
+                        match_count,
+                        filter_json,
+                        source_filter,
+                    )
+                else:
+                    # Call the hybrid search PostgreSQL function
+                    response = await execute_async(
+                        self.supabase_client.rpc(
+                            "hybrid_search_archon_crawled_pages",
+                            {
+                                "query_embedding": query_embedding,
+                                "query_text": query,
+                                "match_count": match_count,
+                                "filter": filter_json,
+                                "source_filter": source_filter,
+                            },
+                        )
+                    )
+
+                    # Format results to match expected structure
+                    results = []
+                    for row in response.data or []:
+                        result = {
+                            "id": row["id"],
+                            "url": row["url"],
+                            "chunk_number": row["chunk_number"],
+                            "content": row["content"],
+                            "metadata": row["metadata"],
+                            "source_id": row["source_id"],
+                            "similarity": row["similarity"],
+                            "match_type": row["match_type"],
+                        }
+                        results.append(result)
+
+                if not results:
                     logger.debug("No results from hybrid search")
                     return []
 
-                # Format results to match expected structure
-                results = []
-                for row in response.data:
-                    result = {
-                        "id": row["id"],
-                        "url": row["url"],
-                        "chunk_number": row["chunk_number"],
-                        "content": row["content"],
-                        "metadata": row["metadata"],
-                        "source_id": row["source_id"],
-                        "similarity": row["similarity"],
-                        "match_type": row["match_type"],
-                    }
-                    results.append(result)
-
                 span.set_attribute("results_count", len(results))
 
                 # Log match type distribution for debugging
@@ -128,7 +294,7 @@ class HybridSearchStrategy:
         with safe_span("hybrid_search_code_examples") as span:
             try:
                 # Create query embedding
-                query_embedding = await create_embedding(query)
+                query_embedding = await create_query_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -141,38 +307,53 @@ class HybridSearchStrategy:
                 if not final_source_filter and "source" in filter_json:
                     final_source_filter = filter_json.pop("source")
 
-                # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
-                    "hybrid_search_archon_code_examples",
-                    {
-                        "query_embedding": query_embedding,
-                        "query_text": query,
-                        "match_count": match_count,
-                        "filter": filter_json,
-                        "source_filter": final_source_filter,
-                    },
-                ).execute()
-
-                if not response.data:
+                if self.use_rrf():
+                    span.set_attribute("fusion", "rrf")
+                    results = await self._search_rrf(
+                        "hybrid_candidates_archon_code_examples_multi",
+                        "archon_code_examples",
+                        CODE_EXAMPLE_COLUMNS,
+                        query,
+                        query_embedding,
+                        match_count,
+                        filter_json,
+                        final_source_filter,
+                    )
+                else:
+                    # Call the hybrid search PostgreSQL function
+                    response = await execute_async(
+                        self.supabase_client.rpc(
+                            "hybrid_search_archon_code_examples",
+                            {
+                                "query_embedding": query_embedding,
+                                "query_text": query,
+                                "match_count": match_count,
+                                "filter": filter_json,
+                                "source_filter": final_source_filter,
+                            },
+                        )
+                    )
+
+                    # Format results to match expected structure
+                    results = []
+                    for row in response.data or []:
+                        result = {
+                            "id": row["id"],
+                            "url": row["url"],
+                            "chunk_number": row["chunk_number"],
+                            "content": row["content"],
+                            "summary": row["summary"],
+                            "metadata": row["metadata"],
+                            "source_id": row["source_id"],
+                            "similarity": row["similarity"],
+                            "match_type": row["match_type"],
+                        }
+                        results.append(result)
+
+                if not results:
                     logger.debug("No results from hybrid code search")
                     return []
 
-                # Format results to match expected structure
-                results = []
-                for row in response.data:
-                    result = {
-                        "id": row["id"],
-                        "url": row["url"],
-                        "chunk_number": row["chunk_number"],
-                        "content": row["content"],
-                        "summary": row["summary"],
-                        "metadata": row["metadata"],
-                        "source_id": row["source_id"],
-                        "similarity": row["similarity"],
-                        "match_type": row["match_type"],
-                    }
-                    results.append(result)
-
                 span.set_attribute("results_count", len(results))
 
                 # Log match type distribution for debugging
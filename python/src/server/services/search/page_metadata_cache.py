@@ -0,0 +1,79 @@
+"""
+Page Metadata Cache
+
+Bounded LRU cache (with TTL) of archon_page_metadata rows used when grouping RAG
+chunk results into pages. Rows are indexed both by page id and by URL, since chunks
+without a page_id are grouped by URL. The cache is cleared whenever pages are
+(re)stored so recrawled word counts and titles show up immediately.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+PAGE_METADATA_COLUMNS = "id, url, section_title, word_count"
+
+
+class PageMetadataCache:
+    """LRU cache of page metadata rows keyed by page id and URL."""
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, field: str, value: str) -> dict[str, Any] | None:
+        """Look up a page row by "id" or "url"."""
+        key = (field, value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            row, stored_at = entry
+            if time.time() - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return row
+
+    def set(self, row: dict[str, Any]) -> None:
+        """Store a page row under both its id and its URL."""
+        if self.max_entries <= 0:
+            return
+        stored_at = time.time()
+        with self._lock:
+            for key in (("id", row.get("id")), ("url", row.get("url"))):
+                if key[1] is None:
+                    continue
+                self._entries[key] = (row, stored_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global cache instance
+_page_metadata_cache: PageMetadataCache | None = None
+
+
+def get_page_metadata_cache() -> PageMetadataCache:
+    """Get the global page metadata cache, creating it from environment settings on first use."""
+    global _page_metadata_cache
+    if _page_metadata_cache is None:
+        _page_metadata_cache = PageMetadataCache(
+            max_entries=int(os.getenv("PAGE_METADATA_CACHE_SIZE", "2048")),
+            ttl_seconds=float(os.getenv("PAGE_METADATA_CACHE_TTL", "300")),
+        )
+    return _page_metadata_cache
+
+
+def clear_page_metadata_cache() -> None:
+    """Clear cached page metadata (called after pages are stored or replaced)."""
+    if _page_metadata_cache is not None:
+        _page_metadata_cache.clear()
@@ -12,18 +12,22 @@ It combines multiple RAG strategies in a pipeline fashion:
 Multiple strategies can be enabled simultaneously and work together.
 """
 
+import asyncio
 import os
+from collections.abc import Iterable
 from typing import Any
 
 from ...config.logfire_config import get_logger, safe_span
 from ...utils import get_supabase_client
-from ..embeddings.embedding_service import create_embedding
+from ..client_manager import execute_async
+from ..embeddings.embedding_service import create_query_embedding
 from .agentic_rag_strategy import AgenticRAGStrategy
 
 # Import all strategies
 from .base_search_strategy import BaseSearchStrategy
 from .hybrid_search_strategy import HybridSearchStrategy
-from .reranking_strategy import RerankingStrategy
+from .page_metadata_cache import PAGE_METADATA_COLUMNS, get_page_metadata_cache
+from .reranking_strategy import DEFAULT_RERANKING_MODEL, RerankingStrategy
 
 logger = get_logger(__name__)
 
@@ -44,7 +48,9 @@ class RAGService:
         self.base_strategy = BaseSearchStrategy(self.supabase_client)
 
         # Initialize optional strategies
-        self.hybrid_strategy = HybridSearchStrategy(self.supabase_client, self.base_strategy)
+        self.hybrid_strategy = HybridSearchStrategy(
+            self.supabase_client, self.base_strategy, get_setting=self.get_setting
+        )
         self.agentic_strategy = AgenticRAGStrategy(self.supabase_client, self.base_strategy)
 
         # Initialize reranking strategy based on settings
@@ -52,8 +58,9 @@ class RAGService:
         use_reranking = self.get_bool_setting("USE_RERANKING", False)
         if use_reranking:
             try:
-                self.reranking_strategy = RerankingStrategy()
-                logger.info("Reranking strategy loaded successfully")
+                model_name = self.get_setting("RERANKING_MODEL", DEFAULT_RERANKING_MODEL)
+                self.reranking_strategy = RerankingStrategy(model_name=model_name)
+                logger.debug("Reranking strategy initialized from shared model registry")
             except Exception as e:
                 logger.warning(f"Failed to load reranking strategy: {e}")
                 self.reranking_strategy = None
@@ -113,7 +120,7 @@ class RAGService:
         ) as span:
             try:
                 # Create embedding for the query
-                query_embedding = await create_embedding(query)
+                query_embedding = await create_query_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for query")
@@ -201,37 +208,26 @@ class RAGService:
             page_groups[group_key]["chunk_matches"] += 1
             page_groups[group_key]["total_similarity"] += result.get("similarity_score", 0.0)
 
+        page_rows = await self._fetch_page_metadata(page_groups.values())
+
         page_results = []
         for group_key, data in page_groups.items():
             avg_similarity = data["total_similarity"] / data["chunk_matches"]
             match_boost = min(0.2, data["chunk_matches"] * 0.02)
             aggregate_score = avg_similarity * (1 + match_boost)
 
-            # Query page by page_id if available, otherwise by URL
+            # Look up page by page_id if available, otherwise by URL
             if data["page_id"]:
-                page_info = (
-                    self.supabase_client.table("archon_page_metadata")
-                    .select("id, url, section_title, word_count")
-                    .eq("id", data["page_id"])
-                    .maybe_single()
-                    .execute()
-                )
+                page_info = page_rows.get(("id", data["page_id"]))
             else:
-                # Regular pages - exact URL match
-                page_info = (
-                    self.supabase_client.table("archon_page_metadata")
-                    .select("id, url, section_title, word_count")
-                    .eq("url", data["url"])
-                    .maybe_single()
-                    .execute()
-                )
+                page_info = page_rows.get(("url", data["url"]))
 
-            if page_info and page_info.data is not None:
+            if page_info is not None:
                 page_results.append({
-                    "page_id": page_info.data["id"],
-                    "url": page_info.data["url"],
-                    "section_title": page_info.data.get("section_title"),
-                    "word_count": page_info.data.get("word_count", 0),
+                    "page_id": page_info["id"],
+                    "url": page_info["url"],
+                    "section_title": page_info.get("section_title"),
+                    "word_count": page_info.get("word_count", 0),
                     "chunk_matches": data["chunk_matches"],
                     "aggregate_similarity": aggregate_score,
                     "average_similarity": avg_similarity,
@@ -241,6 +237,50 @@ class RAGService:
         page_results.sort(key=lambda x: x["aggregate_similarity"], reverse=True)
         return page_results[:match_count]
 
+    async def _fetch_page_metadata(
+        self, page_groups: Iterable[dict[str, Any]]
+    ) -> dict[tuple[str, str], dict[str, Any]]:
+        """
+        Resolve page metadata for all groups with at most one query per lookup field.
+
+        Returns:
+            Mapping of ("id", page_id) / ("url", url) to archon_page_metadata rows
+        """
+        cache = get_page_metadata_cache()
+        rows: dict[tuple[str, str], dict[str, Any]] = {}
+        missing: dict[str, set[str]] = {"id": set(), "url": set()}
+
+        for data in page_groups:
+            field, value = ("id", data["page_id"]) if data["page_id"] else ("url", data["url"])
+            cached = cache.get(field, value)
+            if cached is not None:
+                rows[(field, value)] = cached
+            else:
+                missing[field].add(value)
+
+        async def fetch(field: str, values: set[str]) -> list[dict[str, Any]]:
+            response = await execute_async(
+                self.supabase_client.table("archon_page_metadata")
+                .select(PAGE_METADATA_COLUMNS)
+                .in_(field, list(values))
+            )
+            return response.data or []
+
+        lookups = [(field, values) for field, values in missing.items() if values]
+        if lookups:
+            try:
+                results = await asyncio.gather(*(fetch(field, values) for field, values in lookups))
+            except Exception as e:
+                logger.error(f"Failed to fetch page metadata: {e}")
+                return rows
+
+            for (field, _), fetched in zip(lookups, results, strict=True):
+                for row in fetched:
+                    cache.set(row)
+                    rows[(field, row[field])] = row
+
+        return rows
+
     async def perform_rag_query(
         self, query: str, source: str = None, match_count: int = 5, return_mode: str = "chunks"
     ) -> tuple[bool, dict[str, Any]]:
@@ -8,7 +8,11 @@ a trained neural model, typically improving precision over initial retrieval sco
 Uses the cross-encoder/ms-marco-MiniLM-L-6-v2 model for reranking by default.
 """
 
+import asyncio
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 
 try:
@@ -27,11 +31,225 @@ logger = get_logger(__name__)
 DEFAULT_RERANKING_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
 
+class RerankingModelRegistry:
+    """
+    Process-wide cache of loaded CrossEncoder models.
+
+    Loading a CrossEncoder reads several hundred MB from disk, so the model is loaded
+    once and shared by every RerankingStrategy. The cached model is only replaced when
+    a different model name is requested (e.g. after RERANKING_MODEL changes).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._model: Any | None = None
+        self._model_name: str | None = None
+
+    def get_model(self, model_name: str = DEFAULT_RERANKING_MODEL) -> Any | None:
+        """Return the cached model for model_name, loading it on first use or on name change."""
+        if self._model is not None and self._model_name == model_name:
+            return self._model
+
+        with self._lock:
+            # Another thread may have loaded it while we waited for the lock
+            if self._model is not None and self._model_name == model_name:
+                return self._model
+
+            if not CROSSENCODER_AVAILABLE:
+                logger.warning("sentence-transformers not available - reranking disabled")
+                return None
+
+            try:
+                logger.info(f"Loading reranking model: {model_name}")
+                model = CrossEncoder(model_name)
+            except Exception as e:
+                logger.error(f"Failed to load reranking model {model_name}: {e}")
+                return None
+
+            if self._model_name is not None and self._model_name != model_name:
+                logger.info(f"Replacing cached reranking model {self._model_name} with {model_name}")
+            self._model = model
+            self._model_name = model_name
+            return model
+
+    def get_cached_model(self, model_name: str = DEFAULT_RERANKING_MODEL) -> Any | None:
+        """Return the cached model for model_name without loading it (None if not loaded)."""
+        model = self._model
+        return model if model is not None and self._model_name == model_name else None
+
+    async def load_model(self, model_name: str = DEFAULT_RERANKING_MODEL) -> Any | None:
+        """Return the model for model_name, loading it on a worker thread if it isn't cached."""
+        model = self.get_cached_model(model_name)
+        if model is not None:
+            return model
+        return await asyncio.to_thread(self.get_model, model_name)
+
+    def clear(self) -> None:
+        """Drop the cached model so the next request reloads it."""
+        with self._lock:
+            self._model = None
+            self._model_name = None
+
+    def get_info(self) -> dict[str, Any]:
+        """Get information about the cached model."""
+        return {"model_name": self._model_name, "model_loaded": self._model is not None}
+
+
+# Global registry instance
+_model_registry = RerankingModelRegistry()
+
+
+def get_reranking_model_registry() -> RerankingModelRegistry:
+    """Get the global reranking model registry."""
+    return _model_registry
+
+
+async def initialize_reranking_model(model_name: str = DEFAULT_RERANKING_MODEL) -> bool:
+    """
+    Warm-load the reranking model into the registry without blocking the event loop.
+
+    Returns:
+        True if the model is loaded and ready, False otherwise
+    """
+    model = await _model_registry.load_model(model_name)
+    return model is not None
+
+
+def clear_reranking_model_cache() -> None:
+    """Clear the cached reranking model."""
+    _model_registry.clear()
+
+
+@dataclass
+class _PendingPrediction:
+    """A caller's query-document pairs waiting to be scored."""
+
+    model: Any
+    pairs: list[list[str]]
+    future: asyncio.Future = field(repr=False)
+
+
+class RerankingExecutor:
+    """
+    Micro-batching executor for CrossEncoder predictions.
+
+    Model forward passes are CPU-bound, so they run on a dedicated worker thread instead
+    of the event loop. Pairs submitted by concurrent callers within a short window are
+    scored in a single predict call and each caller receives only its own scores.
+    """
+
+    def __init__(self, max_wait_ms: float = 5.0, max_batch_size: int = 256):
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        # Single worker: the model is shared and predict already parallelizes internally
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+        self._pending: list[_PendingPrediction] = []
+        self._pending_pairs = 0
+        self._flush_task: asyncio.Task | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    async def predict(self, model: Any, pairs: list[list[str]]) -> list[float]:
+        """Score query-document pairs, batching with other concurrent callers."""
+        if not pairs:
+            return []
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(_PendingPrediction(model=model, pairs=pairs, future=future))
+        self._pending_pairs += len(pairs)
+
+        if self._pending_pairs >= self.max_batch_size:
+            # Batch is full - score it now rather than waiting out the window
+            self._track(loop.create_task(self._flush()))
+        elif (
+            self._flush_task is None
+            or self._flush_task.done()
+            or self._flush_task.get_loop() is not loop
+        ):
+            self._flush_task = self._track(loop.create_task(self._flush_after_delay()))
+
+        return await future
+
+    def _track(self, task: asyncio.Task) -> asyncio.Task:
+        # Keep a strong reference so the task isn't garbage collected mid-flight
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _flush_after_delay(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        await self._flush()
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch, self._pending = self._pending, []
+        self._pending_pairs = 0
+        # Callers arriving while this batch is scored need a flush of their own
+        self._flush_task = None
+        # Drop anything left over from a loop that no longer exists
+        batch = [item for item in batch if item.future.get_loop() is loop]
+        if not batch:
+            return
+
+        # Group by model so callers using different models are never mixed
+        groups: dict[int, list[_PendingPrediction]] = {}
+        for item in batch:
+            groups.setdefault(id(item.model), []).append(item)
+
+        for items in groups.values():
+            all_pairs = [pair for item in items for pair in item.pairs]
+            try:
+                with safe_span("reranking_batch_predict", batch_size=len(all_pairs), callers=len(items)):
+                    scores = await loop.run_in_executor(self._executor, items[0].model.predict, all_pairs)
+                scores = [float(score) for score in scores]
+            except Exception as e:
+                for item in items:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+
+            offset = 0
+            for item in items:
+                item_scores = scores[offset : offset + len(item.pairs)]
+                offset += len(item.pairs)
+                if not item.future.done():
+                    item.future.set_result(item_scores)
+
+    def shutdown(self) -> None:
+        """Stop the worker thread."""
+        self._executor.shutdown(wait=False)
+
+
+_reranking_executor: RerankingExecutor | None = None
+
+
+def get_reranking_executor() -> RerankingExecutor:
+    """Get the global reranking executor, creating it on first use."""
+    global _reranking_executor
+    if _reranking_executor is None:
+        _reranking_executor = RerankingExecutor(
+            max_wait_ms=float(os.getenv("RERANKING_BATCH_WAIT_MS", "5")),
+            max_batch_size=int(os.getenv("RERANKING_MAX_BATCH_SIZE", "256")),
+        )
+    return _reranking_executor
+
+
+def shutdown_reranking_executor() -> None:
+    """Shut down the global reranking executor."""
+    global _reranking_executor
+    if _reranking_executor is not None:
+        _reranking_executor.shutdown()
+        _reranking_executor = None
+
+
 class RerankingStrategy:
     """Strategy class implementing result reranking using CrossEncoder models"""
 
     def __init__(
-        self, model_name: str = DEFAULT_RERANKING_MODEL, model_instance: Any | None = None
+        self,
+        model_name: str = DEFAULT_RERANKING_MODEL,
+        model_instance: Any | None = None,
+        executor: RerankingExecutor | None = None,
     ):
         """
         Initialize reranking strategy.
@@ -39,9 +257,14 @@ class RerankingStrategy:
         Args:
             model_name: Name/path of the CrossEncoder model to use
             model_instance: Pre-loaded CrossEncoder instance or any object with a predict method (optional)
+            executor: Executor used to run predictions off the event loop (defaults to the global one)
         """
         self.model_name = model_name
-        self.model = model_instance or self._load_model()
+        # Never load here: strategies are built on request paths. A model that isn't
+        # warm yet is loaded off the event loop by the first rerank_results call.
+        self.model = model_instance or _model_registry.get_cached_model(model_name)
+        self._load_attempted = model_instance is not None
+        self.executor = executor or get_reranking_executor()
 
     @classmethod
     def from_model(cls, model: Any, model_name: str = "custom_model") -> "RerankingStrategy":
@@ -59,18 +282,12 @@ class RerankingStrategy:
         """
         return cls(model_name=model_name, model_instance=model)
 
-    def _load_model(self) -> CrossEncoder:
-        """Load the CrossEncoder model for reranking."""
-        if not CROSSENCODER_AVAILABLE:
-            logger.warning("sentence-transformers not available - reranking disabled")
-            return None
-
-        try:
-            logger.info(f"Loading reranking model: {self.model_name}")
-            return CrossEncoder(self.model_name)
-        except Exception as e:
-            logger.error(f"Failed to load reranking model {self.model_name}: {e}")
-            return None
+    async def ensure_model(self) -> Any | None:
+        """Get the model, loading it from the shared registry on a worker thread the first time."""
+        if self.model is None and not self._load_attempted:
+            self._load_attempted = True
+            self.model = await _model_registry.load_model(self.model_name)
+        return self.model
 
     def is_available(self) -> bool:
         """Check if reranking is available (model loaded successfully)."""
@@ -155,7 +372,7 @@ class RerankingStrategy:
         Returns:
             Reranked list of results ordered by rerank_score (highest first)
         """
-        if not self.model or not results:
+        if not results or not await self.ensure_model():
             logger.debug("Reranking skipped - no model or no results")
             return results
 
@@ -172,9 +389,9 @@ class RerankingStrategy:
                     logger.warning("No valid texts found for reranking")
                     return results
 
-                # Get reranking scores from the model
+                # Get reranking scores from the model (batched, off the event loop)
                 with safe_span("crossencoder_predict"):
-                    scores = self.model.predict(query_doc_pairs)
+                    scores = await self.executor.predict(self.model, query_doc_pairs)
 
                 # Apply scores and sort results
                 reranked_results = self.apply_rerank_scores(results, scores, valid_indices, top_k)
@@ -0,0 +1,306 @@
+"""
+Vector Index Service
+
+Manages the pgvector indexes on the embedding columns of archon_crawled_pages and
+archon_code_examples. For each column it picks HNSW or ivfflat, sizes ivfflat lists
+from the number of embedded rows, and stores the search parameters
+(ivfflat.probes / hnsw.ef_search) that the search functions apply for a recall target.
+
+3072-d embeddings exceed the 2000-dimension limit of vector indexes and are indexed
+as halfvec by the database (see migration 018_add_vector_index_management).
+"""
+
+import math
+import os
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..client_manager import execute_async
+
+logger = get_logger(__name__)
+
+VECTOR_INDEX_TABLES = ("archon_crawled_pages", "archon_code_examples")
+VECTOR_INDEX_DIMENSIONS = (384, 768, 1024, 1536, 3072)
+VECTOR_INDEX_METHODS = ("hnsw", "ivfflat")
+
+DEFAULT_RECALL_TARGET = 0.95
+# HNSW builds get slow and memory-hungry on very large columns; "auto" uses ivfflat there
+DEFAULT_HNSW_MAX_ROWS = 1_000_000
+# ivfflat trains its lists on existing rows, so small columns are better served by HNSW
+IVFFLAT_MIN_ROWS = 10_000
+
+# pgvector defaults
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+HNSW_DEFAULT_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def ivfflat_lists(row_count: int) -> int:
+    """pgvector's sizing guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    if row_count <= 1_000_000:
+        return max(1, row_count // 1000)
+    return int(math.sqrt(row_count))
+
+
+def _recall_scale(recall_target: float) -> float:
+    """
+    Search effort relative to pgvector's defaults, which give roughly 90% recall.
+
+    Effort grows with the odds of the recall target: 1x at 0.9, ~2x at 0.95, 11x at 0.99.
+    """
+    if not 0 < recall_target < 1:
+        raise ValueError(f"Recall target must be between 0 and 1 (exclusive), got {recall_target}")
+    # Rounded so 0.9 maps to exactly 1x despite float error
+    return round((recall_target / (1 - recall_target)) / 9, 6)
+
+
+def ivfflat_probes(lists: int, recall_target: float) -> int:
+    """Lists to probe per query, starting from pgvector's sqrt(lists) suggestion."""
+    return min(lists, max(1, math.ceil(math.sqrt(lists) * _recall_scale(recall_target))))
+
+
+def hnsw_ef_search(recall_target: float, min_results: int = 0) -> int:
+    """
+    Candidate list size per query.
+
+    HNSW returns at most ef_search rows, so it never drops below the number of results
+    a search asks for (e.g. the hybrid search candidate count).
+    """
+    ef_search = math.ceil(HNSW_DEFAULT_EF_SEARCH * _recall_scale(recall_target))
+    return min(HNSW_MAX_EF_SEARCH, max(ef_search, min_results, 1))
+
+
+@dataclass
+class VectorIndexPlan:
+    """Index method and search parameters chosen for one embedding column."""
+
+    table_name: str
+    dimension: int
+    row_count: int
+    method: str
+    recall_target: float
+    lists: int | None = None
+    probes: int | None = None
+    ef_search: int | None = None
+
+    @property
+    def halfvec(self) -> bool:
+        return self.dimension > 2000
+
+
+def plan_vector_index(
+    table_name: str,
+    dimension: int,
+    row_count: int,
+    method: str = "auto",
+    recall_target: float = DEFAULT_RECALL_TARGET,
+    hnsw_max_rows: int = DEFAULT_HNSW_MAX_ROWS,
+    min_results: int = 0,
+) -> VectorIndexPlan:
+    """
+    Choose the index method and parameters for an embedding column.
+
+    Args:
+        table_name: Table of the embedding column
+        dimension: Embedding dimension of the column
+        row_count: Rows with an embedding in this column
+        method: "hnsw", "ivfflat" or "auto" (HNSW unless the column is too large for it)
+        recall_target: Desired recall of the approximate search, between 0 and 1
+        hnsw_max_rows: Row count above which "auto" picks ivfflat
+        min_results: Largest number of rows a single search requests
+
+    Returns:
+        VectorIndexPlan
+    """
+    if method == "auto":
+        method = "ivfflat" if row_count > max(hnsw_max_rows, IVFFLAT_MIN_ROWS) else "hnsw"
+    if method not in VECTOR_INDEX_METHODS:
+        raise ValueError(f"Unsupported vector index method: {method}")
+
+    plan = VectorIndexPlan(table_name, dimension, row_count, method, recall_target)
+    if method == "ivfflat":
+        plan.lists = ivfflat_lists(row_count)
+        plan.probes = ivfflat_probes(plan.lists, recall_target)
+    else:
+        plan.ef_search = hnsw_ef_search(recall_target, min_results)
+    return plan
+
+
+def _index_lists(index_options: list[str] | None) -> int | None:
+    """Read lists=N from the reloptions of an ivfflat index."""
+    for option in index_options or []:
+        name, _, value = option.partition("=")
+        if name.strip() == "lists" and value.strip().isdigit():
+            return int(value)
+    return None
+
+
+def needs_rebuild(status: dict[str, Any], plan: VectorIndexPlan) -> bool:
+    """
+    Whether the current index of a column must be rebuilt to match the plan.
+
+    ivfflat indexes are only rebuilt once their lists are off by more than 2x, since a
+    rebuild locks the table and retrains every list.
+    """
+    if not status.get("index_name") or status.get("index_method") != plan.method:
+        return True
+    if plan.method == "ivfflat":
+        current_lists = _index_lists(status.get("index_options"))
+        if current_lists is None:
+            return True
+        return not (plan.lists / 2 <= current_lists <= plan.lists * 2)
+    return False
+
+
+class VectorIndexService:
+    """
+    Reads the state of the embedding indexes and rebuilds or re-tunes them.
+    """
+
+    def __init__(self, supabase_client, get_setting: Callable[[str, str], str] | None = None):
+        """
+        Initialize the vector index service.
+
+        Args:
+            supabase_client: The Supabase client for database operations
+            get_setting: Optional settings lookup (key, default) -> value; defaults to env vars
+        """
+        self.supabase_client = supabase_client
+        self.get_setting = get_setting or os.getenv
+
+    def _plan(
+        self, status: dict[str, Any], method: str | None = None, recall_target: float | None = None
+    ) -> VectorIndexPlan:
+        return plan_vector_index(
+            status["table_name"],
+            status["dimension"],
+            status.get("row_count") or 0,
+            method=method or self.get_setting("VECTOR_INDEX_METHOD", "auto"),
+            recall_target=(
+                recall_target
+                if recall_target is not None
+                else float(self.get_setting("VECTOR_SEARCH_RECALL_TARGET", str(DEFAULT_RECALL_TARGET)))
+            ),
+            hnsw_max_rows=int(self.get_setting("VECTOR_INDEX_HNSW_MAX_ROWS", str(DEFAULT_HNSW_MAX_ROWS))),
+            min_results=int(self.get_setting("HYBRID_CANDIDATE_COUNT", "50")),
+        )
+
+    async def get_status(self) -> list[dict[str, Any]]:
+        """
+        Current index of every embedding column with the recommended plan.
+
+        Returns:
+            One dict per (table, dimension) with row_count, index_method, index_options,
+            probes/ef_search in effect, the recommended plan and whether it needs a rebuild
+        """
+        result = await execute_async(self.supabase_client.rpc("archon_vector_index_status", {}))
+        statuses = []
+        for row in result.data or []:
+            plan = self._plan(row)
+            statuses.append({
+                **row,
+                "recommended": asdict(plan),
+                "needs_rebuild": needs_rebuild(row, plan),
+            })
+        return statuses
+
+    async def rebuild(
+        self,
+        table_name: str | None = None,
+        dimension: int | None = None,
+        method: str | None = None,
+        recall_target: float | None = None,
+        force: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Rebuild indexes that no longer fit their data and re-tune search parameters.
+
+        Columns whose index already matches the plan are not rebuilt; only their
+        search parameters are updated.
+
+        Args:
+            table_name: Limit to one table (default: both)
+            dimension: Limit to one embedding dimension (default: all)
+            method: "hnsw", "ivfflat" or "auto" (default: VECTOR_INDEX_METHOD setting)
+            recall_target: Recall target for the search parameters
+                (default: VECTOR_SEARCH_RECALL_TARGET setting)
+            force: Rebuild even when the current index matches the plan
+
+        Returns:
+            One result per column with the plan and the action taken
+            ("rebuilt", "tuned" or "failed")
+        """
+        if table_name is not None and table_name not in VECTOR_INDEX_TABLES:
+            raise ValueError(f"Unsupported table for vector indexes: {table_name}")
+        if dimension is not None and dimension not in VECTOR_INDEX_DIMENSIONS:
+            raise ValueError(f"Unsupported embedding dimension: {dimension}")
+
+        result = await execute_async(self.supabase_client.rpc("archon_vector_index_status", {}))
+        results = []
+        for status in result.data or []:
+            if table_name and status["table_name"] != table_name:
+                continue
+            if dimension and status["dimension"] != dimension:
+                continue
+
+            plan = self._plan(status, method, recall_target)
+            entry = {**asdict(plan), "action": "tuned"}
+            try:
+                if force or needs_rebuild(status, plan):
+                    rebuilt = await execute_async(
+                        self.supabase_client.rpc(
+                            "archon_rebuild_vector_index",
+                            {
+                                "p_table_name": plan.table_name,
+                                "p_dimension": plan.dimension,
+                                "p_method": plan.method,
+                                "p_lists": plan.lists,
+                                "p_m": HNSW_M,
+                                "p_ef_construction": HNSW_EF_CONSTRUCTION,
+                            },
+                        )
+                    )
+                    entry["action"] = "rebuilt"
+                    entry["index_definition"] = rebuilt.data
+                    safe_logfire_info(
+                        f"Rebuilt vector index | table={plan.table_name} | dimension={plan.dimension} "
+                        f"| method={plan.method} | lists={plan.lists} | rows={plan.row_count}"
+                    )
+                elif plan.method == "ivfflat":
+                    # Probes are tuned for the lists the index actually has
+                    plan.lists = _index_lists(status.get("index_options"))
+                    plan.probes = ivfflat_probes(plan.lists, plan.recall_target)
+                    entry.update(lists=plan.lists, probes=plan.probes)
+                await self._save_search_params(plan)
+            except Exception as e:
+                safe_logfire_error(
+                    f"Failed to rebuild vector index | table={plan.table_name} | dimension={plan.dimension} "
+                    f"| error={str(e)}"
+                )
+                entry["action"] = "failed"
+                entry["error"] = str(e)
+            results.append(entry)
+        return results
+
+    async def _save_search_params(self, plan: VectorIndexPlan) -> None:
+        """Store the parameters the search functions apply to queries on this index."""
+        await execute_async(
+            self.supabase_client.table("archon_vector_index_settings").upsert(
+                {
+                    "table_name": plan.table_name,
+                    "dimension": plan.dimension,
+                    "index_method": plan.method,
+                    "lists": plan.lists,
+                    "probes": plan.probes,
+                    "ef_search": plan.ef_search,
+                    "recall_target": plan.recall_target,
+                    "row_count": plan.row_count,
+                    "updated_at": datetime.now().astimezone().isoformat(),
+                },
+                on_conflict="table_name,dimension",
+            )
+        )
@@ -9,12 +9,13 @@ import json
 import os
 import re
 import time
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 from collections.abc import Callable
 from difflib import SequenceMatcher
 from typing import Any
 from urllib.parse import urlparse
 
+import numpy as np
 from supabase import Client
 
 from ...config.logfire_config import search_logger
@@ -181,6 +182,144 @@ def _calculate_code_similarity(code1: str, code2: str) -> float:
     return similarity
 
 
+# Near-duplicate detection indexes blocks with MinHash signatures of the character
+# 5-grams of their normalized code, banded for LSH. Renaming an identifier only
+# changes the shingles around it, so renamed variants keep most of their shingles
+# (token shingles lose every shingle that touches the name): blocks at the similarity
+# threshold share about 0.6 or more of them. 64 bands of 4 rows make such a pair a
+# candidate with probability above 0.999; candidates whose signatures agree on less
+# than _DEDUP_MIN_JACCARD are dropped before the exact SequenceMatcher check.
+# Small inputs are still compared exhaustively. Recall against the all-pairs scan is
+# measured by tests/benchmarks/benchmark_code_dedup.py.
+CODE_SIMILARITY_THRESHOLD = 0.85
+_DEDUP_EXHAUSTIVE_LIMIT = 100
+_DEDUP_SHINGLE_CHARS = 5
+_DEDUP_NUM_PERMUTATIONS = 256
+_DEDUP_BAND_ROWS = 4
+_DEDUP_MIN_JACCARD = 0.5
+# One seed per MinHash permutation, fixed so results are reproducible
+_DEDUP_HASH_SEEDS = np.random.default_rng(0x5EED).integers(0, 2**63, _DEDUP_NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, in place; uint64 arithmetic wraps."""
+    values ^= values >> np.uint64(30)
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+
+def _minhash_signature(normalized: str) -> np.ndarray:
+    """MinHash signature of the character shingles of a normalized code string."""
+    chars = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    width = min(_DEDUP_SHINGLE_CHARS, len(chars))
+    count = len(chars) - width + 1
+    # Polynomial hash of every shingle
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        hashes = hashes * np.uint64(1_000_003) + chars[offset : offset + count]
+    shingles = np.unique(hashes)
+    # Seeded scrambles stand in for random permutations; linear (multiply-shift)
+    # families are cheaper but skew the minimum and overestimate Jaccard
+    return _mix64(shingles[:, None] ^ _DEDUP_HASH_SEEDS).min(axis=0)
+
+
+def _find_similar_code_groups(
+    codes: list[str], similarity_threshold: float = CODE_SIMILARITY_THRESHOLD
+) -> list[list[int]]:
+    """
+    Group code strings whose normalized similarity reaches the threshold.
+
+    Groups are built greedily in input order, as with an all-pairs scan: each
+    ungrouped block claims every later ungrouped block that is similar to it.
+    Candidate pairs come from an LSH index (or all later blocks for small inputs) and
+    must pass SequenceMatcher's length and character-count upper bounds before the
+    full ratio() is computed.
+
+    Args:
+        codes: Code strings to group
+        similarity_threshold: Minimum similarity ratio for two blocks to be grouped
+
+    Returns:
+        Lists of indices into codes; the first index of each group is its seed
+    """
+    normalized = [_normalize_code_for_comparison(code) for code in codes]
+    lengths = [len(norm) for norm in normalized]
+    count = len(codes)
+    char_counts: list[Counter | None] = [None] * count
+    # One matcher per block, reused as the second sequence so its index is built once
+    matchers: list[SequenceMatcher | None] = [None] * count
+
+    use_index = count > _DEDUP_EXHAUSTIVE_LIMIT
+    if use_index:
+        signatures = np.stack([_minhash_signature(norm) for norm in normalized])
+        rows = _DEDUP_BAND_ROWS
+        band_keys = [
+            [bytes([band]) + signature[band * rows : (band + 1) * rows].tobytes() for band in range(len(signature) // rows)]
+            for signature in signatures
+        ]
+        members: dict[bytes, list[int]] = defaultdict(list)
+        for index, keys in enumerate(band_keys):
+            for key in keys:
+                members[key].append(index)
+        buckets = {key: np.array(indices) for key, indices in members.items()}
+        min_matching = _DEDUP_MIN_JACCARD * _DEDUP_NUM_PERMUTATIONS
+
+    groups = []
+    processed = np.zeros(count, dtype=bool)
+    for i in range(count):
+        if processed[i]:
+            continue
+        processed[i] = True
+        group = [i]
+
+        if use_index:
+            # Bucket members are in index order, so later blocks are a suffix
+            later = [bucket[bucket.searchsorted(i, side="right") :] for bucket in map(buckets.__getitem__, band_keys[i])]
+            candidates = np.unique(np.concatenate(later))
+            candidates = candidates[~processed[candidates]]
+            matching = (signatures[candidates] == signatures[i]).sum(axis=1)
+            candidates = candidates[matching >= min_matching].tolist()
+        else:
+            candidates = range(i + 1, count)
+
+        len_i = lengths[i]
+        for j in candidates:
+            if processed[j]:
+                continue
+            total_length = len_i + lengths[j]
+            if not total_length:
+                similarity = 1.0
+            else:
+                # ratio() can't exceed 2 * shorter length / total length...
+                if 2 * min(len_i, lengths[j]) < similarity_threshold * total_length:
+                    continue
+                # ...nor the share of characters the two strings have in common
+                if char_counts[i] is None:
+                    char_counts[i] = Counter(normalized[i])
+                if char_counts[j] is None:
+                    char_counts[j] = Counter(normalized[j])
+                common = sum((char_counts[i] & char_counts[j]).values())
+                if 2 * common < similarity_threshold * total_length:
+                    continue
+                matcher = matchers[j]
+                if matcher is None:
+                    matcher = matchers[j] = SequenceMatcher(None, b=normalized[j])
+                matcher.set_seq1(normalized[i])
+                similarity = matcher.ratio()
+
+            if similarity >= similarity_threshold:
+                group.append(j)
+                processed[j] = True
+                search_logger.debug(f"Found similar code blocks with {similarity:.2f} similarity")
+
+        groups.append(group)
+
+    return groups
+
+
 def _select_best_code_variant(similar_blocks: list[dict[str, Any]]) -> dict[str, Any]:
     """
     Select the best variant from a list of similar code blocks.
@@ -535,34 +674,11 @@ def extract_code_blocks(markdown_content: str, min_length: int = None) -> list[d
 
     search_logger.debug(f"Starting deduplication process for {len(code_blocks)} code blocks")
 
-    # Group similar code blocks together
-    similarity_threshold = 0.85  # 85% similarity threshold
-    grouped_blocks = []
-    processed_indices = set()
-
-    for i, block1 in enumerate(code_blocks):
-        if i in processed_indices:
-            continue
-
-        # Start a new group with this block
-        similar_group = [block1]
-        processed_indices.add(i)
-
-        # Find all similar blocks
-        for j, block2 in enumerate(code_blocks):
-            if j <= i or j in processed_indices:
-                continue
-
-            similarity = _calculate_code_similarity(block1["code"], block2["code"])
-
-            if similarity >= similarity_threshold:
-                similar_group.append(block2)
-                processed_indices.add(j)
-                search_logger.debug(f"Found similar code blocks with {similarity:.2f} similarity")
-
-        # Select the best variant from the similar group
-        best_variant = _select_best_code_variant(similar_group)
-        grouped_blocks.append(best_variant)
+    # Group similar code blocks together and keep the best variant of each group
+    grouped_blocks = [
+        _select_best_code_variant([code_blocks[index] for index in group])
+        for group in _find_similar_code_groups([block["code"] for block in code_blocks])
+    ]
 
     deduplicated_count = len(code_blocks) - len(grouped_blocks)
     if deduplicated_count > 0:
@@ -5,12 +5,87 @@ Handles storage of documents in Supabase with parallel processing support.
 """
 
 import asyncio
+import hashlib
 import os
 from typing import Any
 
 from ...config.logfire_config import safe_span, search_logger
+from ..client_manager import execute_async, run_db_call
 from ..embeddings.contextual_embedding_service import generate_contextual_embeddings_batch
-from ..embeddings.embedding_service import create_embeddings_batch
+from ..embeddings.embedding_service import EmbeddingBatchResult, create_embeddings_batch
+
+# Embedding columns on archon_crawled_pages keyed by vector dimension
+EMBEDDING_COLUMNS = {
+    384: "embedding_384",
+    768: "embedding_768",
+    1024: "embedding_1024",
+    1536: "embedding_1536",
+    3072: "embedding_3072",
+}
+
+
+def compute_content_hash(content: str) -> str:
+    """Hash a chunk's original text so unchanged chunks can be recognized on recrawl."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def fetch_reusable_chunks(
+    client,
+    urls: list[str],
+    embedding_model: str,
+    embedding_dimensions: int | None,
+    use_contextual_embeddings: bool,
+    batch_size: int = 50,
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """
+    Load stored chunks whose vectors can be reused for the given embedding configuration.
+
+    A stored chunk is reusable when it has a content hash, was embedded with the same
+    model (and, for dimension-configurable OpenAI models, the same dimension), and was
+    stored with the same contextual-embedding setting.
+
+    Returns:
+        Mapping of (url, content_hash) to the stored content, embedding and dimension
+    """
+    from ..llm_provider_service import is_openai_embedding_model
+
+    check_dimension = embedding_dimensions is not None and is_openai_embedding_model(embedding_model)
+    columns = ", ".join(
+        ["url", "content", "content_hash", "metadata", "embedding_model", "embedding_dimension"]
+        + list(EMBEDDING_COLUMNS.values())
+    )
+
+    reusable: dict[tuple[str, str], dict[str, Any]] = {}
+    for i in range(0, len(urls), batch_size):
+        batch_urls = urls[i : i + batch_size]
+        try:
+            response = (
+                client.table("archon_crawled_pages").select(columns).in_("url", batch_urls).execute()
+            )
+        except Exception as e:
+            search_logger.warning(f"Could not load existing chunks for embedding reuse: {e}")
+            continue
+
+        for row in response.data or []:
+            content_hash = row.get("content_hash")
+            if not content_hash or row.get("embedding_model") != embedding_model:
+                continue
+            dimension = row.get("embedding_dimension")
+            if check_dimension and dimension != embedding_dimensions:
+                continue
+            metadata = row.get("metadata") or {}
+            if bool(metadata.get("contextual_embedding")) != use_contextual_embeddings:
+                continue
+            embedding = row.get(EMBEDDING_COLUMNS.get(dimension, ""))
+            if embedding is None:
+                continue
+            reusable[(row["url"], content_hash)] = {
+                "content": row.get("content"),
+                "embedding": embedding,
+                "embedding_dimension": dimension,
+            }
+
+    return reusable
 
 
 async def add_documents_to_supabase(
@@ -58,6 +133,7 @@ async def add_documents_to_supabase(
                     search_logger.warning(f"Progress callback failed: {e}. Storage continuing...")
 
         # Load settings from database
+        rag_settings: dict[str, Any] = {}
         try:
             # Defensive import to handle any initialization issues
             from ..credential_service import credential_service as cred_service
@@ -80,6 +156,45 @@ async def add_documents_to_supabase(
         # Get unique URLs to delete existing records
         unique_urls = list(set(urls))
 
+        # Check if contextual embeddings are enabled (use credential_service)
+        from ..credential_service import credential_service
+
+        try:
+            use_contextual_embeddings = await credential_service.get_credential(
+                "USE_CONTEXTUAL_EMBEDDINGS", "false", decrypt=True
+            )
+            if isinstance(use_contextual_embeddings, str):
+                use_contextual_embeddings = use_contextual_embeddings.lower() == "true"
+        except Exception:
+            # Fallback to environment variable
+            use_contextual_embeddings = os.getenv("USE_CONTEXTUAL_EMBEDDINGS", "false") == "true"
+
+        # Get model information for tracking and embedding reuse
+        from ..llm_provider_service import get_embedding_model
+
+        embedding_model_name = await get_embedding_model(provider=provider)
+
+        # Before deleting, remember vectors for chunks that haven't changed since the last crawl
+        content_hashes = [compute_content_hash(content) for content in contents]
+        try:
+            embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
+        except (TypeError, ValueError):
+            embedding_dimensions = None
+        reusable_chunks = (
+            await run_db_call(
+                fetch_reusable_chunks,
+                client,
+                unique_urls,
+                embedding_model_name,
+                embedding_dimensions,
+                bool(use_contextual_embeddings),
+                delete_batch_size,
+            )
+            if unique_urls
+            else {}
+        )
+        total_chunks_reused = 0
+
         # Delete existing records for these URLs in batches
         try:
             if unique_urls:
@@ -101,7 +216,7 @@ async def add_documents_to_supabase(
                             raise
 
                     batch_urls = unique_urls[i : i + delete_batch_size]
-                    client.table("archon_crawled_pages").delete().in_("url", batch_urls).execute()
+                    await execute_async(client.table("archon_crawled_pages").delete().in_("url", batch_urls))
                     # Yield control to allow other async operations
                     if i + delete_batch_size < len(unique_urls):
                         await asyncio.sleep(0.05)  # Reduced pause between delete batches
@@ -131,7 +246,7 @@ async def add_documents_to_supabase(
 
                 batch_urls = unique_urls[i : i + fallback_batch_size]
                 try:
-                    client.table("archon_crawled_pages").delete().in_("url", batch_urls).execute()
+                    await execute_async(client.table("archon_crawled_pages").delete().in_("url", batch_urls))
                     await asyncio.sleep(0.05)  # Rate limit to prevent overwhelming
                 except Exception as inner_e:
                     search_logger.error(
@@ -142,18 +257,6 @@ async def add_documents_to_supabase(
             if failed_urls:
                 search_logger.error(f"Failed to delete {len(failed_urls)} URLs")
 
-        # Check if contextual embeddings are enabled (use credential_service)
-
-        try:
-            use_contextual_embeddings = await credential_service.get_credential(
-                "USE_CONTEXTUAL_EMBEDDINGS", "false", decrypt=True
-            )
-            if isinstance(use_contextual_embeddings, str):
-                use_contextual_embeddings = use_contextual_embeddings.lower() == "true"
-        except Exception:
-            # Fallback to environment variable
-            use_contextual_embeddings = os.getenv("USE_CONTEXTUAL_EMBEDDINGS", "false") == "true"
-
         # Initialize batch tracking for simplified progress
         completed_batches = 0
         total_batches = (len(contents) + batch_size - 1) // batch_size
@@ -183,6 +286,43 @@ async def add_documents_to_supabase(
             batch_chunk_numbers = chunk_numbers[i:batch_end]
             batch_contents = contents[i:batch_end]
             batch_metadatas = metadatas[i:batch_end]
+            batch_hashes = content_hashes[i:batch_end]
+            batch_size_total = len(batch_contents)
+
+            # Unchanged chunks reuse their stored vectors; only new or changed chunks get embedded
+            reused_records = []
+            new_indices = []
+            for j in range(len(batch_contents) if reusable_chunks else 0):
+                stored = reusable_chunks.get((batch_urls[j], batch_hashes[j]))
+                source_id = batch_metadatas[j].get("source_id")
+                if stored is None or not source_id:
+                    new_indices.append(j)
+                    continue
+                metadata = {"chunk_size": len(stored["content"]), **batch_metadatas[j]}
+                if use_contextual_embeddings:
+                    metadata["contextual_embedding"] = True
+                reused_records.append({
+                    "url": batch_urls[j],
+                    "chunk_number": batch_chunk_numbers[j],
+                    "content": stored["content"],
+                    "metadata": metadata,
+                    "source_id": source_id,
+                    EMBEDDING_COLUMNS[stored["embedding_dimension"]]: stored["embedding"],
+                    "embedding_model": embedding_model_name,
+                    "embedding_dimension": stored["embedding_dimension"],
+                    "content_hash": batch_hashes[j],
+                    "page_id": url_to_page_id.get(batch_urls[j]) if url_to_page_id else None,
+                })
+
+            if reused_records:
+                batch_urls = [batch_urls[j] for j in new_indices]
+                batch_chunk_numbers = [batch_chunk_numbers[j] for j in new_indices]
+                batch_contents = [batch_contents[j] for j in new_indices]
+                batch_metadatas = [batch_metadatas[j] for j in new_indices]
+                batch_hashes = [batch_hashes[j] for j in new_indices]
+                search_logger.info(
+                    f"Batch {batch_num}: reusing stored embeddings for {len(reused_records)}/{batch_size_total} unchanged chunks"
+                )
 
             # Simple batch progress - only track completed batches
             current_progress = int((completed_batches / total_batches) * 100)
@@ -205,12 +345,12 @@ async def add_documents_to_supabase(
                     await progress_callback(
                         "document_storage",  # status (will be overridden by base_status anyway)
                         current_progress,    # progress
-                        f"Processing batch {batch_num}/{total_batches} ({len(batch_contents)} chunks)",  # message
+                        f"Processing batch {batch_num}/{total_batches} ({batch_size_total} chunks)",  # message
                     **{  # **kwargs - these will be stored at top level
                         "current_batch": batch_num,
                         "total_batches": total_batches,
                         "completed_batches": completed_batches,
-                        "chunks_in_batch": len(batch_contents),
+                        "chunks_in_batch": batch_size_total,
                         "active_workers": max_workers if use_contextual_embeddings else 1,
                     }
                 )
@@ -221,7 +361,9 @@ async def add_documents_to_supabase(
             # Only report on completion
 
             # Apply contextual embedding to each chunk if enabled
-            if use_contextual_embeddings:
+            if not batch_contents:
+                contextual_contents = []
+            elif use_contextual_embeddings:
                 # Prepare full documents list for batch processing
                 full_documents = []
                 for j, _content in enumerate(batch_contents):
@@ -312,11 +454,14 @@ async def add_documents_to_supabase(
             wrapper_func = make_embedding_progress_wrapper(current_progress, batch_num)
 
             # Pass progress callback for rate limiting updates
-            result = await create_embeddings_batch(
-                contextual_contents,
-                provider=provider,
-                progress_callback=wrapper_func if progress_callback else None
-            )
+            if contextual_contents:
+                result = await create_embeddings_batch(
+                    contextual_contents,
+                    provider=provider,
+                    progress_callback=wrapper_func if progress_callback else None
+                )
+            else:
+                result = EmbeddingBatchResult()
 
             # Log any failures
             if result.has_failures:
@@ -328,14 +473,7 @@ async def add_documents_to_supabase(
             # Use only successful embeddings
             batch_embeddings = result.embeddings
             successful_texts = result.texts_processed
-            
-            # Get model information for tracking
-            from ..llm_provider_service import get_embedding_model
-            from ..credential_service import credential_service
-            
-            # Get embedding model name
-            embedding_model_name = await get_embedding_model(provider=provider)
-            
+
             # Get LLM chat model (used for contextual embeddings if enabled)
             llm_chat_model = None
             if use_contextual_embeddings:
@@ -349,16 +487,19 @@ async def add_documents_to_supabase(
                     search_logger.warning(f"Failed to get LLM chat model: {e}")
                     llm_chat_model = "gpt-4o-mini"  # Default fallback
 
-            if not batch_embeddings:
+            if not batch_embeddings and not reused_records:
                 search_logger.warning(
                     f"Skipping batch {batch_num} - no successful embeddings created"
                 )
                 completed_batches += 1
                 continue
 
-            # Prepare batch data - only for successful embeddings
+            # Prepare batch data - reused chunks plus successful new embeddings
             from collections import defaultdict, deque
-            batch_data = []
+            for record in reused_records:
+                record["llm_chat_model"] = llm_chat_model
+            batch_data = list(reused_records)
+            total_chunks_reused += len(reused_records)
 
             # Build positions map to handle duplicate texts correctly
             # Each text maps to a queue of indices where it appears
@@ -385,21 +526,12 @@ async def add_documents_to_supabase(
 
                 # Determine the correct embedding column based on dimension
                 embedding_dim = len(embedding) if isinstance(embedding, list) else len(embedding.tolist())
-                embedding_column = None
-                
-                if embedding_dim == 768:
-                    embedding_column = "embedding_768"
-                elif embedding_dim == 1024:
-                    embedding_column = "embedding_1024"
-                elif embedding_dim == 1536:
-                    embedding_column = "embedding_1536"
-                elif embedding_dim == 3072:
-                    embedding_column = "embedding_3072"
-                else:
+                embedding_column = EMBEDDING_COLUMNS.get(embedding_dim)
+                if embedding_column is None:
                     # Default to closest supported dimension
                     search_logger.warning(f"Unsupported embedding dimension {embedding_dim}, using embedding_1536")
                     embedding_column = "embedding_1536"
-                
+
                 # Get page_id for this URL if available
                 page_id = url_to_page_id.get(batch_urls[j]) if url_to_page_id else None
 
@@ -413,6 +545,7 @@ async def add_documents_to_supabase(
                     "llm_chat_model": llm_chat_model,  # Add LLM model tracking
                     "embedding_model": embedding_model_name,  # Add embedding model tracking
                     "embedding_dimension": embedding_dim,  # Add dimension tracking
+                    "content_hash": batch_hashes[j],  # Lets the next recrawl reuse this embedding
                     "page_id": page_id,  # Link chunk to page
                 }
                 batch_data.append(data)
@@ -439,7 +572,7 @@ async def add_documents_to_supabase(
                         raise
 
                 try:
-                    client.table("archon_crawled_pages").insert(batch_data).execute()
+                    await execute_async(client.table("archon_crawled_pages").insert(batch_data))
                     total_chunks_stored += len(batch_data)
 
                     # Increment completed batches and report simple progress
@@ -497,7 +630,7 @@ async def add_documents_to_supabase(
                                     raise
 
                             try:
-                                client.table("archon_crawled_pages").insert(record).execute()
+                                await execute_async(client.table("archon_crawled_pages").insert(record))
                                 successful_inserts += 1
                                 total_chunks_stored += 1
                             except Exception as individual_error:
@@ -538,5 +671,11 @@ async def add_documents_to_supabase(
         span.set_attribute("success", True)
         span.set_attribute("total_processed", len(contents))
         span.set_attribute("total_stored", total_chunks_stored)
+        span.set_attribute("total_reused", total_chunks_reused)
+
+        if total_chunks_reused:
+            search_logger.info(
+                f"Reused stored embeddings for {total_chunks_reused}/{len(contents)} unchanged chunks"
+            )
 
-        return {"chunks_stored": total_chunks_stored}
+        return {"chunks_stored": total_chunks_stored, "chunks_reused": total_chunks_reused}
@@ -9,13 +9,15 @@ Based on proven patterns from crawl4ai_mcp.py architecture.
 
 import asyncio
 import gc
+import re
 import threading
 import time
 from collections import deque
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from datetime import datetime
 
 # Removed direct logging import - using unified config
 from enum import Enum
@@ -46,6 +48,74 @@ class RateLimitConfig:
     max_concurrent: int = 2  # Concurrent request limit
     backoff_multiplier: float = 1.5  # Exponential backoff multiplier
     max_backoff: float = 60.0  # Maximum backoff delay in seconds
+    decrease_factor: float = 0.5  # Multiplicative decrease applied to the budget on a 429
+    increase_fraction: float = 0.05  # Share of the ceiling added back per successful request
+    min_budget_fraction: float = 0.05  # Budget never shrinks below this share of the ceiling
+
+
+# Provider headers describing the current rate-limit window (OpenAI-style first, Anthropic-style second)
+_LIMIT_HEADERS = {
+    "limit_requests": ("x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit"),
+    "limit_tokens": ("x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit"),
+    "remaining_requests": ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"),
+    "remaining_tokens": ("x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining"),
+    "reset_requests": ("x-ratelimit-reset-requests", "anthropic-ratelimit-requests-reset"),
+    "reset_tokens": ("x-ratelimit-reset-tokens", "anthropic-ratelimit-tokens-reset"),
+}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _header_value(headers: Any, names: tuple[str, ...]) -> str | None:
+    """Return the first header in names that is present, as a string."""
+    getter = getattr(headers, "get", None)
+    if not callable(getter):
+        return None
+    for name in names:
+        value = getter(name)
+        if isinstance(value, str | int | float) and not isinstance(value, bool):
+            return str(value).strip()
+    return None
+
+
+def _parse_number(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_reset_seconds(value: str | None, now: float) -> float | None:
+    """
+    Parse a reset header into seconds from now.
+
+    Accepts plain seconds ("12"), Go-style durations ("6m0s", "20ms") and
+    RFC 3339 timestamps ("2025-01-01T00:00:30Z").
+    """
+    if not value:
+        return None
+    seconds = _parse_number(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return max(0.0, reset_at.timestamp() - now)
+
+
+def _parse_retry_after(headers: Any, now: float) -> float | None:
+    """Retry-After in seconds (retry-after-ms takes precedence when present)."""
+    retry_after_ms = _parse_number(_header_value(headers, ("retry-after-ms",)))
+    if retry_after_ms is not None:
+        return max(0.0, retry_after_ms / 1000)
+    return _parse_reset_seconds(_header_value(headers, ("retry-after",)), now)
 
 
 @dataclass
@@ -72,26 +142,126 @@ class ThreadingConfig:
     health_check_interval: float = 30  # System health check frequency
 
 
+class ConcurrencyLimit:
+    """
+    Semaphore whose limit can be changed while it is held.
+
+    Lowering the limit takes effect as holders release: nobody gets in until
+    fewer than the new limit are in flight. Waiters are admitted in FIFO order.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    def locked(self) -> bool:
+        return self.in_use >= self.limit
+
+    def resize(self, limit: int) -> None:
+        """Change the limit; raising it admits waiters right away."""
+        self.limit = limit
+        self._wake()
+
+    async def acquire(self) -> bool:
+        if not self._waiters and self.in_use < self.limit:
+            self.in_use += 1
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just before the cancellation: pass the slot on
+                self.release()
+            raise
+        finally:
+            if future in self._waiters:
+                self._waiters.remove(future)
+        return True
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Slots are taken on behalf of the woken waiters
+        while self._waiters and self.in_use < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
 class RateLimiter:
-    """Thread-safe rate limiter with token bucket algorithm"""
+    """
+    Sliding-window rate limiter for one provider.
+
+    Requests and tokens used in the last minute are kept in a single deque with a
+    running token total, so admission checks are O(1). The budget starts at the
+    configured limits and adapts AIMD-style: a 429 cuts it multiplicatively,
+    every successful request adds back a fraction of the ceiling, and limits
+    advertised in provider rate-limit headers become the new ceiling.
+    """
+
+    WINDOW_SECONDS = 60.0
 
-    def __init__(self, config: RateLimitConfig):
+    def __init__(self, config: RateLimitConfig, name: str = "default"):
         self.config = config
-        self.request_times = deque()
-        self.token_usage = deque()
-        self.semaphore = asyncio.Semaphore(config.max_concurrent)
+        self.name = name
+        self.semaphore = ConcurrencyLimit(config.max_concurrent)
         self._lock = asyncio.Lock()
 
+        # (timestamp, tokens) per admitted request inside the window
+        self._window: deque[tuple[float, float]] = deque()
+        self._window_tokens = 0.0
+
+        # Ceilings are the best known provider limits; budgets are what we currently allow
+        self.request_ceiling = float(config.requests_per_minute)
+        self.token_ceiling = float(config.tokens_per_minute)
+        self.request_budget = self.request_ceiling
+        self.token_budget = self.token_ceiling
+        self.limits_learned = False
+
+        # Usage reported by the provider that we did not see locally (other workers, other keys)
+        self._provider_requests_used = 0.0
+        self._provider_tokens_used = 0.0
+        self._provider_usage_expires = 0.0
+
+        self._blocked_until = 0.0
+        self._consecutive_throttles = 0
+        self._last_throttle_at: float | None = None
+
+        self.throttle_count = 0
+        self.wait_count = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def set_max_concurrent(self, max_concurrent: int) -> None:
+        """Change the in-flight request limit; after a decrease, requests in flight finish first."""
+        max_concurrent = max(1, max_concurrent)
+        if max_concurrent != self.config.max_concurrent:
+            self.config.max_concurrent = max_concurrent
+            self.semaphore.resize(max_concurrent)
+
     async def acquire(self, estimated_tokens: int = 8000, progress_callback: Callable | None = None) -> bool:
         """Acquire permission to make API call with token awareness
-        
+
         Args:
             estimated_tokens: Estimated number of tokens for the operation
             progress_callback: Optional async callback for progress updates during wait
         """
         while True:  # Loop instead of recursion to avoid stack overflow
             wait_time_to_sleep = None
-            
+
             async with self._lock:
                 now = time.time()
 
@@ -99,26 +269,30 @@ class RateLimiter:
                 self._clean_old_entries(now)
 
                 # Check if we can make the request
-                if self._can_make_request(estimated_tokens):
+                if self._can_make_request(estimated_tokens, now):
                     # Record the request
-                    self.request_times.append(now)
-                    self.token_usage.append((now, estimated_tokens))
+                    self._window.append((now, estimated_tokens))
+                    self._window_tokens += estimated_tokens
                     return True
-                
+
                 # Calculate wait time if we can't make the request
-                wait_time = self._calculate_wait_time(estimated_tokens)
+                wait_time = self._calculate_wait_time(estimated_tokens, now)
                 if wait_time > 0:
                     logfire_logger.info(
                         f"Rate limiting: waiting {wait_time:.1f}s",
                         extra={
+                            "limiter": self.name,
                             "tokens": estimated_tokens,
                             "current_usage": self._get_current_usage(),
                         }
                     )
                     wait_time_to_sleep = wait_time
+                    self.wait_count += 1
+                    self.total_wait_seconds += wait_time
+                    self.max_wait_seconds = max(self.max_wait_seconds, wait_time)
                 else:
                     return False
-            
+
             # Sleep outside the lock to avoid deadlock
             if wait_time_to_sleep is not None:
                 # For long waits, break into smaller chunks with progress updates
@@ -140,50 +314,202 @@ class RateLimiter:
                     await asyncio.sleep(wait_time_to_sleep)
                 # Continue the loop to try again
 
-    def _can_make_request(self, estimated_tokens: int) -> bool:
+    def _used(self, now: float) -> tuple[float, float]:
+        """Requests and tokens used in the window, including provider-reported usage."""
+        requests = float(len(self._window))
+        tokens = self._window_tokens
+        if now < self._provider_usage_expires:
+            requests = max(requests, self._provider_requests_used)
+            tokens = max(tokens, self._provider_tokens_used)
+        return requests, tokens
+
+    def _can_make_request(self, estimated_tokens: int, now: float | None = None) -> bool:
         """Check if request can be made within limits"""
-        # Check request rate limit
-        if len(self.request_times) >= self.config.requests_per_minute:
+        now = time.time() if now is None else now
+        if now < self._blocked_until:
             return False
 
-        # Check token usage limit
-        current_tokens = sum(tokens for _, tokens in self.token_usage)
-        if current_tokens + estimated_tokens > self.config.tokens_per_minute:
+        requests, tokens = self._used(now)
+        if requests + 1 > self.request_budget:
             return False
 
-        return True
+        # A request larger than the whole budget can never fit; let it through on an idle window
+        if estimated_tokens > self.token_budget:
+            return tokens == 0
+        return tokens + estimated_tokens <= self.token_budget
 
     def _clean_old_entries(self, current_time: float):
-        """Remove entries older than 1 minute"""
-        cutoff_time = current_time - 60
+        """Remove entries older than the window"""
+        cutoff_time = current_time - self.WINDOW_SECONDS
 
-        while self.request_times and self.request_times[0] < cutoff_time:
-            self.request_times.popleft()
+        while self._window and self._window[0][0] < cutoff_time:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+        if not self._window:
+            self._window_tokens = 0.0
 
-        while self.token_usage and self.token_usage[0][0] < cutoff_time:
-            self.token_usage.popleft()
+    def _calculate_wait_time(self, estimated_tokens: int, now: float | None = None) -> float:
+        """
+        Calculate how long to wait before retrying.
 
-    def _calculate_wait_time(self, estimated_tokens: int) -> float:
-        """Calculate how long to wait before retrying"""
-        if not self.request_times:
+        Only the constraint that is actually exceeded is waited on: the request
+        limit waits for enough requests to age out, the token limit waits until
+        enough tokens have aged out to fit this request.
+        """
+        now = time.time() if now is None else now
+        waits = [self._blocked_until - now]
+
+        if now < self._provider_usage_expires:
+            requests, tokens = self._used(now)
+            if requests + 1 > self.request_budget or tokens + estimated_tokens > self.token_budget:
+                waits.append(self._provider_usage_expires - now)
+
+        # Request limit: the entry that has to age out so one more request fits
+        excess_requests = len(self._window) + 1 - int(self.request_budget)
+        if excess_requests > 0 and self._window:
+            index = min(excess_requests, len(self._window)) - 1
+            waits.append(self._window[index][0] + self.WINDOW_SECONDS - now)
+
+        # Token limit: walk the oldest entries until enough tokens are freed
+        needed = min(estimated_tokens, self.token_budget)
+        excess_tokens = self._window_tokens + needed - self.token_budget
+        if excess_tokens > 0:
+            freed = 0.0
+            for timestamp, tokens in self._window:
+                freed += tokens
+                if freed >= excess_tokens:
+                    waits.append(timestamp + self.WINDOW_SECONDS - now)
+                    break
+
+        wait = max(waits)
+        if wait <= 0:
             return 0
+        return min(wait, self.WINDOW_SECONDS) + 0.1
 
-        oldest_request = self.request_times[0]
-        time_since_oldest = time.time() - oldest_request
+    def record_success(self, headers: Any = None) -> None:
+        """Additive increase after a successful call, then apply any rate-limit headers."""
+        self._consecutive_throttles = 0
+        self.request_budget = min(
+            self.request_ceiling, self.request_budget + self.request_ceiling * self.config.increase_fraction
+        )
+        self.token_budget = min(
+            self.token_ceiling, self.token_budget + self.token_ceiling * self.config.increase_fraction
+        )
+        if headers is not None:
+            self.update_from_headers(headers)
 
-        if time_since_oldest < 60:
-            return 60 - time_since_oldest + 0.1
+    def record_throttle(self, headers: Any = None) -> float:
+        """
+        Multiplicative decrease after a 429.
 
-        return 0
+        Blocks new requests until the provider's Retry-After (or an exponential
+        backoff when none is given) and returns that delay in seconds.
+        """
+        now = time.time()
+        self.throttle_count += 1
+        self._consecutive_throttles += 1
+        self._last_throttle_at = now
+
+        self.request_budget = max(
+            self.request_ceiling * self.config.min_budget_fraction,
+            1.0,
+            self.request_budget * self.config.decrease_factor,
+        )
+        self.token_budget = max(
+            self.token_ceiling * self.config.min_budget_fraction,
+            self.token_budget * self.config.decrease_factor,
+        )
+
+        if headers is not None:
+            self.update_from_headers(headers)
+
+        delay = _parse_retry_after(headers, now) if headers is not None else None
+        if delay is None:
+            delay = self.config.backoff_multiplier ** self._consecutive_throttles
+        delay = min(delay, self.config.max_backoff)
+
+        self._blocked_until = max(self._blocked_until, now + delay)
+        logfire_logger.warning(
+            f"Provider throttled requests, backing off {delay:.1f}s",
+            extra={
+                "limiter": self.name,
+                "request_budget": self.request_budget,
+                "token_budget": self.token_budget,
+            },
+        )
+        return delay
+
+    def update_from_headers(self, headers: Any) -> None:
+        """Learn limits and current provider-side usage from rate-limit response headers."""
+        now = time.time()
+        values = {key: _header_value(headers, names) for key, names in _LIMIT_HEADERS.items()}
+
+        limit_requests = _parse_number(values["limit_requests"])
+        limit_tokens = _parse_number(values["limit_tokens"])
+        recently_throttled = (
+            self._last_throttle_at is not None and now - self._last_throttle_at < self.WINDOW_SECONDS
+        )
+        if limit_requests and limit_requests > 0:
+            self.request_ceiling = limit_requests
+            self.request_budget = (
+                min(self.request_budget, limit_requests) if recently_throttled else limit_requests
+            )
+            self.limits_learned = True
+        if limit_tokens and limit_tokens > 0:
+            self.token_ceiling = limit_tokens
+            self.token_budget = min(self.token_budget, limit_tokens) if recently_throttled else limit_tokens
+            self.limits_learned = True
+
+        # Remaining counts reflect usage we may not have seen (shared keys, other workers)
+        remaining_requests = _parse_number(values["remaining_requests"])
+        remaining_tokens = _parse_number(values["remaining_tokens"])
+        resets = [
+            reset
+            for reset in (
+                _parse_reset_seconds(values["reset_requests"], now),
+                _parse_reset_seconds(values["reset_tokens"], now),
+            )
+            if reset is not None
+        ]
+        if (remaining_requests is not None or remaining_tokens is not None) and resets:
+            if remaining_requests is not None:
+                self._provider_requests_used = max(0.0, self.request_ceiling - remaining_requests)
+            if remaining_tokens is not None:
+                self._provider_tokens_used = max(0.0, self.token_ceiling - remaining_tokens)
+            self._provider_usage_expires = now + min(max(resets), self.WINDOW_SECONDS)
 
     def _get_current_usage(self) -> dict[str, int]:
         """Get current usage statistics"""
-        current_tokens = sum(tokens for _, tokens in self.token_usage)
         return {
-            "requests": len(self.request_times),
-            "tokens": current_tokens,
-            "max_requests": self.config.requests_per_minute,
-            "max_tokens": self.config.tokens_per_minute,
+            "requests": len(self._window),
+            "tokens": int(self._window_tokens),
+            "max_requests": int(self.request_budget),
+            "max_tokens": int(self.token_budget),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """Current budget, learned ceilings and wait statistics."""
+        now = time.time()
+        self._clean_old_entries(now)
+        requests, tokens = self._used(now)
+        return {
+            "name": self.name,
+            "requests_in_window": len(self._window),
+            "tokens_in_window": int(self._window_tokens),
+            "request_budget": int(self.request_budget),
+            "token_budget": int(self.token_budget),
+            "request_ceiling": int(self.request_ceiling),
+            "token_ceiling": int(self.token_ceiling),
+            "remaining_requests": max(0, int(self.request_budget - requests)),
+            "remaining_tokens": max(0, int(self.token_budget - tokens)),
+            "limits_learned": self.limits_learned,
+            "in_flight": self.semaphore.in_use,
+            "max_concurrent": self.semaphore.limit,
+            "blocked_for_seconds": round(max(0.0, self._blocked_until - now), 3),
+            "throttle_count": self.throttle_count,
+            "wait_count": self.wait_count,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
         }
 
 
@@ -412,7 +738,10 @@ class ThreadingService:
         rate_limit_config: RateLimitConfig | None = None,
     ):
         self.config = threading_config or ThreadingConfig()
-        self.rate_limiter = RateLimiter(rate_limit_config or RateLimitConfig())
+        self.rate_limit_config = rate_limit_config or RateLimitConfig()
+        self.rate_limiter = RateLimiter(self.rate_limit_config)
+        # One limiter per provider key, created on first use with the same starting config
+        self.rate_limiters: dict[str, RateLimiter] = {}
         self.memory_dispatcher = MemoryAdaptiveDispatcher(self.config)
 
         # Thread pools for different workload types
@@ -455,27 +784,62 @@ class ThreadingService:
 
         logfire_logger.info("Threading service stopped")
 
+    def get_rate_limiter(self, provider: str | None = None, max_concurrent: int | None = None) -> RateLimiter:
+        """Get the rate limiter for a provider key (the shared default limiter when None)
+
+        Args:
+            provider: Provider key such as "openai:embeddings"
+            max_concurrent: Optional in-flight request limit to apply to the limiter
+        """
+        if provider is None:
+            limiter = self.rate_limiter
+        else:
+            limiter = self.rate_limiters.get(provider)
+            if limiter is None:
+                limiter = RateLimiter(replace(self.rate_limit_config), name=provider)
+                self.rate_limiters[provider] = limiter
+        if max_concurrent is not None:
+            limiter.set_max_concurrent(max_concurrent)
+        return limiter
+
+    def get_rate_limit_stats(self) -> dict[str, dict[str, Any]]:
+        """Budget and wait statistics for every rate limiter in use"""
+        stats = {"default": self.rate_limiter.get_stats()}
+        for provider, limiter in self.rate_limiters.items():
+            stats[provider] = limiter.get_stats()
+        return stats
+
     @asynccontextmanager
-    async def rate_limited_operation(self, estimated_tokens: int = 8000, progress_callback: Callable | None = None):
+    async def rate_limited_operation(
+        self,
+        estimated_tokens: int = 8000,
+        progress_callback: Callable | None = None,
+        provider: str | None = None,
+    ):
         """Context manager for rate-limited operations
-        
+
+        Yields the limiter so callers can report throttles (record_throttle) and
+        successful responses (record_success) back to it.
+
         Args:
             estimated_tokens: Estimated number of tokens for the operation
             progress_callback: Optional async callback for progress updates during wait
+            provider: Provider key selecting a per-provider limiter (default limiter when None)
         """
-        async with self.rate_limiter.semaphore:
-            can_proceed = await self.rate_limiter.acquire(estimated_tokens, progress_callback)
+        rate_limiter = self.get_rate_limiter(provider)
+        async with rate_limiter.semaphore:
+            can_proceed = await rate_limiter.acquire(estimated_tokens, progress_callback)
             if not can_proceed:
                 raise Exception("Rate limit exceeded")
 
             start_time = time.time()
             try:
-                yield
+                yield rate_limiter
             finally:
                 duration = time.time() - start_time
                 logfire_logger.debug(
                     "Rate limited operation completed",
-                    extra={"duration": duration, "tokens": estimated_tokens},
+                    extra={"duration": duration, "tokens": estimated_tokens, "limiter": rate_limiter.name},
                 )
 
     async def run_cpu_intensive(self, func: Callable, *args, **kwargs) -> Any:
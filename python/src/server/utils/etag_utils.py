@@ -2,8 +2,14 @@
 
 import hashlib
 import json
+import time
 from typing import Any
 
+from ..config.logfire_config import get_logger
+from .progress.state_store import get_state_store
+
+logger = get_logger(__name__)
+
 
 def generate_etag(data: Any) -> str:
     """Generate an ETag hash from data.
@@ -40,3 +46,72 @@ def check_etag(request_etag: str | None, current_etag: str) -> bool:
     # Both ETags should have quotes, compare directly
     # The If-None-Match header and our generated ETag should both be quoted
     return request_etag == current_etag
+
+
+# Data version scopes: writes bump them, polling endpoints read them
+PROJECTS_SCOPE = "projects"
+TASKS_SCOPE = "tasks"
+
+# A version ETag is trusted for at most this many seconds, so that writes which
+# bypass the services (e.g. the agents service updating project docs) still
+# show up in polls after this delay
+VERSION_ETAG_MAX_AGE = 30.0
+
+
+class VersionedETagCache:
+    """Remembers the ETag served for a resource at a given data version.
+
+    Writes bump the version of their scope (see bump_data_version), so while the
+    version is unchanged a poll whose If-None-Match equals the remembered ETag can
+    be answered with 304 before querying or serializing anything.
+    """
+
+    def __init__(self, max_age: float = VERSION_ETAG_MAX_AGE):
+        self.max_age = max_age
+        self._entries: dict[str, tuple[Any, str, float]] = {}
+
+    def get(self, key: str, version: Any) -> str | None:
+        """Get the ETag remembered for a resource at this version, if still fresh."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        cached_version, etag, stored_at = entry
+        if cached_version != version or time.monotonic() - stored_at > self.max_age:
+            return None
+        return etag
+
+    def set(self, key: str, version: Any, etag: str) -> None:
+        """Remember the ETag computed for a resource from data read at this version."""
+        self._entries[key] = (version, etag, time.monotonic())
+
+    def is_unchanged(self, key: str, version: Any, request_etag: str | None) -> bool:
+        """Check if the client already has the resource at this version."""
+        if not request_etag:
+            return False
+        etag = self.get(key, version)
+        return etag is not None and check_etag(request_etag, etag)
+
+
+# Shared by the polling endpoints
+versioned_etags = VersionedETagCache()
+
+
+def get_data_version(*scopes: str) -> tuple[int, ...]:
+    """Get the data versions of the given scopes (e.g. "projects", "tasks").
+
+    Read the version before querying the data, so a write that lands during the
+    query invalidates the ETag computed from it.
+    """
+    store = get_state_store()
+    return tuple(store.get_version(scope) for scope in scopes)
+
+
+def bump_data_version(*scopes: str) -> None:
+    """Record that the data of the given scopes changed."""
+    store = get_state_store()
+    for scope in scopes:
+        try:
+            store.bump_version(scope)
+        except Exception as e:
+            # Polls then keep returning 304 until VERSION_ETAG_MAX_AGE passes
+            logger.warning(f"Failed to bump data version | scope={scope} | error={e}")
@@ -3,6 +3,26 @@ Progress Tracking Utilities
 
 Provides utilities for tracking and broadcasting progress updates.
 """
+from .progress_broadcaster import ProgressBroadcaster, ProgressSubscription, progress_broadcaster
 from .progress_tracker import ProgressTracker
+from .state_store import (
+    FileStateStore,
+    MemoryStateStore,
+    StateStore,
+    create_state_store,
+    get_state_store,
+    set_state_store,
+)
 
-__all__ = ['ProgressTracker']
+__all__ = [
+    'ProgressBroadcaster',
+    'ProgressSubscription',
+    'ProgressTracker',
+    'progress_broadcaster',
+    'StateStore',
+    'MemoryStateStore',
+    'FileStateStore',
+    'create_state_store',
+    'get_state_store',
+    'set_state_store',
+]
@@ -0,0 +1,89 @@
+"""
+Progress Broadcaster
+
+Pushes progress states from ProgressTracker to streaming subscribers (the
+Server-Sent Events endpoints), so clients no longer need to poll.
+
+Each subscription keeps only the latest state per operation: rapid updates
+between two reads by the client overwrite each other and are delivered once.
+"""
+
+import asyncio
+from typing import Any
+
+
+class ProgressSubscription:
+    """
+    Latest-value mailbox for the progress of one operation, or of all operations.
+    """
+
+    def __init__(self, progress_id: str | None = None):
+        """
+        Args:
+            progress_id: Operation to follow, or None for every operation
+        """
+        self.progress_id = progress_id
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._changed = asyncio.Event()
+
+    def push(self, progress_id: str, state: dict[str, Any]) -> None:
+        """Record the newest state of an operation, replacing any undelivered one."""
+        self._pending[progress_id] = state
+        self._changed.set()
+
+    async def next(self, timeout: float | None = None) -> dict[str, dict[str, Any]]:
+        """
+        Wait for updates and return the latest state of each updated operation.
+
+        Returns:
+            Dict mapping progress_id to its latest state; empty when the timeout expired
+        """
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except TimeoutError:
+                return {}
+        pending, self._pending = self._pending, {}
+        self._changed.clear()
+        return pending
+
+
+class ProgressBroadcaster:
+    """
+    Fans progress states out to the subscriptions interested in them.
+    """
+
+    def __init__(self):
+        self._subscriptions: dict[str | None, set[ProgressSubscription]] = {}
+
+    def subscribe(self, progress_id: str | None = None) -> ProgressSubscription:
+        """Subscribe to one operation, or to all operations when progress_id is None."""
+        subscription = ProgressSubscription(progress_id)
+        self._subscriptions.setdefault(progress_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.progress_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.progress_id]
+
+    def subscriber_count(self, progress_id: str | None = None) -> int:
+        return len(self._subscriptions.get(progress_id, ()))
+
+    def publish(self, progress_id: str, state: dict[str, Any]) -> None:
+        """
+        Hand a state to every interested subscription.
+
+        The state is passed by reference and serialized when it is sent, so a
+        publish costs nothing beyond a dict assignment per subscriber.
+        """
+        for key in (progress_id, None):
+            for subscription in self._subscriptions.get(key, ()):
+                subscription.push(progress_id, state)
+
+
+# Shared by ProgressTracker and the progress endpoints
+progress_broadcaster = ProgressBroadcaster()
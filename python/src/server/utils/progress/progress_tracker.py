@@ -1,23 +1,37 @@
 """
 Progress Tracker Utility
 
-Tracks operation progress in memory for HTTP polling access.
+Tracks operation progress in memory for HTTP polling access and pushes every
+change to streaming subscribers. With a shared state store, states are also
+visible to the other API workers.
 """
 
 import asyncio
+import time
 from datetime import datetime
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from .progress_broadcaster import progress_broadcaster
+from .state_store import get_state_store
+
+_last_state_version = 0
+
+
+def _next_state_version() -> int:
+    """Version for a progress state; unique within this process and unlikely to repeat across workers."""
+    global _last_state_version
+    _last_state_version = max(time.time_ns(), _last_state_version + 1)
+    return _last_state_version
 
 
 class ProgressTracker:
     """
     Utility class for tracking progress updates in memory.
-    State can be accessed via HTTP polling endpoints.
+    State can be accessed via HTTP polling endpoints or streamed as it changes.
     """
 
-    # Class-level storage for all progress states
+    # Class-level storage for the progress states of this worker
     _progress_states: dict[str, dict[str, Any]] = {}
 
     def __init__(self, progress_id: str, operation_type: str = "crawl"):
@@ -43,7 +57,23 @@ class ProgressTracker:
 
     @classmethod
     def get_progress(cls, progress_id: str) -> dict[str, Any] | None:
-        """Get progress state by ID."""
+        """Get progress state by ID, including operations running on other workers."""
+        store = get_state_store()
+        if store.shared:
+            state = store.load_progress(progress_id)
+            if state is not None:
+                return state
+        return cls._progress_states.get(progress_id)
+
+    @classmethod
+    async def get_progress_async(cls, progress_id: str) -> dict[str, Any] | None:
+        """Like get_progress, but reads the shared state store off the event loop."""
+        store = get_state_store()
+        if not store.shared:
+            return cls.get_progress(progress_id)
+        state = await store.load_progress_async(progress_id)
+        if state is not None:
+            return state
         return cls._progress_states.get(progress_id)
 
     @classmethod
@@ -51,12 +81,34 @@ class ProgressTracker:
         """Remove progress state from memory."""
         if progress_id in cls._progress_states:
             del cls._progress_states[progress_id]
+        cls._delete_shared(progress_id)
 
     @classmethod
     def list_active(cls) -> dict[str, dict[str, Any]]:
         """Get all active progress states."""
+        store = get_state_store()
+        if store.shared:
+            return {**cls._progress_states, **store.list_progress()}
         return cls._progress_states.copy()
 
+    @classmethod
+    async def list_active_async(cls) -> dict[str, dict[str, Any]]:
+        """Like list_active, but reads the shared state store off the event loop."""
+        store = get_state_store()
+        if not store.shared:
+            return cls.list_active()
+        return {**cls._progress_states, **await store.list_progress_async()}
+
+    @classmethod
+    def _delete_shared(cls, progress_id: str) -> None:
+        store = get_state_store()
+        if not store.shared:
+            return
+        try:
+            store.delete_progress(progress_id)
+        except Exception as e:
+            safe_logfire_error(f"Failed to delete shared progress state | progress_id={progress_id} | error={e}")
+
     @classmethod
     async def _delayed_cleanup(cls, progress_id: str, delay_seconds: int = 30):
         """
@@ -70,6 +122,7 @@ class ProgressTracker:
             # Only clean up if still in terminal state (prevent cleanup of reused IDs)
             if status in ["completed", "failed", "error", "cancelled"]:
                 del cls._progress_states[progress_id]
+                cls._delete_shared(progress_id)
                 safe_logfire_info(f"Progress state cleaned up after delay | progress_id={progress_id} | status={status}")
 
     async def start(self, initial_data: dict[str, Any] | None = None):
@@ -344,8 +397,21 @@ class ProgressTracker:
 
     def _update_state(self):
         """Update progress state in memory storage."""
+        # Lets the polling endpoint answer unchanged polls without rebuilding the response
+        self.state["version"] = _next_state_version()
         # Update the class-level dictionary
         ProgressTracker._progress_states[self.progress_id] = self.state
+        # Push to streaming clients
+        progress_broadcaster.publish(self.progress_id, self.state)
+        # Share with the other workers
+        store = get_state_store()
+        if store.shared:
+            try:
+                store.save_progress(self.progress_id, self.state)
+            except Exception as e:
+                safe_logfire_error(
+                    f"Failed to share progress state | progress_id={self.progress_id} | error={e}"
+                )
 
         safe_logfire_info(
             f"📊 [PROGRESS] Updated {self.operation_type} | ID: {self.progress_id} | "
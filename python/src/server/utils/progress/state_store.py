@@ -0,0 +1,636 @@
+"""
+Operation State Store
+
+Shares the progress states and crawl cancellations of long-running operations
+between API workers, so a progress poll or stop request served by one worker
+finds an operation started on another (uvicorn --workers N, or replicas sharing
+a volume). It also holds the data versions behind the polling ETags.
+
+Backends:
+- MemoryStateStore: per process, for a single worker (default)
+- FileStateStore: JSON files in a directory shared by all workers
+
+Select with ARCHON_STATE_STORE=memory|file; the file store lives in
+ARCHON_STATE_DIR (default: <tmp>/archon-state) and removes what crashed workers
+left behind after ARCHON_STATE_TTL seconds (default: 86400).
+"""
+
+import asyncio
+import json
+import os
+import re
+import socket
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+from ...config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+ProgressCallback = Callable[[str, dict[str, Any]], None]
+CancelCallback = Callable[[str], None]
+
+# Progress IDs become file names in the file store
+_OPERATION_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+class StateStore(ABC):
+    """
+    Interface for operation state backends.
+
+    Watchers are notified of changes made by other workers; changes made by
+    this worker are delivered in-process (see ProgressBroadcaster).
+    """
+
+    # Whether other workers see what this store holds
+    shared = False
+
+    def __init__(self):
+        self._progress_callbacks: list[ProgressCallback] = []
+        self._cancel_callbacks: list[CancelCallback] = []
+
+    @abstractmethod
+    def save_progress(self, progress_id: str, state: dict[str, Any]) -> None:
+        """Store the latest progress state of an operation."""
+
+    @abstractmethod
+    def load_progress(self, progress_id: str) -> dict[str, Any] | None:
+        """Get the progress state of an operation, or None if unknown."""
+
+    @abstractmethod
+    def delete_progress(self, progress_id: str) -> None:
+        """Remove the progress state of an operation."""
+
+    @abstractmethod
+    def list_progress(self) -> dict[str, dict[str, Any]]:
+        """Get the progress states of all operations."""
+
+    @abstractmethod
+    def register_operation(self, progress_id: str) -> None:
+        """Mark an operation as running on this worker."""
+
+    @abstractmethod
+    def unregister_operation(self, progress_id: str) -> None:
+        """Mark an operation as finished and drop its pending cancellation."""
+
+    @abstractmethod
+    def is_operation_active(self, progress_id: str) -> bool:
+        """Whether an operation is running on any worker."""
+
+    @abstractmethod
+    def request_cancel(self, progress_id: str) -> None:
+        """Ask the worker running an operation to cancel it."""
+
+    @abstractmethod
+    def get_version(self, scope: str) -> int:
+        """Current data version of a scope (e.g. "tasks"); 0 if never bumped."""
+
+    @abstractmethod
+    def bump_version(self, scope: str) -> int:
+        """Record a change to the data of a scope and return its new version."""
+
+    # Async accessors for callers on the event loop; backends doing file I/O run it on a thread
+    async def load_progress_async(self, progress_id: str) -> dict[str, Any] | None:
+        return self.load_progress(progress_id)
+
+    async def list_progress_async(self) -> dict[str, dict[str, Any]]:
+        return self.list_progress()
+
+    async def register_operation_async(self, progress_id: str) -> None:
+        self.register_operation(progress_id)
+
+    async def unregister_operation_async(self, progress_id: str) -> None:
+        self.unregister_operation(progress_id)
+
+    async def is_operation_active_async(self, progress_id: str) -> bool:
+        return self.is_operation_active(progress_id)
+
+    async def request_cancel_async(self, progress_id: str) -> None:
+        self.request_cancel(progress_id)
+
+    def watch_progress(self, callback: ProgressCallback) -> None:
+        """Call callback(progress_id, state) when another worker updates a progress state."""
+        self._progress_callbacks.append(callback)
+
+    def watch_cancellations(self, callback: CancelCallback) -> None:
+        """Call callback(progress_id) when cancellation of an operation is requested."""
+        self._cancel_callbacks.append(callback)
+
+    @abstractmethod
+    def start(self) -> None:
+        """Start delivering changes to watchers; requires a running event loop."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Stop delivering changes to watchers and finish pending writes."""
+
+    def _notify_cancel(self, progress_id: str) -> None:
+        for callback in self._cancel_callbacks:
+            try:
+                callback(progress_id)
+            except Exception as e:
+                logger.warning(f"Cancellation watcher failed | progress_id={progress_id} | error={e}")
+
+    def _notify_progress(self, progress_id: str, state: dict[str, Any]) -> None:
+        for callback in self._progress_callbacks:
+            try:
+                callback(progress_id, state)
+            except Exception as e:
+                logger.warning(f"Progress watcher failed | progress_id={progress_id} | error={e}")
+
+
+class MemoryStateStore(StateStore):
+    """State of the operations of this process only."""
+
+    def __init__(self):
+        super().__init__()
+        self._progress: dict[str, dict[str, Any]] = {}
+        self._operations: set[str] = set()
+        self._versions: dict[str, int] = {}
+
+    def save_progress(self, progress_id: str, state: dict[str, Any]) -> None:
+        self._progress[progress_id] = state
+
+    def load_progress(self, progress_id: str) -> dict[str, Any] | None:
+        return self._progress.get(progress_id)
+
+    def delete_progress(self, progress_id: str) -> None:
+        self._progress.pop(progress_id, None)
+
+    def list_progress(self) -> dict[str, dict[str, Any]]:
+        return self._progress.copy()
+
+    def register_operation(self, progress_id: str) -> None:
+        self._operations.add(progress_id)
+
+    def unregister_operation(self, progress_id: str) -> None:
+        self._operations.discard(progress_id)
+
+    def is_operation_active(self, progress_id: str) -> bool:
+        return progress_id in self._operations
+
+    def request_cancel(self, progress_id: str) -> None:
+        self._notify_cancel(progress_id)
+
+    def get_version(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    def bump_version(self, scope: str) -> int:
+        version = self._versions.get(scope, 0) + 1
+        self._versions[scope] = version
+        return version
+
+    # Every change is made by this process, so there is nothing to watch or flush
+    def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class FileStateStore(StateStore):
+    """
+    State kept as files in a directory shared by all workers.
+
+    Layout: progress/<id>.json holds the state, operations/<id> records the
+    process running the operation, cancel/<id> marks a requested stop and
+    versions/<scope> holds a data version.
+    States are replaced atomically, so readers never see a partial write.
+
+    Inside an event loop, progress states are written behind by a writer task
+    that coalesces updates and does the file I/O on a worker thread; reads of
+    this process see its pending writes. The *_async accessors do their file I/O
+    on a worker thread as well. Watchers are fed by polling the
+    directory on a worker thread, which also removes files left by crashed
+    workers once they are older than the TTL.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        directory: str,
+        poll_interval: float = 0.5,
+        ttl: float | None = None,
+        cleanup_interval: float = 300,
+    ):
+        """
+        Args:
+            directory: State directory, created if missing
+            poll_interval: Seconds between checks for changes by other workers
+            ttl: Seconds after which abandoned states, operations and cancellations are
+                removed (default: ARCHON_STATE_TTL or 86400)
+            cleanup_interval: Seconds between removals of abandoned files
+        """
+        super().__init__()
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.ttl = ttl if ttl is not None else float(os.getenv("ARCHON_STATE_TTL", "86400"))
+        self.cleanup_interval = cleanup_interval
+        self._progress_dir = os.path.join(directory, "progress")
+        self._operations_dir = os.path.join(directory, "operations")
+        self._cancel_dir = os.path.join(directory, "cancel")
+        self._versions_dir = os.path.join(directory, "versions")
+        for path in (self._progress_dir, self._operations_dir, self._cancel_dir, self._versions_dir):
+            os.makedirs(path, exist_ok=True)
+
+        self._hostname = socket.gethostname()
+        # Modification time of each state as last written or delivered by this process
+        self._seen_mtimes: dict[str, int] = {}
+        self._seen_cancels: set[str] = set()
+        self._watch_task: asyncio.Task | None = None
+        # Progress states not written yet (None: delete) and the batch being written
+        self._pending_writes: dict[str, dict[str, Any] | None] = {}
+        self._inflight_writes: dict[str, dict[str, Any] | None] = {}
+        self._writer_task: asyncio.Task | None = None
+
+    def _path(self, directory: str, progress_id: str, suffix: str = "") -> str:
+        if not _OPERATION_ID_PATTERN.match(progress_id):
+            raise ValueError(f"Invalid operation ID for state store: {progress_id!r}")
+        return os.path.join(directory, progress_id + suffix)
+
+    def save_progress(self, progress_id: str, state: dict[str, Any]) -> None:
+        self._path(self._progress_dir, progress_id)
+        self._queue_write(progress_id, state)
+
+    def load_progress(self, progress_id: str) -> dict[str, Any] | None:
+        for writes in (self._pending_writes, self._inflight_writes):
+            if progress_id in writes:
+                return writes[progress_id]
+        return self._read_progress(progress_id)
+
+    async def load_progress_async(self, progress_id: str) -> dict[str, Any] | None:
+        for writes in (self._pending_writes, self._inflight_writes):
+            if progress_id in writes:
+                return writes[progress_id]
+        state = await asyncio.to_thread(self._read_progress, progress_id)
+        # A save made while the file was read is newer
+        for writes in (self._pending_writes, self._inflight_writes):
+            if progress_id in writes:
+                return writes[progress_id]
+        return state
+
+    def delete_progress(self, progress_id: str) -> None:
+        self._path(self._progress_dir, progress_id)
+        self._queue_write(progress_id, None)
+
+    def list_progress(self) -> dict[str, dict[str, Any]]:
+        return self._overlay_writes(self._read_all_progress())
+
+    async def list_progress_async(self) -> dict[str, dict[str, Any]]:
+        return self._overlay_writes(await asyncio.to_thread(self._read_all_progress))
+
+    def register_operation(self, progress_id: str) -> None:
+        with open(self._path(self._operations_dir, progress_id), "w", encoding="utf-8") as f:
+            json.dump({"host": self._hostname, "pid": os.getpid()}, f)
+
+    async def register_operation_async(self, progress_id: str) -> None:
+        await asyncio.to_thread(self.register_operation, progress_id)
+
+    def unregister_operation(self, progress_id: str) -> None:
+        self._remove_operation_files(progress_id)
+        self._seen_cancels.discard(progress_id)
+
+    async def unregister_operation_async(self, progress_id: str) -> None:
+        await asyncio.to_thread(self._remove_operation_files, progress_id)
+        self._seen_cancels.discard(progress_id)
+
+    def _remove_operation_files(self, progress_id: str) -> None:
+        self._remove(self._path(self._operations_dir, progress_id))
+        self._remove(self._path(self._cancel_dir, progress_id))
+
+    def is_operation_active(self, progress_id: str) -> bool:
+        if self._check_operation(progress_id):
+            return True
+        self._seen_cancels.discard(progress_id)
+        return False
+
+    async def is_operation_active_async(self, progress_id: str) -> bool:
+        if await asyncio.to_thread(self._check_operation, progress_id):
+            return True
+        self._seen_cancels.discard(progress_id)
+        return False
+
+    def _check_operation(self, progress_id: str) -> bool:
+        """Whether an operation is running; drops the files of one whose worker died."""
+        path = self._path(self._operations_dir, progress_id)
+        try:
+            with open(path, encoding="utf-8") as f:
+                owner = json.load(f)
+        except FileNotFoundError:
+            return False
+        except json.JSONDecodeError:
+            # Being written right now
+            return True
+
+        # Operations of a worker that died are not running anymore
+        if self._owner_died(owner):
+            self._remove_operation_files(progress_id)
+            return False
+        return True
+
+    def request_cancel(self, progress_id: str) -> None:
+        with open(self._path(self._cancel_dir, progress_id), "w", encoding="utf-8"):
+            pass
+
+    async def request_cancel_async(self, progress_id: str) -> None:
+        await asyncio.to_thread(self.request_cancel, progress_id)
+
+    def get_version(self, scope: str) -> int:
+        try:
+            with open(self._path(self._versions_dir, scope), encoding="utf-8") as f:
+                return int(f.read() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump_version(self, scope: str) -> int:
+        # Clock-based so that concurrent bumps by two workers still yield a new value
+        version = max(time.time_ns(), self.get_version(scope) + 1)
+        path = self._path(self._versions_dir, scope)
+        temp_path = os.path.join(self._versions_dir, f".{scope}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(str(version))
+        os.replace(temp_path, path)
+        return version
+
+    def start(self) -> None:
+        if self._watch_task and not self._watch_task.done():
+            return
+        self._watch_task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def close(self) -> None:
+        if self._watch_task:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Wait until every progress state saved so far is written."""
+        while self._writer_task and not self._writer_task.done():
+            await asyncio.shield(self._writer_task)
+
+    def _queue_write(self, progress_id: str, state: dict[str, Any] | None) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to block: write right away
+            self._record_writes(self._apply_writes(self._encode_writes({progress_id: state})))
+            return
+
+        self._pending_writes[progress_id] = state
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = loop.create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        while self._pending_writes:
+            # Later saves of the same operation replace earlier ones that weren't written yet
+            self._inflight_writes, self._pending_writes = self._pending_writes, {}
+            try:
+                mtimes = await asyncio.to_thread(self._apply_writes, self._encode_writes(self._inflight_writes))
+                self._record_writes(mtimes)
+            except Exception as e:
+                logger.warning(f"Failed to write progress states | error={e}")
+            finally:
+                self._inflight_writes = {}
+
+    @staticmethod
+    def _encode_writes(writes: dict[str, dict[str, Any] | None]) -> dict[str, str | None]:
+        return {
+            progress_id: None if state is None else json.dumps(state, default=str)
+            for progress_id, state in writes.items()
+        }
+
+    def _apply_writes(self, writes: dict[str, str | None]) -> dict[str, int | None]:
+        """Write or delete progress files; returns the new modification time of each."""
+        mtimes: dict[str, int | None] = {}
+        for progress_id, data in writes.items():
+            path = self._path(self._progress_dir, progress_id, ".json")
+            if data is None:
+                self._remove(path)
+                mtimes[progress_id] = None
+                continue
+            temp_path = os.path.join(self._progress_dir, f".{progress_id}.{os.getpid()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            mtimes[progress_id] = os.stat(path).st_mtime_ns
+        return mtimes
+
+    def _record_writes(self, mtimes: dict[str, int | None]) -> None:
+        for progress_id, mtime in mtimes.items():
+            if mtime is None:
+                self._seen_mtimes.pop(progress_id, None)
+            else:
+                self._seen_mtimes[progress_id] = mtime
+
+    def _read_all_progress(self) -> dict[str, dict[str, Any]]:
+        states = {}
+        for name in os.listdir(self._progress_dir):
+            if name.endswith(".json") and not name.startswith("."):
+                progress_id = name[: -len(".json")]
+                state = self._read_progress(progress_id)
+                if state is not None:
+                    states[progress_id] = state
+        return states
+
+    def _overlay_writes(self, states: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        """Apply the saves of this process that aren't written yet to states read from disk."""
+        for writes in (self._inflight_writes, self._pending_writes):
+            for progress_id, state in writes.items():
+                if state is None:
+                    states.pop(progress_id, None)
+                else:
+                    states[progress_id] = state
+        return states
+
+    def _read_progress(self, progress_id: str) -> dict[str, Any] | None:
+        try:
+            with open(self._path(self._progress_dir, progress_id, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    async def _watch(self) -> None:
+        # States that exist already are not news
+        try:
+            existing = await asyncio.to_thread(self._progress_mtimes)
+            for progress_id, mtime in existing.items():
+                self._seen_mtimes.setdefault(progress_id, mtime)
+        except Exception as e:
+            logger.warning(f"Failed to read state store | error={e}")
+
+        last_cleanup = 0.0
+        while True:
+            try:
+                changes = await asyncio.to_thread(
+                    self._scan, dict(self._seen_mtimes), bool(self._cancel_callbacks), bool(self._progress_callbacks)
+                )
+                self._deliver(*changes)
+                if time.monotonic() - last_cleanup >= self.cleanup_interval:
+                    last_cleanup = time.monotonic()
+                    for progress_id in await asyncio.to_thread(self.cleanup):
+                        self._seen_mtimes.pop(progress_id, None)
+            except Exception as e:
+                logger.warning(f"Failed to check state store for changes | error={e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def poll(self) -> None:
+        """Deliver cancellations and progress changes made since the last poll."""
+        self._deliver(
+            *self._scan(dict(self._seen_mtimes), bool(self._cancel_callbacks), bool(self._progress_callbacks))
+        )
+
+    def _progress_mtimes(self) -> dict[str, int]:
+        mtimes = {}
+        for entry in os.scandir(self._progress_dir):
+            if entry.name.endswith(".json") and not entry.name.startswith("."):
+                try:
+                    mtimes[entry.name[: -len(".json")]] = entry.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+        return mtimes
+
+    def _scan(
+        self, seen_mtimes: dict[str, int], cancels: bool, progress: bool
+    ) -> tuple[set[str] | None, list[tuple[str, int, dict[str, Any] | None]]]:
+        """Read the requested cancellations and the states changed since seen_mtimes (no side effects)."""
+        requested = set(os.listdir(self._cancel_dir)) if cancels else None
+        changed = []
+        if progress:
+            for progress_id, mtime in self._progress_mtimes().items():
+                if seen_mtimes.get(progress_id) != mtime:
+                    changed.append((progress_id, mtime, self._read_progress(progress_id)))
+        return requested, changed
+
+    def _deliver(
+        self, requested: set[str] | None, changed: list[tuple[str, int, dict[str, Any] | None]]
+    ) -> None:
+        if requested is not None:
+            for progress_id in requested - self._seen_cancels:
+                self._notify_cancel(progress_id)
+            self._seen_cancels = requested
+
+        for progress_id, mtime, state in changed:
+            # Own writes still being written are delivered in-process
+            if progress_id in self._pending_writes or progress_id in self._inflight_writes:
+                continue
+            if self._seen_mtimes.get(progress_id) == mtime:
+                continue
+            self._seen_mtimes[progress_id] = mtime
+            if state is not None:
+                self._notify_progress(progress_id, state)
+
+    def cleanup(self) -> list[str]:
+        """
+        Remove files that crashed or killed workers left behind.
+
+        Operations whose process is gone (same host) are dropped right away; the
+        rest is removed once untouched for the TTL: operations without a recent
+        progress update, progress states, cancellations and temporary files.
+        Data versions are kept.
+
+        Returns:
+            IDs of the removed progress states
+        """
+        expired_before = time.time() - self.ttl
+
+        def expired(path: str) -> bool:
+            try:
+                return os.stat(path).st_mtime < expired_before
+            except FileNotFoundError:
+                return False
+
+        for name in os.listdir(self._operations_dir):
+            path = os.path.join(self._operations_dir, name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    owner = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                owner = {}
+            progress_path = os.path.join(self._progress_dir, name + ".json")
+            if self._owner_died(owner) or (
+                expired(path) and (not os.path.exists(progress_path) or expired(progress_path))
+            ):
+                self._remove(path)
+
+        for name in os.listdir(self._cancel_dir):
+            path = os.path.join(self._cancel_dir, name)
+            if expired(path) and not os.path.exists(os.path.join(self._operations_dir, name)):
+                self._remove(path)
+
+        for directory in (self._progress_dir, self._versions_dir):
+            for name in os.listdir(directory):
+                if name.startswith(".") and name.endswith(".tmp") and expired(os.path.join(directory, name)):
+                    self._remove(os.path.join(directory, name))
+
+        removed = []
+        for name in os.listdir(self._progress_dir):
+            progress_id = name[: -len(".json")]
+            if (
+                name.endswith(".json")
+                and not name.startswith(".")
+                and expired(os.path.join(self._progress_dir, name))
+                and not os.path.exists(os.path.join(self._operations_dir, progress_id))
+            ):
+                self._remove(os.path.join(self._progress_dir, name))
+                removed.append(progress_id)
+        if removed:
+            logger.info(f"Removed {len(removed)} abandoned progress states from the state store")
+        return removed
+
+    def _owner_died(self, owner: dict[str, Any]) -> bool:
+        return owner.get("host") == self._hostname and not _process_alive(owner.get("pid"))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _process_alive(pid: Any) -> bool:
+    if not isinstance(pid, int):
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def create_state_store() -> StateStore:
+    """Create the backend selected by ARCHON_STATE_STORE."""
+    backend = os.getenv("ARCHON_STATE_STORE", "memory").strip().lower()
+    if backend == "memory":
+        return MemoryStateStore()
+    if backend == "file":
+        directory = os.getenv("ARCHON_STATE_DIR") or os.path.join(tempfile.gettempdir(), "archon-state")
+        return FileStateStore(directory)
+    raise ValueError(f"Unsupported ARCHON_STATE_STORE: {backend} (expected 'memory' or 'file')")
+
+
+_state_store: StateStore | None = None
+
+
+def get_state_store() -> StateStore:
+    """Get the process-wide state store, creating it on first use."""
+    global _state_store
+    if _state_store is None:
+        _state_store = create_state_store()
+    return _state_store
+
+
+def set_state_store(store: StateStore | None) -> None:
+    """Replace the process-wide state store (None recreates it from the environment)."""
+    global _state_store
+    _state_store = store
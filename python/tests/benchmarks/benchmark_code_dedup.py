@@ -0,0 +1,197 @@
+"""
+Benchmark for code block near-duplicate detection.
+
+Times the LSH-indexed grouping at increasing sizes on two corpora: generated
+API-reference style blocks with planted near-duplicate variants, and functions from
+the server's own services with renamed identifiers. Where feasible, the result is
+checked against a plain all-pairs scan, reporting the share of the scan's grouped
+pairs that the indexed grouping also puts together (recall).
+
+Run from the python/ directory:
+    uv run python -m tests.benchmarks.benchmark_code_dedup [sizes...]
+"""
+
+import ast
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from src.server.services.storage.code_storage_service import (
+    _find_similar_code_groups,
+    _normalize_code_for_comparison,
+)
+
+SERVICES_DIR = Path(__file__).resolve().parents[2] / "src" / "server" / "services"
+
+RESOURCES = ["user", "order", "invoice", "project", "task", "webhook", "file", "team", "price", "event"]
+VERBS = ["list", "get", "create", "update", "delete", "archive", "restore", "search", "export", "sync"]
+FIELDS = [
+    "id", "name", "status", "created_at", "owner", "limit", "cursor", "tags", "email", "amount",
+    "currency", "region", "timeout", "retries", "metadata", "parent_id", "expand", "locale",
+]
+STATEMENTS = [
+    "    {a} = {b}.strip().lower() if {b} else None",
+    "    if {a} is None:\n        raise ValueError(\"{a} is required\")",
+    "    {a} = int({b} or {n})",
+    "    logger.info(\"{verb} {resource}\", extra={{\"{a}\": {a}}})",
+    "    {a} = [item for item in {b} if item.get(\"{field}\") != {n}]",
+    "    headers[\"X-{Resource}-{Field}\"] = str({a})",
+    "    {a} = await cache.get(f\"{resource}:{{{b}}}\")",
+    "    for page in range({n}):\n        {a}.extend(await fetch_{resource}s(page=page, {field}={b}))",
+]
+
+
+def _make_block(rng: random.Random, index: int) -> str:
+    resource = rng.choice(RESOURCES)
+    verb = rng.choice(VERBS)
+    fields = rng.sample(FIELDS, k=rng.randint(2, 6))
+    params = ", ".join(f"{field}: str | None = None" for field in fields)
+    body = []
+    for _ in range(rng.randint(3, 10)):
+        a, b = rng.sample(fields, k=2)
+        field = rng.choice(FIELDS)
+        body.append(
+            rng.choice(STATEMENTS).format(
+                a=a, b=b, n=rng.randint(0, 999), verb=verb, resource=resource,
+                Resource=resource.title(), field=field, Field=field.title(),
+            )
+        )
+    return (
+        f"@router.post(\"/{resource}s/{verb}_{index}\")\n"
+        f"async def {verb}_{resource}_{index}({params}):\n"
+        + "\n".join(body)
+        + f"\n    return await client.{verb}(\"{resource}\", {fields[0]}={fields[0]})\n"
+    )
+
+
+def _make_variant(rng: random.Random, code: str) -> str:
+    """Small edit of a block: annotated params, renamed variable or an extra comment."""
+    choice = rng.randrange(3)
+    if choice == 0:
+        return code.replace(": str | None = None", ": Annotated[str | None, Query()] = None")
+    if choice == 1:
+        return code.replace("async def", "def").replace("await ", "")
+    return code.replace("    return result\n", "    # Return the API response\n    return result\n")
+
+
+def generate_code_blocks(count: int, duplicate_ratio: float = 0.3, seed: int = 1) -> list[str]:
+    """Generate count code blocks, about duplicate_ratio of them variants of earlier blocks."""
+    rng = random.Random(seed)
+    blocks: list[str] = []
+    for index in range(count):
+        if blocks and rng.random() < duplicate_ratio:
+            blocks.append(_make_variant(rng, rng.choice(blocks)))
+        else:
+            blocks.append(_make_block(rng, index))
+    return blocks
+
+
+def generate_renamed_functions(count: int, seed: int = 1) -> list[str]:
+    """
+    Take functions from the server's own services, each followed by copies with
+    some identifiers renamed, so many pairs sit close to the similarity threshold.
+    """
+    rng = random.Random(seed)
+    blocks: list[str] = []
+    for path in sorted(SERVICES_DIR.rglob("*.py")):
+        source = path.read_text(encoding="utf-8")
+        for node in ast.walk(ast.parse(source)):
+            if not isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+                continue
+            code = ast.get_source_segment(source, node)
+            if not code or not 300 <= len(code) <= 1500:
+                continue
+            blocks.append(code)
+            names = sorted({name.id for name in ast.walk(node) if isinstance(name, ast.Name)})
+            for _ in range(2):
+                variant = code
+                for name in rng.sample(names, k=min(len(names), rng.randint(1, 4))):
+                    variant = re.sub(rf"\b{name}\b", f"{name}_{rng.randint(0, 99)}", variant)
+                blocks.append(variant)
+            if len(blocks) >= count:
+                return blocks[:count]
+    return blocks
+
+
+def all_pairs_groups(codes: list[str], threshold: float = 0.85) -> list[list[int]]:
+    """
+    Greedy grouping comparing every block with every later block, as the reference.
+
+    Pairs are pruned only with SequenceMatcher's own upper bounds (real_quick_ratio,
+    quick_ratio), so the groups are those of a plain ratio() scan.
+    """
+    normalized = [_normalize_code_for_comparison(code) for code in codes]
+    # SequenceMatcher caches its analysis of the second sequence
+    matchers = [SequenceMatcher(None, b=norm) for norm in normalized]
+    groups = []
+    processed = set()
+    for i, norm in enumerate(normalized):
+        if i in processed:
+            continue
+        group = [i]
+        processed.add(i)
+        for j in range(i + 1, len(codes)):
+            if j in processed:
+                continue
+            matcher = matchers[j]
+            matcher.set_seq1(norm)
+            if (
+                matcher.real_quick_ratio() >= threshold
+                and matcher.quick_ratio() >= threshold
+                and matcher.ratio() >= threshold
+            ):
+                group.append(j)
+                processed.add(j)
+        groups.append(group)
+    return groups
+
+
+def grouped_pairs(groups: list[list[int]]) -> set[tuple[int, int]]:
+    """Every pair of indices that share a group."""
+    return {(i, j) for group in groups for i in group for j in group if i < j}
+
+
+CORPORA = {"generated": generate_code_blocks, "renamed": generate_renamed_functions}
+# The all-pairs reference takes minutes beyond this
+ALL_PAIRS_LIMIT = 2000
+
+
+def main(sizes: list[int]) -> None:
+    header = f"{'corpus':>10} {'blocks':>8} {'groups':>8} {'grouped (s)':>12} {'all-pairs (s)':>14} {'recall':>7} {'agree':>6}"
+    print(header)
+    for corpus, generate in CORPORA.items():
+        reported = 0
+        for size in sizes:
+            codes = generate(size)
+            # The renamed corpus runs out of functions to take
+            if len(codes) <= reported:
+                break
+            reported = len(codes)
+
+            started = time.perf_counter()
+            groups = _find_similar_code_groups(codes)
+            grouped_seconds = time.perf_counter() - started
+
+            exhaustive = "-"
+            recall = "-"
+            agree = "-"
+            if len(codes) <= ALL_PAIRS_LIMIT:
+                started = time.perf_counter()
+                expected = all_pairs_groups(codes)
+                exhaustive = f"{time.perf_counter() - started:.2f}"
+                expected_pairs = grouped_pairs(expected)
+                found = len(expected_pairs & grouped_pairs(groups))
+                recall = f"{found / len(expected_pairs):.3f}" if expected_pairs else "1.000"
+                agree = "yes" if expected == groups else "no"
+
+            print(
+                f"{corpus:>10} {len(codes):>8} {len(groups):>8} {grouped_seconds:>12.2f} "
+                f"{exhaustive:>14} {recall:>7} {agree:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [500, 2000, 10000, 40000])
@@ -86,6 +86,16 @@ def prevent_real_db_calls():
                 yield
 
 
+@pytest.fixture(autouse=True)
+def reset_query_embedding_cache():
+    """Keep cached query vectors from leaking between tests."""
+    from src.server.services.embeddings import query_embedding_cache
+
+    query_embedding_cache._query_embedding_cache = None
+    yield
+    query_embedding_cache._query_embedding_cache = None
+
+
 @pytest.fixture
 def mock_supabase_client():
     """Mock Supabase client for testing."""
@@ -146,7 +156,7 @@ def client(mock_supabase_client):
             return_value=mock_supabase_client,
         ):
             with patch(
-                "src.server.services.credential_service.create_client",
+                "src.server.services.credential_service.get_supabase_client",
                 return_value=mock_supabase_client,
             ):
                 with patch("supabase.create_client", return_value=mock_supabase_client):
@@ -0,0 +1,95 @@
+"""Unit tests for pushing progress updates to streaming subscribers."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.server.api_routes.progress_api import router
+from src.server.middleware.auth_middleware import require_auth
+from src.server.utils.progress import ProgressBroadcaster, ProgressTracker, progress_broadcaster
+
+
+class TestProgressBroadcaster:
+    """Tests for ProgressBroadcaster and ProgressSubscription"""
+
+    @pytest.mark.asyncio
+    async def test_rapid_updates_are_coalesced(self):
+        broadcaster = ProgressBroadcaster()
+        subscription = broadcaster.subscribe("op-1")
+
+        for progress in (10, 20, 30):
+            broadcaster.publish("op-1", {"status": "crawling", "progress": progress})
+        broadcaster.publish("op-2", {"status": "crawling", "progress": 99})
+
+        assert await subscription.next(timeout=0.1) == {"op-1": {"status": "crawling", "progress": 30}}
+        assert await subscription.next(timeout=0.01) == {}
+
+    @pytest.mark.asyncio
+    async def test_subscription_to_all_operations(self):
+        broadcaster = ProgressBroadcaster()
+        subscription = broadcaster.subscribe()
+
+        waiter = asyncio.create_task(subscription.next(timeout=1))
+        await asyncio.sleep(0)
+        broadcaster.publish("op-1", {"status": "starting"})
+        broadcaster.publish("op-2", {"status": "completed"})
+
+        assert set(await waiter) == {"op-1", "op-2"}
+
+        broadcaster.unsubscribe(subscription)
+        assert broadcaster.subscriber_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_tracker_updates_are_published(self):
+        subscription = progress_broadcaster.subscribe("tracker-push")
+        try:
+            tracker = ProgressTracker("tracker-push", operation_type="crawl")
+            await tracker.start({"progress": 0})
+            await tracker.update("crawling", 40, "Crawling pages")
+
+            pending = await subscription.next(timeout=0.1)
+            assert pending["tracker-push"]["progress"] == 40
+        finally:
+            progress_broadcaster.unsubscribe(subscription)
+            ProgressTracker.clear_progress("tracker-push")
+
+
+class TestProgressStream:
+    """Tests for the Server-Sent Events endpoints"""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[require_auth] = lambda: None
+        return TestClient(app)
+
+    def test_stream_sends_current_state_and_closes_when_finished(self, client):
+        ProgressTracker._progress_states["stream-done"] = {
+            "progress_id": "stream-done",
+            "type": "crawl",
+            "status": "completed",
+            "progress": 100,
+            "log": "Crawl completed",
+        }
+        try:
+            with client.stream("GET", "/api/progress/stream-done/stream") as response:
+                assert response.status_code == 200
+                assert response.headers["content-type"].startswith("text/event-stream")
+                body = "".join(response.iter_text())
+        finally:
+            ProgressTracker.clear_progress("stream-done")
+
+        event, data = body.strip().split("\n")
+        assert event == "event: progress"
+        payload = json.loads(data.removeprefix("data: "))
+        assert payload["progressId"] == "stream-done"
+        assert payload["status"] == "completed"
+        assert progress_broadcaster.subscriber_count("stream-done") == 0
+
+    def test_stream_unknown_operation(self, client):
+        response = client.get("/api/progress/missing-op/stream")
+        assert response.status_code == 404
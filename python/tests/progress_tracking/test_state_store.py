@@ -0,0 +1,205 @@
+"""Unit tests for sharing operation state between API workers."""
+
+import asyncio
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from src.server.services.crawling import cancel_orchestration, is_orchestration_active
+from src.server.utils.progress import FileStateStore, ProgressTracker, set_state_store
+
+
+@pytest.fixture
+async def shared_store(tmp_path):
+    """This worker's view of a state directory shared with other workers."""
+    store = FileStateStore(str(tmp_path))
+    set_state_store(store)
+    yield store
+    await store.close()
+    set_state_store(None)
+
+
+class TestFileStateStore:
+    """Tests for FileStateStore"""
+
+    def test_progress_roundtrip(self, tmp_path):
+        store = FileStateStore(str(tmp_path))
+
+        store.save_progress("op-1", {"status": "crawling", "progress": 40})
+
+        assert store.load_progress("op-1") == {"status": "crawling", "progress": 40}
+        assert list(store.list_progress()) == ["op-1"]
+        store.delete_progress("op-1")
+        assert store.load_progress("op-1") is None
+        with pytest.raises(ValueError):
+            store.save_progress("../escape", {})
+
+    def test_changes_by_other_workers_reach_watchers(self, tmp_path):
+        worker_a = FileStateStore(str(tmp_path))
+        worker_b = FileStateStore(str(tmp_path))
+        progress, cancels = [], []
+        worker_a.watch_progress(lambda progress_id, state: progress.append((progress_id, state["progress"])))
+        worker_a.watch_cancellations(cancels.append)
+
+        worker_a.save_progress("own-op", {"progress": 10})
+        worker_b.save_progress("other-op", {"progress": 70})
+        worker_b.request_cancel("own-op")
+        worker_a.poll()
+        worker_a.poll()
+
+        # Own writes are delivered in-process, not through the store
+        assert progress == [("other-op", 70)]
+        assert cancels == ["own-op"]
+
+    def test_operation_of_dead_process_is_not_active(self, tmp_path):
+        store = FileStateStore(str(tmp_path))
+        store.register_operation("op-1")
+        assert store.is_operation_active("op-1")
+
+        with open(os.path.join(tmp_path, "operations", "op-1"), "w") as f:
+            f.write(f'{{"host": "{socket.gethostname()}", "pid": 999999999}}')
+
+        assert not store.is_operation_active("op-1")
+
+    @pytest.mark.asyncio
+    async def test_writes_in_event_loop_are_coalesced_off_the_loop(self, tmp_path):
+        store = FileStateStore(str(tmp_path))
+        other_worker = FileStateStore(str(tmp_path))
+        threads = []
+        apply_writes = store._apply_writes
+
+        def recording_apply_writes(writes):
+            threads.append(threading.current_thread())
+            return apply_writes(writes)
+
+        store._apply_writes = recording_apply_writes
+        for progress in (10, 20, 30):
+            store.save_progress("op-1", {"progress": progress})
+
+        # Pending writes are visible to this process before they reach the file
+        assert store.load_progress("op-1") == {"progress": 30}
+        assert other_worker.load_progress("op-1") is None
+
+        await store.flush()
+
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+        assert other_worker.load_progress("op-1") == {"progress": 30}
+
+        store.delete_progress("op-1")
+        assert store.load_progress("op-1") is None
+        await store.close()
+        assert other_worker.load_progress("op-1") is None
+
+    @pytest.mark.asyncio
+    async def test_async_reads_run_off_the_loop(self, tmp_path):
+        store = FileStateStore(str(tmp_path))
+        other_worker = FileStateStore(str(tmp_path))
+        other_worker.save_progress("other-op", {"progress": 50})
+        other_worker.register_operation("other-op")
+        await other_worker.flush()
+        threads = []
+        read_progress, check_operation = store._read_progress, store._check_operation
+
+        def recording(read):
+            def wrapper(progress_id):
+                threads.append(threading.current_thread())
+                return read(progress_id)
+
+            return wrapper
+
+        store._read_progress = recording(read_progress)
+        store._check_operation = recording(check_operation)
+        store.save_progress("own-op", {"progress": 10})
+
+        assert await store.load_progress_async("other-op") == {"progress": 50}
+        assert await store.load_progress_async("own-op") == {"progress": 10}
+        assert await store.list_progress_async() == {"other-op": {"progress": 50}, "own-op": {"progress": 10}}
+        assert await store.is_operation_active_async("other-op")
+        assert not await store.is_operation_active_async("own-op")
+
+        assert threads
+        assert threading.main_thread() not in threads
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_watcher_delivers_changes_of_other_workers(self, tmp_path):
+        store = FileStateStore(str(tmp_path), poll_interval=0.01)
+        other_worker = FileStateStore(str(tmp_path))
+        received = asyncio.Event()
+        store.watch_progress(lambda progress_id, state: received.set())
+
+        store.start()
+        await asyncio.sleep(0.05)
+        other_worker.save_progress("other-op", {"progress": 50})
+        await other_worker.flush()
+
+        await asyncio.wait_for(received.wait(), timeout=2)
+        await store.close()
+
+    def test_cleanup_removes_files_left_by_crashed_workers(self, tmp_path):
+        store = FileStateStore(str(tmp_path), ttl=60)
+        other_host = FileStateStore(str(tmp_path))
+        other_host._hostname = "other-host"
+        stale = time.time() - 120
+
+        store.save_progress("finished-op", {"status": "completed"})
+        store.save_progress("running-op", {"status": "crawling"})
+        other_host.register_operation("running-op")
+        other_host.register_operation("abandoned-op")
+        store.request_cancel("abandoned-op")
+        temp_file = os.path.join(tmp_path, "progress", ".crashed-op.123.tmp")
+        open(temp_file, "w").close()
+        for path in (
+            os.path.join(tmp_path, "progress", "finished-op.json"),
+            os.path.join(tmp_path, "operations", "running-op"),
+            os.path.join(tmp_path, "operations", "abandoned-op"),
+            os.path.join(tmp_path, "cancel", "abandoned-op"),
+            temp_file,
+        ):
+            os.utime(path, (stale, stale))
+
+        assert store.cleanup() == ["finished-op"]
+
+        # The operation still reporting progress survives; everything abandoned is gone
+        assert store.is_operation_active("running-op")
+        assert store.load_progress("running-op") == {"status": "crawling"}
+        assert not store.is_operation_active("abandoned-op")
+        assert os.listdir(os.path.join(tmp_path, "cancel")) == []
+        assert not os.path.exists(temp_file)
+
+
+class TestSharedProgress:
+    """Tests for ProgressTracker and the crawl registry on a shared store"""
+
+    @pytest.mark.asyncio
+    async def test_progress_is_visible_to_other_workers(self, shared_store):
+        tracker = ProgressTracker("shared-op", operation_type="crawl")
+        await tracker.update("crawling", 30, "Crawling pages")
+        # Another worker has nothing in memory
+        ProgressTracker._progress_states.pop("shared-op")
+
+        assert ProgressTracker.get_progress("shared-op")["progress"] == 30
+        assert "shared-op" in ProgressTracker.list_active()
+        assert (await ProgressTracker.get_progress_async("shared-op"))["progress"] == 30
+        assert "shared-op" in await ProgressTracker.list_active_async()
+
+        ProgressTracker.clear_progress("shared-op")
+        assert ProgressTracker.get_progress("shared-op") is None
+
+    @pytest.mark.asyncio
+    async def test_stop_request_reaches_crawl_on_other_worker(self, shared_store, tmp_path):
+        other_worker = FileStateStore(str(tmp_path))
+        other_worker.register_operation("remote-crawl")
+        cancelled = []
+        other_worker.watch_cancellations(cancelled.append)
+
+        assert await is_orchestration_active("remote-crawl")
+        assert await cancel_orchestration("remote-crawl")
+        assert not await cancel_orchestration("unknown-crawl")
+
+        other_worker.poll()
+        assert cancelled == ["remote-crawl"]
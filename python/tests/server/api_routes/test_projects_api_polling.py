@@ -96,6 +96,7 @@ class TestProjectsListPolling:
     async def test_list_projects_etag_changes_with_data(self):
         """Test that ETag changes when project data changes."""
         from src.server.api_routes.projects_api import list_projects
+        from src.server.utils.etag_utils import PROJECTS_SCOPE, bump_data_version
         
         with patch("src.server.api_routes.projects_api.ProjectService") as mock_proj_class, \
              patch("src.server.api_routes.projects_api.SourceLinkingService") as mock_source_class:
@@ -118,6 +119,8 @@ class TestProjectsListPolling:
             projects2 = [{"id": "proj-1", "name": "Project 1 Updated"}]
             mock_proj_service.list_projects.return_value = (True, {"projects": projects2})
             mock_source_service.format_projects_with_sources.return_value = projects2
+            # Project writes bump the data version behind the ETag
+            bump_data_version(PROJECTS_SCOPE)
             
             response2 = Response()
             await list_projects(response=response2, if_none_match=etag1)
@@ -234,6 +237,48 @@ class TestProjectTasksPolling:
             assert response2.status_code == 304
             assert response2.headers["ETag"] == etag
 
+    @pytest.mark.asyncio
+    async def test_list_project_tasks_304_skips_query_until_tasks_change(self):
+        """Test that unchanged polls are answered from the data version without querying."""
+        from fastapi import Request
+
+        from src.server.api_routes.projects_api import list_project_tasks
+        from src.server.utils.etag_utils import TASKS_SCOPE, bump_data_version
+
+        def make_request(etag=None):
+            request = MagicMock(spec=Request)
+            request.headers = MagicMock()
+            request.headers.get = lambda key, default=None: etag if key == "If-None-Match" else default
+            return request
+
+        with patch("src.server.api_routes.projects_api.TaskService") as mock_task_class:
+            mock_task_service = MagicMock()
+            mock_task_class.return_value = mock_task_service
+            mock_task_service.list_tasks.return_value = (
+                True, {"tasks": [{"id": "task-1", "title": "Task 1", "status": "todo"}]}
+            )
+
+            response1 = Response()
+            await list_project_tasks("proj-versioned", request=make_request(), response=response1)
+            etag = response1.headers["ETag"]
+
+            response2 = Response()
+            result = await list_project_tasks("proj-versioned", request=make_request(etag), response=response2)
+            assert result is None
+            assert response2.status_code == 304
+            assert mock_task_service.list_tasks.call_count == 1
+
+            # A task write invalidates the version; the data is queried again
+            mock_task_service.list_tasks.return_value = (
+                True, {"tasks": [{"id": "task-1", "title": "Task 1", "status": "doing"}]}
+            )
+            bump_data_version(TASKS_SCOPE)
+            response3 = Response()
+            result = await list_project_tasks("proj-versioned", request=make_request(etag), response=response3)
+            assert mock_task_service.list_tasks.call_count == 2
+            assert result[0]["status"] == "doing"
+            assert response3.headers["ETag"] != etag
+
     def test_list_project_tasks_http_polling(self, test_client):
         """Test project tasks endpoint polling via HTTP."""
         with patch("src.server.api_routes.projects_api.ProjectService") as mock_proj_class, \
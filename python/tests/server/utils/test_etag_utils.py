@@ -4,7 +4,15 @@ import json
 
 import pytest
 
-from src.server.utils.etag_utils import check_etag, generate_etag
+from src.server.utils.etag_utils import (
+    PROJECTS_SCOPE,
+    TASKS_SCOPE,
+    VersionedETagCache,
+    bump_data_version,
+    check_etag,
+    generate_etag,
+    get_data_version,
+)
 
 
 class TestGenerateEtag:
@@ -188,4 +196,34 @@ class TestEtagIntegration:
         etag3 = generate_etag(progress_data)
         
         assert etag2 != etag3
-        assert not check_etag(etag2, etag3)
\ No newline at end of file
+        assert not check_etag(etag2, etag3)
+
+class TestVersionedETagCache:
+    """Tests for answering polls from data versions."""
+
+    def test_unchanged_only_at_same_version(self):
+        """Test that a remembered ETag matches until the version changes."""
+        cache = VersionedETagCache()
+        cache.set("tasks:p1", (3,), '"abc"')
+
+        assert cache.is_unchanged("tasks:p1", (3,), '"abc"')
+        assert not cache.is_unchanged("tasks:p1", (4,), '"abc"')
+        assert not cache.is_unchanged("tasks:p1", (3,), '"other"')
+        assert not cache.is_unchanged("tasks:p1", (3,), None)
+        assert not cache.is_unchanged("tasks:p2", (3,), '"abc"')
+
+    def test_entries_expire(self):
+        """Test that writes bypassing the version counters are seen after max_age."""
+        cache = VersionedETagCache(max_age=0)
+        cache.set("projects", (1,), '"abc"')
+
+        assert cache.get("projects", (1,)) is None
+
+    def test_bump_data_version(self):
+        """Test that a write moves the version of its scope only."""
+        before = get_data_version(PROJECTS_SCOPE, TASKS_SCOPE)
+        bump_data_version(TASKS_SCOPE)
+        after = get_data_version(PROJECTS_SCOPE, TASKS_SCOPE)
+
+        assert after[0] == before[0]
+        assert after[1] != before[1]
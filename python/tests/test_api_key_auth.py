@@ -0,0 +1,105 @@
+"""
+Tests for API key validation: prefix lookup, verified-key cache and invalidation.
+"""
+
+from unittest.mock import patch
+
+import bcrypt
+import pytest
+
+from src.server.services import api_key_service
+from src.server.services.api_key_service import APIKeyService, VerifiedKeyCache
+
+API_KEY = "ak_AB12_secret-token-value"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Give every test its own verified-key cache."""
+    with patch.object(api_key_service, "_verified_key_cache", VerifiedKeyCache(ttl_seconds=60)):
+        yield
+
+
+@pytest.fixture
+def key_row():
+    """Stored row for API_KEY."""
+    return {
+        "id": "key-1",
+        "key_name": "ci",
+        "key_hash": bcrypt.hashpw(API_KEY.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8"),
+        "permissions": {"read": True},
+        "metadata": {},
+        "created_at": "2025-10-15T00:00:00Z",
+    }
+
+
+class TestValidateApiKey:
+    """Tests for APIKeyService.validate_api_key"""
+
+    @pytest.mark.asyncio
+    async def test_lookup_filters_by_prefix(self, mock_supabase_client, key_row):
+        query = mock_supabase_client.table.return_value.select.return_value
+        query.execute.return_value.data = [key_row]
+
+        valid, key_info = await APIKeyService(mock_supabase_client).validate_api_key(API_KEY)
+
+        assert valid
+        assert key_info["id"] == "key-1"
+        assert query.eq.call_args_list[0].args == ("key_prefix", "ak_AB12")
+
+    @pytest.mark.asyncio
+    async def test_verified_key_is_served_from_cache(self, mock_supabase_client, key_row):
+        mock_supabase_client.table.return_value.select.return_value.execute.return_value.data = [key_row]
+        service = APIKeyService(mock_supabase_client)
+
+        await service.validate_api_key(API_KEY)
+        with patch.object(api_key_service.bcrypt, "checkpw") as mock_checkpw:
+            valid, _ = await service.validate_api_key(API_KEY)
+
+        assert valid
+        mock_checkpw.assert_not_called()
+        assert mock_supabase_client.table.return_value.select.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_wrong_key_is_rejected_and_not_cached(self, mock_supabase_client, key_row):
+        mock_supabase_client.table.return_value.select.return_value.execute.return_value.data = [key_row]
+        service = APIKeyService(mock_supabase_client)
+
+        valid, key_info = await service.validate_api_key("ak_AB12_wrong")
+
+        assert not valid
+        assert key_info is None
+        assert api_key_service.get_verified_key_cache().get("ak_AB12_wrong") is None
+
+    @pytest.mark.asyncio
+    async def test_malformed_key_skips_database(self, mock_supabase_client):
+        valid, _ = await APIKeyService(mock_supabase_client).validate_api_key("not-an-archon-key")
+
+        assert not valid
+        mock_supabase_client.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_revoke_invalidates_cache(self, mock_supabase_client, key_row):
+        mock_supabase_client.table.return_value.select.return_value.execute.return_value.data = [key_row]
+        service = APIKeyService(mock_supabase_client)
+        await service.validate_api_key(API_KEY)
+
+        await service.revoke_api_key("key-1")
+
+        assert api_key_service.get_verified_key_cache().get(API_KEY) is None
+
+
+class TestVerifiedKeyCache:
+    """Tests for VerifiedKeyCache"""
+
+    def test_entries_expire(self):
+        cache = VerifiedKeyCache(ttl_seconds=30)
+        with patch.object(api_key_service.time, "monotonic", return_value=100.0):
+            cache.set(API_KEY, {"id": "key-1"})
+        with patch.object(api_key_service.time, "monotonic", return_value=131.0):
+            assert cache.get(API_KEY) is None
+
+    def test_digest_does_not_contain_key(self):
+        cache = VerifiedKeyCache()
+        assert API_KEY not in cache.digest(API_KEY)
+        assert cache.digest(API_KEY) != VerifiedKeyCache().digest(API_KEY)
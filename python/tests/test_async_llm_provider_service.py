@@ -5,13 +5,17 @@ Tests all aspects of the async LLM provider service after sync function removal.
 Covers different providers (OpenAI, Ollama, Google) and error scenarios.
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.server.services.llm_provider_service import (
     _get_cached_settings,
+    _get_pooled_client,
     _set_cached_settings,
+    clear_provider_cache,
+    close_llm_clients,
     get_embedding_model,
     get_llm_client,
 )
@@ -45,8 +49,12 @@ class TestAsyncLLMProviderService:
         import src.server.services.llm_provider_service as llm_module
 
         llm_module._settings_cache.clear()
+        llm_module._client_pool.clear()
         yield
         llm_module._settings_cache.clear()
+        llm_module._client_pool.clear()
+        llm_module._client_users.clear()
+        llm_module._retired_clients.clear()
 
     @pytest.fixture
     def mock_credential_service(self):
@@ -109,7 +117,7 @@ class TestAsyncLLMProviderService:
 
                 async with get_llm_client() as client:
                     assert client == mock_client
-                    mock_openai.assert_called_once_with(api_key="test-openai-key")
+                    mock_openai.assert_called_once_with(api_key="test-openai-key", http_client=ANY)
 
                 # Verify provider config was fetched
                 mock_credential_service.get_active_provider.assert_called_once_with("llm")
@@ -133,7 +141,9 @@ class TestAsyncLLMProviderService:
                 async with get_llm_client() as client:
                     assert client == mock_client
                     mock_openai.assert_called_once_with(
-                        api_key="ollama", base_url="http://host.docker.internal:11434/v1"
+                        api_key="ollama",
+                        base_url="http://host.docker.internal:11434/v1",
+                        http_client=ANY,
                     )
 
     @pytest.mark.asyncio
@@ -157,6 +167,7 @@ class TestAsyncLLMProviderService:
                     mock_openai.assert_called_once_with(
                         api_key="test-google-key",
                         base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+                        http_client=ANY,
                     )
 
     @pytest.mark.asyncio
@@ -177,7 +188,7 @@ class TestAsyncLLMProviderService:
 
                 async with get_llm_client(provider="openai") as client:
                     assert client == mock_client
-                    mock_openai.assert_called_once_with(api_key="override-key")
+                    mock_openai.assert_called_once_with(api_key="override-key", http_client=ANY)
 
                 # Verify explicit provider API key was requested
                 mock_credential_service._get_provider_api_key.assert_called_once_with("openai")
@@ -205,7 +216,7 @@ class TestAsyncLLMProviderService:
 
                 async with get_llm_client(use_embedding_provider=True) as client:
                     assert client == mock_client
-                    mock_openai.assert_called_once_with(api_key="embedding-key")
+                    mock_openai.assert_called_once_with(api_key="embedding-key", http_client=ANY)
 
                 # Verify embedding provider was requested
                 mock_credential_service.get_active_provider.assert_called_once_with("embedding")
@@ -240,7 +251,8 @@ class TestAsyncLLMProviderService:
                     # Verify it created an Ollama client with correct params
                     mock_openai.assert_called_once_with(
                         api_key="ollama",
-                        base_url="http://host.docker.internal:11434/v1"
+                        base_url="http://host.docker.internal:11434/v1",
+                        http_client=ANY,
                     )
 
     @pytest.mark.asyncio
@@ -478,10 +490,84 @@ class TestAsyncLLMProviderService:
                     client_ref = client
                     assert client == mock_client
 
-                # After context manager exits, should still have reference to client
+                # Pooled client stays open after the context manager exits
                 assert client_ref == mock_client
+                mock_client.aclose.assert_not_awaited()
+
+                # Clearing the provider cache closes pooled clients
+                clear_provider_cache()
+                await asyncio.sleep(0)
                 mock_client.aclose.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_evicted_client_closes_after_last_user(self, mock_credential_service, openai_provider_config):
+        """Clearing the cache mid-request evicts the client but leaves it open for its users"""
+        mock_credential_service.get_active_provider.return_value = openai_provider_config
+
+        with (
+            patch("src.server.services.llm_provider_service.credential_service", mock_credential_service),
+            patch("src.server.services.llm_provider_service.openai.AsyncOpenAI") as mock_openai,
+        ):
+            mock_openai.side_effect = lambda **kwargs: self._make_mock_client()
+
+            async with get_llm_client() as first:
+                async with get_llm_client() as second:
+                    assert second is first
+                    clear_provider_cache()
+                    await asyncio.sleep(0)
+
+                    # A new caller gets a fresh client while the evicted one stays open
+                    async with get_llm_client() as fresh:
+                        assert fresh is not first
+                    first.aclose.assert_not_awaited()
+
+                await asyncio.sleep(0)
+                first.aclose.assert_not_awaited()
+
+            await asyncio.sleep(0)
+            first.aclose.assert_awaited_once()
+            fresh.aclose.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_clients_in_use(self, mock_credential_service, openai_provider_config):
+        """close_llm_clients() closes pooled and in-use clients without waiting for callers"""
+        mock_credential_service.get_active_provider.return_value = openai_provider_config
+
+        with (
+            patch("src.server.services.llm_provider_service.credential_service", mock_credential_service),
+            patch("src.server.services.llm_provider_service.openai.AsyncOpenAI") as mock_openai,
+        ):
+            mock_openai.side_effect = lambda **kwargs: self._make_mock_client()
+
+            async with get_llm_client() as client:
+                await close_llm_clients()
+                client.aclose.assert_awaited_once()
+
+            await asyncio.sleep(0)
+            client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_clients_are_pooled_per_key(self, mock_credential_service, openai_provider_config):
+        """Same provider/base_url/key reuses one client; a different key gets its own"""
+        with patch("src.server.services.llm_provider_service.openai.AsyncOpenAI") as mock_openai:
+            mock_openai.side_effect = lambda **kwargs: self._make_mock_client()
+
+            first = _get_pooled_client("openai", api_key="key-a")
+            again = _get_pooled_client("openai", api_key="key-a")
+            other = _get_pooled_client("openai", api_key="key-b")
+
+            assert first is again
+            assert other is not first
+            assert mock_openai.call_count == 2
+
+            # A closed client is replaced
+            first.is_closed.return_value = True
+            assert _get_pooled_client("openai", api_key="key-a") is not first
+
+            clear_provider_cache()
+            await asyncio.sleep(0)
+            other.aclose.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_multiple_providers_in_sequence(self, mock_credential_service):
         """Test creating clients for different providers in sequence"""
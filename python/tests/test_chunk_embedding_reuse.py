@@ -0,0 +1,155 @@
+"""
+Test reuse of stored chunk embeddings on recrawl.
+
+Unchanged chunks (same content hash and embedding model) must be stored with their
+existing vectors instead of being sent to the embedding provider again.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.embeddings.embedding_service import EmbeddingBatchResult
+from src.server.services.storage.document_storage_service import (
+    add_documents_to_supabase,
+    compute_content_hash,
+    fetch_reusable_chunks,
+)
+
+URL = "https://example.com/docs"
+MODEL = "text-embedding-3-small"
+
+
+@pytest.fixture
+def stored_row():
+    """A chunk stored by a previous crawl with the current embedding configuration."""
+    return {
+        "url": URL,
+        "content": "unchanged",
+        "content_hash": compute_content_hash("unchanged"),
+        "metadata": {},
+        "embedding_model": MODEL,
+        "embedding_dimension": 1536,
+        "embedding_1536": [0.5] * 1536,
+    }
+
+
+class TestFetchReusableChunks:
+    """Tests for selecting reusable stored chunks"""
+
+    def test_matching_rows_are_reusable(self, mock_supabase_client, stored_row):
+        select = mock_supabase_client.table.return_value.select.return_value
+        select.in_.return_value.execute.return_value.data = [stored_row]
+
+        reusable = fetch_reusable_chunks(mock_supabase_client, [URL], MODEL, 1536, False)
+
+        assert (URL, compute_content_hash("unchanged")) in reusable
+
+    def test_384_dimension_rows_are_reusable(self, mock_supabase_client, stored_row):
+        row = {**stored_row, "embedding_dimension": 384, "embedding_1536": None, "embedding_384": [0.5] * 384}
+        select = mock_supabase_client.table.return_value.select.return_value
+        select.in_.return_value.execute.return_value.data = [row]
+
+        reusable = fetch_reusable_chunks(mock_supabase_client, [URL], MODEL, 384, False)
+
+        assert reusable[(URL, compute_content_hash("unchanged"))]["embedding"] == [0.5] * 384
+        assert "embedding_384" in mock_supabase_client.table.return_value.select.call_args.args[0]
+
+    def test_model_change_prevents_reuse(self, mock_supabase_client, stored_row):
+        select = mock_supabase_client.table.return_value.select.return_value
+        select.in_.return_value.execute.return_value.data = [{**stored_row, "embedding_model": "other-model"}]
+
+        assert fetch_reusable_chunks(mock_supabase_client, [URL], MODEL, 1536, False) == {}
+
+    def test_contextual_setting_change_prevents_reuse(self, mock_supabase_client, stored_row):
+        select = mock_supabase_client.table.return_value.select.return_value
+        select.in_.return_value.execute.return_value.data = [stored_row]
+
+        assert fetch_reusable_chunks(mock_supabase_client, [URL], MODEL, 1536, True) == {}
+
+    def test_rows_without_hash_are_ignored(self, mock_supabase_client, stored_row):
+        select = mock_supabase_client.table.return_value.select.return_value
+        select.in_.return_value.execute.return_value.data = [{**stored_row, "content_hash": None}]
+
+        assert fetch_reusable_chunks(mock_supabase_client, [URL], MODEL, 1536, False) == {}
+
+
+class TestAddDocumentsReuse:
+    """Tests for embedding reuse inside add_documents_to_supabase"""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_chunks_are_embedded(self, mock_supabase_client, stored_row):
+        table = mock_supabase_client.table.return_value
+        table.select.return_value.in_.return_value.execute.return_value.data = [stored_row]
+
+        new_result = EmbeddingBatchResult()
+        new_result.add_success([0.1] * 1536, "changed")
+
+        mock_cred = MagicMock()
+        mock_cred.get_credentials_by_category = AsyncMock(return_value={"EMBEDDING_DIMENSIONS": "1536"})
+        mock_cred.get_credential = AsyncMock(return_value="false")
+
+        with (
+            patch("src.server.services.credential_service.credential_service", mock_cred),
+            patch(
+                "src.server.services.llm_provider_service.get_embedding_model",
+                AsyncMock(return_value=MODEL),
+            ),
+            patch(
+                "src.server.services.storage.document_storage_service.create_embeddings_batch",
+                AsyncMock(return_value=new_result),
+            ) as mock_embed,
+        ):
+            result = await add_documents_to_supabase(
+                client=mock_supabase_client,
+                urls=[URL, URL],
+                chunk_numbers=[0, 1],
+                contents=["unchanged", "changed"],
+                metadatas=[{"source_id": "src1"}, {"source_id": "src1"}],
+                url_to_full_document={URL: "unchanged changed"},
+            )
+
+        mock_embed.assert_awaited_once()
+        assert mock_embed.await_args.args[0] == ["changed"]
+        assert result == {"chunks_stored": 2, "chunks_reused": 1}
+
+        inserted = table.insert.call_args.args[0]
+        assert {row["content"] for row in inserted} == {"unchanged", "changed"}
+        assert all(row["content_hash"] == compute_content_hash(row["content"]) for row in inserted)
+
+    @pytest.mark.asyncio
+    async def test_settings_failure_falls_back_to_defaults(self, mock_supabase_client):
+        """Storage still runs when the rag_strategy settings cannot be loaded"""
+        table = mock_supabase_client.table.return_value
+        table.select.return_value.in_.return_value.execute.return_value.data = []
+
+        new_result = EmbeddingBatchResult()
+        new_result.add_success([0.1] * 384, "changed")
+
+        mock_cred = MagicMock()
+        mock_cred.get_credentials_by_category = AsyncMock(side_effect=RuntimeError("settings unavailable"))
+        mock_cred.get_credential = AsyncMock(return_value="false")
+
+        with (
+            patch("src.server.services.credential_service.credential_service", mock_cred),
+            patch(
+                "src.server.services.llm_provider_service.get_embedding_model",
+                AsyncMock(return_value=MODEL),
+            ),
+            patch(
+                "src.server.services.storage.document_storage_service.create_embeddings_batch",
+                AsyncMock(return_value=new_result),
+            ),
+        ):
+            result = await add_documents_to_supabase(
+                client=mock_supabase_client,
+                urls=[URL],
+                chunk_numbers=[0],
+                contents=["changed"],
+                metadatas=[{"source_id": "src1"}],
+                url_to_full_document={URL: "changed"},
+            )
+
+        assert result == {"chunks_stored": 1, "chunks_reused": 0}
+        inserted = table.insert.call_args.args[0]
+        assert inserted[0]["embedding_384"] == [0.1] * 384
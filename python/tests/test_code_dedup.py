@@ -0,0 +1,124 @@
+"""
+Tests for near-duplicate detection of extracted code blocks.
+"""
+
+from difflib import SequenceMatcher
+from unittest.mock import patch
+
+from src.server.services.storage import code_storage_service
+from src.server.services.storage.code_storage_service import (
+    _calculate_code_similarity,
+    _find_similar_code_groups,
+    extract_code_blocks,
+)
+
+FETCH_PAGE = '''async def fetch_page(session, url, retries=3):
+    for attempt in range(retries):
+        try:
+            async with session.get(url, timeout=30) as response:
+                response.raise_for_status()
+                return await response.text()
+        except aiohttp.ClientError as error:
+            logger.warning(f"Attempt {attempt + 1} for {url} failed: {error}")
+            await asyncio.sleep(2 ** attempt)
+    raise RuntimeError(f"Giving up on {url}")
+'''
+
+CHUNK_TEXT = '''def chunk_text(text, chunk_size=5000, overlap=200):
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        boundary = text.rfind("\\n\\n", start, end)
+        if boundary > start + chunk_size // 2:
+            end = boundary
+        chunks.append(text[start:end].strip())
+        start = end - overlap if end < len(text) else end
+    return [chunk for chunk in chunks if chunk]
+'''
+
+MERGE_SETTINGS = '''def merge_settings(defaults, overrides):
+    merged = dict(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_settings(merged[key], value)
+        elif value is not None:
+            merged[key] = value
+    return merged
+'''
+
+RENAMED_SNIPPETS = [
+    FETCH_PAGE,
+    CHUNK_TEXT,
+    FETCH_PAGE.replace("session", "client").replace("attempt", "try_number"),
+    MERGE_SETTINGS,
+    CHUNK_TEXT.replace("chunks", "pieces").replace("boundary", "split_at"),
+    MERGE_SETTINGS.replace("key", "name"),
+    FETCH_PAGE.replace("url", "page_url").replace("response", "resp"),
+    MERGE_SETTINGS.replace("defaults", "base_config"),
+]
+
+
+def all_pairs_groups(codes: list[str], threshold: float = 0.85) -> list[list[int]]:
+    """Greedy grouping comparing every block with every later block, as the reference."""
+    groups = []
+    processed = set()
+    for i, code in enumerate(codes):
+        if i in processed:
+            continue
+        group = [i]
+        processed.add(i)
+        for j in range(i + 1, len(codes)):
+            if j not in processed and _calculate_code_similarity(code, codes[j]) >= threshold:
+                group.append(j)
+                processed.add(j)
+        groups.append(group)
+    return groups
+
+
+class TestCodeDeduplication:
+    """Tests for _find_similar_code_groups"""
+
+    def test_exhaustive_scan_matches_all_pairs_scan(self):
+        groups = _find_similar_code_groups(RENAMED_SNIPPETS)
+
+        assert groups == all_pairs_groups(RENAMED_SNIPPETS)
+        assert groups == [[0, 2, 6], [1, 4], [3, 5, 7]]
+
+    def test_lsh_index_finds_renamed_identifiers(self):
+        with patch.object(code_storage_service, "_DEDUP_EXHAUSTIVE_LIMIT", 0):
+            groups = _find_similar_code_groups(RENAMED_SNIPPETS)
+
+        assert groups == all_pairs_groups(RENAMED_SNIPPETS)
+
+    def test_lsh_index_skips_unrelated_blocks(self):
+        codes = [FETCH_PAGE, CHUNK_TEXT, MERGE_SETTINGS]
+
+        with (
+            patch.object(code_storage_service, "_DEDUP_EXHAUSTIVE_LIMIT", 0),
+            patch.object(code_storage_service, "SequenceMatcher", wraps=SequenceMatcher) as mock_matcher,
+        ):
+            groups = _find_similar_code_groups(codes)
+
+        assert groups == [[0], [1], [2]]
+        mock_matcher.assert_not_called()
+
+    def test_bounds_skip_dissimilar_pairs(self):
+        codes = ["x = 1\n" * 50, "def f():\n    return 2\n", "x = 1\n" * 50 + "y = 2\n"]
+
+        with patch(
+            "src.server.services.storage.code_storage_service.SequenceMatcher", wraps=SequenceMatcher
+        ) as mock_matcher:
+            groups = _find_similar_code_groups(codes)
+
+        assert groups == [[0, 2], [1]]
+        assert mock_matcher.call_count == 1
+
+    def test_annotated_variants_are_consolidated(self):
+        plain = "```python\n" + "def get_item(item_id: int, q: str = Query(None)):\n    return {'item_id': item_id, 'q': q}\n" * 3 + "```"
+        annotated = plain.replace("q: str = Query(None)", "q: Annotated[str, Query()] = None")
+
+        blocks = extract_code_blocks(f"{plain}\n\nSome text\n\n{annotated}", min_length=10)
+
+        assert len(blocks) == 1
+        assert blocks[0]["consolidated_variants"] == 2
@@ -0,0 +1,130 @@
+"""
+Tests for conditional recrawls: validator probes and content-hash change detection.
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.server.services.crawling.conditional_recrawl import ConditionalRecrawl, page_validators
+from src.server.services.storage.document_storage_service import compute_content_hash
+from tests.test_recursive_crawl_frontier import FakeCrawler, crawl
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 May 2024 10:00:00 GMT"
+
+
+async def probe_with(recrawl: ConditionalRecrawl, responses: dict[str, httpx.Response], urls: list[str]):
+    """Filter URLs against an in-memory set of responses, recording the requests made."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = responses.get(str(request.url))
+        if response is None:
+            raise httpx.ConnectError("unreachable", request=request)
+        return response
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(**client_kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **client_kwargs)
+
+    with patch(
+        "src.server.services.crawling.conditional_recrawl.httpx.AsyncClient", side_effect=client_factory
+    ):
+        changed = await recrawl.filter_changed(urls)
+        await recrawl.close()
+    return changed, requests
+
+
+class TestConditionalProbes:
+    """Tests for ConditionalRecrawl.filter_changed"""
+
+    @pytest.mark.asyncio
+    async def test_unmodified_pages_are_skipped(self):
+        recrawl = ConditionalRecrawl({
+            "https://a.com/304": {"etag": ETAG, "last_modified": LAST_MODIFIED},
+            "https://a.com/same-etag": {"etag": ETAG, "last_modified": None},
+            "https://a.com/same-date": {"etag": None, "last_modified": LAST_MODIFIED},
+            "https://a.com/changed": {"etag": ETAG, "last_modified": None},
+            "https://a.com/down": {"etag": ETAG, "last_modified": None},
+        })
+        responses = {
+            "https://a.com/304": httpx.Response(304),
+            # Servers that ignore conditional headers still report unchanged validators
+            "https://a.com/same-etag": httpx.Response(200, headers={"ETag": ETAG}, content=b"page"),
+            "https://a.com/same-date": httpx.Response(200, headers={"Last-Modified": LAST_MODIFIED}),
+            "https://a.com/changed": httpx.Response(200, headers={"ETag": '"v2"'}),
+        }
+
+        changed, requests = await probe_with(recrawl, responses, list(recrawl.validators) + ["https://a.com/new"])
+
+        assert changed == ["https://a.com/changed", "https://a.com/down", "https://a.com/new"]
+        # Pages without stored validators are not probed
+        assert "https://a.com/new" not in [str(request.url) for request in requests]
+        assert requests[0].headers["If-None-Match"] == ETAG
+        assert requests[0].headers["If-Modified-Since"] == LAST_MODIFIED
+        assert recrawl.report()["pages_not_modified"] == 3
+        assert recrawl.report()["probe_errors"] == 1
+
+    def test_page_validators_are_read_case_insensitively(self):
+        assert page_validators({"etag": ETAG, "LAST-MODIFIED": LAST_MODIFIED}) == {
+            "etag": ETAG,
+            "last_modified": LAST_MODIFIED,
+        }
+        assert page_validators(None) == {"etag": None, "last_modified": None}
+
+
+class TestContentHash:
+    """Tests for ConditionalRecrawl.content_unchanged"""
+
+    def test_only_changed_or_new_content_is_kept(self):
+        recrawl = ConditionalRecrawl({
+            "https://a.com/same": {"content_hash": compute_content_hash("hello")},
+            "https://a.com/edited": {"content_hash": compute_content_hash("hello")},
+        })
+
+        assert recrawl.content_unchanged({"url": "https://a.com/same", "markdown": " hello\n", "etag": ETAG})
+        assert not recrawl.content_unchanged({"url": "https://a.com/edited", "markdown": "hello world"})
+        assert not recrawl.content_unchanged({"url": "https://a.com/new", "markdown": "hello"})
+
+        # The unchanged page gets its fresh validators saved so the next probe can skip it
+        assert recrawl.refreshed_validators == {
+            "https://a.com/same": {"etag": ETAG, "last_modified": None}
+        }
+        assert recrawl.report() == {
+            "pages_not_modified": 0,
+            "pages_content_unchanged": 1,
+            "pages_changed": 1,
+            "pages_new": 1,
+            "probe_errors": 0,
+        }
+
+
+class TestRecursiveRefresh:
+    """Recursive crawls skipping unmodified pages"""
+
+    @pytest.mark.asyncio
+    async def test_unmodified_pages_are_not_rendered_but_their_links_are_followed(self):
+        graph = {
+            "https://a.com/": ["https://a.com/1", "https://a.com/2"],
+            "https://a.com/1": ["https://a.com/3"],
+        }
+        crawler = FakeCrawler(graph)
+
+        async def unchanged_page_links(url: str) -> list[str] | None:
+            return ["https://a.com/3"] if url == "https://a.com/1" else None
+
+        pages = await crawl(
+            crawler,
+            ["https://a.com/"],
+            max_depth=3,
+            max_concurrent=2,
+            unchanged_page_links=unchanged_page_links,
+        )
+
+        assert sorted(crawler.crawled) == ["https://a.com/", "https://a.com/2", "https://a.com/3"]
+        start_page = next(page for page in pages if page["url"] == "https://a.com/")
+        assert start_page["internal_links"] == ["https://a.com/1", "https://a.com/2"]
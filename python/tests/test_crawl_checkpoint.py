@@ -0,0 +1,135 @@
+"""
+Tests for crawl checkpoints and resuming interrupted crawls.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.crawling.crawl_checkpoint_operations import (
+    CrawlCheckpoint,
+    CrawlCheckpointOperations,
+)
+
+CHECKPOINT_MODULE = "src.server.services.crawling.crawl_checkpoint_operations"
+
+
+@pytest.fixture
+def checkpoint():
+    """Fresh checkpoint of a recursive crawl of https://a.com/."""
+    return CrawlCheckpoint("progress-1", "src1", "https://a.com/", {"max_depth": 3})
+
+
+class TestCrawlCheckpoint:
+    """Tests for CrawlCheckpoint state"""
+
+    def test_pending_urls_exclude_stored_pages(self, checkpoint):
+        checkpoint.seen_urls.update({"https://a.com/": 0, "https://a.com/2": 2, "https://a.com/1": 1})
+        checkpoint.mark_stored({"https://a.com/": "page-1"}, word_count=40)
+
+        assert checkpoint.pending_urls() == [("https://a.com/1", 1), ("https://a.com/2", 2)]
+        assert checkpoint.stored_word_count == 40
+        assert checkpoint.summary()["pages_pending"] == 2
+
+    def test_row_round_trip_marks_checkpoint_as_resumed(self, checkpoint):
+        assert not checkpoint.resumed
+
+        checkpoint.add_urls(["https://a.com/", "https://a.com/1"])
+        checkpoint.mark_stored({"https://a.com/": None}, word_count=10)
+        restored = CrawlCheckpoint.from_row(checkpoint.to_row())
+
+        assert restored.resumed
+        assert restored.seen_urls == checkpoint.seen_urls
+        assert restored.stored_pages == {"https://a.com/": None}
+        assert restored.request == {"max_depth": 3}
+
+
+class TestCrawlCheckpointOperations:
+    """Tests for CrawlCheckpointOperations"""
+
+    @pytest.mark.asyncio
+    async def test_periodic_saves_are_throttled(self, checkpoint):
+        ops = CrawlCheckpointOperations(MagicMock(), interval=60)
+
+        with patch(f"{CHECKPOINT_MODULE}.execute_async", new_callable=AsyncMock) as mock_execute:
+            assert await ops.save(checkpoint)
+            assert not await ops.save_if_due(checkpoint)
+            ops.interval = 0
+            assert await ops.save_if_due(checkpoint)
+
+        assert mock_execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_save_failure_does_not_raise(self, checkpoint):
+        ops = CrawlCheckpointOperations(MagicMock())
+
+        with patch(f"{CHECKPOINT_MODULE}.execute_async", AsyncMock(side_effect=Exception("no table"))):
+            assert not await ops.save(checkpoint)
+
+
+class TestResumeCrawl:
+    """Tests for the resume endpoint"""
+
+    @pytest.fixture
+    def resume_env(self):
+        """Patch the resume endpoint's collaborators; the crawl itself blocks until released."""
+        from src.server.api_routes import knowledge_api
+
+        release = asyncio.Event()
+
+        async def perform_crawl(*args):
+            async with knowledge_api.crawl_semaphore:
+                await release.wait()
+
+        resumable = CrawlCheckpoint("progress-1", "src1", "https://a.com/", {"url": "https://a.com/"})
+        tracker = MagicMock(start=AsyncMock(), update=AsyncMock())
+        with (
+            patch.object(knowledge_api, "CrawlCheckpointOperations") as mock_ops,
+            patch.object(knowledge_api, "get_supabase_client"),
+            patch.object(knowledge_api, "is_orchestration_active", AsyncMock(return_value=False)),
+            patch.object(knowledge_api.credential_service, "get_active_provider", AsyncMock(return_value={})),
+            patch.object(knowledge_api, "_validate_provider_api_key", AsyncMock()),
+            patch.object(knowledge_api, "_perform_crawl_with_progress", side_effect=perform_crawl) as mock_perform,
+            patch("src.server.utils.progress.progress_tracker.ProgressTracker") as mock_tracker_cls,
+            patch("src.server.services.crawling.cancel_orchestration", AsyncMock(return_value=False)),
+            patch("src.server.services.crawling.unregister_orchestration", AsyncMock()),
+        ):
+            mock_ops.return_value.load = AsyncMock(return_value=resumable)
+            mock_tracker_cls.return_value = tracker
+            mock_tracker_cls.get_progress_async = AsyncMock(return_value=None)
+            yield knowledge_api, mock_perform, release
+            release.set()
+            knowledge_api.active_crawl_tasks.clear()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_resumes_start_one_crawl(self, resume_env):
+        knowledge_api, mock_perform, release = resume_env
+        from fastapi import HTTPException
+
+        results = await asyncio.gather(
+            knowledge_api.resume_crawl("progress-1"),
+            knowledge_api.resume_crawl("progress-1"),
+            return_exceptions=True,
+        )
+        release.set()
+        await asyncio.sleep(0)
+
+        assert sum(isinstance(result, dict) for result in results) == 1
+        assert [result.status_code for result in results if isinstance(result, HTTPException)] == [409]
+        assert mock_perform.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_resume_queued_on_semaphore(self, resume_env):
+        knowledge_api, mock_perform, _ = resume_env
+
+        with patch.object(knowledge_api, "crawl_semaphore", asyncio.Semaphore(0)):
+            await knowledge_api.resume_crawl("progress-1")
+            queued = knowledge_api.active_crawl_tasks["progress-1"]
+            await asyncio.sleep(0)
+
+            response = await knowledge_api.stop_crawl_task("progress-1")
+
+        assert response["success"]
+        assert queued.cancelled()
+        assert "progress-1" not in knowledge_api.active_crawl_tasks
@@ -0,0 +1,83 @@
+"""
+Tests for DatabaseMetricsService: HEAD-only counts and the cached statistics snapshot.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.server.services.knowledge import database_metrics_service
+from src.server.services.knowledge.database_metrics_service import DatabaseMetricsService
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshot():
+    database_metrics_service.clear_metrics_snapshot()
+    yield
+    database_metrics_service.clear_metrics_snapshot()
+
+
+@pytest.fixture
+def counting_client(mock_supabase_client):
+    """Supabase mock whose count queries all report 5 rows."""
+    mock_supabase_client.table.return_value.select.return_value.execute.return_value.count = 5
+    return mock_supabase_client
+
+
+class TestDatabaseMetricsService:
+    """Tests for DatabaseMetricsService"""
+
+    @pytest.mark.asyncio
+    async def test_counts_are_head_only_estimates_by_default(self, counting_client):
+        metrics = await DatabaseMetricsService(counting_client).get_metrics()
+
+        assert metrics["sources_count"] == 5
+        assert metrics["pages_count"] == 5
+        assert metrics["code_examples_count"] == 5
+        assert metrics["average_pages_per_source"] == 1.0
+        assert metrics["count_mode"] == "estimated"
+        select = counting_client.table.return_value.select
+        assert select.call_count == 3
+        select.assert_called_with("*", count="estimated", head=True)
+
+    @pytest.mark.asyncio
+    async def test_estimates_are_served_from_snapshot(self, counting_client):
+        service = DatabaseMetricsService(counting_client)
+
+        await service.get_metrics()
+        await service.get_metrics()
+
+        assert counting_client.table.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_exact_mode_always_counts(self, counting_client):
+        service = DatabaseMetricsService(counting_client)
+
+        await service.get_metrics()
+        metrics = await service.get_metrics(exact=True)
+
+        assert counting_client.table.call_count == 6
+        assert metrics["count_mode"] == "exact"
+
+    @pytest.mark.asyncio
+    async def test_code_examples_count_failure_reports_zero(self, mock_supabase_client):
+        service = DatabaseMetricsService(mock_supabase_client)
+
+        async def count_rows(table, exact=False):
+            if table == "archon_code_examples":
+                raise RuntimeError("relation does not exist")
+            return 4
+
+        with patch.object(service, "count_rows", AsyncMock(side_effect=count_rows)):
+            metrics = await service.get_metrics()
+
+        assert metrics["sources_count"] == 4
+        assert metrics["code_examples_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_required_count_failure_raises(self, mock_supabase_client):
+        service = DatabaseMetricsService(mock_supabase_client)
+
+        with patch.object(service, "count_rows", AsyncMock(side_effect=RuntimeError("db down"))):
+            with pytest.raises(RuntimeError, match="db down"):
+                await service.get_metrics()
@@ -0,0 +1,115 @@
+"""
+Tests for concurrent embedding batches in create_embeddings_batch.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import openai
+import pytest
+
+from src.server.services.embeddings.embedding_service import (
+    _get_max_in_flight,
+    create_embeddings_batch,
+)
+from src.server.services.threading_service import RateLimitConfig, ThreadingService
+
+
+class AsyncContextManager:
+    """Helper class for mocking async context managers"""
+
+    def __init__(self, return_value):
+        self.return_value = return_value
+
+    async def __aenter__(self):
+        return self.return_value
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class TrackingEmbeddings:
+    """Fake embeddings endpoint that records concurrency and finishes batches out of order."""
+
+    def __init__(self, fail_first_for: set[str] | None = None):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.fail_first_for = set(fail_first_for or ())
+
+    async def create(self, model, input, dimensions=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Earlier batches take longer, so completion order is reversed
+            index = int(input[0].split("-")[1])
+            await asyncio.sleep(0.05 - index * 0.002)
+            if input[0] in self.fail_first_for:
+                self.fail_first_for.discard(input[0])
+                raise openai.RateLimitError(
+                    "Rate limit exceeded", response=MagicMock(headers={"retry-after": "0"}), body=None
+                )
+            return MagicMock(data=[MagicMock(embedding=[float(int(text.split("-")[1]))]) for text in input])
+        finally:
+            self.in_flight -= 1
+
+
+async def run_batch(texts, settings, embeddings):
+    client = MagicMock()
+    client.embeddings = embeddings
+    service = ThreadingService(rate_limit_config=RateLimitConfig())
+
+    with patch(
+        "src.server.services.embeddings.embedding_service.get_threading_service", return_value=service
+    ), patch(
+        "src.server.services.embeddings.embedding_service.get_llm_client",
+        return_value=AsyncContextManager(client),
+    ), patch(
+        "src.server.services.embeddings.embedding_service.get_embedding_model",
+        new_callable=AsyncMock,
+        return_value="text-embedding-3-small",
+    ), patch(
+        "src.server.services.embeddings.embedding_service.credential_service"
+    ) as mock_cred:
+        mock_cred.get_active_provider = AsyncMock(return_value={"provider": "openai"})
+        mock_cred.get_credentials_by_category = AsyncMock(return_value=settings)
+        return await create_embeddings_batch(texts), service
+
+
+class TestConcurrentEmbeddingBatches:
+    """Bounded-concurrency scheduling of embedding batches"""
+
+    @pytest.mark.asyncio
+    async def test_batches_run_concurrently_and_keep_input_order(self):
+        texts = [f"text-{i}" for i in range(20)]
+        embeddings = TrackingEmbeddings()
+
+        result, _ = await run_batch(
+            texts, {"EMBEDDING_BATCH_SIZE": "2", "EMBEDDING_MAX_IN_FLIGHT": "3"}, embeddings
+        )
+
+        assert embeddings.max_in_flight == 3
+        assert result.texts_processed == texts
+        assert [vector[0] for vector in result.embeddings] == [float(i) for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_batch_is_retried_alone(self):
+        texts = [f"text-{i}" for i in range(6)]
+        embeddings = TrackingEmbeddings(fail_first_for={"text-2"})
+
+        result, service = await run_batch(
+            texts, {"EMBEDDING_BATCH_SIZE": "2", "EMBEDDING_MAX_IN_FLIGHT": "4"}, embeddings
+        )
+
+        assert embeddings.calls == 4
+        assert result.success_count == 6
+        assert result.texts_processed == texts
+        assert service.get_rate_limit_stats()["openai:embeddings"]["throttle_count"] == 1
+
+    def test_provider_specific_max_in_flight(self):
+        settings = {"EMBEDDING_MAX_IN_FLIGHT": "2", "OLLAMA_EMBEDDING_MAX_IN_FLIGHT": "1"}
+
+        assert _get_max_in_flight(settings, "ollama") == 1
+        assert _get_max_in_flight(settings, "openai") == 2
+        assert _get_max_in_flight({}, "openai") == 4
@@ -0,0 +1,132 @@
+"""
+Tests for project documents stored one row per document.
+
+A single-document write must touch only that document's row, never the other
+documents of the project.
+"""
+
+from unittest.mock import Mock, patch
+
+from src.server.services.projects.document_service import DOCUMENTS_TABLE, DocumentService
+from src.server.services.projects.versioning_service import VersioningService
+
+
+def _response(data):
+    response = Mock()
+    response.data = data
+    return response
+
+
+class TestSingleDocumentWrites:
+    """Writes address one row by project ID and document ID."""
+
+    def test_update_document_updates_only_changed_fields_of_one_row(self):
+        mock_client = Mock()
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        update_query = mock_table.update.return_value.eq.return_value.eq.return_value
+        update_query.execute.return_value = _response([
+            {"project_id": "project-1", "id": "doc-1", "title": "New title", "position": 4}
+        ])
+
+        service = DocumentService(mock_client)
+        success, result = service.update_document(
+            "project-1", "doc-1", {"title": "New title", "docs": "ignored"}, create_version=False
+        )
+
+        assert success
+        assert result["document"] == {"project_id": "project-1", "id": "doc-1", "title": "New title"}
+        mock_client.table.assert_called_with(DOCUMENTS_TABLE)
+        update_data = mock_table.update.call_args[0][0]
+        assert set(update_data) == {"title", "updated_at"}
+        mock_table.update.return_value.eq.assert_called_with("project_id", "project-1")
+        mock_table.update.return_value.eq.return_value.eq.assert_called_with("id", "doc-1")
+        mock_table.select.assert_not_called()
+
+    def test_update_document_versions_only_that_document(self):
+        mock_client = Mock()
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        current = {"project_id": "project-1", "id": "doc-1", "content": {"a": 1}}
+        mock_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = _response([current])
+        mock_table.update.return_value.eq.return_value.eq.return_value.execute.return_value = _response([current])
+
+        with patch.object(VersioningService, "create_version", return_value=(True, {})) as create_version:
+            service = DocumentService(mock_client)
+            success, _ = service.update_document("project-1", "doc-1", {"content": {"a": 2}})
+
+        assert success
+        kwargs = create_version.call_args.kwargs
+        assert kwargs["field_name"] == "docs"
+        assert kwargs["document_id"] == "doc-1"
+        assert kwargs["content"] == current
+
+    def test_update_missing_document_fails(self):
+        mock_client = Mock()
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        mock_table.update.return_value.eq.return_value.eq.return_value.execute.return_value = _response([])
+
+        service = DocumentService(mock_client)
+        success, result = service.update_document(
+            "project-1", "missing", {"title": "x"}, create_version=False
+        )
+
+        assert not success
+        assert "not found" in result["error"]
+
+
+class TestReplaceDocuments:
+    """Writing a whole docs array deletes the documents missing from it."""
+
+    def test_replace_documents_deletes_stale_rows_and_upserts_the_rest(self):
+        mock_client = Mock()
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        mock_table.select.return_value.eq.return_value.execute.return_value = _response(
+            [{"id": "keep"}, {"id": "stale"}]
+        )
+
+        service = DocumentService(mock_client)
+        success, result = service.replace_documents(
+            "project-1", [{"id": "keep", "title": "Kept"}, {"title": "New", "extra": "dropped"}]
+        )
+
+        assert success
+        assert result == {"project_id": "project-1", "saved": 2, "deleted": 1}
+        mock_table.delete.return_value.eq.return_value.in_.assert_called_with("id", ["stale"])
+        rows = mock_table.upsert.call_args[0][0]
+        assert [row["title"] for row in rows] == ["Kept", "New"]
+        assert all(row["project_id"] == "project-1" for row in rows)
+        assert rows[1]["id"]
+        assert "extra" not in rows[1]
+        assert mock_table.upsert.call_args.kwargs["on_conflict"] == "project_id,id"
+
+
+class TestRestoreDocumentVersion:
+    """Restoring a single-document version rewrites only that document."""
+
+    def test_restore_single_document_version(self):
+        mock_client = Mock()
+        versions_table = Mock()
+        mock_client.table.return_value = versions_table
+        versions_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = (
+            _response([{"content": {"title": "Old"}, "document_id": "doc-1"}])
+        )
+
+        service = VersioningService(mock_client)
+        with patch.object(
+            DocumentService, "get_document", return_value=(True, {"document": {"id": "doc-1"}})
+        ), patch.object(
+            DocumentService, "save_document", return_value=(True, {"document": {}})
+        ) as save_document, patch.object(
+            DocumentService, "replace_documents"
+        ) as replace_documents, patch.object(
+            service, "create_version", return_value=(True, {})
+        ):
+            success, result = service.restore_version("project-1", "docs", 3)
+
+        assert success
+        assert result["restored_version"] == 3
+        save_document.assert_called_once_with("project-1", {"title": "Old", "id": "doc-1"})
+        replace_documents.assert_not_called()
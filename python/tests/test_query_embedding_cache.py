@@ -0,0 +1,122 @@
+"""
+Tests for the query embedding cache.
+
+Covers LRU/TTL behaviour, the optional disk tier, hit-rate metrics and the
+create_query_embedding wrapper used by the search strategies.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.embeddings.query_embedding_cache import (
+    QueryEmbeddingCache,
+    normalize_query,
+)
+
+
+class TestQueryEmbeddingCache:
+    """Tests for QueryEmbeddingCache"""
+
+    def test_normalize_query_collapses_whitespace(self):
+        assert normalize_query("  how   to\tuse\nhooks ") == "how to use hooks"
+
+    def test_key_separates_models(self):
+        key_a = QueryEmbeddingCache.make_key("openai", "text-embedding-3-small", 1536, "query")
+        key_b = QueryEmbeddingCache.make_key("openai", "text-embedding-3-large", 1536, "query")
+        assert key_a != key_b
+
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_metrics(self):
+        cache = QueryEmbeddingCache(max_entries=10)
+        key = cache.make_key("openai", "model", 3, "query")
+
+        assert await cache.get(key) is None
+        await cache.set(key, [0.1, 0.2, 0.3])
+        assert await cache.get(key) == [0.1, 0.2, 0.3]
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = QueryEmbeddingCache(max_entries=2)
+        keys = [cache.make_key("openai", "model", 1, f"q{i}") for i in range(3)]
+
+        await cache.set(keys[0], [0.0])
+        await cache.set(keys[1], [1.0])
+        await cache.get(keys[0])  # Touch so keys[1] becomes least recently used
+        await cache.set(keys[2], [2.0])
+
+        assert await cache.get(keys[1]) is None
+        assert await cache.get(keys[0]) == [0.0]
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_ignored(self):
+        cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=60)
+        key = cache.make_key("openai", "model", 1, "query")
+
+        with patch("src.server.services.embeddings.query_embedding_cache.time.time", return_value=1000.0):
+            await cache.set(key, [0.5])
+        with patch("src.server.services.embeddings.query_embedding_cache.time.time", return_value=1061.0):
+            assert await cache.get(key) is None
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_new_instance(self, tmp_path):
+        path = str(tmp_path / "query_embeddings.db")
+        key = QueryEmbeddingCache.make_key("openai", "model", 2, "query")
+
+        await QueryEmbeddingCache(disk_path=path).set(key, [0.25, 0.75])
+        fresh = QueryEmbeddingCache(disk_path=path)
+
+        assert await fresh.get(key) == [0.25, 0.75]
+        assert fresh.get_stats()["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_clear_empties_cache(self):
+        cache = QueryEmbeddingCache(max_entries=10)
+        key = cache.make_key("openai", "model", 1, "query")
+        await cache.set(key, [1.0])
+
+        cache.clear()
+
+        assert await cache.get(key) is None
+
+
+class TestCreateQueryEmbedding:
+    """Tests for the cached query embedding wrapper"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_hits_cache(self):
+        from src.server.services.embeddings import embedding_service
+
+        mock_cred = MagicMock()
+        mock_cred.get_active_provider = AsyncMock(return_value={"provider": "openai"})
+        mock_cred.get_credentials_by_category = AsyncMock(return_value={"EMBEDDING_DIMENSIONS": "1536"})
+
+        with (
+            patch.object(embedding_service, "credential_service", mock_cred),
+            patch.object(embedding_service, "get_embedding_model", AsyncMock(return_value="text-embedding-3-small")),
+            patch.object(embedding_service, "create_embedding", AsyncMock(return_value=[0.1] * 1536)) as mock_embed,
+        ):
+            first = await embedding_service.create_query_embedding("react hooks")
+            second = await embedding_service.create_query_embedding("  react   hooks ")
+
+        assert first == second
+        mock_embed.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_credential_change_clears_cache(self):
+        from src.server.services.credential_service import CredentialService
+        from src.server.services.embeddings.query_embedding_cache import get_query_embedding_cache
+
+        cache = get_query_embedding_cache()
+        key = cache.make_key("openai", "model", 1, "query")
+        await cache.set(key, [1.0])
+
+        CredentialService()._invalidate_embedding_caches("EMBEDDING_MODEL")
+
+        assert await cache.get(key) is None
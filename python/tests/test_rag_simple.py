@@ -101,7 +101,7 @@ class TestRAGServiceSearch:
         """Test document search with mocked embedding"""
         # Patch at the module level where it's called from RAGService
         with (
-            patch("src.server.services.search.rag_service.create_embedding") as mock_embed,
+            patch("src.server.services.search.rag_service.create_query_embedding") as mock_embed,
             patch.object(rag_service.base_strategy, "vector_search") as mock_search,
         ):
             # Setup mocks
@@ -163,6 +163,69 @@ class TestHybridSearchCore:
         assert hybrid_strategy is not None
         assert hasattr(hybrid_strategy, "search_documents_hybrid")
 
+    def test_reciprocal_rank_fusion_rewards_both_legs(self):
+        """A chunk ranked by both legs beats chunks that top a single leg"""
+        from src.server.services.search.hybrid_search_strategy import reciprocal_rank_fusion
+
+        fused = reciprocal_rank_fusion([
+            {"id": 1, "vector_rank": 1, "vector_similarity": 0.9, "text_rank": None, "text_similarity": None},
+            {"id": 2, "vector_rank": 2, "vector_similarity": 0.8, "text_rank": 2, "text_similarity": 0.3},
+            {"id": 3, "vector_rank": None, "vector_similarity": None, "text_rank": 1, "text_similarity": 0.5},
+        ])
+
+        assert [c["id"] for c in fused] == [2, 1, 3]
+        assert [c["match_type"] for c in fused] == ["hybrid", "vector", "keyword"]
+        assert fused[2]["similarity"] == 0.5
+
+    def test_reciprocal_rank_fusion_weights(self):
+        """Leg weights decide between single-leg matches"""
+        from src.server.services.search.hybrid_search_strategy import reciprocal_rank_fusion
+
+        candidates = [
+            {"id": 1, "vector_rank": 1, "text_rank": None},
+            {"id": 2, "vector_rank": None, "text_rank": 1},
+        ]
+
+        fused = reciprocal_rank_fusion(candidates, vector_weight=0.5, keyword_weight=1.0)
+
+        assert [c["id"] for c in fused] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_rrf_mode_fetches_content_for_top_k_only(self, mock_supabase):
+        """RRF mode reads candidate ids from the RPC and full rows only for the fused top-k"""
+        from src.server.services.search.base_search_strategy import BaseSearchStrategy
+        from src.server.services.search.hybrid_search_strategy import HybridSearchStrategy
+
+        settings = {"HYBRID_SEARCH_MODE": "rrf", "HYBRID_CANDIDATE_COUNT": "40"}
+        strategy = HybridSearchStrategy(
+            mock_supabase,
+            BaseSearchStrategy(mock_supabase),
+            get_setting=lambda key, default: settings.get(key, default),
+        )
+        mock_supabase.rpc.return_value.execute.return_value.data = [
+            {"id": 1, "vector_rank": 3, "vector_similarity": 0.7, "text_rank": None, "text_similarity": None},
+            {"id": 2, "vector_rank": 1, "vector_similarity": 0.9, "text_rank": 1, "text_similarity": 0.4},
+            {"id": 3, "vector_rank": 2, "vector_similarity": 0.8, "text_rank": None, "text_similarity": None},
+        ]
+        fetch = mock_supabase.table.return_value.select.return_value.in_
+        fetch.return_value.execute.return_value.data = [
+            {"id": 3, "url": "u3", "chunk_number": 0, "content": "three", "metadata": {}, "source_id": "s"},
+            {"id": 2, "url": "u2", "chunk_number": 0, "content": "two", "metadata": {}, "source_id": "s"},
+        ]
+
+        results = await strategy.search_documents_hybrid(
+            query="query", query_embedding=[0.1] * 768, match_count=2
+        )
+
+        rpc_name, rpc_params = mock_supabase.rpc.call_args.args
+        assert rpc_name == "hybrid_candidates_archon_crawled_pages_multi"
+        assert rpc_params["embedding_dimension"] == 768
+        assert rpc_params["candidate_count"] == 40
+        fetch.assert_called_once_with("id", [2, 3])
+        assert [r["content"] for r in results] == ["two", "three"]
+        assert results[0]["match_type"] == "hybrid"
+        assert results[0]["similarity"] == 0.9
+
 
 class TestRerankingCore:
     """Basic reranking tests"""
@@ -230,6 +293,214 @@ class TestRerankingCore:
         assert result[0]["rerank_score"] == 0.95
 
 
+class TestRerankingModelRegistry:
+    """Tests for the process-wide reranking model cache"""
+
+    @pytest.fixture
+    def registry(self):
+        from src.server.services.search.reranking_strategy import RerankingModelRegistry
+
+        return RerankingModelRegistry()
+
+    def test_model_loaded_once(self, registry):
+        """Repeated lookups for the same model reuse the loaded instance"""
+        with patch("src.server.services.search.reranking_strategy.CROSSENCODER_AVAILABLE", True), patch(
+            "src.server.services.search.reranking_strategy.CrossEncoder"
+        ) as mock_cross_encoder:
+            first = registry.get_model("model-a")
+            second = registry.get_model("model-a")
+
+        assert first is second
+        mock_cross_encoder.assert_called_once_with("model-a")
+
+    def test_model_reloaded_on_name_change(self, registry):
+        """Requesting a different model replaces the cached one"""
+        with patch("src.server.services.search.reranking_strategy.CROSSENCODER_AVAILABLE", True), patch(
+            "src.server.services.search.reranking_strategy.CrossEncoder",
+            side_effect=lambda name: MagicMock(name=name),
+        ) as mock_cross_encoder:
+            first = registry.get_model("model-a")
+            second = registry.get_model("model-b")
+
+        assert first is not second
+        assert mock_cross_encoder.call_count == 2
+        assert registry.get_info()["model_name"] == "model-b"
+
+    def test_strategies_share_registry_model(self):
+        """RerankingStrategy instances get their model from the global registry"""
+        from src.server.services.search import reranking_strategy as module
+
+        shared_model = MagicMock()
+        with patch.object(module._model_registry, "get_cached_model", return_value=shared_model):
+            first = module.RerankingStrategy()
+            second = module.RerankingStrategy()
+
+        assert first.model is shared_model
+        assert second.model is shared_model
+
+    @pytest.mark.asyncio
+    async def test_cold_model_loads_off_event_loop(self):
+        """A strategy never loads in __init__; a cold model is loaded on a worker thread"""
+        import threading
+
+        from src.server.services.search import reranking_strategy as module
+
+        model = MagicMock()
+        model.predict.return_value = [0.5]
+        loading_threads = []
+
+        def get_model(name):
+            loading_threads.append(threading.current_thread())
+            return model
+
+        registry = module.RerankingModelRegistry()
+        with patch.object(module, "_model_registry", registry), patch.object(
+            registry, "get_model", side_effect=get_model
+        ):
+            strategy = module.RerankingStrategy(model_name="cold-model")
+            assert strategy.model is None
+            assert loading_threads == []
+
+            results = await strategy.rerank_results("query", [{"content": "text"}])
+
+        assert strategy.model is model
+        assert results[0]["rerank_score"] == 0.5
+        assert loading_threads and loading_threads[0] is not threading.main_thread()
+
+
+class TestRerankingExecutor:
+    """Tests for micro-batched reranking predictions"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_predict(self):
+        """Concurrent requests are scored in one batch and each gets its own scores"""
+        import asyncio
+
+        from src.server.services.search.reranking_strategy import RerankingExecutor
+
+        mock_model = MagicMock()
+        mock_model.predict.side_effect = lambda pairs: [float(len(doc)) for _, doc in pairs]
+        executor = RerankingExecutor(max_wait_ms=20)
+
+        try:
+            first, second = await asyncio.gather(
+                executor.predict(mock_model, [["q1", "a"], ["q1", "bb"]]),
+                executor.predict(mock_model, [["q2", "ccc"]]),
+            )
+        finally:
+            executor.shutdown()
+
+        assert first == [1.0, 2.0]
+        assert second == [3.0]
+        mock_model.predict.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_caller_arriving_during_predict_is_flushed(self):
+        """A request queued while a batch is being scored still gets its own flush"""
+        import asyncio
+        import threading
+
+        from src.server.services.search.reranking_strategy import RerankingExecutor
+
+        predicting = threading.Event()
+        release = threading.Event()
+
+        def predict(pairs):
+            predicting.set()
+            release.wait(timeout=5)
+            return [float(len(doc)) for _, doc in pairs]
+
+        mock_model = MagicMock()
+        mock_model.predict.side_effect = predict
+        executor = RerankingExecutor(max_wait_ms=1)
+
+        try:
+            first = asyncio.create_task(executor.predict(mock_model, [["q1", "a"]]))
+            await asyncio.to_thread(predicting.wait, 5)
+            # The first batch's model call is blocked while the second caller arrives
+            second = asyncio.create_task(executor.predict(mock_model, [["q2", "bb"]]))
+            await asyncio.sleep(0.01)
+            release.set()
+
+            assert await asyncio.wait_for(first, timeout=2) == [1.0]
+            assert await asyncio.wait_for(second, timeout=2) == [2.0]
+        finally:
+            release.set()
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_predict_error_propagates_to_callers(self):
+        """A failing predict call surfaces as an exception for each caller"""
+        from src.server.services.search.reranking_strategy import RerankingExecutor
+
+        mock_model = MagicMock()
+        mock_model.predict.side_effect = RuntimeError("model failure")
+        executor = RerankingExecutor(max_wait_ms=1)
+
+        try:
+            with pytest.raises(RuntimeError, match="model failure"):
+                await executor.predict(mock_model, [["q", "doc"]])
+        finally:
+            executor.shutdown()
+
+
+class TestPageGrouping:
+    """Tests for page-mode grouping of chunk results"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_page_cache(self):
+        from src.server.services.search import page_metadata_cache
+
+        with patch.object(page_metadata_cache, "_page_metadata_cache", page_metadata_cache.PageMetadataCache()):
+            yield
+
+    @staticmethod
+    def chunk(page_id, url, similarity):
+        return {
+            "content": f"chunk of {url}",
+            "similarity_score": similarity,
+            "metadata": {"page_id": page_id, "url": url, "source_id": "src1"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_pages_resolved_with_single_query_per_field(self, rag_service, mock_supabase):
+        in_query = mock_supabase.table.return_value.select.return_value.in_
+        in_query.return_value.execute.side_effect = lambda: MagicMock(
+            data=[
+                {"id": "p1", "url": "https://a.com/1", "section_title": None, "word_count": 10},
+                {"id": "p2", "url": "https://a.com/2", "section_title": None, "word_count": 20},
+                {"id": "p3", "url": "https://a.com/3", "section_title": None, "word_count": 30},
+            ]
+        )
+        chunks = [
+            self.chunk("p1", "https://a.com/1", 0.9),
+            self.chunk("p1", "https://a.com/1", 0.8),
+            self.chunk("p2", "https://a.com/2", 0.7),
+            self.chunk(None, "https://a.com/3", 0.6),
+        ]
+
+        pages = await rag_service._group_chunks_by_pages(chunks, match_count=5)
+
+        assert [page["page_id"] for page in pages] == ["p1", "p2", "p3"]
+        assert pages[0]["chunk_matches"] == 2
+        fields = sorted(call.args[0] for call in in_query.call_args_list)
+        assert fields == ["id", "url"]
+
+    @pytest.mark.asyncio
+    async def test_page_metadata_is_cached(self, rag_service, mock_supabase):
+        in_query = mock_supabase.table.return_value.select.return_value.in_
+        in_query.return_value.execute.return_value.data = [
+            {"id": "p1", "url": "https://a.com/1", "section_title": "Intro", "word_count": 10},
+        ]
+        chunks = [self.chunk("p1", "https://a.com/1", 0.9)]
+
+        await rag_service._group_chunks_by_pages(chunks, match_count=5)
+        pages = await rag_service._group_chunks_by_pages(chunks, match_count=5)
+
+        assert pages[0]["section_title"] == "Intro"
+        assert in_query.call_count == 1
+
+
 class TestAgenticRAGCore:
     """Basic agentic RAG tests"""
 
@@ -337,7 +608,7 @@ class TestRAGIntegrationSimple:
     async def test_hybrid_search_integration(self, rag_service):
         """Test RAG with hybrid search enabled"""
         with (
-            patch("src.server.services.search.rag_service.create_embedding") as mock_embed,
+            patch("src.server.services.search.rag_service.create_query_embedding") as mock_embed,
             patch.object(rag_service.hybrid_strategy, "search_documents_hybrid") as mock_hybrid,
             patch.object(rag_service, "get_bool_setting") as mock_settings,
         ):
@@ -0,0 +1,182 @@
+"""
+Tests for the adaptive per-provider rate limiter in threading_service.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.server.services.threading_service import (
+    RateLimitConfig,
+    RateLimiter,
+    ThreadingService,
+    _parse_reset_seconds,
+)
+
+
+@pytest.fixture
+def limiter():
+    """Limiter allowing 1000 tokens and 10 requests per minute."""
+    return RateLimiter(RateLimitConfig(tokens_per_minute=1000, requests_per_minute=10), name="test")
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_running_token_total_tracks_window(self, limiter):
+        assert await limiter.acquire(300)
+        assert await limiter.acquire(200)
+        assert limiter._window_tokens == 500
+
+        # Age the first entry out of the window
+        limiter._window[0] = (time.time() - 61, 300)
+        limiter._clean_old_entries(time.time())
+
+        assert limiter._window_tokens == 200
+        assert len(limiter._window) == 1
+
+    def test_token_wait_only_until_enough_tokens_age_out(self, limiter):
+        now = time.time()
+        limiter._window.extend([(now - 50, 400), (now - 10, 400)])
+        limiter._window_tokens = 800
+
+        # Needs 300 more tokens: only the oldest entry (10s left) has to expire
+        assert not limiter._can_make_request(300, now)
+        assert limiter._calculate_wait_time(300, now) == pytest.approx(10.1)
+
+    def test_request_limit_waits_for_oldest_needed_request(self, limiter):
+        now = time.time()
+        for age in range(59, 49, -1):
+            limiter._window.append((now - age, 1))
+        limiter._window_tokens = 10
+
+        assert not limiter._can_make_request(1, now)
+        assert limiter._calculate_wait_time(1, now) == pytest.approx(1.1)
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_passes_on_idle_window(self, limiter):
+        assert await limiter.acquire(5000)
+
+    def test_throttle_decreases_budget_and_success_recovers(self, limiter):
+        delay = limiter.record_throttle({"retry-after": "2"})
+
+        assert delay == 2
+        assert limiter.token_budget == 500
+        assert limiter.request_budget == 5
+        assert not limiter._can_make_request(1, time.time())
+
+        limiter.record_success()
+        assert limiter.token_budget == 550
+        assert limiter.get_stats()["throttle_count"] == 1
+
+    def test_headers_set_ceiling_and_provider_usage(self, limiter):
+        limiter.update_from_headers(
+            {
+                "x-ratelimit-limit-requests": "5000",
+                "x-ratelimit-limit-tokens": "5000000",
+                "x-ratelimit-remaining-requests": "4999",
+                "x-ratelimit-remaining-tokens": "100",
+                "x-ratelimit-reset-requests": "12ms",
+                "x-ratelimit-reset-tokens": "6m0s",
+            }
+        )
+
+        stats = limiter.get_stats()
+        assert stats["limits_learned"]
+        assert stats["token_ceiling"] == 5_000_000
+        assert stats["request_budget"] == 5000
+        # Provider says only 100 tokens remain, even though nothing was sent locally
+        assert stats["remaining_tokens"] == 100
+        assert not limiter._can_make_request(200, time.time())
+
+    def test_non_string_header_values_are_ignored(self, limiter):
+        class Headers:
+            def get(self, name):
+                return object()
+
+        limiter.update_from_headers(Headers())
+
+        assert not limiter.limits_learned
+        assert limiter.token_ceiling == 1000
+
+    @pytest.mark.asyncio
+    async def test_lowered_concurrency_limit_holds_for_requests_in_flight(self, limiter):
+        limiter.set_max_concurrent(4)
+        in_flight, peak = 0, 0
+        release = asyncio.Event()
+
+        async def request():
+            nonlocal in_flight, peak
+            async with limiter.semaphore:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await release.wait()
+                in_flight -= 1
+
+        first = [asyncio.create_task(request()) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert in_flight == 4
+
+        limiter.set_max_concurrent(2)
+        peak = 0
+        later = [asyncio.create_task(request()) for _ in range(4)]
+        release.set()
+        await asyncio.gather(*first, *later)
+
+        assert peak <= 2
+        assert limiter.semaphore.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_raised_concurrency_limit_admits_waiters(self, limiter):
+        limiter.set_max_concurrent(1)
+        await limiter.semaphore.acquire()
+        waiter = asyncio.create_task(limiter.semaphore.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.set_max_concurrent(2)
+        await asyncio.wait_for(waiter, timeout=1)
+
+        assert limiter.get_stats()["in_flight"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_keep_a_slot(self, limiter):
+        limiter.set_max_concurrent(1)
+        await limiter.semaphore.acquire()
+        waiter = asyncio.create_task(limiter.semaphore.acquire())
+        await asyncio.sleep(0)
+
+        # Admitted by the release, then cancelled before it resumes
+        limiter.semaphore.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.semaphore.in_use == 0
+        assert await asyncio.wait_for(limiter.semaphore.acquire(), timeout=1)
+
+    def test_parse_reset_formats(self):
+        assert _parse_reset_seconds("1m30s", 0) == 90
+        assert _parse_reset_seconds("250ms", 0) == pytest.approx(0.25)
+        assert _parse_reset_seconds("7", 0) == 7
+        assert _parse_reset_seconds("1970-01-01T00:00:30Z", 0) == 30
+        assert _parse_reset_seconds("soon", 0) is None
+
+
+class TestProviderLimiters:
+    """Per-provider limiters on ThreadingService"""
+
+    @pytest.mark.asyncio
+    async def test_limiters_are_isolated_per_provider(self, limiter):
+        service = ThreadingService(rate_limit_config=RateLimitConfig(tokens_per_minute=1000))
+
+        async with service.rate_limited_operation(100, provider="openai:embeddings") as limiter:
+            limiter.record_throttle({"retry-after": "1"})
+
+        stats = service.get_rate_limit_stats()
+        assert stats["openai:embeddings"]["throttle_count"] == 1
+        assert stats["openai:embeddings"]["tokens_in_window"] == 100
+        assert stats["default"]["throttle_count"] == 0
+        assert service.get_rate_limiter("google:embeddings").token_budget == 1000
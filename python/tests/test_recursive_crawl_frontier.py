@@ -0,0 +1,198 @@
+"""
+Tests for the frontier-based recursive crawl strategy.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.server.services.crawling.crawl_checkpoint_operations import CrawlCheckpoint
+from src.server.services.crawling.strategies.recursive import CrawlFrontier, RecursiveCrawlStrategy
+
+
+class FakeCrawler:
+    """Crawler stub serving an in-memory link graph and recording concurrency."""
+
+    def __init__(self, graph: dict[str, list[str]], delays: dict[str, float] | None = None):
+        self.graph = graph
+        self.delays = delays or {}
+        self.crawled: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_in_flight_per_host: dict[str, int] = {}
+        self._per_host: dict[str, int] = {}
+
+    async def arun(self, url, config):
+        host = url.split("/")[2]
+        self.crawled.append(url)
+        self.in_flight += 1
+        self._per_host[host] = self._per_host.get(host, 0) + 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.max_in_flight_per_host[host] = max(
+            self.max_in_flight_per_host.get(host, 0), self._per_host[host]
+        )
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.01))
+        finally:
+            self.in_flight -= 1
+            self._per_host[host] -= 1
+        return SimpleNamespace(
+            url=url,
+            success=True,
+            markdown=SimpleNamespace(fit_markdown=f"content of {url}"),
+            html=f"<title>{url}</title>",
+            links={"internal": [{"href": link} for link in self.graph.get(url, [])]},
+        )
+
+
+async def crawl(crawler, start_urls, settings=None, **kwargs):
+    strategy = RecursiveCrawlStrategy(crawler, markdown_generator=None)
+    with patch(
+        "src.server.services.crawling.strategies.recursive.credential_service"
+    ) as mock_cred:
+        mock_cred.get_credentials_by_category = AsyncMock(return_value=settings or {})
+        return await strategy.crawl_recursive_with_progress(
+            start_urls, lambda url: url, lambda url: False, **kwargs
+        )
+
+
+class TestRecursiveFrontierCrawl:
+    """Tests for RecursiveCrawlStrategy.crawl_recursive_with_progress"""
+
+    @pytest.mark.asyncio
+    async def test_crawls_each_url_once_within_max_depth(self):
+        graph = {
+            "https://a.com/": ["https://a.com/1", "https://a.com/2#intro", "https://a.com/file.pdf"],
+            "https://a.com/1": ["https://a.com/2", "https://a.com/"],
+            "https://a.com/2": ["https://a.com/3"],
+            "https://a.com/3": ["https://a.com/4"],
+        }
+        crawler = FakeCrawler(graph)
+
+        pages = await crawl(crawler, ["https://a.com/"], max_depth=3, max_concurrent=4)
+
+        assert sorted(crawler.crawled) == [
+            "https://a.com/",
+            "https://a.com/1",
+            "https://a.com/2",
+            "https://a.com/3",
+        ]
+        assert {page["url"] for page in pages} == set(crawler.crawled)
+        assert pages[0]["title"] == "https://a.com/"
+
+    @pytest.mark.asyncio
+    async def test_slow_page_does_not_hold_back_deeper_links(self):
+        # The slow page would end its depth level late; its siblings' children
+        # must start crawling before it finishes
+        graph = {
+            "https://a.com/": [f"https://a.com/{i}" for i in range(4)],
+            **{f"https://a.com/{i}": [f"https://a.com/{i}/child"] for i in range(1, 4)},
+        }
+        crawler = FakeCrawler(graph, delays={"https://a.com/0": 0.3})
+        order = []
+        original_arun = crawler.arun
+
+        async def tracking_arun(url, config):
+            result = await original_arun(url, config)
+            order.append(url)
+            return result
+
+        crawler.arun = tracking_arun
+
+        await crawl(crawler, ["https://a.com/"], max_depth=3, max_concurrent=4)
+
+        assert order[-1] == "https://a.com/0"
+        assert crawler.max_in_flight == 4
+
+    @pytest.mark.asyncio
+    async def test_per_host_concurrency_limit(self):
+        graph = {
+            "https://a.com/": [f"https://a.com/{i}" for i in range(6)]
+            + [f"https://b.com/{i}" for i in range(6)],
+        }
+        crawler = FakeCrawler(graph)
+
+        await crawl(
+            crawler,
+            ["https://a.com/"],
+            settings={"CRAWL_PER_HOST_MAX_CONCURRENT": "2"},
+            max_depth=2,
+            max_concurrent=8,
+        )
+
+        assert len(crawler.crawled) == 13
+        assert crawler.max_in_flight_per_host == {"a.com": 2, "b.com": 2}
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_workers(self):
+        graph = {"https://a.com/": [f"https://a.com/{i}" for i in range(50)]}
+        crawler = FakeCrawler(graph)
+        progress = AsyncMock()
+
+        def cancellation_check():
+            if len(crawler.crawled) >= 5:
+                raise asyncio.CancelledError()
+
+        pages = await crawl(
+            crawler,
+            ["https://a.com/"],
+            max_depth=2,
+            max_concurrent=2,
+            progress_callback=progress,
+            cancellation_check=cancellation_check,
+        )
+
+        assert len(crawler.crawled) < 10
+        assert len(pages) < 10
+        assert progress.await_args_list[-1].args[0] == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_resume_only_crawls_unstored_urls(self):
+        graph = {
+            "https://a.com/": ["https://a.com/1", "https://a.com/2"],
+            "https://a.com/1": ["https://a.com/3"],
+            "https://a.com/2": ["https://a.com/4", "https://a.com/"],
+        }
+        checkpoint = CrawlCheckpoint(
+            "progress-1",
+            "src1",
+            "https://a.com/",
+            {"max_depth": 3},
+            seen_urls={"https://a.com/": 0, "https://a.com/1": 1, "https://a.com/2": 1, "https://a.com/3": 2},
+            stored_pages={"https://a.com/": "p0", "https://a.com/1": "p1"},
+        )
+        crawler = FakeCrawler(graph)
+
+        await crawl(
+            crawler,
+            ["https://a.com/"],
+            max_depth=3,
+            max_concurrent=2,
+            seen_urls=checkpoint.seen_urls,
+            resume_urls=checkpoint.pending_urls(),
+        )
+
+        # Stored pages are skipped; queued and newly discovered URLs are crawled once
+        assert sorted(crawler.crawled) == ["https://a.com/2", "https://a.com/3", "https://a.com/4"]
+        assert checkpoint.seen_urls["https://a.com/4"] == 2
+
+
+class TestCrawlFrontier:
+    """Tests for CrawlFrontier ordering"""
+
+    @pytest.mark.asyncio
+    async def test_shallowest_url_first_and_empty_when_drained(self):
+        frontier = CrawlFrontier(per_host_max_concurrent=4)
+        frontier.add("https://a.com/deep", 2)
+        frontier.add("https://b.com/", 0)
+        assert not frontier.add("https://b.com/", 1)
+
+        assert await frontier.get() == ("https://b.com/", 0)
+        assert await frontier.get() == ("https://a.com/deep", 2)
+        frontier.done("https://b.com/")
+        frontier.done("https://a.com/deep")
+
+        assert await frontier.get() is None
+        assert frontier.discovered == 2
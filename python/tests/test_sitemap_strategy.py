@@ -0,0 +1,169 @@
+"""
+Tests for streaming sitemap parsing and lastmod-based incremental refresh.
+"""
+
+import gzip
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.server.services.crawling.strategies.sitemap import (
+    SitemapCrawlStrategy,
+    SitemapEntry,
+    filter_changed_entries,
+    parse_lastmod,
+)
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*pages: tuple[str, str | None]) -> bytes:
+    body = "".join(
+        f"<url><loc>{loc}</loc>{f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}</url>"
+        for loc, lastmod in pages
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'.encode()
+
+
+def sitemap_index(*locs: str) -> bytes:
+    body = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{body}</sitemapindex>'.encode()
+
+
+async def read_with(documents: dict[str, bytes], url: str, **kwargs):
+    """Read a sitemap against an in-memory set of documents."""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        if str(request.url) not in documents:
+            return httpx.Response(404)
+        return httpx.Response(200, content=documents[str(request.url)])
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(**client_kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **client_kwargs)
+
+    with patch(
+        "src.server.services.crawling.strategies.sitemap.httpx.AsyncClient", side_effect=client_factory
+    ):
+        entries = await SitemapCrawlStrategy().read_sitemap(url, **kwargs)
+    return entries, requested
+
+
+class TestSitemapParsing:
+    """Tests for SitemapCrawlStrategy.read_sitemap"""
+
+    @pytest.mark.asyncio
+    async def test_reads_urls_and_lastmod(self):
+        documents = {
+            "https://example.com/sitemap.xml": urlset(
+                ("https://example.com/a", "2024-05-01"),
+                ("https://example.com/b", None),
+            )
+        }
+
+        entries, _ = await read_with(documents, "https://example.com/sitemap.xml")
+
+        assert entries == [
+            SitemapEntry("https://example.com/a", datetime(2024, 5, 1, tzinfo=UTC)),
+            SitemapEntry("https://example.com/b", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_gzipped_sitemap(self):
+        documents = {
+            "https://example.com/sitemap.xml.gz": gzip.compress(
+                urlset(("https://example.com/a", None))
+            )
+        }
+
+        entries, _ = await read_with(documents, "https://example.com/sitemap.xml.gz")
+
+        assert [entry.url for entry in entries] == ["https://example.com/a"]
+
+    @pytest.mark.asyncio
+    async def test_follows_sitemap_index_and_skips_loops(self):
+        documents = {
+            "https://example.com/index.xml": sitemap_index(
+                "https://example.com/docs.xml",
+                "https://example.com/blog.xml",
+                "https://example.com/missing.xml",
+            ),
+            "https://example.com/docs.xml": urlset(
+                ("https://example.com/docs/1", None), ("https://example.com/shared", None)
+            ),
+            # Points back at the index, which must not be fetched again
+            "https://example.com/blog.xml": sitemap_index(
+                "https://example.com/index.xml", "https://example.com/blog-posts.xml"
+            ),
+            "https://example.com/blog-posts.xml": urlset(
+                ("https://example.com/blog/1", None), ("https://example.com/shared", None)
+            ),
+        }
+
+        entries, requested = await read_with(documents, "https://example.com/index.xml")
+
+        assert [entry.url for entry in entries] == [
+            "https://example.com/docs/1",
+            "https://example.com/shared",
+            "https://example.com/blog/1",
+        ]
+        assert requested.count("https://example.com/index.xml") == 1
+
+    @pytest.mark.asyncio
+    async def test_max_depth_stops_recursion(self):
+        documents = {
+            "https://example.com/index.xml": sitemap_index("https://example.com/pages.xml"),
+            "https://example.com/pages.xml": urlset(("https://example.com/a", None)),
+        }
+
+        entries, requested = await read_with(documents, "https://example.com/index.xml", max_depth=0)
+
+        assert entries == []
+        assert requested == ["https://example.com/index.xml"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_xml_returns_no_entries(self):
+        documents = {"https://example.com/sitemap.xml": b"<urlset><url><loc>oops"}
+
+        entries, _ = await read_with(documents, "https://example.com/sitemap.xml")
+
+        assert entries == []
+
+
+class TestIncrementalSelection:
+    """Tests for lastmod parsing and change detection"""
+
+    def test_parse_lastmod_formats(self):
+        assert parse_lastmod("2024-05-01") == datetime(2024, 5, 1, tzinfo=UTC)
+        assert parse_lastmod("2024-05-01T10:00:00Z") == datetime(2024, 5, 1, 10, tzinfo=UTC)
+        assert parse_lastmod("2024-05-01T12:00:00+02:00") == datetime(2024, 5, 1, 10, tzinfo=UTC)
+        assert parse_lastmod("yesterday") is None
+        assert parse_lastmod(None) is None
+
+    def test_only_new_or_changed_entries_are_selected(self):
+        old = datetime(2024, 1, 1, tzinfo=UTC)
+        new = datetime(2024, 6, 1, tzinfo=UTC)
+        entries = [
+            SitemapEntry("https://example.com/unchanged", old),
+            SitemapEntry("https://example.com/updated", new),
+            SitemapEntry("https://example.com/new", old),
+            SitemapEntry("https://example.com/no-lastmod", None),
+        ]
+        previous = {
+            "https://example.com/unchanged": old,
+            "https://example.com/updated": old,
+            "https://example.com/no-lastmod": old,
+        }
+
+        changed = filter_changed_entries(entries, previous)
+
+        assert [entry.url for entry in changed] == [
+            "https://example.com/updated",
+            "https://example.com/new",
+            "https://example.com/no-lastmod",
+        ]
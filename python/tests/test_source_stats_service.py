@@ -0,0 +1,87 @@
+"""
+Tests for per-source counters and the knowledge list/summary read paths that use them.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.services.knowledge.knowledge_summary_service import KnowledgeSummaryService
+from src.server.services.knowledge.source_stats_service import SourceStatsService
+
+STATS_ROWS = [
+    {
+        "source_id": "src1",
+        "chunks_count": 120,
+        "code_examples_count": 7,
+        "pages_count": 12,
+        "word_count": 30000,
+        "first_url": "https://docs.example.com/intro",
+        "last_crawled_at": "2025-10-16T00:00:00Z",
+    }
+]
+
+
+@pytest.fixture
+def stats_client(mock_supabase_client):
+    """Supabase mock whose from_() query chain returns the stats rows."""
+    query = mock_supabase_client.from_.return_value
+    for method in ("select", "in_", "eq", "contains", "or_", "range", "order"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = MagicMock(data=STATS_ROWS)
+    return mock_supabase_client
+
+
+class TestSourceStatsService:
+    """Tests for SourceStatsService"""
+
+    @pytest.mark.asyncio
+    async def test_single_query_with_defaults_for_missing_sources(self, stats_client):
+        stats = await SourceStatsService(stats_client).get_stats(["src1", "src2"])
+
+        stats_client.from_.assert_called_once_with("archon_source_stats")
+        stats_client.from_.return_value.in_.assert_called_once_with("source_id", ["src1", "src2"])
+        assert stats["src1"]["chunks_count"] == 120
+        assert stats["src1"]["first_url"] == "https://docs.example.com/intro"
+        assert stats["src2"]["chunks_count"] == 0
+        assert stats["src2"]["first_url"] is None
+
+    @pytest.mark.asyncio
+    async def test_missing_table_returns_zeros(self, stats_client):
+        stats_client.from_.side_effect = RuntimeError("relation archon_source_stats does not exist")
+
+        stats = await SourceStatsService(stats_client).get_stats(["src1"])
+
+        assert stats["src1"]["code_examples_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_no_sources_skips_query(self, stats_client):
+        assert await SourceStatsService(stats_client).get_stats([]) == {}
+        stats_client.from_.assert_not_called()
+
+
+class TestKnowledgeSummaryCounts:
+    """Summaries read counts from archon_source_stats instead of per-source queries"""
+
+    @pytest.mark.asyncio
+    async def test_summaries_use_source_stats(self, stats_client):
+        sources = [
+            {"source_id": f"src{i}", "title": f"Source {i}", "metadata": {"knowledge_type": "technical"}}
+            for i in range(1, 6)
+        ]
+        stats_client.from_.return_value.execute.side_effect = [
+            MagicMock(count=len(sources)),
+            MagicMock(data=sources),
+            MagicMock(data=STATS_ROWS),
+        ]
+
+        result = await KnowledgeSummaryService(stats_client).get_summaries()
+
+        # Count + page query on sources, one stats query, nothing per source
+        tables = [call.args[0] for call in stats_client.from_.call_args_list]
+        assert tables == ["archon_sources", "archon_sources", "archon_source_stats"]
+        first = result["items"][0]
+        assert first["document_count"] == 120
+        assert first["code_examples_count"] == 7
+        assert first["url"] == "https://docs.example.com/intro"
+        assert result["items"][1]["document_count"] == 0
@@ -0,0 +1,188 @@
+"""
+Tests for the streaming crawl -> chunk -> embed -> store pipeline.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.crawling.document_storage_operations import DocumentStorageOperations
+from src.server.services.crawling.streaming_pipeline import StreamingDocumentPipeline
+
+PIPELINE_MODULE = "src.server.services.crawling.streaming_pipeline"
+REQUEST = {"knowledge_type": "documentation", "tags": []}
+PAGES = [
+    {"url": f"https://example.com/{i}", "markdown": f"content {i}", "html": "<p></p>"} for i in range(50)
+]
+
+
+@pytest.fixture
+def doc_storage_ops():
+    """Mocked storage operations chunking each page into a single chunk."""
+    ops = MagicMock()
+    ops.doc_storage_service.smart_chunk_text_async = AsyncMock(side_effect=lambda text, chunk_size: [text])
+    ops.build_chunk_metadata = DocumentStorageOperations.build_chunk_metadata
+    ops._create_source_records = AsyncMock()
+    ops.extract_code_blocks = AsyncMock(return_value=[])
+    return ops
+
+
+@pytest.fixture(autouse=True)
+def page_storage_ops():
+    """Page storage returning a page ID per stored URL."""
+    with patch(f"{PIPELINE_MODULE}.PageStorageOperations") as mock_class:
+        ops = mock_class.return_value
+        ops.store_pages = AsyncMock(side_effect=lambda pages, *args: {p["url"]: f"page-{p['url']}" for p in pages})
+        yield ops
+
+
+@pytest.fixture(autouse=True)
+def mock_execute_async():
+    with patch(f"{PIPELINE_MODULE}.execute_async", AsyncMock()) as mock_execute:
+        yield mock_execute
+
+
+class TestStreamingDocumentPipeline:
+    """Tests for StreamingDocumentPipeline"""
+
+    @pytest.mark.asyncio
+    async def test_pages_are_stored_in_batches(self, doc_storage_ops, mock_execute_async):
+        pipeline = StreamingDocumentPipeline(
+            doc_storage_ops, REQUEST, crawl_type="sitemap", source_id="src1", flush_chunk_count=2
+        )
+
+        async def fake_add_documents(**kwargs):
+            return {"chunks_stored": len(kwargs["contents"]), "chunks_reused": 0}
+
+        with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", side_effect=fake_add_documents) as mock_add:
+            for page in PAGES[:5]:
+                await pipeline.put(page)
+            result = await pipeline.finish()
+
+        assert [len(call.kwargs["contents"]) for call in mock_add.call_args_list] == [2, 2, 1]
+        first_batch = mock_add.call_args_list[0].kwargs
+        assert first_batch["metadatas"][0]["page_id"] == "page-https://example.com/0"
+        assert first_batch["metadatas"][0]["crawl_type"] == "sitemap"
+
+        doc_storage_ops._create_source_records.assert_awaited_once()
+        assert result["chunk_count"] == 5
+        assert result["chunks_stored"] == 5
+        assert result["total_word_count"] == 10
+        # The final word count is written without blocking the event loop
+        mock_execute_async.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_only_code_blocks_are_kept_for_code_extraction(self, doc_storage_ops):
+        block = {"block": {"code": "print(1)"}, "source_url": PAGES[1]["url"], "source_id": "src1"}
+        doc_storage_ops.extract_code_blocks = AsyncMock(
+            side_effect=lambda pages, source_id: [block] if pages[0]["url"] == PAGES[1]["url"] else []
+        )
+        pipeline = StreamingDocumentPipeline(doc_storage_ops, REQUEST, crawl_type="sitemap", source_id="src1")
+
+        with patch(
+            f"{PIPELINE_MODULE}.add_documents_to_supabase",
+            AsyncMock(return_value={"chunks_stored": 1}),
+        ):
+            for page in PAGES[:3]:
+                await pipeline.put(page)
+            result = await pipeline.finish()
+
+        assert doc_storage_ops.extract_code_blocks.await_count == 3
+        assert pipeline.code_blocks == [block]
+        # Only documents with code examples are kept, for contextual code embeddings
+        assert result["url_to_full_document"] == {PAGES[1]["url"]: "content 1"}
+        assert pipeline.processed_urls == {page["url"] for page in PAGES[:3]}
+        assert not hasattr(pipeline, "crawl_results")
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self, doc_storage_ops):
+        pipeline = StreamingDocumentPipeline(
+            doc_storage_ops, REQUEST, crawl_type="sitemap", source_id="src1", page_queue_size=1, flush_chunk_count=1
+        )
+        release = asyncio.Event()
+
+        async def slow_add_documents(**kwargs):
+            await release.wait()
+            return {"chunks_stored": len(kwargs["contents"])}
+
+        with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", side_effect=slow_add_documents):
+            producer = asyncio.create_task(self._produce(pipeline, 10))
+            await asyncio.sleep(0.05)
+
+            # Storage is stalled, so the producer is blocked well short of the full crawl
+            assert not producer.done()
+            assert pipeline.pages_received < 10
+
+            release.set()
+            await producer
+            result = await pipeline.finish()
+
+        assert result["chunks_stored"] == 10
+
+    @pytest.mark.asyncio
+    async def test_storage_error_stops_producer(self, doc_storage_ops):
+        pipeline = StreamingDocumentPipeline(
+            doc_storage_ops, REQUEST, crawl_type="sitemap", source_id="src1", flush_chunk_count=1
+        )
+
+        with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", AsyncMock(side_effect=RuntimeError("db down"))):
+            with pytest.raises(RuntimeError, match="db down"):
+                for page in PAGES:
+                    await pipeline.put(page)
+                    await asyncio.sleep(0)
+                await pipeline.finish()
+
+        await pipeline.abort()
+
+    @pytest.mark.asyncio
+    async def test_no_code_extraction_when_disabled(self, doc_storage_ops):
+        pipeline = StreamingDocumentPipeline(
+            doc_storage_ops, REQUEST, crawl_type="sitemap", source_id="src1", extract_code=False
+        )
+
+        with patch(
+            f"{PIPELINE_MODULE}.add_documents_to_supabase",
+            AsyncMock(return_value={"chunks_stored": 1}),
+        ):
+            await pipeline.put(PAGES[0])
+            result = await pipeline.finish()
+
+        doc_storage_ops.extract_code_blocks.assert_not_called()
+        assert pipeline.code_blocks == []
+        assert result["url_to_full_document"] == {}
+        assert result["chunk_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stored_batches_are_reported_for_checkpoints(self, doc_storage_ops):
+        pipeline = StreamingDocumentPipeline(
+            doc_storage_ops, REQUEST, crawl_type="sitemap", source_id="src1", flush_chunk_count=2
+        )
+        stored = []
+        pipeline.on_batch_stored = AsyncMock(side_effect=lambda pages, words: stored.append((pages, words)))
+        pipeline.resume_from(stored_word_count=100)
+
+        async def fake_add_documents(**kwargs):
+            return {"chunks_stored": len(kwargs["contents"])}
+
+        with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", side_effect=fake_add_documents):
+            for page in PAGES[:3]:
+                await pipeline.put(page)
+            result = await pipeline.finish()
+
+        assert stored[0] == (
+            {
+                "https://example.com/0": "page-https://example.com/0",
+                "https://example.com/1": "page-https://example.com/1",
+            },
+            4,
+        )
+        assert list(stored[1][0]) == ["https://example.com/2"]
+        # The source exists from the interrupted run and the word count carries over
+        doc_storage_ops._create_source_records.assert_not_awaited()
+        assert result["total_word_count"] == 106
+
+    @staticmethod
+    async def _produce(pipeline, count):
+        for page in PAGES[:count]:
+            await pipeline.put(page)
@@ -9,7 +9,13 @@ from unittest.mock import Mock, patch
 
 from src.server.services.projects import ProjectService
 from src.server.services.projects.task_service import TaskService
-from src.server.services.projects.document_service import DocumentService
+from src.server.services.projects.document_service import (
+    DOCUMENT_COLUMNS,
+    DOCUMENT_SUMMARY_COLUMNS,
+    DOCUMENTS_TABLE,
+    DocumentService,
+)
+from src.server.services.projects.project_service import PROJECT_COLUMNS
 
 
 class TestProjectServiceOptimization:
@@ -29,21 +35,22 @@ class TestProjectServiceOptimization:
             "title": "Test Project",
             "description": "Test Description",
             "github_repo": "https://github.com/test/repo",
-            "docs": [{"id": "doc1", "content": {"large": "content" * 100}}],
             "features": [{"feature1": "data"}],
             "data": [{"key": "value"}],
             "pinned": False,
             "created_at": "2024-01-01",
             "updated_at": "2024-01-01"
         }]
+        docs_response = Mock()
+        docs_response.data = [
+            {"project_id": "test-id", "id": "doc1", "content": {"large": "content" * 100}, "position": 1}
+        ]
         
         mock_table = Mock()
-        mock_select = Mock()
-        mock_order = Mock()
-        mock_order.execute.return_value = mock_response
-        mock_select.order.return_value = mock_order
-        mock_table.select.return_value = mock_select
-        mock_client.table.return_value = mock_table
+        mock_table.select.return_value.order.return_value.execute.return_value = mock_response
+        docs_table = Mock()
+        docs_table.select.return_value.order.return_value.execute.return_value = docs_response
+        mock_client.table.side_effect = lambda name: docs_table if name == DOCUMENTS_TABLE else mock_table
         
         # Test
         service = ProjectService(mock_client)
@@ -59,9 +66,11 @@ class TestProjectServiceOptimization:
         # Verify full content is returned
         assert len(result["projects"][0]["docs"]) == 1
         assert result["projects"][0]["docs"][0]["content"]["large"] is not None
+        assert "position" not in result["projects"][0]["docs"][0]
         
-        # Verify SELECT * was used
-        mock_table.select.assert_called_with("*")
+        # Verify documents come from their own table, not the deprecated docs column
+        mock_table.select.assert_called_with(PROJECT_COLUMNS)
+        docs_table.select.assert_called_with(DOCUMENT_COLUMNS)
     
     @patch('src.server.utils.get_supabase_client')
     def test_list_projects_lightweight(self, mock_supabase):
@@ -80,20 +89,20 @@ class TestProjectServiceOptimization:
             "created_at": "2024-01-01",
             "updated_at": "2024-01-01",
             "pinned": False,
-            "docs": [{"id": "doc1"}, {"id": "doc2"}, {"id": "doc3"}],  # 3 docs
             "features": [{"feature1": "data"}, {"feature2": "data"}],  # 2 features
             "data": [{"key": "value"}]  # Has data
         }]
+        docs_response = Mock()
+        docs_response.data = [
+            {"project_id": "test-id", "id": f"doc{i}", "content_size": 10} for i in range(3)
+        ]  # 3 docs
         
-        # Setup mock chain - now simpler after N+1 fix
+        # Setup mock chain - one query for projects and one for all document summaries
         mock_table = Mock()
-        mock_select = Mock()
-        mock_order = Mock()
-        
-        mock_order.execute.return_value = mock_response
-        mock_select.order.return_value = mock_order
-        mock_table.select.return_value = mock_select
-        mock_client.table.return_value = mock_table
+        mock_table.select.return_value.order.return_value.execute.return_value = mock_response
+        docs_table = Mock()
+        docs_table.select.return_value.order.return_value.execute.return_value = docs_response
+        mock_client.table.side_effect = lambda name: docs_table if name == DOCUMENTS_TABLE else mock_table
         
         # Test
         service = ProjectService(mock_client)
@@ -115,9 +124,10 @@ class TestProjectServiceOptimization:
         assert project["stats"]["features_count"] == 2
         assert project["stats"]["has_data"] is True
         
-        # Verify SELECT * was used (after N+1 fix, we fetch all data in one query)
-        mock_table.select.assert_called_with("*")
-        assert mock_client.table.call_count == 1  # Only one query now!
+        # Verify document content is never fetched and no query runs per project
+        mock_table.select.assert_called_with(PROJECT_COLUMNS)
+        docs_table.select.assert_called_with(DOCUMENT_SUMMARY_COLUMNS)
+        assert mock_client.table.call_count == 2
     
     def test_token_reduction(self):
         """Verify token count reduction."""
@@ -260,28 +270,23 @@ class TestDocumentServiceOptimization:
         mock_client = Mock()
         mock_supabase.return_value = mock_client
         
+        # Summary rows carry the size computed by the database instead of the content
         mock_response = Mock()
         mock_response.data = [{
-            "docs": [{
-                "id": "doc-1",
-                "title": "Test Doc",
-                "content": {"huge": "content" * 1000},
-                "document_type": "spec",
-                "status": "draft",
-                "version": "1.0",
-                "tags": ["test"],
-                "author": "Test Author"
-            }]
+            "project_id": "project-1",
+            "id": "doc-1",
+            "title": "Test Doc",
+            "document_type": "spec",
+            "status": "draft",
+            "version": "1.0",
+            "tags": ["test"],
+            "author": "Test Author",
+            "content_size": 7000
         }]
         
         # Setup mock chain
         mock_table = Mock()
-        mock_select = Mock()
-        mock_eq = Mock()
-        
-        mock_eq.execute.return_value = mock_response
-        mock_select.eq.return_value = mock_eq
-        mock_table.select.return_value = mock_select
+        mock_table.select.return_value.eq.return_value.order.return_value.execute.return_value = mock_response
         mock_client.table.return_value = mock_table
         
         service = DocumentService(mock_client)
@@ -291,8 +296,10 @@ class TestDocumentServiceOptimization:
         doc = result["documents"][0]
         assert "content" not in doc
         assert "stats" in doc
-        assert doc["stats"]["content_size"] > 0
+        assert doc["stats"]["content_size"] == 7000
         assert doc["title"] == "Test Doc"
+        mock_client.table.assert_called_with(DOCUMENTS_TABLE)
+        mock_table.select.assert_called_with(DOCUMENT_SUMMARY_COLUMNS)
     
     @patch('src.server.utils.get_supabase_client')
     def test_list_documents_with_content(self, mock_supabase):
@@ -302,22 +309,16 @@ class TestDocumentServiceOptimization:
         
         mock_response = Mock()
         mock_response.data = [{
-            "docs": [{
-                "id": "doc-1",
-                "title": "Test Doc",
-                "content": {"huge": "content"},
-                "document_type": "spec"
-            }]
+            "project_id": "project-1",
+            "id": "doc-1",
+            "title": "Test Doc",
+            "content": {"huge": "content"},
+            "document_type": "spec"
         }]
         
         # Setup mock chain
         mock_table = Mock()
-        mock_select = Mock()
-        mock_eq = Mock()
-        
-        mock_eq.execute.return_value = mock_response
-        mock_select.eq.return_value = mock_eq
-        mock_table.select.return_value = mock_select
+        mock_table.select.return_value.eq.return_value.order.return_value.execute.return_value = mock_response
         mock_client.table.return_value = mock_table
         
         service = DocumentService(mock_client)
@@ -327,6 +328,7 @@ class TestDocumentServiceOptimization:
         doc = result["documents"][0]
         assert "content" in doc
         assert doc["content"]["huge"] == "content"
+        mock_table.select.assert_called_with(DOCUMENT_COLUMNS)
 
 
 class TestBackwardCompatibility:
@@ -0,0 +1,115 @@
+"""
+Tests for vector index planning and rebuilds.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.search.vector_index_service import (
+    VectorIndexService,
+    hnsw_ef_search,
+    ivfflat_lists,
+    ivfflat_probes,
+    needs_rebuild,
+    plan_vector_index,
+)
+
+SERVICE_MODULE = "src.server.services.search.vector_index_service"
+
+
+def status(dimension=1536, row_count=0, method=None, options=None, table_name="archon_crawled_pages"):
+    return {
+        "table_name": table_name,
+        "dimension": dimension,
+        "row_count": row_count,
+        "index_name": f"idx_{table_name}_embedding_{dimension}" if method else None,
+        "index_method": method,
+        "index_options": options,
+    }
+
+
+class TestPlanning:
+    """Tests for index method and parameter selection"""
+
+    def test_ivfflat_lists_follow_row_count(self):
+        assert ivfflat_lists(0) == 1
+        assert ivfflat_lists(250_000) == 250
+        assert ivfflat_lists(4_000_000) == 2000
+
+    def test_search_effort_grows_with_recall_target(self):
+        assert ivfflat_probes(100, 0.9) == 10
+        assert ivfflat_probes(100, 0.95) == 22
+        assert ivfflat_probes(100, 0.999) == 100
+        assert hnsw_ef_search(0.9) == 40
+        # HNSW returns at most ef_search rows, so it covers the largest search
+        assert hnsw_ef_search(0.9, min_results=50) == 50
+        with pytest.raises(ValueError):
+            hnsw_ef_search(1.0)
+
+    def test_auto_method_uses_hnsw_until_the_column_is_large(self):
+        small = plan_vector_index("archon_crawled_pages", 3072, 20_000)
+        large = plan_vector_index("archon_crawled_pages", 1536, 2_000_000)
+
+        assert (small.method, small.ef_search, small.lists) == ("hnsw", 85, None)
+        assert small.halfvec
+        assert (large.method, large.lists) == ("ivfflat", 1414)
+
+    def test_rebuild_only_when_index_no_longer_fits(self):
+        plan = plan_vector_index("archon_crawled_pages", 1536, 250_000, method="ivfflat")
+
+        assert needs_rebuild(status(method=None), plan)
+        assert needs_rebuild(status(method="hnsw"), plan)
+        # Created with lists = 100 on an empty table, now 2.5x too few
+        assert needs_rebuild(status(method="ivfflat", options=["lists=100"]), plan)
+        assert not needs_rebuild(status(method="ivfflat", options=["lists=200"]), plan)
+
+
+class TestVectorIndexService:
+    """Tests for VectorIndexService.rebuild"""
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_stale_indexes_and_tunes_the_rest(self):
+        supabase = MagicMock()
+        statuses = [
+            status(1536, 250_000, "ivfflat", ["lists=100"]),
+            status(768, 5_000, "hnsw"),
+            status(3072, 1_000, None),
+        ]
+        settings = {"VECTOR_INDEX_METHOD": "auto", "VECTOR_INDEX_HNSW_MAX_ROWS": "100000"}
+        service = VectorIndexService(supabase, get_setting=lambda key, default: settings.get(key, default))
+
+        responses = [MagicMock(data=statuses), *[MagicMock(data="CREATE INDEX ...")] * 10]
+        with patch(f"{SERVICE_MODULE}.execute_async", AsyncMock(side_effect=responses)):
+            results = await service.rebuild()
+
+        assert [(r["dimension"], r["method"], r["action"]) for r in results] == [
+            (1536, "ivfflat", "rebuilt"),
+            (768, "hnsw", "tuned"),
+            (3072, "hnsw", "rebuilt"),
+        ]
+        rebuild_calls = [c for c in supabase.rpc.call_args_list if c.args[0] == "archon_rebuild_vector_index"]
+        assert rebuild_calls[0].args[1]["p_lists"] == 250
+        assert rebuild_calls[1].args[1]["p_dimension"] == 3072
+        saved = [c.args[0] for c in supabase.table.return_value.upsert.call_args_list]
+        assert [row["dimension"] for row in saved] == [1536, 768, 3072]
+        assert saved[0]["probes"] == ivfflat_probes(250, 0.95)
+
+    @pytest.mark.asyncio
+    async def test_failed_rebuild_is_reported_per_index(self):
+        supabase = MagicMock()
+        service = VectorIndexService(supabase, get_setting=lambda key, default: default)
+        responses = [MagicMock(data=[status(3072, 10, None)]), Exception("type halfvec does not exist")]
+
+        with patch(f"{SERVICE_MODULE}.execute_async", AsyncMock(side_effect=responses)):
+            results = await service.rebuild(dimension=3072)
+
+        assert results[0]["action"] == "failed"
+        assert "halfvec" in results[0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_table_is_rejected(self):
+        service = VectorIndexService(MagicMock())
+
+        with pytest.raises(ValueError):
+            await service.rebuild(table_name="archon_projects")